@@ -817,7 +817,7 @@ def _resolve_rate_set(project_id, set_id):
 
     Returns ``{'rate': Decimal, 'name': str}`` or an error envelope. Refuses a
     graduated (multi-step) set: the engine applies ONE annual rate per line
-    (``_apply_inflation(amount, period, annual_rate)``), so flattening a stepped
+    (``land_dev_inputs.inflation_factors(annual_rate, period_count)``), so flattening a stepped
     schedule to its first step would misstate every later period while looking
     like it worked.
     """
@@ -83,6 +83,8 @@ class ConstructionLoanService:
             )
 
             svc = LandDevCashFlowService(self.project_id)
+            # Load the filtered snapshot first so project-level config comes from it
+            svc._get_inputs(container_ids)
             project_config = svc._get_project_config()
             dcf_assumptions = svc._get_dcf_assumptions()
             hold_period_months = svc._get_dcf_hold_period_months()
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import numpy_financial as npf
 
 
@@ -87,6 +88,9 @@ class RevolverResult:
     maturity_shortfall: float = 0.0
     total_parcels: int = 0
     total_parcels_released: int = 0
+    # |reserve(k+1) - reserve(k)| per interest reserve iteration
+    reserve_residuals: List[float] = field(default_factory=list)
+    converged: bool = True
 
 
 @dataclass
@@ -114,6 +118,29 @@ class TermResult:
     monthly_payment_amort: float
 
 
+@dataclass
+class _RevolverInputs:
+    """period_data flattened to arrays once per revolver calculation."""
+
+    period_index: np.ndarray
+    total_costs: np.ndarray
+    lots_sold: np.ndarray
+
+    @classmethod
+    def from_period_data(cls, period_data: List[PeriodCosts]) -> "_RevolverInputs":
+        return cls(
+            period_index=np.array([p.period_index for p in period_data], dtype=np.int64),
+            total_costs=np.array([p.total_costs for p in period_data], dtype=float),
+            lots_sold=np.array(
+                [sum(p.lots_sold_by_product.values()) for p in period_data], dtype=np.int64
+            ),
+        )
+
+    @property
+    def total_parcels(self) -> int:
+        return int(self.lots_sold.sum())
+
+
 class DebtServiceEngine:
     MAX_ITERATIONS = 15
     CONVERGENCE_TOLERANCE = 1.0
@@ -133,27 +160,26 @@ class DebtServiceEngine:
                 f"draw_trigger_type '{params.draw_trigger_type}' not supported. Use COST_INCURRED."
             )
 
-        commitment, interest_reserve, origination_fee, iterations = self._iterate_reserve_and_fee(
-            params,
-            period_data,
+        inputs = _RevolverInputs.from_period_data(period_data)
+        commitment, interest_reserve, origination_fee, iterations, residuals = (
+            self._iterate_reserve_and_fee(params, period_data, inputs)
         )
 
-        periods = self._generate_revolver_schedule(
+        schedule = self._revolver_arrays(
             params,
-            period_data,
+            inputs,
             commitment,
             interest_reserve,
             origination_fee,
         )
+        periods = self._build_revolver_periods(period_data, inputs, schedule)
 
-        total_interest = sum(p.accrued_interest for p in periods)
-        total_release_payments = sum(p.release_payments for p in periods)
-        peak_balance = max((p.ending_balance for p in periods), default=0.0)
+        total_interest = float(schedule['accrued_interest'].sum())
+        total_release_payments = float(schedule['release_payments'].sum())
+        peak_balance = float(schedule['ending_balance'].max()) if len(periods) else 0.0
         peak_balance_pct = peak_balance / commitment if commitment else 0.0
 
-        total_parcels = sum(
-            sum(p.lots_sold_by_product.values()) for p in period_data
-        )
+        total_parcels = inputs.total_parcels
         total_released = periods[-1].cumulative_parcels_released if periods else 0
 
         # Maturity shortfall: balance remaining at term end
@@ -178,6 +204,8 @@ class DebtServiceEngine:
             maturity_shortfall=maturity_shortfall,
             total_parcels=total_parcels,
             total_parcels_released=total_released,
+            reserve_residuals=residuals,
+            converged=bool(residuals) and residuals[-1] < self.CONVERGENCE_TOLERANCE,
         )
 
     def calculate_term(
@@ -305,7 +333,8 @@ class DebtServiceEngine:
         self,
         params: RevolverLoanParams,
         period_data: List[PeriodCosts],
-    ) -> Tuple[float, float, float, int]:
+        inputs: Optional[_RevolverInputs] = None,
+    ) -> Tuple[float, float, float, int, List[float]]:
         """
         Iterative convergence for interest reserve and origination fee.
 
@@ -326,9 +355,19 @@ class DebtServiceEngine:
             reserve = total_interest / (1 - cushion)
                     = total_interest / (2 - inflator)
 
-        Returns: (commitment_amount, interest_reserve, origination_fee, iterations)
+        The fixed point reserve = g(reserve) is solved with secant steps on
+        g(r) - r (one-dimensional Anderson acceleration), falling back to a
+        plain fixed-point step when the secant is degenerate or negative.
+        Every iteration costs one array schedule; no RevolverPeriod objects
+        are built until the final pass.
+
+        Returns: (commitment_amount, interest_reserve, origination_fee,
+                  iterations, residuals)
         """
-        base_costs = sum(p.total_costs for p in period_data)
+        if inputs is None:
+            inputs = _RevolverInputs.from_period_data(period_data)
+
+        base_costs = float(inputs.total_costs.sum())
         ltc = params.loan_to_cost_pct
         fee_pct = params.origination_fee_pct
         denom = 1.0 - ltc * fee_pct
@@ -337,47 +376,72 @@ class DebtServiceEngine:
         # inflator=1.2 -> 20% cushion -> multiplier = 1/(2-1.2) = 1.25
         effective_multiplier = 1.0 / (2.0 - params.interest_reserve_inflator)
 
-        prev_reserve = 0.0
-        commitment = 0.0
-        iterations = 0
-
-        for iteration in range(self.MAX_ITERATIONS):
-            iterations = iteration + 1
+        def size(reserve: float) -> Tuple[float, float]:
+            commitment = (base_costs + params.closing_costs + reserve) * ltc / denom
+            return commitment, commitment * fee_pct
 
-            commitment = (base_costs + params.closing_costs + prev_reserve) * ltc / denom
-            origination_fee = commitment * fee_pct
+        def required_reserve(reserve: float) -> float:
+            commitment, origination_fee = size(reserve)
+            schedule = self._revolver_arrays(params, inputs, commitment, reserve, origination_fee)
+            return float(schedule['accrued_interest'].sum()) * effective_multiplier
 
-            schedule = self._generate_revolver_schedule(
-                params,
-                period_data,
-                commitment,
-                prev_reserve,
-                origination_fee,
-            )
-            total_interest = sum(p.accrued_interest for p in schedule)
+        reserve = 0.0
+        previous: Optional[Tuple[float, float]] = None
+        residuals: List[float] = []
 
-            new_reserve = total_interest * effective_multiplier
+        for _ in range(self.MAX_ITERATIONS):
+            new_reserve = required_reserve(reserve)
+            residual = new_reserve - reserve
+            residuals.append(abs(residual))
 
-            if abs(new_reserve - prev_reserve) < self.CONVERGENCE_TOLERANCE:
-                prev_reserve = new_reserve
-                commitment = (base_costs + params.closing_costs + prev_reserve) * ltc / denom
-                origination_fee = commitment * fee_pct
+            if abs(residual) < self.CONVERGENCE_TOLERANCE:
+                reserve = new_reserve
                 break
 
-            prev_reserve = new_reserve
+            next_reserve = new_reserve
+            if previous is not None and reserve != previous[0]:
+                slope = (residual - previous[1]) / (reserve - previous[0])
+                if slope != 0.0:
+                    candidate = reserve - residual / slope
+                    if np.isfinite(candidate) and candidate >= 0.0:
+                        next_reserve = candidate
 
-        return commitment, prev_reserve, origination_fee, iterations
+            previous = (reserve, residual)
+            reserve = next_reserve
 
-    def _generate_revolver_schedule(
+        commitment, origination_fee = size(reserve)
+        return commitment, reserve, origination_fee, len(residuals), residuals
+
+    @staticmethod
+    def _reverse_fill(costs: np.ndarray, capacity: float) -> np.ndarray:
+        """
+        Allocate capacity from the last cost period backward: later periods
+        draw their full cost, the earliest funded period gets the residual.
+        """
+        if not (costs >= 0).all():
+            draws = np.zeros(len(costs))
+            remaining = capacity
+            for i in range(len(costs) - 1, -1, -1):
+                draws[i] = min(costs[i], remaining)
+                remaining -= draws[i]
+                if remaining <= 0:
+                    break
+            return draws
+
+        # Capacity left before each period = capacity - costs of all later periods
+        later_costs = np.concatenate([np.cumsum(costs[::-1])[::-1][1:], [0.0]])
+        return np.minimum(costs, np.maximum(capacity - later_costs, 0.0))
+
+    def _revolver_arrays(
         self,
         params: RevolverLoanParams,
-        period_data: List[PeriodCosts],
+        inputs: _RevolverInputs,
         commitment: float,
         interest_reserve: float,
         origination_fee: float,
-    ) -> List[RevolverPeriod]:
+    ) -> Dict[str, np.ndarray]:
         """
-        Generate the period-by-period loan schedule.
+        Period-by-period revolver schedule as aligned arrays.
 
         Interest reserve is a segregated escrow funded from commitment
         capacity.  Each month, the reserve pays accrued interest so it
@@ -391,136 +455,177 @@ class DebtServiceEngine:
         Cost draws use reverse-fill ordering: later periods draw their
         full costs first, and the first cost period receives whatever
         commitment capacity remains (the residual).
+
+        Draws, fees and release obligations are vectorized; only the
+        balance / reserve recurrence runs period by period.
         """
-        periods: List[RevolverPeriod] = []
+        period_index = inputs.period_index
+        count = len(period_index)
         monthly_rate = params.interest_rate_annual / 12 if params.interest_rate_annual else 0.0
-        term_end = params.loan_start_period + params.loan_term_months
+        start = params.loan_start_period
+        term_end = start + params.loan_term_months
 
-        # --- Pre-calculate release price per lot (pro-rata of commitment) ---
-        total_parcels = sum(
-            sum(p.lots_sold_by_product.values()) for p in period_data
-        )
+        # --- Release price per lot (pro-rata of commitment) ---
+        total_parcels = inputs.total_parcels
         if total_parcels > 0:
-            pro_rata_allocation = commitment / total_parcels
-            release_price_per_lot = max(
-                pro_rata_allocation * params.release_price_pct * params.repayment_acceleration,
+            release_price_per_lot = self._calculate_release_price(
+                commitment / total_parcels,
+                params.release_price_pct,
+                params.repayment_acceleration,
                 params.release_price_minimum,
             )
         else:
             release_price_per_lot = 0.0
 
-        # --- Pass 1: Pre-allocate cost draws using reverse-fill ordering ---
-        # Available commitment capacity for cost draws (after reserve/fee/closing)
+        # --- Cost draws: reverse-fill the capacity left after reserve/fee/closing ---
         non_cost_uses = interest_reserve + origination_fee + params.closing_costs
         available_for_costs = max(commitment - non_cost_uses, 0.0)
+        in_term = (period_index >= start) & (period_index < term_end)
+        cost_draw = np.zeros(count)
+        cost_draw[in_term] = self._reverse_fill(inputs.total_costs[in_term], available_for_costs)
+
+        is_start = period_index == start
+        active = period_index >= start
+        origination_cost = np.where(is_start, origination_fee + params.closing_costs, 0.0)
+        reserve_funding = np.where(is_start, interest_reserve, 0.0)
+        parcels_released = np.where(active, inputs.lots_sold, 0)
+        release_due = (
+            release_price_per_lot * parcels_released
+            if release_price_per_lot > 0 else np.zeros(count)
+        )
 
-        # Collect period indices and costs during the loan term
-        cost_periods: List[Tuple[int, float]] = []
-        for period in period_data:
-            if params.loan_start_period <= period.period_index < term_end:
-                cost_periods.append((period.period_index, period.total_costs))
-
-        # Reverse-fill: allocate from last period backward
-        draw_by_period: Dict[int, float] = {}
-        remaining_capacity = available_for_costs
-        for period_index, period_cost in reversed(cost_periods):
-            draw = min(period_cost, remaining_capacity)
-            draw_by_period[period_index] = draw
-            remaining_capacity -= draw
-            if remaining_capacity <= 0:
-                break
-
-        # Periods not reached by reverse-fill get zero draws
-        for period_index, _ in cost_periods:
-            if period_index not in draw_by_period:
-                draw_by_period[period_index] = 0.0
+        beginning_balance = np.zeros(count)
+        accrued_interest = np.zeros(count)
+        interest_reserve_draw = np.zeros(count)
+        interest_reserve_balance = np.zeros(count)
+        interest_capitalized = np.zeros(count)
+        release_payments = np.zeros(count)
+        ending_balance = np.zeros(count)
 
-        # --- Pass 2: Generate period-by-period schedule ---
         reserve_balance = 0.0
-        ending_balance = 0.0
-        cumulative_parcels = 0
-
-        for period in period_data:
-            period_index = period.period_index
-            date = period.date
-            beginning_balance = ending_balance
-            balance = beginning_balance
-
-            origination_cost = 0.0
-            if period_index == params.loan_start_period:
-                origination_cost = origination_fee + params.closing_costs
-                reserve_balance += interest_reserve
-                balance += origination_cost
-
-            cost_draw = 0.0
-            accrued_interest = 0.0
-            interest_reserve_draw = 0.0
-            interest_capitalized = 0.0
-            release_payments = 0.0
-            release_payments_by_product: Dict[int, float] = {}
-            parcels_this_period = 0
-
-            # Cost draws: only during loan term
-            if params.loan_start_period <= period_index < term_end:
-                cost_draw = draw_by_period.get(period_index, 0.0)
-                balance += cost_draw
+        balance_end = 0.0
+        rows = zip(
+            origination_cost.tolist(),
+            cost_draw.tolist(),
+            reserve_funding.tolist(),
+            active.tolist(),
+            release_due.tolist(),
+        )
+        for i, (origination, draw, funding, is_active, due) in enumerate(rows):
+            beginning = balance_end
+            balance = beginning + origination + draw
+            reserve_balance += funding
 
             # Interest accrues on beginning balance whenever balance > 0
             # (continues past term_end if balance remains)
-            if period_index >= params.loan_start_period and beginning_balance > 0:
-                accrued_interest = beginning_balance * monthly_rate
-
+            if is_active and beginning > 0:
+                accrued = beginning * monthly_rate
+                paid = 0.0
                 # Reserve pays interest first — does NOT capitalize
-                if reserve_balance > 0 and accrued_interest > 0:
-                    interest_reserve_draw = min(accrued_interest, reserve_balance)
-                    reserve_balance -= interest_reserve_draw
-
-                # Only the portion NOT covered by reserve capitalizes
-                interest_capitalized = accrued_interest - interest_reserve_draw
-                balance += interest_capitalized
+                if reserve_balance > 0 and accrued > 0:
+                    paid = min(accrued, reserve_balance)
+                    reserve_balance -= paid
+                capitalized = accrued - paid
+                balance += capitalized
+                accrued_interest[i] = accrued
+                interest_reserve_draw[i] = paid
+                interest_capitalized[i] = capitalized
 
             # Release payments: whenever parcels sell (even past term_end)
-            if period_index >= params.loan_start_period:
-                parcels_this_period = sum(period.lots_sold_by_product.values())
-                if parcels_this_period > 0 and release_price_per_lot > 0:
-                    uncapped_release = release_price_per_lot * parcels_this_period
-                    release_payments = min(uncapped_release, max(balance, 0.0))
-                    balance -= release_payments
-
-                    # Track per-product breakdown (pro-rate cap across products)
-                    cap_ratio = release_payments / uncapped_release if uncapped_release > 0 else 0.0
-                    for product_id, lots_sold in period.lots_sold_by_product.items():
-                        release_payments_by_product[product_id] = (
-                            release_price_per_lot * lots_sold * cap_ratio
-                        )
-
-            cumulative_parcels += parcels_this_period
-            ending_balance = max(balance, 0.0)
-            loan_activity = ending_balance - beginning_balance
+            if due > 0:
+                payment = min(due, max(balance, 0.0))
+                balance -= payment
+                release_payments[i] = payment
+
+            balance_end = max(balance, 0.0)
+            beginning_balance[i] = beginning
+            interest_reserve_balance[i] = reserve_balance
+            ending_balance[i] = balance_end
+
+        return {
+            'beginning_balance': beginning_balance,
+            'cost_draw': cost_draw,
+            'accrued_interest': accrued_interest,
+            'interest_reserve_draw': interest_reserve_draw,
+            'interest_reserve_balance': interest_reserve_balance,
+            'origination_cost': origination_cost,
+            'interest_capitalized': interest_capitalized,
+            'release_due': release_due,
+            'release_payments': release_payments,
+            'ending_balance': ending_balance,
+            'parcels_released': parcels_released,
+            'release_price_per_lot': np.float64(release_price_per_lot),
+        }
+
+    def _build_revolver_periods(
+        self,
+        period_data: List[PeriodCosts],
+        inputs: _RevolverInputs,
+        schedule: Dict[str, np.ndarray],
+    ) -> List[RevolverPeriod]:
+        """Materialize RevolverPeriod rows from an array schedule."""
+        release_price_per_lot = float(schedule['release_price_per_lot'])
+        cumulative = np.cumsum(schedule['parcels_released']).tolist()
+        total_parcels = inputs.total_parcels
+        columns = {
+            name: schedule[name].tolist()
+            for name in (
+                'beginning_balance', 'cost_draw', 'accrued_interest', 'interest_reserve_draw',
+                'interest_reserve_balance', 'origination_cost', 'interest_capitalized',
+                'release_due', 'release_payments', 'ending_balance', 'parcels_released',
+            )
+        }
+
+        periods: List[RevolverPeriod] = []
+        for i, period in enumerate(period_data):
+            release_payments_by_product: Dict[int, float] = {}
+            due = columns['release_due'][i]
+            if due > 0:
+                # Per-product breakdown (pro-rate cap across products)
+                cap_ratio = columns['release_payments'][i] / due
+                for product_id, lots_sold in period.lots_sold_by_product.items():
+                    release_payments_by_product[product_id] = (
+                        release_price_per_lot * lots_sold * cap_ratio
+                    )
 
             periods.append(
                 RevolverPeriod(
-                    period_index=period_index,
-                    date=date,
-                    beginning_balance=beginning_balance,
-                    cost_draw=cost_draw,
-                    accrued_interest=accrued_interest,
-                    interest_reserve_draw=interest_reserve_draw,
-                    interest_reserve_balance=reserve_balance,
-                    origination_cost=origination_cost,
-                    release_payments=release_payments,
+                    period_index=period.period_index,
+                    date=period.date,
+                    beginning_balance=columns['beginning_balance'][i],
+                    cost_draw=columns['cost_draw'][i],
+                    accrued_interest=columns['accrued_interest'][i],
+                    interest_reserve_draw=columns['interest_reserve_draw'][i],
+                    interest_reserve_balance=columns['interest_reserve_balance'][i],
+                    origination_cost=columns['origination_cost'][i],
+                    release_payments=columns['release_payments'][i],
                     release_payments_by_product=release_payments_by_product,
-                    ending_balance=ending_balance,
-                    loan_activity=loan_activity,
-                    interest_capitalized=interest_capitalized,
-                    parcels_released=parcels_this_period,
-                    cumulative_parcels_released=cumulative_parcels,
-                    remaining_parcels=total_parcels - cumulative_parcels,
+                    ending_balance=columns['ending_balance'][i],
+                    loan_activity=columns['ending_balance'][i] - columns['beginning_balance'][i],
+                    interest_capitalized=columns['interest_capitalized'][i],
+                    parcels_released=columns['parcels_released'][i],
+                    cumulative_parcels_released=cumulative[i],
+                    remaining_parcels=total_parcels - cumulative[i],
                 )
             )
 
         return periods
 
+    def _generate_revolver_schedule(
+        self,
+        params: RevolverLoanParams,
+        period_data: List[PeriodCosts],
+        commitment: float,
+        interest_reserve: float,
+        origination_fee: float,
+    ) -> List[RevolverPeriod]:
+        """Generate the period-by-period loan schedule (see _revolver_arrays)."""
+        inputs = _RevolverInputs.from_period_data(period_data)
+        schedule = self._revolver_arrays(
+            params, inputs, commitment, interest_reserve, origination_fee,
+        )
+        return self._build_revolver_periods(period_data, inputs, schedule)
+
     @staticmethod
     def _calculate_release_price(
         pro_rata_allocation: float,
@@ -245,6 +245,16 @@ class WaterfallSettingsSerializer(serializers.Serializer):
         default=8,
         help_text='LP preferred return rate as percentage'
     )
+    period_irr = serializers.ChoiceField(
+        choices=['final', 'every', 'every_n'],
+        default='every',
+        help_text='Which periods report running LP/GP IRR'
+    )
+    period_irr_interval = serializers.IntegerField(
+        min_value=1,
+        default=12,
+        help_text='Period spacing for period_irr=every_n'
+    )
 
 
 class WaterfallCalculateRequestSerializer(serializers.Serializer):
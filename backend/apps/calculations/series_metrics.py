@@ -30,9 +30,10 @@ These functions were previously duplicated as private helpers inside
 apps/calculations/views.py. They live here now so the service layer and the
 view layer share one implementation instead of two.
 
-numpy_financial is imported lazily inside each function, on purpose: callers
-catch ImportError to degrade to HTTP 503 rather than 500 when the optional
-engine dependency is absent. Do not hoist these imports to module scope.
+numpy_financial (and the batch solver in financial_engine) is imported lazily
+inside each function, on purpose: callers catch ImportError to degrade to
+HTTP 503 rather than 500 when the optional engine dependency is absent. Do
+not hoist these imports to module scope.
 """
 
 import math
@@ -63,6 +64,43 @@ def irr_from_series(cash_flows: List[float]) -> Optional[float]:
     return None if math.isnan(irr) else irr
 
 
+def irr_from_series_batch(series_list: List[List[float]]) -> List[Optional[float]]:
+    """IRR of several already-signed series in one vectorized solve.
+
+    Every series is iterated together by financial_engine.core.irr_batch
+    (Halley steps from a 10% guess, bisection where that fails). Series may
+    differ in length. Each result is the root that iteration converges to,
+    which is not necessarily the one irr_from_series picks: a series with a
+    single sign change has one root and both agree, but a series with several
+    sign changes can have several IRRs. None where no real solution exists.
+
+    Args:
+        series_list: Signed series, each period 0 first.
+
+    Returns:
+        One IRR (or None) per input series, in input order.
+
+    Raises:
+        ImportError: when the financial engine is unavailable, so callers can
+                     degrade to 503 rather than 500.
+    """
+    import numpy as np
+    from financial_engine.core.irr_batch import calculate_irr_batch
+
+    if not series_list:
+        return []
+
+    width = max(len(series) for series in series_list)
+    matrix = np.full((len(series_list), width), np.nan)
+    for row, series in enumerate(series_list):
+        matrix[row, :len(series)] = series
+
+    return [
+        None if math.isnan(irr) else float(irr)
+        for irr in calculate_irr_batch(matrix)
+    ]
+
+
 def npv_from_series(discount_rate: float, cash_flows: List[float]) -> float:
     """NPV of an already-signed cash-flow series at a period-0-anchored rate.
 
@@ -19,7 +19,7 @@ from .converters import (
     convert_budget_items_to_cashflows,
     convert_multifamily_to_income_property,
 )
-from .series_metrics import irr_from_series, npv_from_series
+from .series_metrics import irr_from_series, irr_from_series_batch, npv_from_series
 
 # Import Python financial engine
 try:
@@ -34,6 +34,7 @@ except ImportError:
 try:
     from financial_engine.waterfall import (
         WaterfallEngine,
+        FastWaterfallEngine,
         WaterfallTierConfig,
         WaterfallSettings,
         CashFlow as WaterfallCashFlow,
@@ -417,6 +418,80 @@ class CalculationService:
                 'engine': 'python',
             }
     
+    @staticmethod
+    def calculate_irr_batch(project_ids: List[int]) -> List[Dict]:
+        """
+        Calculate IRR for several projects with a single vectorized solve.
+
+        Builds each project's signed series exactly as calculate_irr does,
+        then solves all of them together via series_metrics.irr_from_series_batch.
+
+        Args:
+            project_ids: Project IDs
+
+        Returns:
+            One calculate_irr-shaped result dictionary per project, in input
+            order. Unknown project IDs get an error result instead of raising.
+        """
+        projects = Project.objects.in_bulk(project_ids, field_name='project_id')
+        found_ids = [pid for pid in project_ids if pid in projects]
+        budget_by_project: Dict[int, list] = {pid: [] for pid in found_ids}
+        actual_by_project: Dict[int, list] = {pid: [] for pid in found_ids}
+        for item in BudgetItem.objects.filter(project_id__in=found_ids):
+            budget_by_project[item.project_id].append(item)
+        for item in ActualItem.objects.filter(project_id__in=found_ids):
+            actual_by_project[item.project_id].append(item)
+
+        series = []
+        for project_id in found_ids:
+            data = prepare_irr_calculation_data(
+                projects[project_id], budget_by_project[project_id], actual_by_project[project_id]
+            )
+            series.append(data['cash_flows'])
+
+        try:
+            irrs = irr_from_series_batch(series) if series else []
+            engine, error = 'python', None
+        except ImportError:
+            irrs = [None] * len(found_ids)
+            engine, error = 'fallback', 'Python calculation engine not available'
+        except Exception as e:
+            irrs = [None] * len(found_ids)
+            engine, error = 'python', str(e)
+
+        solved = {
+            project_id: (cash_flows, irr)
+            for project_id, cash_flows, irr in zip(found_ids, series, irrs)
+        }
+        results = []
+        for project_id in project_ids:
+            if project_id not in solved:
+                results.append({
+                    'project_id': project_id,
+                    'project_name': None,
+                    'irr': None,
+                    'error': f'Project {project_id} not found',
+                    'engine': engine,
+                })
+                continue
+            cash_flows, irr = solved[project_id]
+            result = {
+                'project_id': project_id,
+                'project_name': projects[project_id].project_name,
+                'irr': irr,
+                'engine': engine,
+            }
+            if error is None:
+                result.update({
+                    'periods': len(cash_flows),
+                    'total_investment': sum(cf for cf in cash_flows if cf < 0),
+                    'total_return': sum(cf for cf in cash_flows if cf > 0),
+                })
+            else:
+                result['error'] = error
+            results.append(result)
+        return results
+
     @staticmethod
     def calculate_npv(project_id: int, discount_rate: Optional[float] = None) -> Dict:
         """
@@ -636,38 +711,8 @@ class CalculationService:
         from decimal import Decimal
 
         try:
-            # Convert tiers to WaterfallTierConfig objects
-            tier_configs = [
-                WaterfallTierConfig(
-                    tier_number=t['tier_number'],
-                    tier_name=t.get('tier_name', f"Tier {t['tier_number']}"),
-                    irr_hurdle=Decimal(str(t['irr_hurdle'])) if t.get('irr_hurdle') is not None else None,
-                    emx_hurdle=Decimal(str(t['emx_hurdle'])) if t.get('emx_hurdle') is not None else None,
-                    promote_percent=Decimal(str(t.get('promote_percent', 0))),
-                    lp_split_pct=Decimal(str(t['lp_split_pct'])),
-                    gp_split_pct=Decimal(str(t['gp_split_pct'])),
-                )
-                for t in tiers
-            ]
-
-            # Convert settings to WaterfallSettings object
-            hurdle_method_map = {
-                'IRR': HurdleMethod.IRR,
-                'EMx': HurdleMethod.EMX,
-                'IRR_EMx': HurdleMethod.IRR_EMX,
-            }
-            return_of_capital_map = {
-                'LP First': ReturnOfCapital.LP_FIRST,
-                'Pari Passu': ReturnOfCapital.PARI_PASSU,
-            }
-
-            waterfall_settings = WaterfallSettings(
-                hurdle_method=hurdle_method_map.get(settings.get('hurdle_method', 'IRR'), HurdleMethod.IRR),
-                num_tiers=settings.get('num_tiers', 3),
-                return_of_capital=return_of_capital_map.get(settings.get('return_of_capital', 'Pari Passu'), ReturnOfCapital.PARI_PASSU),
-                gp_catch_up=settings.get('gp_catch_up', True),
-                lp_ownership=Decimal(str(settings.get('lp_ownership', 0.90))),
-                preferred_return_pct=Decimal(str(settings.get('preferred_return_pct', 8))),
+            tier_configs, waterfall_settings = CalculationService._build_waterfall_config(
+                tiers, settings
             )
 
             # Convert cash flows to WaterfallCashFlow objects
@@ -701,6 +746,222 @@ class CalculationService:
                 'engine': 'python',
             }
 
+    @staticmethod
+    def _build_waterfall_config(tiers: List[Dict], settings: Dict):
+        """Convert request tier/settings dictionaries into engine config objects."""
+        from decimal import Decimal
+
+        # Convert tiers to WaterfallTierConfig objects
+        tier_configs = [
+            WaterfallTierConfig(
+                tier_number=t['tier_number'],
+                tier_name=t.get('tier_name', f"Tier {t['tier_number']}"),
+                irr_hurdle=Decimal(str(t['irr_hurdle'])) if t.get('irr_hurdle') is not None else None,
+                emx_hurdle=Decimal(str(t['emx_hurdle'])) if t.get('emx_hurdle') is not None else None,
+                promote_percent=Decimal(str(t.get('promote_percent', 0))),
+                lp_split_pct=Decimal(str(t['lp_split_pct'])),
+                gp_split_pct=Decimal(str(t['gp_split_pct'])),
+            )
+            for t in tiers
+        ]
+
+        # Convert settings to WaterfallSettings object
+        hurdle_method_map = {
+            'IRR': HurdleMethod.IRR,
+            'EMx': HurdleMethod.EMX,
+            'IRR_EMx': HurdleMethod.IRR_EMX,
+        }
+        return_of_capital_map = {
+            'LP First': ReturnOfCapital.LP_FIRST,
+            'Pari Passu': ReturnOfCapital.PARI_PASSU,
+        }
+
+        waterfall_settings = WaterfallSettings(
+            hurdle_method=hurdle_method_map.get(settings.get('hurdle_method', 'IRR'), HurdleMethod.IRR),
+            num_tiers=settings.get('num_tiers', 3),
+            return_of_capital=return_of_capital_map.get(settings.get('return_of_capital', 'Pari Passu'), ReturnOfCapital.PARI_PASSU),
+            gp_catch_up=settings.get('gp_catch_up', True),
+            lp_ownership=Decimal(str(settings.get('lp_ownership', 0.90))),
+            preferred_return_pct=Decimal(str(settings.get('preferred_return_pct', 8))),
+            period_irr=settings.get('period_irr', 'every'),
+            period_irr_interval=settings.get('period_irr_interval', 12),
+        )
+        return tier_configs, waterfall_settings
+
+    @staticmethod
+    def calculate_waterfall_scenarios(
+        tiers: List[Dict],
+        settings: Dict,
+        dates: List,
+        scenario_amounts: List[List[float]],
+        verify: bool = False,
+    ) -> Dict:
+        """
+        Run many waterfall scenarios on the float64 fast path.
+
+        For what-if, sensitivity and Monte Carlo callers that need partner
+        returns across many cash-flow variants. Reports keep using
+        calculate_waterfall (Decimal).
+
+        Args:
+            tiers: List of tier configurations
+            settings: Waterfall settings
+            dates: Period dates (date objects or 'YYYY-MM-DD'), shared by all scenarios
+            scenario_amounts: One list of period cash flows per scenario
+            verify: Also run the Decimal engine and report cent-level divergence
+
+        Returns:
+            Dictionary with per-scenario partner and project metrics
+        """
+        if not WATERFALL_ENGINE_AVAILABLE:
+            return {
+                'error': 'Python waterfall engine not available',
+                'engine': 'unavailable',
+            }
+
+        from datetime import datetime
+        import math
+
+        def nan_to_none(val):
+            val = float(val)
+            return None if math.isnan(val) else val
+
+        try:
+            tier_configs, waterfall_settings = CalculationService._build_waterfall_config(
+                tiers, settings
+            )
+            parsed_dates = [
+                datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d
+                for d in dates
+            ]
+            result = FastWaterfallEngine(
+                tier_configs, waterfall_settings, parsed_dates, scenario_amounts
+            ).calculate(verify=verify)
+
+            contributions = result.total_contributions
+            distributions = result.total_distributions
+            scenarios = []
+            for s in range(result.net_cash_flow.shape[0]):
+                scenarios.append({
+                    'lp_irr': nan_to_none(result.lp_irr[s]),
+                    'gp_irr': nan_to_none(result.gp_irr[s]),
+                    'project_irr': nan_to_none(result.project_irr[s]),
+                    'lp_emx': float(result.lp_emx[s]),
+                    'gp_emx': float(result.gp_emx[s]),
+                    'project_emx': float(result.project_emx[s]),
+                    'lp_contributions': float(contributions[s, 0]),
+                    'gp_contributions': float(contributions[s, 1]),
+                    'lp_distributions': float(distributions[s, 0]),
+                    'gp_distributions': float(distributions[s, 1]),
+                })
+
+            response = {
+                'scenarios': scenarios,
+                'success': True,
+                'engine': 'python-float64',
+            }
+            if result.verification is not None:
+                response['verification'] = {
+                    'max_divergence_cents': result.verification.max_cents,
+                    'period_max_divergence_cents': result.verification.max_divergence_cents.tolist(),
+                    'irr_divergence': result.verification.irr_divergence.tolist(),
+                }
+            return response
+
+        except Exception as e:
+            return {
+                'error': str(e),
+                'engine': 'python-float64',
+            }
+
+    @staticmethod
+    def run_monte_carlo(
+        project_id: int,
+        distributions: Dict,
+        config: Optional[Dict] = None,
+        tiers: Optional[List[Dict]] = None,
+        settings: Optional[Dict] = None,
+        progress_callback=None,
+    ) -> Dict:
+        """
+        Simulate IRR, NPV, equity multiple and peak equity distributions.
+
+        Project inputs are loaded once through LandDevCashFlowService or
+        IncomePropertyCashFlowService; draws are evaluated by MonteCarloEngine
+        in a process pool. When tiers/settings are given, LP/GP returns are
+        added via the fast waterfall.
+
+        Args:
+            project_id: Project ID
+            distributions: assumption -> distribution dict, e.g.
+                {'exit_cap': {'distribution': 'normal', 'mean': 0.055, 'std': 0.0025}}
+            config: SimulationConfig fields (draws, seed, batch_size, ...)
+            tiers: Optional waterfall tier configurations
+            settings: Optional waterfall settings
+            progress_callback: Called with a progress dict after each batch
+
+        Returns:
+            Dictionary with percentile bands per metric
+        """
+        from django.db import connection
+        from financial_engine.core.monte_carlo import MonteCarloEngine, SimulationConfig
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT project_type_code
+                    FROM landscape.tbl_project
+                    WHERE project_id = %s
+                    LIMIT 1
+                """, [project_id])
+                project_row = cursor.fetchone()
+            if not project_row:
+                return {'error': f'Project {project_id} not found', 'engine': 'monte-carlo'}
+
+            if (project_row[0] or '').upper() == 'LAND':
+                from apps.financial.services.land_dev_cashflow_service import LandDevCashFlowService
+                inputs = LandDevCashFlowService(project_id).build_simulation_inputs()
+            else:
+                from apps.financial.services.income_property_cashflow_service import (
+                    IncomePropertyCashFlowService,
+                )
+                inputs = IncomePropertyCashFlowService(project_id).build_simulation_inputs()
+            if inputs is None:
+                return {'error': 'No projections available for simulation', 'engine': 'monte-carlo'}
+
+            waterfall = None
+            if tiers:
+                if not WATERFALL_ENGINE_AVAILABLE:
+                    return {
+                        'error': 'Python waterfall engine not available',
+                        'engine': 'unavailable',
+                    }
+                waterfall = CalculationService._build_waterfall_config(tiers, settings or {})
+
+            engine = MonteCarloEngine(
+                inputs,
+                distributions,
+                SimulationConfig(**(config or {})),
+                waterfall=waterfall,
+            )
+            callback = None
+            if progress_callback is not None:
+                callback = lambda progress: progress_callback(progress.to_dict())
+            result = engine.run(callback)
+
+            return {
+                **result.to_dict(),
+                'project_id': project_id,
+                'success': True,
+                'engine': 'monte-carlo',
+            }
+
+        except Exception as e:
+            return {
+                'error': str(e),
+                'engine': 'monte-carlo',
+            }
+
     @staticmethod
     def _serialize_waterfall_result(result) -> Dict:
         """Convert WaterfallResult to JSON-serializable dictionary."""
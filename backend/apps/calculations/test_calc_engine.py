@@ -204,6 +204,23 @@ class InvestmentMetricRegressionTests(TestCase):
         # Six periods of -100k followed by six of +150k solves to ~6.99%/period.
         self.assertAlmostEqual(result['irr'], 0.069913, places=4)
 
+    def test_irr_batch_matches_single_and_reports_unknown_ids(self):
+        """The vectorized batch must agree with calculate_irr per project, and an
+        unknown project ID must yield an error result in place, not a KeyError."""
+        missing_id = self.project.project_id + 10_000
+        single = CalculationService.calculate_irr(self.project.project_id)
+
+        results = CalculationService.calculate_irr_batch(
+            [missing_id, self.project.project_id]
+        )
+
+        self.assertEqual([r['project_id'] for r in results], [missing_id, self.project.project_id])
+        self.assertIsNone(results[0]['irr'])
+        self.assertIn('not found', results[0]['error'])
+        self.assertIsNone(results[1].get('error'))
+        self.assertAlmostEqual(results[1]['irr'], single['irr'], places=8)
+        self.assertEqual(results[1]['periods'], single['periods'])
+
     def test_npv_returns_an_actual_number(self):
         """NPV must compute. Pre-fix, the call passed (cash_flows, discount_rate)
         into a signature of (discount_rate, initial_investment, cash_flows,
@@ -327,6 +344,23 @@ class APIEndpointTests(TestCase):
         # May fail if Python engine not available, but should not error
         self.assertIn(response.status_code, [200, 503])
 
+    def test_projects_irr_endpoint(self):
+        """The multi-project IRR endpoint returns one result per requested ID."""
+        from rest_framework.test import APIClient
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(
+            f'/api/calculations/projects/irr/?project_ids={self.project.project_id},0'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r['project_id'] for r in response.json()['results']],
+            [self.project.project_id, 0],
+        )
+        self.assertEqual(client.get('/api/calculations/projects/irr/?project_ids=x').status_code, 400)
+
     def test_project_cashflow_endpoint(self):
         """Test project cash flow endpoint."""
         from django.test import Client
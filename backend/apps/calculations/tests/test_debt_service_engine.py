@@ -2,8 +2,9 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import numpy as np
 import pytest
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from apps.calculations.engines.debt_service_engine import (
     DebtServiceEngine,
@@ -261,3 +262,78 @@ class TestTermLoanCalculation(TestCase):
         )
         result = self.engine.calculate_term(params, 60)
         self.assertGreater(result.balloon_amount, 0)
+
+
+class TestReserveConvergence(SimpleTestCase):
+    """Accelerated interest reserve iteration on a synthetic land deal."""
+
+    def setUp(self):
+        self.engine = DebtServiceEngine()
+        self.params = RevolverLoanParams(
+            loan_to_cost_pct=0.65,
+            interest_rate_annual=0.085,
+            origination_fee_pct=0.01,
+            interest_reserve_inflator=1.2,
+            repayment_acceleration=1.2,
+            release_price_pct=1.0,
+            release_price_minimum=0.0,
+            closing_costs=32500.0,
+            loan_start_period=0,
+            loan_term_months=48,
+        )
+        self.period_data = [
+            PeriodCosts(
+                period_index=i,
+                date=f'P{i}',
+                total_costs=750_000.0 if i < 30 else 0.0,
+                lots_sold_by_product={1: 6, 2: 4} if 18 <= i < 54 else {},
+                cost_per_lot_by_product={1: 40_000.0, 2: 55_000.0},
+            )
+            for i in range(60)
+        ]
+
+    def test_reserve_is_a_fixed_point(self):
+        result = self.engine.calculate_revolver(self.params, self.period_data)
+        multiplier = 1.0 / (2.0 - self.params.interest_reserve_inflator)
+
+        self.assertTrue(result.converged)
+        self.assertEqual(len(result.reserve_residuals), result.iterations_to_converge)
+        self.assertLess(result.reserve_residuals[-1], DebtServiceEngine.CONVERGENCE_TOLERANCE)
+        self.assertAlmostEqual(
+            result.interest_reserve_funded, result.total_interest * multiplier, delta=1.0
+        )
+
+    def test_secant_beats_plain_fixed_point(self):
+        result = self.engine.calculate_revolver(self.params, self.period_data)
+
+        # Plain fixed-point iteration on the same schedule
+        multiplier = 1.0 / (2.0 - self.params.interest_reserve_inflator)
+        base = sum(p.total_costs for p in self.period_data) + self.params.closing_costs
+        denom = 1.0 - self.params.loan_to_cost_pct * self.params.origination_fee_pct
+        reserve, plain_iterations = 0.0, 0
+        for plain_iterations in range(1, 200):
+            commitment = (base + reserve) * self.params.loan_to_cost_pct / denom
+            schedule = self.engine._generate_revolver_schedule(
+                self.params, self.period_data, commitment, reserve,
+                commitment * self.params.origination_fee_pct,
+            )
+            new_reserve = sum(p.accrued_interest for p in schedule) * multiplier
+            if abs(new_reserve - reserve) < DebtServiceEngine.CONVERGENCE_TOLERANCE:
+                break
+            reserve = new_reserve
+
+        self.assertLess(result.iterations_to_converge, plain_iterations)
+        self.assertAlmostEqual(result.interest_reserve_funded, new_reserve, delta=2.0)
+
+    def test_reverse_fill_matches_loop(self):
+        costs = np.array([100.0, 0.0, 250.0, 400.0, 50.0])
+        for capacity in (0.0, 75.0, 500.0, 2_000.0):
+            expected, remaining = [0.0] * len(costs), capacity
+            for i in range(len(costs) - 1, -1, -1):
+                expected[i] = min(costs[i], remaining)
+                remaining -= expected[i]
+                if remaining <= 0:
+                    break
+            np.testing.assert_allclose(
+                DebtServiceEngine._reverse_fill(costs, capacity), expected
+            )
@@ -224,6 +224,38 @@ class CalculationViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['get'], url_path='projects/irr')
+    def projects_irr(self, request):
+        """
+        Calculate IRR for several projects in one vectorized solve.
+
+        Query parameters:
+        - project_ids: Comma-separated project IDs (e.g. ?project_ids=7,9,12)
+        """
+        try:
+            project_ids = [
+                int(pid) for pid in request.query_params.get('project_ids', '').split(',')
+                if pid.strip()
+            ]
+        except ValueError:
+            return Response(
+                {'error': 'project_ids must be a comma-separated list of integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not project_ids:
+            return Response(
+                {'error': 'project_ids is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            return Response({'results': CalculationService.calculate_irr_batch(project_ids)})
+        except Exception as e:
+            return Response(
+                {'error': str(e), 'project_ids': project_ids},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=False, methods=['get'], url_path='project/(?P<project_id>[0-9]+)/npv')
     def project_npv(self, request, project_id=None):
         """Calculate NPV for a specific project based on budget/actual data."""
@@ -0,0 +1,155 @@
+"""
+Migration 0052: Project data revision stamps for the cash flow cache.
+
+Creates landscape.tbl_project_data_revision and AFTER ... FOR EACH STATEMENT
+triggers on every table the land dev and income property engines read. Each
+statement reads its transition tables and stamps every project it touched
+once, with a fresh value from seq_project_data_revision; sequences are not
+transactional, so a rolled-back write never hands its revision to a later,
+different write. Rows that cannot be traced to a project (global cost
+categories, shared growth rate sets) stamp project_id 0, which every cache
+key includes.
+
+Statement-level stamping keeps a bulk import to one upsert per project
+rather than one per row, and concurrent writers only contend on a
+project's revision row once per statement. Projects are stamped in
+project_id order so two statements never lock them in opposite orders.
+
+Transition tables cannot be shared between events, so each table gets an
+INSERT, an UPDATE and a DELETE trigger. Tables without a project_id column
+pass (parent_table, key_column) trigger arguments to resolve it. Missing
+tables are skipped.
+
+Uses RunSQL because the engine tables are unmanaged.
+"""
+
+from django.db import migrations
+
+
+# (table, parent_table, key_column) - parent is None when the table has project_id
+WATCHED_TABLES = [
+    ('tbl_project', None, None),
+    ('tbl_project_config', None, None),
+    ('tbl_project_settings', None, None),
+    ('tbl_project_assumption', None, None),
+    ('tbl_dcf_analysis', None, None),
+    ('tbl_cre_dcf_analysis', None, None),
+    ('tbl_income_approach', None, None),
+    ('core_fin_growth_rate_sets', None, None),
+    ('core_fin_growth_rate_steps', 'core_fin_growth_rate_sets', 'set_id'),
+    ('core_fin_fact_budget', None, None),
+    ('core_unit_cost_category', None, None),
+    ('tbl_division', None, None),
+    ('tbl_phase', None, None),
+    ('tbl_parcel', None, None),
+    ('tbl_parcel_sale_assumptions', 'tbl_parcel', 'parcel_id'),
+    ('land_use_pricing', None, None),
+    ('tbl_acquisition', None, None),
+    ('tbl_property_acquisition', None, None),
+    ('tbl_loan', None, None),
+    ('tbl_loan_container', 'tbl_loan', 'loan_id'),
+    ('tbl_multifamily_unit', None, None),
+    ('tbl_multifamily_unit_type', None, None),
+    ('tbl_operating_expenses', None, None),
+    ('tbl_operating_expense_fact', None, None),
+    ('tbl_value_add_assumptions', None, None),
+]
+
+
+FORWARD_SQL = """
+CREATE SEQUENCE IF NOT EXISTS landscape.seq_project_data_revision;
+
+CREATE TABLE IF NOT EXISTS landscape.tbl_project_data_revision (
+    project_id  BIGINT PRIMARY KEY,
+    revision    BIGINT NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE landscape.tbl_project_data_revision IS
+    'Last write stamp per project over the cash flow engine inputs. project_id 0 = shared rows.';
+
+CREATE OR REPLACE FUNCTION landscape.stamp_project_data_revision()
+RETURNS TRIGGER AS $$
+DECLARE
+    project_expr TEXT := $e$(to_jsonb(r)->>'project_id')::BIGINT$e$;
+    parent_join TEXT := '';
+    changed_rows TEXT;
+BEGIN
+    IF TG_NARGS = 2 THEN
+        parent_join := format(
+            ' LEFT JOIN landscape.%I p ON p.%I = (to_jsonb(r)->>%L)::BIGINT',
+            TG_ARGV[0], TG_ARGV[1], TG_ARGV[1]
+        );
+        project_expr := project_expr || ', p.project_id';
+    END IF;
+
+    changed_rows := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT * FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT * FROM old_rows'
+        ELSE 'SELECT * FROM old_rows UNION ALL SELECT * FROM new_rows'
+    END;
+
+    EXECUTE format($sql$
+        INSERT INTO landscape.tbl_project_data_revision (project_id, revision, updated_at)
+        SELECT project_id, nextval('landscape.seq_project_data_revision'), NOW()
+        FROM (
+            SELECT DISTINCT COALESCE(%s, 0) AS project_id
+            FROM (%s) r%s
+        ) affected
+        ORDER BY project_id
+        ON CONFLICT (project_id) DO UPDATE
+            SET revision = EXCLUDED.revision,
+                updated_at = EXCLUDED.updated_at
+    $sql$, project_expr, changed_rows, parent_join);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+REVERSE_SQL = """
+DROP FUNCTION IF EXISTS landscape.stamp_project_data_revision() CASCADE;
+DROP TABLE IF EXISTS landscape.tbl_project_data_revision;
+DROP SEQUENCE IF EXISTS landscape.seq_project_data_revision;
+"""
+
+
+# (suffix, event, REFERENCING clause) - transition tables allow one event per trigger
+TRIGGER_EVENTS = [
+    ('ins', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('upd', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('del', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def _trigger_sql(table, parent_table, key_column):
+    args = f"'{parent_table}', '{key_column}'" if parent_table else ''
+    triggers = ''.join(f"""
+        DROP TRIGGER IF EXISTS trg_{table}_data_revision_{suffix} ON landscape.{table};
+        CREATE TRIGGER trg_{table}_data_revision_{suffix}
+            AFTER {event} ON landscape.{table}
+            REFERENCING {referencing}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION landscape.stamp_project_data_revision({args});"""
+        for suffix, event, referencing in TRIGGER_EVENTS
+    )
+    return f"""
+DO $$
+BEGIN
+    IF to_regclass('landscape.{table}') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trg_{table}_data_revision ON landscape.{table};{triggers}
+    END IF;
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('financial', '0051_add_loan_index_rate_pct'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=FORWARD_SQL + ''.join(_trigger_sql(*entry) for entry in WATCHED_TABLES),
+            reverse_sql=REVERSE_SQL,
+        ),
+    ]
@@ -0,0 +1,190 @@
+"""Revision-keyed cache for cash-flow envelopes.
+
+``fetch_cashflow_schedule`` recomputes the full engine envelope for every
+report, Landscaper tool call and metric. Envelopes are a pure function of the
+project's engine inputs, so they are cached under::
+
+    (engine version, project_id, include_financing, container_ids,
+     project revision, shared revision)
+
+The revisions come from ``landscape.tbl_project_data_revision``, stamped by
+triggers on every engine input table (migration 0052). Any write to a
+project's inputs changes its key, so entries never need explicit
+invalidation; the cache TIMEOUT only bounds memory. A change to the engine
+itself does not touch the revisions, so ENGINE_VERSION (plus the optional
+``settings.CASHFLOW_CACHE_VERSION``, e.g. a release id for caches shared
+across deploys) is part of the key too.
+
+The backend is the ``'cashflow'`` alias in ``settings.CACHES``: LocMemCache
+(per-process LRU) by default, DatabaseCache / FileBasedCache / Redis to share
+envelopes across gunicorn workers. When no revision is available (non-Postgres
+database, migration not applied) the cache is bypassed rather than risk
+serving a stale envelope.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'cashflow'
+KEY_PREFIX = 'cashflow-envelope'
+SHARED_REVISION_PROJECT_ID = 0
+# Bump whenever a change to the cash flow services or the envelope shape
+# would produce a different envelope from the same inputs
+ENGINE_VERSION = 1
+
+
+@dataclass
+class CashflowCacheStats:
+    """Per-process cache counters."""
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_stats = CashflowCacheStats()
+_stats_lock = threading.Lock()
+_revision_table_exists: Optional[bool] = None
+
+
+def _count(field: str) -> None:
+    with _stats_lock:
+        setattr(_stats, field, getattr(_stats, field) + 1)
+
+
+def cashflow_cache_stats() -> Dict[str, Any]:
+    """Snapshot of this process's hit/miss counters."""
+    with _stats_lock:
+        return {**asdict(_stats), 'hit_rate': _stats.hit_rate}
+
+
+def reset_cashflow_cache_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = CashflowCacheStats()
+
+
+def _get_cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return None
+
+
+def get_project_revision(project_id: int) -> Optional[Tuple[int, int]]:
+    """Return (project revision, shared revision), or None when unavailable.
+
+    A project that has never been written since the triggers were installed
+    reports revision 0.
+    """
+    global _revision_table_exists
+
+    if connection.vendor != 'postgresql':
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            if _revision_table_exists is None:
+                cursor.execute(
+                    "SELECT to_regclass('landscape.tbl_project_data_revision') IS NOT NULL"
+                )
+                _revision_table_exists = bool(cursor.fetchone()[0])
+            if not _revision_table_exists:
+                return None
+
+            cursor.execute(
+                """
+                SELECT project_id, revision
+                FROM landscape.tbl_project_data_revision
+                WHERE project_id = ANY(%s)
+                """,
+                [[project_id, SHARED_REVISION_PROJECT_ID]],
+            )
+            revisions = dict(cursor.fetchall())
+    except Exception:  # noqa: BLE001 — no revision means no caching, never a failed schedule
+        logger.exception(
+            "[cashflow_cache] Revision lookup failed for project_id=%s", project_id
+        )
+        return None
+
+    return (
+        int(revisions.get(project_id, 0)),
+        int(revisions.get(SHARED_REVISION_PROJECT_ID, 0)),
+    )
+
+
+def _engine_version() -> str:
+    release = getattr(settings, 'CASHFLOW_CACHE_VERSION', '')
+    return f"v{ENGINE_VERSION}-{release}" if release else f"v{ENGINE_VERSION}"
+
+
+def make_cache_key(
+    project_id: int,
+    include_financing: bool,
+    container_ids: Optional[List[int]],
+    revision: Tuple[int, int],
+) -> str:
+    containers = ','.join(str(c) for c in sorted(set(container_ids))) if container_ids else '*'
+    return (
+        f"{KEY_PREFIX}:{_engine_version()}:{project_id}:{int(bool(include_financing))}:{containers}"
+        f":{revision[0]}:{revision[1]}"
+    )
+
+
+def cached_envelope(
+    project_id: int,
+    include_financing: bool,
+    container_ids: Optional[List[int]],
+    compute: Callable[[], Dict[str, Any]],
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Return the cached envelope for the current project revision, computing
+    (and storing) it with ``compute()`` on a miss.
+
+    ``use_cache=False`` (or ``settings.CASHFLOW_CACHE_ENABLED = False``)
+    always computes and leaves the cache untouched. Cache backend errors are
+    logged and fall through to ``compute()``; they never fail the request.
+    """
+    cache = _get_cache() if use_cache and getattr(settings, 'CASHFLOW_CACHE_ENABLED', True) else None
+    revision = get_project_revision(project_id) if cache is not None else None
+    if revision is None:
+        _count('bypassed')
+        return compute()
+
+    key = make_cache_key(project_id, include_financing, container_ids, revision)
+    try:
+        envelope = cache.get(key)
+    except Exception:  # noqa: BLE001 — a broken cache backend must not break the schedule
+        logger.exception("[cashflow_cache] get failed for key=%s", key)
+        _count('errors')
+        envelope = None
+
+    if envelope is not None:
+        _count('hits')
+        logger.debug("[cashflow_cache] hit key=%s", key)
+        return envelope
+
+    _count('misses')
+    logger.debug("[cashflow_cache] miss key=%s", key)
+    envelope = compute()
+    if envelope:
+        try:
+            cache.set(key, envelope)
+        except Exception:  # noqa: BLE001
+            logger.exception("[cashflow_cache] set failed for key=%s", key)
+            _count('errors')
+    return envelope
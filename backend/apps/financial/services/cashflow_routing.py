@@ -22,6 +22,8 @@ from typing import Any, Dict, List, Optional
 
 from django.db import connection
 
+from apps.financial.services.cashflow_cache import cached_envelope
+
 logger = logging.getLogger(__name__)
 
 # Income-property project_type_codes. LAND is handled explicitly; everything
@@ -59,6 +61,7 @@ def fetch_cashflow_schedule(
     project_id: int,
     include_financing: bool = True,
     container_ids: Optional[List[int]] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """Route by ``project_type_code`` and return the engine's ``.calculate()``
     envelope.
@@ -74,6 +77,9 @@ def fetch_cashflow_schedule(
     Both engines are called with keyword arguments because their positional
     parameter order differs.
 
+    Envelopes are cached per project data revision (see ``cashflow_cache``);
+    ``use_cache=False`` forces a fresh calculation.
+
     Raises:
         RuntimeError: if the resolved engine errors or returns nothing.
     """
@@ -93,21 +99,26 @@ def fetch_cashflow_schedule(
         )
         return empty_cashflow_envelope(project_id)
 
-    try:
-        service = service_cls(project_id)
-        data = service.calculate(
-            include_financing=include_financing,
-            container_ids=container_ids,
-        )
-    except ValueError as err:
-        raise RuntimeError(f"Cash flow calculation error: {err}")
-    except Exception as err:
-        raise RuntimeError(f"Cash flow calculation failed: {err}")
-
-    if not data:
-        raise RuntimeError('Cash flow service did not return schedule data')
-
-    return data
+    def compute() -> Dict[str, Any]:
+        try:
+            service = service_cls(project_id)
+            data = service.calculate(
+                include_financing=include_financing,
+                container_ids=container_ids,
+            )
+        except ValueError as err:
+            raise RuntimeError(f"Cash flow calculation error: {err}")
+        except Exception as err:
+            raise RuntimeError(f"Cash flow calculation failed: {err}")
+
+        if not data:
+            raise RuntimeError('Cash flow service did not return schedule data')
+
+        return data
+
+    return cached_envelope(
+        project_id, include_financing, container_ids, compute, use_cache=use_cache,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -26,6 +26,7 @@ from datetime import date
 from dateutil.relativedelta import relativedelta
 from django.db import connection
 from django.shortcuts import get_object_or_404
+import numpy as np
 
 from apps.projects.models import Project
 from .income_approach_service import IncomeApproachDataService
@@ -56,6 +57,134 @@ def _exit_value_or_floor(terminal_noi: float, cap_rate: float) -> tuple:
     return (terminal_noi / cap_rate if cap_rate > 0 else 0.0), False
 
 
+# Assumptions a sensitivity grid can vary, with the step used when an axis
+# gives 'steps' but no 'interval'
+SENSITIVITY_VARIABLES = {
+    'discount_rate': 0.005,
+    'terminal_cap_rate': 0.005,
+    'income_growth_rate': 0.005,
+    'expense_growth_rate': 0.005,
+    'hold_period_years': 1,
+}
+
+
+def _resolve_sensitivity_axis(
+    axis: Dict[str, Any],
+    base: Dict[str, float],
+    intervals: Dict[str, float],
+) -> Dict[str, Any]:
+    """Expand one axis spec into explicit values and locate the base case.
+
+    Rates and cap rates must stay positive and hold periods at least one
+    year; points outside those bounds are dropped, as in the 5x5 matrix.
+    """
+    variable = axis.get('variable')
+    if variable not in SENSITIVITY_VARIABLES:
+        raise ValueError(f"Unknown sensitivity variable: {variable}")
+
+    if axis.get('values') is not None:
+        values = [float(v) for v in axis['values']]
+    else:
+        steps = int(axis.get('steps', 5))
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        interval = float(axis.get('interval') or intervals.get(variable)
+                         or SENSITIVITY_VARIABLES[variable])
+        offset = (steps - 1) / 2
+        values = [base[variable] + interval * (i - offset) for i in range(steps)]
+
+    if variable == 'hold_period_years':
+        values = [int(round(v)) for v in values if v >= 1]
+    elif variable in ('discount_rate', 'terminal_cap_rate'):
+        values = [v for v in values if v > 0]
+    if not values:
+        raise ValueError(f"No valid values for {variable}")
+
+    base_index = next(
+        (i for i, v in enumerate(values) if abs(v - base[variable]) < 1e-9), None
+    )
+    return {
+        'variable': variable,
+        'values': [v if variable == 'hold_period_years' else round(v, 6) for v in values],
+        'base_index': base_index,
+    }
+
+
+def evaluate_sensitivity_grid(
+    current_annual_rent: float,
+    base_opex: float,
+    other_income: float,
+    vacancy_rate: float,
+    credit_loss_rate: float,
+    management_fee_pct: float,
+    replacement_reserves: float,
+    selling_costs_pct: float,
+    discount_rate: np.ndarray,
+    terminal_cap_rate: np.ndarray,
+    income_growth_rate: np.ndarray,
+    expense_growth_rate: np.ndarray,
+    hold_period_years: np.ndarray,
+    purchase_price: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the annual DCF (DCFCalculationService.calculate) for many cells.
+
+    Every per-cell argument is a (C,) array. Growth and discount factors are
+    broadcast over a (C x max hold) NOI strip; years past a cell's hold
+    period are masked out. Terminal NOI is year N grown one year with
+    reserves flat, floored at zero as in _exit_value_or_floor.
+
+    Returns dict of (C,) arrays: present_value, terminal_noi, and irr
+    (against purchase_price; NaN when not given or no sign change).
+    """
+    from financial_engine.core.irr_batch import calculate_irr_batch
+
+    hold = np.asarray(hold_period_years).astype(np.int64)
+    rate = np.asarray(discount_rate, dtype=float)[:, None]
+    income_growth = np.asarray(income_growth_rate, dtype=float)[:, None]
+    expense_growth = np.asarray(expense_growth_rate, dtype=float)[:, None]
+    cap_rate = np.asarray(terminal_cap_rate, dtype=float)
+
+    years = np.arange(1, int(hold.max()) + 1)[None, :]
+    in_hold = years <= hold[:, None]
+
+    gpr = current_annual_rent * (1.0 + income_growth) ** (years - 1)
+    egi = gpr * (1.0 - vacancy_rate - credit_loss_rate) + other_income
+    opex = base_opex * (1.0 + expense_growth) ** (years - 1)
+    management_fee = egi * management_fee_pct
+    noi = np.where(in_hold, egi - opex - management_fee - replacement_reserves, 0.0)
+
+    last = (np.arange(hold.shape[0]), hold - 1)
+    terminal_noi = (
+        egi[last] * (1.0 + income_growth[:, 0])
+        - (opex[last] + management_fee[last]) * (1.0 + expense_growth[:, 0])
+        - replacement_reserves
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exit_value = np.where((terminal_noi > 0) & (cap_rate > 0), terminal_noi / cap_rate, 0.0)
+    net_reversion = exit_value * (1.0 - selling_costs_pct)
+
+    discount_factors = (1.0 + rate) ** -years
+    present_value = (
+        (noi * discount_factors).sum(axis=1) + net_reversion * discount_factors[last]
+    )
+
+    irr = np.full(hold.shape[0], np.nan)
+    if purchase_price is not None:
+        flows = np.concatenate(
+            [np.full((hold.shape[0], 1), -float(purchase_price)), noi], axis=1
+        )
+        flows[last[0], hold] += net_reversion
+        flows[:, 1:][~in_hold] = np.nan  # batch solver ignores NaN padding
+        irr = calculate_irr_batch(flows)
+
+    return {
+        'present_value': present_value,
+        'terminal_noi': terminal_noi,
+        'irr': irr,
+    }
+
+
 def build_renovation_schedule(
     total_units: int,
     avg_unit_sf: float,
@@ -586,23 +715,18 @@ class DCFCalculationService:
         IRR is the discount rate where NPV = 0, meaning:
         PV of all future cash flows = Initial Investment (present_value)
 
-        Uses numpy-financial for calculation.
+        Uses the vectorized batch solver from financial_engine.
         """
         try:
-            import numpy_financial as npf
+            import numpy as np
+            from financial_engine.core.irr_batch import calculate_irr_batch
 
             # Build cash flow array: [-initial_investment, cf1, cf2, ..., cfN + reversion]
             cash_flows = [-present_value]  # Initial investment (what you pay today)
             cash_flows.extend(noi_series[:-1])  # Years 1 to N-1
             cash_flows.append(noi_series[-1] + net_reversion)  # Year N includes reversion
 
-            irr = npf.irr(cash_flows)
-
-            if irr is None or (hasattr(irr, '__iter__') and len(irr) == 0):
-                return None
-
-            # Handle numpy nan
-            import numpy as np
+            irr = calculate_irr_batch([cash_flows])[0]
             if np.isnan(irr):
                 return None
 
@@ -620,6 +744,99 @@ class DCFCalculationService:
         except Exception:
             return None
 
+    def calculate_sensitivity(
+        self,
+        axes: List[Dict[str, Any]],
+        purchase_price: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate present value and IRR over a 1-3 axis sensitivity grid.
+
+        Each axis is {'variable': ..., 'values': [...]} or
+        {'variable': ..., 'steps': n, 'interval': x} (n points centred on
+        the base assumption). Variables: discount_rate, terminal_cap_rate,
+        income_growth_rate, expense_growth_rate, hold_period_years.
+
+        The annual DCF is evaluated for every cell at once (see
+        evaluate_sensitivity_grid). IRR is measured against purchase_price,
+        defaulting to the base-case present value, so each cell reads as
+        "return if you pay the base value and this case happens".
+
+        Returns dict with:
+        - axes: resolved axis values with the base index (if on the grid)
+        - shape: grid dimensions, in axis order
+        - present_value / irr: nested lists shaped like the grid
+        - purchase_price: IRR basis used
+        """
+        if not axes or len(axes) > 3:
+            raise ValueError("Sensitivity grids take 1 to 3 axes")
+
+        assumptions = self.data_service.get_all_assumptions()
+        base_data = self._get_base_data()
+        base = {
+            'discount_rate': float(assumptions.get('discount_rate', 0.085)),
+            'terminal_cap_rate': float(assumptions.get('terminal_cap_rate', 0.0575)),
+            'income_growth_rate': float(assumptions.get('income_growth_rate', 0.03)),
+            'expense_growth_rate': float(assumptions.get('expense_growth_rate', 0.03)),
+            'hold_period_years': int(assumptions.get('hold_period_years', 10)),
+        }
+        intervals = {
+            'discount_rate': float(assumptions.get('discount_rate_interval', 0.005)),
+            'terminal_cap_rate': float(assumptions.get('cap_rate_interval', 0.005)),
+        }
+        resolved_axes = [_resolve_sensitivity_axis(axis, base, intervals) for axis in axes]
+        variables = [axis['variable'] for axis in resolved_axes]
+        if len(set(variables)) != len(variables):
+            raise ValueError("Each sensitivity variable may appear on one axis only")
+
+        # Outer product of the axes, flattened to one row per cell
+        mesh = np.meshgrid(*[np.asarray(a['values'], dtype=float) for a in resolved_axes],
+                           indexing='ij')
+        shape = mesh[0].shape
+        cells = {name: np.full(mesh[0].size, value, dtype=float) for name, value in base.items()}
+        for axis, values in zip(resolved_axes, mesh):
+            cells[axis['variable']] = values.ravel()
+
+        property_inputs = dict(
+            current_annual_rent=base_data['current_annual_rent'],
+            base_opex=base_data['base_opex'],
+            other_income=float(assumptions.get('other_income', 0)),
+            vacancy_rate=float(assumptions.get('vacancy_rate', 0.05)),
+            credit_loss_rate=float(assumptions.get('credit_loss_rate', 0.01)),
+            management_fee_pct=float(assumptions.get('management_fee_pct', 0.03)),
+            replacement_reserves=(
+                float(assumptions.get('replacement_reserves_per_unit', 300))
+                * base_data['unit_count']
+            ),
+            selling_costs_pct=float(assumptions.get('selling_costs_pct', 0.02)),
+        )
+
+        if purchase_price is None:
+            purchase_price = float(evaluate_sensitivity_grid(
+                **property_inputs,
+                **{name: np.array([value]) for name, value in base.items()},
+            )['present_value'][0])
+
+        grid = evaluate_sensitivity_grid(
+            **property_inputs,
+            **cells,
+            purchase_price=purchase_price,
+        )
+
+        def to_cube(values: np.ndarray, digits: int) -> list:
+            rounded = np.round(values.reshape(shape), digits).astype(object)
+            rounded[~np.isfinite(values.reshape(shape))] = None
+            return rounded.tolist()
+
+        return {
+            'project_id': self.project_id,
+            'axes': resolved_axes,
+            'shape': list(shape),
+            'present_value': to_cube(grid['present_value'], 2),
+            'irr': to_cube(grid['irr'], 6),
+            'purchase_price': round(purchase_price, 2),
+        }
+
     def _build_sensitivity_matrix(
         self,
         noi_series: List[float],
@@ -637,8 +854,6 @@ class DCFCalculationService:
         - Rows: discount rates (base -2σ to base +2σ)
         - Columns: exit cap rates (base -2σ to base +2σ)
         """
-        hold_period = len(noi_series)
-
         # Calculate exit cap rates (columns)
         exit_cap_rates = [
             base_exit_cap_rate + (cap_interval * i)
@@ -655,59 +870,28 @@ class DCFCalculationService:
         # Filter out non-positive discount rates
         discount_rates = [r for r in discount_rates if r > 0]
 
-        matrix = []
-
-        for disc_rate in discount_rates:
-            row_values = []
-
-            for exit_cap in exit_cap_rates:
-                # Calculate PV at this combination
-                pv = self._calculate_pv_at_rates(
-                    noi_series=noi_series,
-                    discount_rate=disc_rate,
-                    exit_cap_rate=exit_cap,
-                    terminal_noi=terminal_noi,
-                    selling_costs_pct=selling_costs_pct,
-                )
-                row_values.append(round(pv, 2))
-
-            matrix.append({
+        # Discount factors for every (rate, year), shared by all cap rates
+        years = np.arange(1, len(noi_series) + 1)
+        discount_factors = (1.0 + np.asarray(discount_rates)[:, None]) ** -years[None, :]
+        pv_of_noi = discount_factors @ np.asarray(noi_series, dtype=float)
+
+        # Terminal value floored at zero when terminal NOI is non-positive
+        # (PD15 Fix 6), so a loss-making exit shows the PV of the NOI strip alone
+        net_reversion = np.array([
+            _exit_value_or_floor(terminal_noi, exit_cap)[0] * (1 - selling_costs_pct)
+            for exit_cap in exit_cap_rates
+        ])
+        values = pv_of_noi[:, None] + discount_factors[:, -1:] * net_reversion[None, :]
+
+        return [
+            {
                 'discount_rate': round(disc_rate, 6),
                 'exit_cap_rates': [round(r, 6) for r in exit_cap_rates],
-                'values': row_values,
+                'values': [round(float(v), 2) for v in row],
                 'is_base_discount': abs(disc_rate - base_discount_rate) < 0.0001,
-            })
-
-        return matrix
-
-    def _calculate_pv_at_rates(
-        self,
-        noi_series: List[float],
-        discount_rate: float,
-        exit_cap_rate: float,
-        terminal_noi: float,
-        selling_costs_pct: float,
-    ) -> float:
-        """Calculate present value at specific discount and exit cap rates."""
-        hold_period = len(noi_series)
-
-        # Sum of discounted NOIs
-        pv_of_noi = sum(
-            noi / ((1 + discount_rate) ** (year + 1))
-            for year, noi in enumerate(noi_series)
-        )
-
-        # Terminal value (pre-computed terminal NOI). PD15 Fix 6: floored at zero
-        # when terminal income is non-positive, so every cell of the sensitivity
-        # matrix shows the PV of the NOI strip alone rather than a grid of
-        # negative "sale prices" that vary with the cap rate.
-        exit_value, _ = _exit_value_or_floor(terminal_noi, exit_cap_rate)
-        net_reversion = exit_value * (1 - selling_costs_pct)
-
-        # PV of reversion
-        pv_reversion = net_reversion / ((1 + discount_rate) ** hold_period)
-
-        return pv_of_noi + pv_reversion
+            }
+            for disc_rate, row in zip(discount_rates, values)
+        ]
 
     def calculate_monthly(self) -> Dict[str, Any]:
         """
@@ -1131,17 +1315,19 @@ class DCFCalculationService:
         Returns annualized IRR.
         """
         try:
-            import numpy_financial as npf
             import numpy as np
+            from financial_engine.core.irr_batch import calculate_irr_batch
 
             # Build cash flow array: [-initial_investment, cf1, cf2, ..., cfN + reversion]
             cash_flows = [-present_value]
             cash_flows.extend(noi_series[:-1])
             cash_flows.append(noi_series[-1] + net_reversion)
 
-            monthly_irr = npf.irr(cash_flows)
+            # numpy_financial.irr solves an eigenvalue problem over every month
+            # of the hold; the Halley solver converges in a handful of passes.
+            monthly_irr = calculate_irr_batch([cash_flows])[0]
 
-            if monthly_irr is None or np.isnan(monthly_irr):
+            if np.isnan(monthly_irr):
                 return None
 
             # Annualize monthly IRR: (1 + monthly_irr)^12 - 1
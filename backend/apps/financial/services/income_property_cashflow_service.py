@@ -187,6 +187,52 @@ class IncomePropertyCashFlowService:
             'generatedAt': date.today().isoformat(),
         }
 
+    def build_simulation_inputs(self):
+        """
+        Snapshot the unlevered DCF inputs for MonteCarloEngine.
+
+        Runs the monthly DCF once; every simulated draw then regrows GPR and
+        opex, recomputes vacancy, management fee and the exit reversion in
+        numpy without touching the database. The acquisition basis follows
+        the DCF's IRR convention: effective acquisition cost when
+        underwriting, indicated value otherwise.
+
+        Returns:
+            IncomePropertySimulationInputs, or None when the DCF has no projections
+        """
+        from financial_engine.core.monte_carlo import IncomePropertySimulationInputs
+
+        dcf_result = DCFCalculationService(self.project_id).calculate_monthly()
+        projections = dcf_result.get('projections', [])
+        if not projections:
+            return None
+
+        assumptions = dcf_result.get('assumptions', {})
+        acquisition_cost = (dcf_result.get('acquisition') or {}).get('effective_cost')
+        if dcf_result.get('analysis_purpose') != 'UNDERWRITING' or not acquisition_cost:
+            acquisition_cost = dcf_result.get('metrics', {}).get('present_value') or 0.0
+
+        return IncomePropertySimulationInputs(
+            start_date=date.fromisoformat(dcf_result['start_date']),
+            gpr=[p['gpr'] for p in projections],
+            other_income=[p['other_income'] for p in projections],
+            base_opex=[p['base_opex'] for p in projections],
+            replacement_reserves=[p['replacement_reserves'] for p in projections],
+            capital_costs=[
+                p.get('reno_capex', 0.0) + p.get('relocation_cost', 0.0)
+                for p in projections
+            ],
+            acquisition_cost=acquisition_cost,
+            discount_rate=assumptions.get('discount_rate'),
+            vacancy_rate=assumptions.get('vacancy_rate'),
+            credit_loss_rate=assumptions.get('credit_loss_rate'),
+            management_fee_pct=assumptions.get('management_fee_pct'),
+            income_growth_rate=assumptions.get('income_growth_rate'),
+            expense_growth_rate=assumptions.get('expense_growth_rate'),
+            terminal_cap_rate=assumptions.get('terminal_cap_rate'),
+            selling_costs_pct=assumptions.get('selling_costs_pct'),
+        )
+
     # =========================================================================
     # PERIOD GENERATION
     # =========================================================================
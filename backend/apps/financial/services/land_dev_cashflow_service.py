@@ -12,11 +12,11 @@ Key Features:
 - Revenue calculation from parcel sales with price escalation
 - Revenue deductions (commissions, transaction costs, subdivision costs)
 - Financial metrics: IRR, NPV, equity multiple, peak equity
+- Inputs loaded once per container filter (see land_dev_inputs)
 
 Session: Land Dev Cash Flow Consolidation
 """
 
-from decimal import Decimal
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 from typing import Any, Dict, List, Optional, Tuple
@@ -37,6 +37,11 @@ from apps.calculations.engines.lotbank_engine import (
     LotbankProduct,
 )
 from apps.financial.models_debt import Loan, LoanContainer
+from apps.financial.services.land_dev_inputs import (
+    LandDevInputs,
+    build_cost_matrix,
+    load_land_dev_inputs,
+)
 
 class LandDevCashFlowService:
     """
@@ -50,6 +55,7 @@ class LandDevCashFlowService:
         self.project_id = project_id
         self._project_config: Optional[Dict] = None
         self._dcf_assumptions: Optional[Dict] = None
+        self._inputs: Dict[Tuple[int, ...], LandDevInputs] = {}
 
     def calculate(
         self,
@@ -77,6 +83,7 @@ class LandDevCashFlowService:
             }
         """
         # Step 1: Load project configuration and DCF assumptions
+        self._get_inputs(container_ids)
         project_config = self._get_project_config()
         dcf_assumptions = self._get_dcf_assumptions()
         hold_period_months = self._get_dcf_hold_period_months()
@@ -166,137 +173,101 @@ class LandDevCashFlowService:
             'generatedAt': date.today().isoformat(),
         }
 
+    def build_simulation_inputs(self, container_ids: Optional[List[int]] = None):
+        """
+        Snapshot the unlevered project inputs for MonteCarloEngine.
+
+        Loads budget, acquisition and parcel data once. Costs keep their
+        scheduled timing and base inflation; parcel sales are captured
+        before price growth so each draw can re-time (absorption pace) and
+        re-escalate them. Lotbank sections, when present, are held fixed at
+        unescalated sale prices.
+
+        Args:
+            container_ids: Optional filter for specific villages/phases (division_ids)
+
+        Returns:
+            LandDevSimulationInputs
+        """
+        from financial_engine.core.monte_carlo import LandDevSimulationInputs
+
+        self._get_inputs(container_ids)
+        project_config = self._get_project_config()
+        dcf_assumptions = self._get_dcf_assumptions()
+        required_periods = self._determine_required_periods(container_ids)
+
+        cost_schedule = self._generate_cost_schedule(
+            required_periods,
+            container_ids,
+            dcf_assumptions.get('cost_inflation_rate')
+        )
+        absorption_schedule = self._generate_absorption_schedule(
+            project_config['start_date'],
+            container_ids,
+            None,
+            dcf_assumptions.get('cost_inflation_rate')
+        )
+
+        sales = [
+            parcel
+            for period_sale in absorption_schedule['periodSales']
+            for parcel in period_sale['parcels']
+        ]
+
+        fixed_flows = None
+        lotbank_sections = self._build_lotbank_sections(
+            absorption_schedule,
+            self._generate_periods(project_config['start_date'], required_periods),
+            container_ids,
+        )
+        if lotbank_sections:
+            fixed_flows = self._build_net_cash_flow_array(lotbank_sections, required_periods)
+
+        return LandDevSimulationInputs(
+            start_date=project_config['start_date'],
+            cost_flows=cost_schedule['periodTotals'],
+            sale_periods=[sale['salePeriod'] for sale in sales],
+            sale_net_revenue=[sale['netRevenue'] for sale in sales],
+            discount_rate=dcf_assumptions.get('discount_rate'),
+            price_growth_rate=dcf_assumptions.get('price_growth_rate'),
+            cost_inflation_rate=dcf_assumptions.get('cost_inflation_rate'),
+            fixed_flows=fixed_flows,
+        )
+
     # =========================================================================
     # PROJECT CONFIGURATION
     # =========================================================================
 
+    def _get_inputs(self, container_ids: Optional[List[int]] = None) -> LandDevInputs:
+        """Load (once per container filter) the database snapshot for this project."""
+        key = tuple(sorted(container_ids)) if container_ids else ()
+        if key not in self._inputs:
+            self._inputs[key] = load_land_dev_inputs(self.project_id, list(key) or None)
+        return self._inputs[key]
+
     def _get_project_config(self) -> Dict[str, Any]:
-        """Fetch project configuration from database."""
+        """Project configuration (id, name, start date)."""
         if self._project_config:
             return self._project_config
 
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT
-                    project_id,
-                    project_name,
-                    analysis_start_date
-                FROM landscape.tbl_project
-                WHERE project_id = %s
-            """, [self.project_id])
-            row = cursor.fetchone()
-
-            if not row:
-                raise ValueError(f"Project {self.project_id} not found")
-
-            # Parse start date
-            start_date = row[2]
-            if start_date is None:
-                start_date = date(2025, 1, 1)  # Default to Jan 1, 2025
-            elif isinstance(start_date, str):
-                start_date = date.fromisoformat(start_date.split('T')[0])
-
-            self._project_config = {
-                'project_id': row[0],
-                'project_name': row[1],
-                'start_date': start_date,
-            }
-
+        # Project-level values are the same in every container snapshot; callers
+        # with a container filter prime _get_inputs(container_ids) first so
+        # this does not load a second, unfiltered snapshot
+        inputs = next(iter(self._inputs.values()), None) or self._get_inputs()
+        self._project_config = inputs.project_config
         return self._project_config
 
     def _get_dcf_assumptions(self) -> Dict[str, Any]:
         """
-        Fetch DCF assumptions from tbl_dcf_analysis and look up actual rates
-        from growth rate sets tables.
+        DCF assumptions from tbl_dcf_analysis (falling back to project
+        settings for the growth rate sets), with the current rate of each set.
         """
         if self._dcf_assumptions:
             return self._dcf_assumptions
 
-        with connection.cursor() as cursor:
-            # Get DCF analysis record
-            cursor.execute("""
-                SELECT
-                    hold_period_years,
-                    discount_rate,
-                    selling_costs_pct,
-                    price_growth_set_id,
-                    cost_inflation_set_id
-                FROM landscape.tbl_dcf_analysis
-                WHERE project_id = %s
-                LIMIT 1
-            """, [self.project_id])
-            row = cursor.fetchone()
-
-            if row:
-                hold_period_years = int(row[0]) if row[0] else None
-                discount_rate = float(row[1]) if row[1] else 0.10
-                selling_costs_pct = float(row[2]) if row[2] else 0.0
-                price_growth_set_id = row[3]
-                cost_inflation_set_id = row[4]
-            else:
-                hold_period_years = None
-                discount_rate = 0.10
-                selling_costs_pct = 0.0
-                price_growth_set_id = None
-                cost_inflation_set_id = None
-
-                # Try to get cost_inflation_set_id from project settings
-                cursor.execute("""
-                    SELECT cost_inflation_set_id, price_inflation_set_id
-                    FROM landscape.tbl_project_settings
-                    WHERE project_id = %s
-                """, [self.project_id])
-                settings_row = cursor.fetchone()
-                if settings_row:
-                    cost_inflation_set_id = settings_row[0]
-                    price_growth_set_id = settings_row[1]
-
-            # Look up actual rates from growth rate sets
-            price_growth_rate = 0.0
-            cost_inflation_rate = 0.0
-
-            if price_growth_set_id:
-                cursor.execute("""
-                    SELECT
-                        CASE
-                            WHEN COUNT(st.step_id) = 1 THEN MAX(st.rate)
-                            ELSE MAX(CASE WHEN st.step_number = 1 THEN st.rate END)
-                        END AS current_rate
-                    FROM landscape.core_fin_growth_rate_sets grs
-                    LEFT JOIN landscape.core_fin_growth_rate_steps st ON st.set_id = grs.set_id
-                    WHERE grs.set_id = %s
-                    GROUP BY grs.set_id
-                """, [price_growth_set_id])
-                rate_row = cursor.fetchone()
-                if rate_row and rate_row[0]:
-                    price_growth_rate = float(rate_row[0])
-
-            if cost_inflation_set_id:
-                cursor.execute("""
-                    SELECT
-                        CASE
-                            WHEN COUNT(st.step_id) = 1 THEN MAX(st.rate)
-                            ELSE MAX(CASE WHEN st.step_number = 1 THEN st.rate END)
-                        END AS current_rate
-                    FROM landscape.core_fin_growth_rate_sets grs
-                    LEFT JOIN landscape.core_fin_growth_rate_steps st ON st.set_id = grs.set_id
-                    WHERE grs.set_id = %s
-                    GROUP BY grs.set_id
-                """, [cost_inflation_set_id])
-                rate_row = cursor.fetchone()
-                if rate_row and rate_row[0]:
-                    cost_inflation_rate = float(rate_row[0])
-
-            self._dcf_assumptions = {
-                'hold_period_years': hold_period_years,
-                'discount_rate': discount_rate,
-                'price_growth_rate': price_growth_rate,
-                'cost_inflation_rate': cost_inflation_rate,
-                'selling_costs_pct': selling_costs_pct,
-                'price_growth_set_id': price_growth_set_id,
-                'cost_inflation_set_id': cost_inflation_set_id,
-            }
-
+        # Project-level values are the same in every container snapshot
+        inputs = next(iter(self._inputs.values()), None) or self._get_inputs()
+        self._dcf_assumptions = inputs.dcf_assumptions
         return self._dcf_assumptions
 
     def _get_dcf_hold_period_months(self) -> Optional[int]:
@@ -317,52 +288,7 @@ class LandDevCashFlowService:
 
     def _determine_required_periods(self, container_ids: Optional[List[int]]) -> int:
         """Determine how many periods are needed based on project data."""
-        with connection.cursor() as cursor:
-            # Get max period from budget items
-            if container_ids:
-                cursor.execute("""
-                    SELECT MAX(COALESCE(end_period, start_period + COALESCE(periods_to_complete, 1) - 1)) as max_period
-                    FROM landscape.core_fin_fact_budget
-                    WHERE project_id = %s
-                      AND division_id = ANY(%s)
-                """, [self.project_id, container_ids])
-            else:
-                cursor.execute("""
-                    SELECT MAX(COALESCE(end_period, start_period + COALESCE(periods_to_complete, 1) - 1)) as max_period
-                    FROM landscape.core_fin_fact_budget
-                    WHERE project_id = %s
-                """, [self.project_id])
-
-            budget_row = cursor.fetchone()
-            max_budget_period = int(budget_row[0]) if budget_row and budget_row[0] else 0
-
-            # Get max period from parcel sales
-            if container_ids:
-                cursor.execute("""
-                    SELECT MAX(p.sale_period) as max_period
-                    FROM landscape.tbl_parcel p
-                    LEFT JOIN landscape.tbl_phase ph ON p.phase_id = ph.phase_id
-                    LEFT JOIN landscape.tbl_division d_phase
-                      ON ph.phase_name = d_phase.display_name
-                      AND ph.project_id = d_phase.project_id
-                      AND d_phase.tier = 2
-                    WHERE p.project_id = %s
-                      AND d_phase.division_id = ANY(%s)
-                      AND p.sale_period IS NOT NULL
-                """, [self.project_id, container_ids])
-            else:
-                cursor.execute("""
-                    SELECT MAX(sale_period) as max_period
-                    FROM landscape.tbl_parcel
-                    WHERE project_id = %s
-                      AND sale_period IS NOT NULL
-                """, [self.project_id])
-
-            parcel_row = cursor.fetchone()
-            max_sale_period = int(parcel_row[0]) if parcel_row and parcel_row[0] else 0
-
-        # Return max of both, minimum 1
-        return max(max_budget_period, max_sale_period, 1)
+        return self._get_inputs(container_ids).required_periods
 
     def _generate_periods(self, start_date: date, period_count: int) -> List[Dict]:
         """Generate monthly period objects."""
@@ -410,86 +336,18 @@ class LandDevCashFlowService:
         - categorySummary: costs grouped by activity/category
         - totalCosts: sum of all costs
         - periodTotals: costs by period
+        - matrix: (line items x periods) inflated costs, budget items in
+          categorySummary order followed by acquisition
         """
-        with connection.cursor() as cursor:
-            # Fetch budget items
-            if container_ids:
-                cursor.execute("""
-                    SELECT
-                        b.fact_id,
-                        b.project_id,
-                        b.division_id as container_id,
-                        CASE
-                            WHEN d.tier = 1 THEN COALESCE(pc.tier_1_label, 'Area') || ' ' || d.display_name
-                            WHEN d.tier = 2 THEN COALESCE(pc.tier_2_label, 'Phase') || ' ' || d.display_name
-                            WHEN d.tier = 3 THEN COALESCE(pc.tier_3_label, 'Parcel') || ' ' || d.display_name
-                            ELSE d.display_name
-                        END as container_label,
-                        COALESCE(c.category_name, 'Uncategorized') as description,
-                        b.notes,
-                        b.activity,
-                        b.qty,
-                        b.rate,
-                        b.amount,
-                        b.start_period,
-                        b.periods_to_complete,
-                        b.end_period,
-                        b.timing_method,
-                        b.curve_id,
-                        b.curve_steepness,
-                        b.escalation_rate
-                    FROM landscape.core_fin_fact_budget b
-                    LEFT JOIN landscape.core_unit_cost_category c ON b.category_id = c.category_id
-                    LEFT JOIN landscape.tbl_division d ON b.division_id = d.division_id
-                    LEFT JOIN landscape.tbl_project_config pc ON b.project_id = pc.project_id
-                    WHERE b.project_id = %s
-                      AND b.division_id = ANY(%s)
-                      AND b.amount > 0
-                    ORDER BY b.activity, b.fact_id
-                """, [self.project_id, container_ids])
-            else:
-                cursor.execute("""
-                    SELECT
-                        b.fact_id,
-                        b.project_id,
-                        b.division_id as container_id,
-                        CASE
-                            WHEN d.tier = 1 THEN COALESCE(pc.tier_1_label, 'Area') || ' ' || d.display_name
-                            WHEN d.tier = 2 THEN COALESCE(pc.tier_2_label, 'Phase') || ' ' || d.display_name
-                            WHEN d.tier = 3 THEN COALESCE(pc.tier_3_label, 'Parcel') || ' ' || d.display_name
-                            ELSE d.display_name
-                        END as container_label,
-                        COALESCE(c.category_name, 'Uncategorized') as description,
-                        b.notes,
-                        b.activity,
-                        b.qty,
-                        b.rate,
-                        b.amount,
-                        b.start_period,
-                        b.periods_to_complete,
-                        b.end_period,
-                        b.timing_method,
-                        b.curve_id,
-                        b.curve_steepness,
-                        b.escalation_rate
-                    FROM landscape.core_fin_fact_budget b
-                    LEFT JOIN landscape.core_unit_cost_category c ON b.category_id = c.category_id
-                    LEFT JOIN landscape.tbl_division d ON b.division_id = d.division_id
-                    LEFT JOIN landscape.tbl_project_config pc ON b.project_id = pc.project_id
-                    WHERE b.project_id = %s
-                      AND b.amount > 0
-                    ORDER BY b.activity, b.fact_id
-                """, [self.project_id])
-
-            columns = [col[0] for col in cursor.description]
-            budget_items = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-        # Group by category and distribute across periods
+        budget_items = self._get_inputs(container_ids).budget_items
+        matrix, first, last = build_cost_matrix(budget_items, period_count, cost_inflation_rate)
+        values = matrix.tolist()
+        item_totals = matrix.sum(axis=1).tolist()
+
+        # Group by category; each item keeps its matrix row for section subtotals
         category_summary = {}
-        period_totals = [0.0] * period_count
-        total_costs = 0.0
 
-        for item in budget_items:
+        for row, item in enumerate(budget_items):
             category = self._get_category_from_activity(
                 item.get('activity'),
                 item.get('description')
@@ -499,37 +357,24 @@ class LandDevCashFlowService:
                 category_summary[category] = {
                     'total': 0.0,
                     'items': [],
+                    'rows': [],
                 }
 
-            # Distribute budget item across periods
-            amount = float(item.get('amount') or 0)
-            start_period = int(item.get('start_period') or 1)
-            periods_to_complete = int(item.get('periods_to_complete') or 1)
-
-            # Apply inflation if configured
-            # Note: escalation_rate in DB is stored as percentage (3 = 3%), convert to decimal
-            item_inflation = item.get('escalation_rate')
-            if item_inflation is not None:
-                item_inflation = float(item_inflation) / 100.0  # Convert 3 -> 0.03
-            elif cost_inflation_rate:
-                item_inflation = cost_inflation_rate
-
-            # Create period values for this item
-            period_values = self._distribute_budget_item(
-                amount,
-                start_period,
-                periods_to_complete,
-                period_count,
-                item.get('timing_method'),
-                item.get('curve_steepness'),
-                item_inflation
-            )
+            period_values = [
+                {
+                    'periodIndex': idx,
+                    'periodSequence': idx + 1,
+                    'amount': values[row][idx],
+                    'source': 'budget',
+                }
+                for idx in range(first[row], last[row] + 1)
+            ]
 
-            # Compute inflated total from actual period amounts (accounts for escalation)
-            inflated_total = sum(pv['amount'] for pv in period_values)
+            # Inflated total from the actual period amounts (accounts for escalation)
+            inflated_total = item_totals[row]
 
-            # Add to category
             category_summary[category]['total'] += inflated_total
+            category_summary[category]['rows'].append(row)
             category_summary[category]['items'].append({
                 'factId': item.get('fact_id'),
                 'description': item.get('description'),
@@ -539,26 +384,25 @@ class LandDevCashFlowService:
                 'periods': period_values,
             })
 
-            # Add to period totals
-            for pv in period_values:
-                idx = pv['periodIndex']
-                if 0 <= idx < period_count:
-                    period_totals[idx] += pv['amount']
-
-            total_costs += inflated_total
-
         # Fetch and add acquisition costs from tbl_acquisition
         # These are separate from budget items (e.g., $104M land purchase)
         acquisition_costs = self._fetch_acquisition_costs(container_ids, period_count)
-        if acquisition_costs:
+        if acquisition_costs and period_count > 0:
             acq_category = 'Land Acquisition'
             if acq_category not in category_summary:
                 category_summary[acq_category] = {
                     'total': 0.0,
                     'items': [],
+                    'rows': [],
                 }
 
+            acquisition_row = np.zeros((1, period_count))
+            for pv in acquisition_costs['periods']:
+                acquisition_row[0, pv['periodIndex']] += pv['amount']
+            matrix = np.vstack([matrix, acquisition_row])
+
             category_summary[acq_category]['total'] += acquisition_costs['totalAmount']
+            category_summary[acq_category]['rows'].append(len(budget_items))
             category_summary[acq_category]['items'].append({
                 'factId': -1,  # Synthetic ID for acquisition
                 'description': acquisition_costs['description'],
@@ -568,18 +412,11 @@ class LandDevCashFlowService:
                 'periods': acquisition_costs['periods'],
             })
 
-            # Add to period totals
-            for pv in acquisition_costs['periods']:
-                idx = pv['periodIndex']
-                if 0 <= idx < period_count:
-                    period_totals[idx] += pv['amount']
-
-            total_costs += acquisition_costs['totalAmount']
-
         return {
             'categorySummary': category_summary,
-            'totalCosts': total_costs,
-            'periodTotals': period_totals,
+            'totalCosts': float(matrix.sum()),
+            'periodTotals': matrix.sum(axis=0).tolist(),
+            'matrix': matrix,
         }
 
     def _fetch_acquisition_costs(
@@ -588,99 +425,46 @@ class LandDevCashFlowService:
         period_count: int
     ) -> Optional[Dict[str, Any]]:
         """
-        Fetch acquisition costs from tbl_acquisition.
+        Acquisition costs from tbl_acquisition.
         These are land purchase costs separate from budget items.
 
         When filtered by container, allocates proportionally by acres.
         """
-        with connection.cursor() as cursor:
-            # Fetch acquisition records
-            cursor.execute("""
-                SELECT
-                    acquisition_id,
-                    project_id,
-                    event_date,
-                    event_type,
-                    description,
-                    COALESCE(amount, 0) as amount,
-                    COALESCE(is_applied_to_purchase, true) as is_applied_to_purchase,
-                    notes
-                FROM landscape.tbl_acquisition
-                WHERE project_id = %s
-                  AND is_applied_to_purchase = true
-                  AND amount > 0
-                ORDER BY event_date, acquisition_id
-            """, [self.project_id])
-
-            columns = [col[0] for col in cursor.description]
-            acquisitions = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-            if not acquisitions:
-                return None
-
-            # Calculate total acquisition amount
-            total_acquisition = sum(float(acq['amount']) for acq in acquisitions)
-
-            if total_acquisition <= 0:
-                return None
-
-            # Determine allocation proportion based on acres when filtered
-            allocation_proportion = 1.0  # Default to 100% if no filter
-
-            if container_ids and len(container_ids) > 0:
-                # Calculate acres proportion
-                cursor.execute("""
-                    WITH project_acres AS (
-                        SELECT COALESCE(SUM(acres_gross), 0) as total_acres
-                        FROM landscape.tbl_parcel
-                        WHERE project_id = %s
-                    ),
-                    filtered_acres AS (
-                        SELECT COALESCE(SUM(p.acres_gross), 0) as filtered_acres
-                        FROM landscape.tbl_parcel p
-                        LEFT JOIN landscape.tbl_phase ph ON p.phase_id = ph.phase_id
-                        LEFT JOIN landscape.tbl_division d_phase
-                          ON ph.phase_name = d_phase.display_name
-                          AND ph.project_id = d_phase.project_id
-                          AND d_phase.tier = 2
-                        WHERE p.project_id = %s
-                          AND d_phase.division_id = ANY(%s)
-                    )
-                    SELECT
-                        (SELECT total_acres FROM project_acres) as total_acres,
-                        (SELECT filtered_acres FROM filtered_acres) as filtered_acres
-                """, [self.project_id, self.project_id, container_ids])
-
-                row = cursor.fetchone()
-                if row:
-                    total_acres = float(row[0]) if row[0] else 0
-                    filtered_acres = float(row[1]) if row[1] else 0
-                    if total_acres > 0:
-                        allocation_proportion = filtered_acres / total_acres
-
-            # Calculate allocated acquisition amount
-            allocated_amount = total_acquisition * allocation_proportion
-
-            if allocated_amount <= 0:
-                return None
-
-            # Acquisition costs are placed at period 1 (project start)
-            periods = [{
-                'periodIndex': 0,
-                'periodSequence': 1,
-                'amount': allocated_amount,
-                'source': 'acquisition',
-            }]
+        inputs = self._get_inputs(container_ids)
+        total_acquisition = inputs.acquisition_total
 
-            description = 'Land Acquisition'
-            if allocation_proportion < 1:
-                description = f"Land Acquisition ({round(allocation_proportion * 100)}% allocation)"
+        if total_acquisition <= 0:
+            return None
 
-            return {
-                'totalAmount': allocated_amount,
-                'description': description,
-                'periods': periods,
-            }
+        # Determine allocation proportion based on acres when filtered
+        allocation_proportion = 1.0  # Default to 100% if no filter
+
+        if container_ids and inputs.project_acres > 0:
+            allocation_proportion = inputs.filtered_acres / inputs.project_acres
+
+        # Calculate allocated acquisition amount
+        allocated_amount = total_acquisition * allocation_proportion
+
+        if allocated_amount <= 0:
+            return None
+
+        # Acquisition costs are placed at period 1 (project start)
+        periods = [{
+            'periodIndex': 0,
+            'periodSequence': 1,
+            'amount': allocated_amount,
+            'source': 'acquisition',
+        }]
+
+        description = 'Land Acquisition'
+        if allocation_proportion < 1:
+            description = f"Land Acquisition ({round(allocation_proportion * 100)}% allocation)"
+
+        return {
+            'totalAmount': allocated_amount,
+            'description': description,
+            'periods': periods,
+        }
 
     def _get_category_from_activity(self, activity: Optional[str], description: Optional[str]) -> str:
         """Map activity to standardized category."""
@@ -712,128 +496,6 @@ class LandDevCashFlowService:
 
         return category_map.get(activity, 'Development Costs')
 
-    def _distribute_budget_item(
-        self,
-        amount: float,
-        start_period: int,
-        periods_to_complete: int,
-        max_periods: int,
-        timing_method: Optional[str],
-        curve_steepness: Optional[float],
-        inflation_rate: Optional[float]
-    ) -> List[Dict]:
-        """
-        Distribute a budget item across periods.
-
-        Supports:
-        - 'lump': All in first period
-        - 'distributed': Even distribution
-        - 'curve': S-curve distribution
-        """
-        period_values = []
-
-        if periods_to_complete <= 0:
-            periods_to_complete = 1
-
-        end_period = min(start_period + periods_to_complete - 1, max_periods)
-        actual_periods = end_period - start_period + 1
-
-        if actual_periods <= 0:
-            return period_values
-
-        method = (timing_method or 'distributed').lower()
-
-        if method == 'lump' or actual_periods == 1:
-            # All in first period
-            inflated = self._apply_inflation(amount, start_period, inflation_rate)
-            period_values.append({
-                'periodIndex': start_period - 1,
-                'periodSequence': start_period,
-                'amount': inflated,
-                'source': 'budget',
-            })
-
-        elif method == 'curve':
-            # S-curve distribution
-            steepness = curve_steepness or 0.5
-            weights = self._calculate_scurve_weights(actual_periods, steepness)
-
-            for i, weight in enumerate(weights):
-                period_seq = start_period + i
-                period_amount = amount * weight
-                inflated = self._apply_inflation(period_amount, period_seq, inflation_rate)
-
-                period_values.append({
-                    'periodIndex': period_seq - 1,
-                    'periodSequence': period_seq,
-                    'amount': inflated,
-                    'source': 'budget',
-                })
-
-        else:  # distributed
-            per_period = amount / actual_periods
-            for i in range(actual_periods):
-                period_seq = start_period + i
-                inflated = self._apply_inflation(per_period, period_seq, inflation_rate)
-
-                period_values.append({
-                    'periodIndex': period_seq - 1,
-                    'periodSequence': period_seq,
-                    'amount': inflated,
-                    'source': 'budget',
-                })
-
-        return period_values
-
-    def _calculate_scurve_weights(self, period_count: int, steepness: float) -> List[float]:
-        """Calculate S-curve distribution weights."""
-        if period_count <= 1:
-            return [1.0]
-
-        # Ensure steepness is a float
-        steepness = float(steepness) if isinstance(steepness, Decimal) else steepness
-
-        # Use logistic function for S-curve
-        weights = []
-        for i in range(period_count):
-            # Map i to range [-6, 6] for logistic function
-            x = (i / (period_count - 1)) * 12 - 6
-            # Adjust steepness (0.5 = moderate, higher = steeper)
-            x *= steepness * 2
-            weight = 1 / (1 + np.exp(-x))
-            weights.append(weight)
-
-        # Calculate incremental weights (difference between cumulative values)
-        incremental = [weights[0]]
-        for i in range(1, len(weights)):
-            incremental.append(weights[i] - weights[i-1])
-
-        # Normalize to sum to 1
-        total = sum(incremental)
-        if total > 0:
-            incremental = [w / total for w in incremental]
-
-        return incremental
-
-    def _apply_inflation(
-        self,
-        amount: float,
-        period_sequence: int,
-        annual_rate: Optional[float]
-    ) -> float:
-        """Apply inflation to an amount based on period."""
-        if not annual_rate or annual_rate == 0:
-            return float(amount)
-
-        # Ensure we're working with floats
-        amount = float(amount) if isinstance(amount, Decimal) else amount
-        annual_rate = float(annual_rate) if isinstance(annual_rate, Decimal) else annual_rate
-
-        # Convert annual rate to monthly compounding
-        months_from_start = period_sequence - 1
-        factor = (1 + annual_rate) ** (months_from_start / 12)
-        return amount * factor
-
     # =========================================================================
     # REVENUE SCHEDULE (ABSORPTION)
     # =========================================================================
@@ -850,103 +512,7 @@ class LandDevCashFlowService:
 
         Returns dict with period sales, totals for gross/net revenue, deductions.
         """
-        with connection.cursor() as cursor:
-            # Fetch parcels with sale data
-            if container_ids:
-                cursor.execute("""
-                    SELECT
-                        p.parcel_id,
-                        p.parcel_code,
-                        p.project_id,
-                        p.area_id,
-                        p.phase_id,
-                        p.family_name,
-                        p.density_code,
-                        p.type_code,
-                        p.product_code,
-                        p.units_total,
-                        p.acres_gross,
-                        p.lot_width,
-                        p.lot_depth,
-                        p.lot_area,
-                        p.sale_period,
-                        p.custom_sale_date,
-                        psa.gross_parcel_price,
-                        psa.net_sale_proceeds,
-                        psa.total_transaction_costs,
-                        psa.improvement_offset_total,
-                        COALESCE(psa.price_uom, lup.unit_of_measure) AS price_uom,
-                        psa.commission_amount,
-                        psa.legal_amount,
-                        psa.closing_cost_amount,
-                        psa.title_insurance_amount
-                    FROM landscape.tbl_parcel p
-                    LEFT JOIN landscape.tbl_parcel_sale_assumptions psa ON p.parcel_id = psa.parcel_id
-                    LEFT JOIN LATERAL (
-                        SELECT unit_of_measure
-                        FROM landscape.land_use_pricing lup
-                        WHERE lup.project_id = p.project_id
-                          AND lup.lu_type_code = p.type_code
-                          AND (lup.product_code = p.product_code OR lup.product_code IS NULL)
-                        ORDER BY lup.product_code NULLS LAST
-                        LIMIT 1
-                    ) lup ON TRUE
-                    LEFT JOIN landscape.tbl_phase ph ON p.phase_id = ph.phase_id
-                    LEFT JOIN landscape.tbl_division d_phase
-                      ON ph.phase_name = d_phase.display_name
-                      AND ph.project_id = d_phase.project_id
-                      AND d_phase.tier = 2
-                    WHERE p.project_id = %s
-                      AND d_phase.division_id = ANY(%s)
-                      AND (p.units_total > 0 OR p.acres_gross > 0)
-                    ORDER BY p.sale_period ASC NULLS LAST, p.parcel_code ASC
-                """, [self.project_id, container_ids])
-            else:
-                cursor.execute("""
-                    SELECT
-                        p.parcel_id,
-                        p.parcel_code,
-                        p.project_id,
-                        p.area_id,
-                        p.phase_id,
-                        p.family_name,
-                        p.density_code,
-                        p.type_code,
-                        p.product_code,
-                        p.units_total,
-                        p.acres_gross,
-                        p.lot_width,
-                        p.lot_depth,
-                        p.lot_area,
-                        p.sale_period,
-                        p.custom_sale_date,
-                        psa.gross_parcel_price,
-                        psa.net_sale_proceeds,
-                        psa.total_transaction_costs,
-                        psa.improvement_offset_total,
-                        COALESCE(psa.price_uom, lup.unit_of_measure) AS price_uom,
-                        psa.commission_amount,
-                        psa.legal_amount,
-                        psa.closing_cost_amount,
-                        psa.title_insurance_amount
-                    FROM landscape.tbl_parcel p
-                    LEFT JOIN landscape.tbl_parcel_sale_assumptions psa ON p.parcel_id = psa.parcel_id
-                    LEFT JOIN LATERAL (
-                        SELECT unit_of_measure
-                        FROM landscape.land_use_pricing lup
-                        WHERE lup.project_id = p.project_id
-                          AND lup.lu_type_code = p.type_code
-                          AND (lup.product_code = p.product_code OR lup.product_code IS NULL)
-                        ORDER BY lup.product_code NULLS LAST
-                        LIMIT 1
-                    ) lup ON TRUE
-                    WHERE p.project_id = %s
-                      AND (p.units_total > 0 OR p.acres_gross > 0)
-                    ORDER BY p.sale_period ASC NULLS LAST, p.parcel_code ASC
-                """, [self.project_id])
-
-            columns = [col[0] for col in cursor.description]
-            parcels = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        parcels = self._get_inputs(container_ids).parcels
 
         # Process each parcel into sales
         parcel_sales = []
@@ -1117,8 +683,10 @@ class LandDevCashFlowService:
                     'sourceType': 'budget',
                 })
 
-            # Calculate section subtotals
-            subtotals = self._calculate_subtotals(line_items, period_count)
+            # Section subtotals straight from the category's cost matrix rows
+            subtotals = self._array_subtotals(
+                -cost_schedule['matrix'][cat_data['rows']].sum(axis=0)
+            )
 
             section_data = {
                 'sectionId': f"cost-{category.lower().replace(' ', '-').replace('&', 'and')}",
@@ -1608,18 +1176,24 @@ class LandDevCashFlowService:
         if not phase_ids:
             return {}
 
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT ph.phase_id, d.division_id
-                FROM landscape.tbl_phase ph
-                LEFT JOIN landscape.tbl_division d
-                  ON ph.phase_name = d.display_name
-                  AND ph.project_id = d.project_id
-                  AND d.tier = 2
-                WHERE ph.phase_id = ANY(%s)
-            """, [phase_ids])
-
-            return {row[0]: row[1] for row in cursor.fetchall() if row[1] is not None}
+        mapping = {}
+        for inputs in self._inputs.values():
+            mapping.update(inputs.phase_divisions)
+        missing = [pid for pid in phase_ids if pid not in mapping]
+        if missing:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT ph.phase_id, d.division_id
+                    FROM landscape.tbl_phase ph
+                    LEFT JOIN landscape.tbl_division d
+                      ON ph.phase_name = d.display_name
+                      AND ph.project_id = d.project_id
+                      AND d.tier = 2
+                    WHERE ph.phase_id = ANY(%s)
+                """, [missing])
+                mapping.update({row[0]: row[1] for row in cursor.fetchall() if row[1] is not None})
+
+        return {pid: mapping[pid] for pid in phase_ids if pid in mapping}
 
     def _extend_periods_for_loans(
         self,
@@ -1636,8 +1210,13 @@ class LandDevCashFlowService:
                     division_id__in=container_ids,
                 ).values_list('loan_id', flat=True)
             )
+            assigned_ids = set(
+                LoanContainer.objects.filter(
+                    loan__project_id=self.project_id,
+                ).values_list('loan_id', flat=True)
+            )
             # Include unscoped loans (no container assignment) plus scoped ones
-            unscoped = [l for l in all_loans if not LoanContainer.objects.filter(loan_id=l.loan_id).exists()]
+            unscoped = [l for l in all_loans if l.loan_id not in assigned_ids]
             scoped = [l for l in all_loans if l.loan_id in scoped_ids]
             all_loans = unscoped + scoped
 
@@ -1705,20 +1284,39 @@ class LandDevCashFlowService:
             if period_totals[i] != 0
         ]
 
+    @staticmethod
+    def _array_subtotals(period_totals: np.ndarray) -> List[Dict]:
+        """Subtotal dicts (non-zero periods only) from a per-period array."""
+        return [
+            {
+                'periodIndex': int(i),
+                'periodSequence': int(i) + 1,
+                'amount': float(period_totals[i]),
+                'source': 'calculated',
+            }
+            for i in np.flatnonzero(period_totals)
+        ]
+
     def _fetch_container_labels(self, container_ids: List[Optional[int]]) -> Dict[int, str]:
-        """Fetch phase names for container IDs."""
+        """Phase names for container IDs."""
         valid_ids = [cid for cid in container_ids if cid is not None]
         if not valid_ids:
             return {}
 
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT phase_id, phase_name
-                FROM landscape.tbl_phase
-                WHERE phase_id = ANY(%s)
-            """, [valid_ids])
+        labels = {}
+        for inputs in self._inputs.values():
+            labels.update(inputs.phase_labels)
+        missing = [cid for cid in valid_ids if cid not in labels]
+        if missing:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT phase_id, phase_name
+                    FROM landscape.tbl_phase
+                    WHERE phase_id = ANY(%s)
+                """, [missing])
+                labels.update({row[0]: row[1] for row in cursor.fetchall()})
 
-            return {row[0]: row[1] for row in cursor.fetchall()}
+        return {cid: labels[cid] for cid in valid_ids if cid in labels}
 
     # =========================================================================
     # LOTBANK SECTION
@@ -1738,23 +1336,13 @@ class LandDevCashFlowService:
         list if the project is not a lotbank deal.
         """
         # Check if this project is a lotbank deal
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT analysis_type,
-                       lotbank_management_fee_pct,
-                       lotbank_default_provision_pct,
-                       lotbank_underwriting_fee
-                FROM landscape.tbl_project
-                WHERE project_id = %s
-            """, [self.project_id])
-            row = cursor.fetchone()
-
-        if not row or (row[0] or '').upper() != 'LOTBANK':
+        lotbank_config = self._get_inputs(container_ids).lotbank_config
+        if not lotbank_config:
             return []
 
-        management_fee_pct = float(row[1]) if row[1] else 0.0
-        default_provision_pct = float(row[2]) if row[2] else 0.0
-        underwriting_fee = float(row[3]) if row[3] else 0.0
+        management_fee_pct = lotbank_config['management_fee_pct']
+        default_provision_pct = lotbank_config['default_provision_pct']
+        underwriting_fee = lotbank_config['underwriting_fee']
 
         # Fetch product-level lotbank params from containers (divisions)
         products = self._build_lotbank_products(absorption_schedule, periods, container_ids)
@@ -1952,24 +1540,7 @@ class LandDevCashFlowService:
         premium_pct from tbl_division for each division. Derives
         lots_remaining_by_period from the absorption schedule.
         """
-        # Fetch divisions with lotbank fields
-        with connection.cursor() as cursor:
-            sql = """
-                SELECT division_id, display_name,
-                       option_deposit_pct, option_deposit_cap_pct,
-                       retail_lot_price, premium_pct
-                FROM landscape.tbl_division
-                WHERE project_id = %s
-                  AND tier = 1
-                  AND option_deposit_pct IS NOT NULL
-                  AND retail_lot_price IS NOT NULL
-            """
-            params_list = [self.project_id]
-            if container_ids:
-                sql += " AND division_id = ANY(%s)"
-                params_list.append(container_ids)
-            cursor.execute(sql, params_list)
-            rows = cursor.fetchall()
+        rows = self._get_inputs(container_ids).lotbank_divisions
 
         if not rows:
             return []
@@ -0,0 +1,438 @@
+"""
+Land Development Cash Flow Inputs
+
+Loads everything LandDevCashFlowService needs for one project (and optional
+container filter) in a few batched queries, and spreads budget items over
+monthly periods as a numpy (line items x periods) matrix.
+
+Queries:
+1. Project row with DCF analysis, project settings, growth-rate lookups,
+   acquisition total and project acres
+2. Budget items (with container labels)
+3. Parcels with sale assumptions, phase labels and phase -> division map
+4. Lotbank divisions (LOTBANK projects only)
+
+The cost matrix replaces the per-item, per-period pow() loop: S-curve
+weights and inflation factors are computed once per (duration, steepness)
+and per rate, then broadcast over the items.
+
+Session: Land Dev Cash Flow Consolidation
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db import connection
+
+
+DEFAULT_START_DATE = date(2025, 1, 1)
+DEFAULT_DISCOUNT_RATE = 0.10
+
+
+@dataclass
+class LandDevInputs:
+    """
+    Database snapshot for one LandDevCashFlowService run.
+
+    Attributes:
+        project_config: project_id, project_name, start_date
+        dcf_assumptions: Same keys as LandDevCashFlowService._get_dcf_assumptions
+        lotbank_config: Fee settings when analysis_type = 'LOTBANK', else None
+        budget_items: Budget rows with amount > 0, ordered by activity, fact_id
+        max_budget_period: Last budget period over all rows (any amount)
+        parcels: Parcels with units or acres, ordered by sale period, code
+        max_sale_period: Last sale period over all filtered parcels
+        acquisition_total: Sum of applied acquisition events
+        project_acres: Gross acres across the whole project
+        filtered_acres: Gross acres inside the container filter
+        phase_labels: phase_id -> phase_name for the loaded parcels
+        phase_divisions: phase_id -> tier-2 division_id for the loaded parcels
+        lotbank_divisions: Tier-1 lotbank rows (division_id, display_name,
+            option_deposit_pct, option_deposit_cap_pct, retail_lot_price, premium_pct)
+    """
+    project_config: Dict[str, Any]
+    dcf_assumptions: Dict[str, Any]
+    lotbank_config: Optional[Dict[str, float]]
+    budget_items: List[Dict[str, Any]]
+    max_budget_period: int
+    parcels: List[Dict[str, Any]]
+    max_sale_period: int
+    acquisition_total: float
+    project_acres: float
+    filtered_acres: float
+    phase_labels: Dict[int, str] = field(default_factory=dict)
+    phase_divisions: Dict[int, int] = field(default_factory=dict)
+    lotbank_divisions: List[Tuple] = field(default_factory=list)
+
+    @property
+    def required_periods(self) -> int:
+        """Periods needed to cover budget and parcel sales, minimum 1."""
+        return max(self.max_budget_period, self.max_sale_period, 1)
+
+
+def load_land_dev_inputs(
+    project_id: int,
+    container_ids: Optional[Sequence[int]] = None,
+) -> LandDevInputs:
+    """Fetch a LandDevInputs snapshot; raises ValueError if the project is missing."""
+    container_ids = list(container_ids) if container_ids else None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                p.project_id,
+                p.project_name,
+                p.analysis_start_date,
+                p.analysis_type,
+                p.lotbank_management_fee_pct,
+                p.lotbank_default_provision_pct,
+                p.lotbank_underwriting_fee,
+                dcf.project_id IS NOT NULL AS has_dcf,
+                dcf.hold_period_years,
+                dcf.discount_rate,
+                dcf.selling_costs_pct,
+                sets.price_growth_set_id,
+                sets.cost_inflation_set_id,
+                price_rate.current_rate AS price_growth_rate,
+                cost_rate.current_rate AS cost_inflation_rate,
+                (
+                    SELECT COALESCE(SUM(a.amount), 0)
+                    FROM landscape.tbl_acquisition a
+                    WHERE a.project_id = p.project_id
+                      AND a.is_applied_to_purchase = true
+                      AND a.amount > 0
+                ) AS acquisition_total,
+                (
+                    SELECT COALESCE(SUM(pa.acres_gross), 0)
+                    FROM landscape.tbl_parcel pa
+                    WHERE pa.project_id = p.project_id
+                ) AS project_acres
+            FROM landscape.tbl_project p
+            LEFT JOIN LATERAL (
+                SELECT project_id, hold_period_years, discount_rate, selling_costs_pct,
+                       price_growth_set_id, cost_inflation_set_id
+                FROM landscape.tbl_dcf_analysis
+                WHERE project_id = p.project_id
+                LIMIT 1
+            ) dcf ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT cost_inflation_set_id, price_inflation_set_id
+                FROM landscape.tbl_project_settings
+                WHERE project_id = p.project_id
+                LIMIT 1
+            ) ps ON TRUE
+            CROSS JOIN LATERAL (
+                SELECT
+                    CASE WHEN dcf.project_id IS NOT NULL
+                         THEN dcf.price_growth_set_id ELSE ps.price_inflation_set_id
+                    END AS price_growth_set_id,
+                    CASE WHEN dcf.project_id IS NOT NULL
+                         THEN dcf.cost_inflation_set_id ELSE ps.cost_inflation_set_id
+                    END AS cost_inflation_set_id
+            ) sets
+            LEFT JOIN LATERAL (
+                SELECT
+                    CASE
+                        WHEN COUNT(st.step_id) = 1 THEN MAX(st.rate)
+                        ELSE MAX(CASE WHEN st.step_number = 1 THEN st.rate END)
+                    END AS current_rate
+                FROM landscape.core_fin_growth_rate_sets grs
+                LEFT JOIN landscape.core_fin_growth_rate_steps st ON st.set_id = grs.set_id
+                WHERE grs.set_id = sets.price_growth_set_id
+                GROUP BY grs.set_id
+            ) price_rate ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT
+                    CASE
+                        WHEN COUNT(st.step_id) = 1 THEN MAX(st.rate)
+                        ELSE MAX(CASE WHEN st.step_number = 1 THEN st.rate END)
+                    END AS current_rate
+                FROM landscape.core_fin_growth_rate_sets grs
+                LEFT JOIN landscape.core_fin_growth_rate_steps st ON st.set_id = grs.set_id
+                WHERE grs.set_id = sets.cost_inflation_set_id
+                GROUP BY grs.set_id
+            ) cost_rate ON TRUE
+            WHERE p.project_id = %s
+        """, [project_id])
+        columns = [col[0] for col in cursor.description]
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Project {project_id} not found")
+        project = dict(zip(columns, row))
+
+        budget_filter = "AND b.division_id = ANY(%s)" if container_ids else ""
+        cursor.execute(f"""
+            SELECT
+                b.fact_id,
+                b.division_id as container_id,
+                CASE
+                    WHEN d.tier = 1 THEN COALESCE(pc.tier_1_label, 'Area') || ' ' || d.display_name
+                    WHEN d.tier = 2 THEN COALESCE(pc.tier_2_label, 'Phase') || ' ' || d.display_name
+                    WHEN d.tier = 3 THEN COALESCE(pc.tier_3_label, 'Parcel') || ' ' || d.display_name
+                    ELSE d.display_name
+                END as container_label,
+                COALESCE(c.category_name, 'Uncategorized') as description,
+                b.activity,
+                b.amount,
+                b.start_period,
+                b.periods_to_complete,
+                b.end_period,
+                b.timing_method,
+                b.curve_steepness,
+                b.escalation_rate
+            FROM landscape.core_fin_fact_budget b
+            LEFT JOIN landscape.core_unit_cost_category c ON b.category_id = c.category_id
+            LEFT JOIN landscape.tbl_division d ON b.division_id = d.division_id
+            LEFT JOIN landscape.tbl_project_config pc ON b.project_id = pc.project_id
+            WHERE b.project_id = %s
+              {budget_filter}
+            ORDER BY b.activity, b.fact_id
+        """, [project_id] + ([container_ids] if container_ids else []))
+        columns = [col[0] for col in cursor.description]
+        budget_rows = [dict(zip(columns, r)) for r in cursor.fetchall()]
+
+        # The container filter maps parcels to tier-2 divisions through the
+        # phase name, as the per-section queries did
+        parcel_filter_join = """
+            LEFT JOIN landscape.tbl_division d_phase
+              ON ph.phase_name = d_phase.display_name
+              AND ph.project_id = d_phase.project_id
+              AND d_phase.tier = 2
+        """ if container_ids else ""
+        parcel_filter = "AND d_phase.division_id = ANY(%s)" if container_ids else ""
+        cursor.execute(f"""
+            SELECT
+                p.parcel_id,
+                p.parcel_code,
+                p.phase_id,
+                p.units_total,
+                p.acres_gross,
+                p.sale_period,
+                psa.gross_parcel_price,
+                psa.net_sale_proceeds,
+                psa.total_transaction_costs,
+                psa.improvement_offset_total,
+                COALESCE(psa.price_uom, lup.unit_of_measure) AS price_uom,
+                psa.commission_amount,
+                psa.legal_amount,
+                psa.closing_cost_amount,
+                psa.title_insurance_amount,
+                ph.phase_name,
+                phase_division.division_id AS phase_division_id
+            FROM landscape.tbl_parcel p
+            LEFT JOIN landscape.tbl_parcel_sale_assumptions psa ON p.parcel_id = psa.parcel_id
+            LEFT JOIN LATERAL (
+                SELECT unit_of_measure
+                FROM landscape.land_use_pricing lup
+                WHERE lup.project_id = p.project_id
+                  AND lup.lu_type_code = p.type_code
+                  AND (lup.product_code = p.product_code OR lup.product_code IS NULL)
+                ORDER BY lup.product_code NULLS LAST
+                LIMIT 1
+            ) lup ON TRUE
+            LEFT JOIN landscape.tbl_phase ph ON p.phase_id = ph.phase_id
+            LEFT JOIN LATERAL (
+                SELECT d.division_id
+                FROM landscape.tbl_division d
+                WHERE d.display_name = ph.phase_name
+                  AND d.project_id = ph.project_id
+                  AND d.tier = 2
+                LIMIT 1
+            ) phase_division ON TRUE
+            {parcel_filter_join}
+            WHERE p.project_id = %s
+              {parcel_filter}
+            ORDER BY p.sale_period ASC NULLS LAST, p.parcel_code ASC
+        """, [project_id] + ([container_ids] if container_ids else []))
+        columns = [col[0] for col in cursor.description]
+        parcel_rows = [dict(zip(columns, r)) for r in cursor.fetchall()]
+
+        lotbank_config = None
+        lotbank_divisions = []
+        if (project['analysis_type'] or '').upper() == 'LOTBANK':
+            lotbank_config = {
+                'management_fee_pct': _float(project['lotbank_management_fee_pct']),
+                'default_provision_pct': _float(project['lotbank_default_provision_pct']),
+                'underwriting_fee': _float(project['lotbank_underwriting_fee']),
+            }
+            sql = """
+                SELECT division_id, display_name,
+                       option_deposit_pct, option_deposit_cap_pct,
+                       retail_lot_price, premium_pct
+                FROM landscape.tbl_division
+                WHERE project_id = %s
+                  AND tier = 1
+                  AND option_deposit_pct IS NOT NULL
+                  AND retail_lot_price IS NOT NULL
+            """
+            params_list = [project_id]
+            if container_ids:
+                sql += " AND division_id = ANY(%s)"
+                params_list.append(container_ids)
+            cursor.execute(sql, params_list)
+            lotbank_divisions = cursor.fetchall()
+
+    start_date = project['analysis_start_date']
+    if start_date is None:
+        start_date = DEFAULT_START_DATE
+    elif isinstance(start_date, str):
+        start_date = date.fromisoformat(start_date.split('T')[0])
+
+    hold_period_years = project['hold_period_years'] if project['has_dcf'] else None
+    discount_rate = project['discount_rate'] if project['has_dcf'] else None
+    selling_costs_pct = project['selling_costs_pct'] if project['has_dcf'] else None
+
+    return LandDevInputs(
+        project_config={
+            'project_id': project['project_id'],
+            'project_name': project['project_name'],
+            'start_date': start_date,
+        },
+        dcf_assumptions={
+            'hold_period_years': int(hold_period_years) if hold_period_years else None,
+            'discount_rate': float(discount_rate) if discount_rate else DEFAULT_DISCOUNT_RATE,
+            'price_growth_rate': _float(project['price_growth_rate']),
+            'cost_inflation_rate': _float(project['cost_inflation_rate']),
+            'selling_costs_pct': _float(selling_costs_pct),
+            'price_growth_set_id': project['price_growth_set_id'],
+            'cost_inflation_set_id': project['cost_inflation_set_id'],
+        },
+        lotbank_config=lotbank_config,
+        budget_items=[r for r in budget_rows if r['amount'] is not None and r['amount'] > 0],
+        max_budget_period=max(
+            (p for p in (_budget_end_period(r) for r in budget_rows) if p is not None),
+            default=0,
+        ),
+        parcels=[
+            r for r in parcel_rows
+            if (r['units_total'] or 0) > 0 or (r['acres_gross'] or 0) > 0
+        ],
+        max_sale_period=max(
+            (int(r['sale_period']) for r in parcel_rows if r['sale_period']),
+            default=0,
+        ),
+        acquisition_total=_float(project['acquisition_total']),
+        project_acres=_float(project['project_acres']),
+        filtered_acres=sum(_float(r['acres_gross']) for r in parcel_rows),
+        phase_labels={
+            r['phase_id']: r['phase_name'] for r in parcel_rows if r['phase_id'] is not None
+        },
+        phase_divisions={
+            r['phase_id']: r['phase_division_id'] for r in parcel_rows
+            if r['phase_id'] is not None and r['phase_division_id'] is not None
+        },
+        lotbank_divisions=list(lotbank_divisions),
+    )
+
+
+# =============================================================================
+# COST MATRIX
+# =============================================================================
+
+def scurve_weights(period_count: int, steepness: float) -> np.ndarray:
+    """Incremental logistic S-curve weights over period_count periods, summing to 1."""
+    if period_count <= 1:
+        return np.ones(1)
+    x = (np.arange(period_count) / (period_count - 1) * 12 - 6) * (float(steepness) * 2)
+    cumulative = 1 / (1 + np.exp(-x))
+    incremental = np.diff(cumulative, prepend=0.0)
+    total = incremental.sum()
+    return incremental / total if total > 0 else incremental
+
+
+def inflation_factors(annual_rate: Optional[float], period_count: int) -> np.ndarray:
+    """(1 + rate)^((period - 1) / 12) for periods 1..period_count."""
+    if not annual_rate:
+        return np.ones(period_count)
+    return (1 + float(annual_rate)) ** (np.arange(period_count) / 12)
+
+
+def build_cost_matrix(
+    budget_items: List[Dict[str, Any]],
+    period_count: int,
+    cost_inflation_rate: Optional[float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Spread budget items over periods.
+
+    Timing methods: 'lump' (all in the start period), 'curve' (S-curve),
+    anything else even. Items run from start_period for periods_to_complete
+    periods, truncated at period_count; any share scheduled before period 1
+    is booked in period 1. Each item inflates at its own
+    escalation_rate (stored as a percentage) or the project cost inflation.
+
+    Returns:
+        (matrix, first, last): (items x periods) inflated amounts and each
+        item's first/last 0-based period index (first > last when the item
+        falls outside the horizon)
+    """
+    item_count = len(budget_items)
+    matrix = np.zeros((item_count, period_count))
+    first = np.zeros(item_count, dtype=np.int64)
+    last = np.full(item_count, -1, dtype=np.int64)
+    if not item_count or period_count <= 0:
+        return matrix, first, last
+
+    curve_cache: Dict[Tuple[int, float], np.ndarray] = {}
+    inflation_cache: Dict[Optional[float], np.ndarray] = {}
+
+    for row, item in enumerate(budget_items):
+        amount = float(item.get('amount') or 0)
+        start_period = int(item.get('start_period') or 1)
+        periods_to_complete = int(item.get('periods_to_complete') or 1)
+        if periods_to_complete <= 0:
+            periods_to_complete = 1
+
+        end_period = min(start_period + periods_to_complete - 1, period_count)
+        actual_periods = end_period - start_period + 1
+        if actual_periods <= 0:
+            continue
+
+        method = (item.get('timing_method') or 'distributed').lower()
+        if method == 'lump' or actual_periods == 1:
+            weights = np.ones(1)
+        elif method == 'curve':
+            key = (actual_periods, float(item.get('curve_steepness') or 0.5))
+            weights = curve_cache.get(key)
+            if weights is None:
+                weights = curve_cache[key] = scurve_weights(*key)
+        else:
+            weights = np.full(actual_periods, 1 / actual_periods)
+
+        # Columns before period 1 cannot be represented in the matrix, so
+        # their share is booked in period 1 rather than dropped
+        offset = max(1 - start_period, 0)
+        if offset:
+            early = weights[:offset].sum()
+            weights = weights[offset:].copy() if offset < weights.size else np.zeros(1)
+            weights[0] += early
+        start_index = start_period - 1 + offset
+
+        escalation = item.get('escalation_rate')
+        rate = float(escalation) / 100.0 if escalation is not None else (cost_inflation_rate or None)
+        factors = inflation_cache.get(rate)
+        if factors is None:
+            factors = inflation_cache[rate] = inflation_factors(rate, period_count)
+
+        stop = start_index + weights.size
+        matrix[row, start_index:stop] = amount * weights * factors[start_index:stop]
+        first[row] = start_index
+        last[row] = stop - 1
+
+    return matrix, first, last
+
+
+def _budget_end_period(row: Dict[str, Any]) -> Optional[int]:
+    """COALESCE(end_period, start_period + COALESCE(periods_to_complete, 1) - 1)."""
+    if row.get('end_period') is not None:
+        return int(row['end_period'])
+    if row.get('start_period') is None:
+        return None
+    periods = row.get('periods_to_complete')
+    return int(row['start_period']) + (int(periods) if periods is not None else 1) - 1
+
+
+def _float(value: Any) -> float:
+    return float(value) if value else 0.0
@@ -0,0 +1,132 @@
+"""
+Revision-keyed cash flow envelope cache.
+
+A repeat call at the same project revision must be served from the cache,
+any revision or engine version change must recompute, and the bypass
+flag / missing revision must always compute without touching the cache.
+"""
+
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+
+from apps.financial.services import cashflow_cache
+from apps.financial.services.cashflow_cache import (
+    cached_envelope,
+    cashflow_cache_stats,
+    make_cache_key,
+    reset_cashflow_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    caches[cashflow_cache.CACHE_ALIAS].clear()
+    reset_cashflow_cache_stats()
+    yield
+    caches[cashflow_cache.CACHE_ALIAS].clear()
+
+
+def _counting_compute():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'projectId': 7, 'summary': {'irr': 0.12}, 'call': len(calls)}
+
+    return compute, calls
+
+
+def _at_revision(revision):
+    return mock.patch.object(cashflow_cache, 'get_project_revision', return_value=revision)
+
+
+def test_repeat_call_is_a_hit_until_revision_changes():
+    compute, calls = _counting_compute()
+
+    with _at_revision((41, 3)):
+        first = cached_envelope(7, True, None, compute)
+        second = cached_envelope(7, True, None, compute)
+    assert len(calls) == 1
+    assert second == first
+
+    with _at_revision((42, 3)):
+        cached_envelope(7, True, None, compute)
+    with _at_revision((42, 4)):
+        cached_envelope(7, True, None, compute)
+    assert len(calls) == 3
+
+    stats = cashflow_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 3)
+    assert stats['hit_rate'] == pytest.approx(0.25)
+
+
+def test_key_separates_financing_and_containers():
+    compute, calls = _counting_compute()
+
+    with _at_revision((1, 0)):
+        cached_envelope(7, True, None, compute)
+        cached_envelope(7, False, None, compute)
+        cached_envelope(7, True, [3, 2], compute)
+        cached_envelope(7, True, [2, 3, 3], compute)
+    assert len(calls) == 3
+    assert make_cache_key(7, True, [3, 2], (1, 0)) == make_cache_key(7, 1, [2, 3], (1, 0))
+
+
+def test_engine_version_change_recomputes(monkeypatch, settings):
+    compute, calls = _counting_compute()
+
+    with _at_revision((1, 0)):
+        cached_envelope(7, True, None, compute)
+        monkeypatch.setattr(cashflow_cache, 'ENGINE_VERSION', cashflow_cache.ENGINE_VERSION + 1)
+        cached_envelope(7, True, None, compute)
+        settings.CASHFLOW_CACHE_VERSION = 'release-2'
+        cached_envelope(7, True, None, compute)
+        cached_envelope(7, True, None, compute)
+    assert len(calls) == 3
+
+
+def test_bypass_and_missing_revision_always_compute():
+    compute, calls = _counting_compute()
+
+    with _at_revision((1, 0)):
+        cached_envelope(7, True, None, compute, use_cache=False)
+        cached_envelope(7, True, None, compute, use_cache=False)
+    with _at_revision(None):
+        cached_envelope(7, True, None, compute)
+    assert len(calls) == 3
+    assert cashflow_cache_stats()['bypassed'] == 3
+
+
+def test_cached_envelope_is_not_shared_with_callers():
+    compute, _ = _counting_compute()
+
+    with _at_revision((1, 0)):
+        envelope = cached_envelope(7, True, None, compute)
+        envelope['summary']['irr'] = None
+        again = cached_envelope(7, True, None, compute)
+    assert again['summary']['irr'] == 0.12
+
+
+def _mock_connection(*results):
+    cursor = mock.MagicMock()
+    cursor.fetchone.side_effect = [r for r in results if not isinstance(r, list)]
+    cursor.fetchall.side_effect = [r for r in results if isinstance(r, list)]
+    connection = mock.MagicMock(vendor='postgresql')
+    connection.cursor.return_value.__enter__.return_value = cursor
+    return connection
+
+
+def test_revision_lookup_defaults_unstamped_projects_to_zero():
+    connection = _mock_connection((True,), [(0, 12)])
+    with mock.patch.object(cashflow_cache, 'connection', connection), \
+            mock.patch.object(cashflow_cache, '_revision_table_exists', None):
+        assert cashflow_cache.get_project_revision(7) == (0, 12)
+
+
+def test_missing_revision_table_disables_cache():
+    connection = _mock_connection((False,))
+    with mock.patch.object(cashflow_cache, 'connection', connection), \
+            mock.patch.object(cashflow_cache, '_revision_table_exists', None):
+        assert cashflow_cache.get_project_revision(7) is None
@@ -0,0 +1,200 @@
+"""
+Land dev cost matrix and snapshot-driven cash flow.
+
+build_cost_matrix must reproduce the per-item, per-period distribution it
+replaced (lump / even / S-curve, escalation vs project inflation, horizon
+truncation) without losing amounts scheduled before period 1, and calculate() must run from a LandDevInputs snapshot without
+further database access.
+"""
+
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+from apps.financial.services.land_dev_cashflow_service import LandDevCashFlowService
+from apps.financial.services.land_dev_inputs import LandDevInputs, build_cost_matrix
+
+
+def _loop_distribution(amount, start_period, periods_to_complete, max_periods,
+                       timing_method, curve_steepness, inflation_rate):
+    """Loop form of the former _distribute_budget_item (period sequence -> amount)."""
+    def inflate(value, seq):
+        if not inflation_rate:
+            return value
+        return value * (1 + inflation_rate) ** ((seq - 1) / 12)
+
+    if periods_to_complete <= 0:
+        periods_to_complete = 1
+    end_period = min(start_period + periods_to_complete - 1, max_periods)
+    actual = end_period - start_period + 1
+    if actual <= 0:
+        return {}
+
+    method = (timing_method or 'distributed').lower()
+    if method == 'lump' or actual == 1:
+        return {start_period: inflate(amount, start_period)}
+    if method == 'curve':
+        steepness = curve_steepness or 0.5
+        cumulative = [
+            1 / (1 + np.exp(-((i / (actual - 1)) * 12 - 6) * steepness * 2))
+            for i in range(actual)
+        ]
+        incremental = [cumulative[0]] + [
+            cumulative[i] - cumulative[i - 1] for i in range(1, actual)
+        ]
+        total = sum(incremental)
+        return {
+            start_period + i: inflate(amount * w / total, start_period + i)
+            for i, w in enumerate(incremental)
+        }
+    return {start_period + i: inflate(amount / actual, start_period + i) for i in range(actual)}
+
+
+def _budget_items(count, seed=7):
+    rng = random.Random(seed)
+    items = []
+    for fact_id in range(1, count + 1):
+        items.append({
+            'fact_id': fact_id,
+            'container_id': rng.choice([None, 11, 12]),
+            'container_label': None,
+            'description': rng.choice(['Grading', 'Sewer', 'Contingency', 'Fees']),
+            'activity': rng.choice(['Acquisition', 'Planning', 'Improvements', 'Sales', None]),
+            'amount': rng.uniform(1_000, 2_000_000),
+            'start_period': rng.randint(1, 60),
+            'periods_to_complete': rng.choice([None, 0, 1, 6, 24, 48]),
+            'end_period': None,
+            'timing_method': rng.choice(['lump', 'distributed', 'curve', 'CURVE', None]),
+            'curve_steepness': rng.choice([None, 0.3, 0.5, 1.0]),
+            'escalation_rate': rng.choice([None, None, 0, 3]),
+        })
+    return items
+
+
+def _snapshot(budget_items, parcel_count=0, acquisition_total=0.0):
+    parcels = [
+        {
+            'parcel_id': i,
+            'parcel_code': f'P{i:04d}',
+            'phase_id': 100 + i % 4,
+            'units_total': 40,
+            'acres_gross': 8.0,
+            'sale_period': 12 + i % 60,
+            'gross_parcel_price': 4_000_000,
+            'net_sale_proceeds': 3_700_000,
+            'price_uom': 'FF',
+            'commission_amount': 120_000,
+            'legal_amount': 5_000,
+            'closing_cost_amount': 20_000,
+            'title_insurance_amount': 5_000,
+            'improvement_offset_total': 150_000,
+        }
+        for i in range(parcel_count)
+    ]
+    return LandDevInputs(
+        project_config={'project_id': 1, 'project_name': 'Test', 'start_date': date(2025, 1, 1)},
+        dcf_assumptions={
+            'hold_period_years': None,
+            'discount_rate': 0.10,
+            'price_growth_rate': 0.03,
+            'cost_inflation_rate': 0.025,
+            'selling_costs_pct': 0.0,
+            'price_growth_set_id': None,
+            'cost_inflation_set_id': None,
+        },
+        lotbank_config=None,
+        budget_items=budget_items,
+        max_budget_period=108,
+        parcels=parcels,
+        max_sale_period=max((p['sale_period'] for p in parcels), default=0),
+        acquisition_total=acquisition_total,
+        project_acres=8.0 * parcel_count,
+        filtered_acres=8.0 * parcel_count,
+        phase_labels={100 + k: f'Phase {k + 1}' for k in range(4)},
+    )
+
+
+def test_matrix_matches_loop_distribution():
+    items = _budget_items(300)
+    period_count = 72
+    matrix, first, last = build_cost_matrix(items, period_count, 0.025)
+
+    for row, item in enumerate(items):
+        escalation = item['escalation_rate']
+        rate = escalation / 100.0 if escalation is not None else 0.025
+        expected = _loop_distribution(
+            item['amount'], item['start_period'], item['periods_to_complete'] or 1,
+            period_count, item['timing_method'], item['curve_steepness'], rate,
+        )
+        actual = {
+            idx + 1: matrix[row, idx] for idx in range(first[row], last[row] + 1)
+        }
+        assert actual.keys() == expected.keys()
+        for seq, value in expected.items():
+            assert actual[seq] == pytest.approx(value, rel=1e-12)
+        assert matrix[row].sum() == pytest.approx(sum(expected.values()), rel=1e-12)
+
+
+@pytest.mark.parametrize('timing_method', ['lump', 'distributed', 'curve'])
+def test_amounts_before_period_one_are_booked_in_period_one(timing_method):
+    items = [
+        {'amount': 120_000, 'start_period': -2, 'periods_to_complete': 6,
+         'timing_method': timing_method, 'curve_steepness': None, 'escalation_rate': 0},
+        {'amount': 50_000, 'start_period': -10, 'periods_to_complete': 3,
+         'timing_method': timing_method, 'curve_steepness': None, 'escalation_rate': 0},
+    ]
+    matrix, first, last = build_cost_matrix(items, 12, None)
+
+    assert matrix.sum(axis=1) == pytest.approx([120_000, 50_000])
+    assert list(first) == [0, 0]
+    assert last[1] == 0
+
+
+def test_calculate_runs_from_snapshot():
+    service = LandDevCashFlowService(project_id=1)
+    service._inputs[()] = _snapshot(_budget_items(200), parcel_count=40,
+                                    acquisition_total=5_000_000.0)
+
+    result = service.calculate()
+
+    assert result['totalPeriods'] == 108
+    costs = [s for s in result['sections'] if s['sectionId'].startswith('cost-')]
+    assert costs[0]['sectionId'] == 'cost-land-acquisition'
+    for section in costs:
+        by_period = {}
+        for item in section['lineItems']:
+            for pv in item['periods']:
+                by_period[pv['periodIndex']] = by_period.get(pv['periodIndex'], 0.0) + pv['amount']
+        assert {s['periodIndex']: s['amount'] for s in section['subtotals']} == pytest.approx(
+            {k: v for k, v in by_period.items() if v != 0}
+        )
+        assert section['sectionTotal'] == pytest.approx(
+            sum(item['total'] for item in section['lineItems'])
+        )
+
+    acquisition = costs[0]['lineItems'][-1]
+    assert acquisition['periods'] == [{
+        'periodIndex': 0, 'periodSequence': 1, 'amount': -5_000_000.0, 'source': 'acquisition',
+    }]
+    gross = next(s for s in result['sections'] if s['sectionId'] == 'revenue-gross')
+    assert {item['description'] for item in gross['lineItems']} == {
+        'Phase 1', 'Phase 2', 'Phase 3', 'Phase 4',
+    }
+
+
+def test_cost_schedule_totals_include_acquisition():
+    service = LandDevCashFlowService(project_id=1)
+    items = _budget_items(50)
+    service._inputs[()] = _snapshot(items, acquisition_total=1_000_000.0)
+
+    schedule = service._generate_cost_schedule(72, None, 0.025)
+
+    assert schedule['matrix'].shape == (51, 72)
+    assert schedule['periodTotals'][0] == pytest.approx(
+        1_000_000.0 + schedule['matrix'][:50, 0].sum()
+    )
+    assert schedule['totalCosts'] == pytest.approx(sum(
+        category['total'] for category in schedule['categorySummary'].values()
+    ))
@@ -0,0 +1,138 @@
+"""
+Vectorized DCF sensitivity grid.
+
+evaluate_sensitivity_grid must reproduce the annual DCF (calculate()) cell
+by cell, including the zero-floored exit, and the 5x5 matrix built on top of
+it must match the per-cell present value formula it replaced.
+"""
+
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from apps.financial.services.dcf_calculation_service import (
+    DCFCalculationService,
+    _exit_value_or_floor,
+    _resolve_sensitivity_axis,
+    evaluate_sensitivity_grid,
+)
+
+
+PROPERTY = dict(
+    current_annual_rent=2_400_000.0,
+    base_opex=900_000.0,
+    other_income=60_000.0,
+    vacancy_rate=0.05,
+    credit_loss_rate=0.01,
+    management_fee_pct=0.03,
+    replacement_reserves=30_000.0,
+    selling_costs_pct=0.02,
+)
+
+BASE = {
+    'discount_rate': 0.085,
+    'terminal_cap_rate': 0.0575,
+    'income_growth_rate': 0.03,
+    'expense_growth_rate': 0.03,
+    'hold_period_years': 10,
+}
+
+
+def _scalar_dcf(discount_rate, terminal_cap_rate, income_growth_rate,
+                expense_growth_rate, hold_period_years, p=PROPERTY):
+    """Loop form of DCFCalculationService.calculate (unrounded)."""
+    nois = []
+    for year in range(1, hold_period_years + 1):
+        gpr = p['current_annual_rent'] * (1 + income_growth_rate) ** (year - 1)
+        egi = gpr * (1 - p['vacancy_rate'] - p['credit_loss_rate']) + p['other_income']
+        opex = p['base_opex'] * (1 + expense_growth_rate) ** (year - 1)
+        fee = egi * p['management_fee_pct']
+        nois.append(egi - opex - fee - p['replacement_reserves'])
+    terminal_noi = (
+        egi * (1 + income_growth_rate)
+        - (opex + fee) * (1 + expense_growth_rate)
+        - p['replacement_reserves']
+    )
+    exit_value, _ = _exit_value_or_floor(terminal_noi, terminal_cap_rate)
+    reversion = exit_value * (1 - p['selling_costs_pct'])
+    pv = sum(n / (1 + discount_rate) ** (y + 1) for y, n in enumerate(nois))
+    pv += reversion / (1 + discount_rate) ** hold_period_years
+    return pv, nois, reversion
+
+
+def test_grid_matches_scalar_dcf_for_every_cell():
+    axes = [
+        np.array([0.07, 0.085, 0.10]),
+        np.array([0.05, 0.0575, 0.065]),
+        np.array([5, 7, 10]),
+    ]
+    mesh = [m.ravel() for m in np.meshgrid(*axes, indexing='ij')]
+    cells = {
+        'discount_rate': mesh[0],
+        'terminal_cap_rate': mesh[1],
+        'income_growth_rate': np.full(mesh[0].size, BASE['income_growth_rate']),
+        'expense_growth_rate': np.full(mesh[0].size, BASE['expense_growth_rate']),
+        'hold_period_years': mesh[2],
+    }
+    price = 30_000_000.0
+
+    grid = evaluate_sensitivity_grid(**PROPERTY, **cells, purchase_price=price)
+
+    for c in range(mesh[0].size):
+        pv, nois, reversion = _scalar_dcf(
+            cells['discount_rate'][c], cells['terminal_cap_rate'][c],
+            BASE['income_growth_rate'], BASE['expense_growth_rate'],
+            int(cells['hold_period_years'][c]),
+        )
+        flows = [-price] + nois[:-1] + [nois[-1] + reversion]
+        assert grid['present_value'][c] == pytest.approx(pv, rel=1e-12)
+        assert grid['irr'][c] == pytest.approx(npf.irr(flows), abs=1e-10)
+
+
+def test_loss_making_exit_is_floored():
+    losing = {**PROPERTY, 'base_opex': 3_000_000.0}
+    cells = {name: np.array([value]) for name, value in BASE.items()}
+    grid = evaluate_sensitivity_grid(**losing, **cells)
+
+    pv, _, reversion = _scalar_dcf(**BASE, p=losing)
+    assert grid['terminal_noi'][0] < 0
+    assert reversion == 0.0
+    assert grid['present_value'][0] == pytest.approx(pv, rel=1e-12)
+    assert np.isnan(grid['irr'][0])  # no purchase price given
+
+
+def test_axis_resolution_centres_steps_on_base():
+    axis = _resolve_sensitivity_axis(
+        {'variable': 'discount_rate', 'steps': 7, 'interval': 0.0025}, BASE, {}
+    )
+    assert axis['values'] == [0.0775, 0.08, 0.0825, 0.085, 0.0875, 0.09, 0.0925]
+    assert axis['base_index'] == 3
+
+    hold = _resolve_sensitivity_axis(
+        {'variable': 'hold_period_years', 'values': [0, 5, 10]}, BASE, {}
+    )
+    assert hold['values'] == [5, 10]
+    assert hold['base_index'] == 1
+
+    with pytest.raises(ValueError, match='Unknown sensitivity variable'):
+        _resolve_sensitivity_axis({'variable': 'rent'}, BASE, {})
+
+
+def test_matrix_matches_per_cell_formula():
+    nois = [1_000_000.0 * 1.03 ** y for y in range(10)]
+    matrix = DCFCalculationService._build_sensitivity_matrix(
+        None,
+        noi_series=nois,
+        base_discount_rate=0.085,
+        base_exit_cap_rate=0.0575,
+        terminal_noi=1_400_000.0,
+        selling_costs_pct=0.02,
+    )
+
+    assert len(matrix) == 5 and all(len(row['values']) == 5 for row in matrix)
+    for row in matrix:
+        rate = row['discount_rate']
+        for cap, value in zip(row['exit_cap_rates'], row['values']):
+            expected = sum(n / (1 + rate) ** (y + 1) for y, n in enumerate(nois))
+            expected += 1_400_000.0 / cap * 0.98 / (1 + rate) ** 10
+            assert value == pytest.approx(round(expected, 2), abs=0.011)
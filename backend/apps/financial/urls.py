@@ -41,6 +41,7 @@ from .views_income_approach import (
     update_income_approach_assumptions,
     income_approach_dcf,
     income_approach_dcf_monthly,
+    income_approach_dcf_sensitivity,
     income_approach_unit_rent_schedule,
 )
 from .views_dcf_analysis import (
@@ -128,6 +129,7 @@ urlpatterns = [
     path('valuation/income-approach-data/<int:project_id>/update/', update_income_approach_assumptions, name='income-approach-update'),
     path('valuation/income-approach-data/<int:project_id>/dcf/', income_approach_dcf, name='income-approach-dcf'),
     path('valuation/income-approach-data/<int:project_id>/dcf/monthly/', income_approach_dcf_monthly, name='income-approach-dcf-monthly'),
+    path('valuation/income-approach-data/<int:project_id>/dcf/sensitivity/', income_approach_dcf_sensitivity, name='income-approach-dcf-sensitivity'),
     path('valuation/income-approach-data/<int:project_id>/unit-rent-schedule/', income_approach_unit_rent_schedule, name='income-approach-unit-rent-schedule'),
 
     # DCF Analysis endpoints (unified for CRE and Land Dev)
@@ -33,6 +33,8 @@ class DebtScheduleView(APIView):
             container_ids = None
 
         service = LandDevCashFlowService(project_id)
+        # Load the filtered snapshot first so project-level config comes from it
+        service._get_inputs(container_ids)
         project_config = service._get_project_config()
         dcf_assumptions = service._get_dcf_assumptions()
         required_periods = service._determine_required_periods(container_ids)
@@ -97,6 +99,8 @@ class DebtScheduleView(APIView):
                     'peak_balance': result.peak_balance,
                     'peak_balance_pct': result.peak_balance_pct,
                     'iterations_to_converge': result.iterations_to_converge,
+                    'reserve_residuals': result.reserve_residuals,
+                    'converged': result.converged,
                 },
                 'periods': [
                     {
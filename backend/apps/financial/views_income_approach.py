@@ -622,6 +622,37 @@ def income_approach_dcf_monthly(request, project_id: int):
     return Response(result)
 
 
+@api_view(['POST'])
+def income_approach_dcf_sensitivity(request, project_id: int):
+    """
+    POST /api/valuation/income-approach-data/{project_id}/dcf/sensitivity/
+
+    Returns a 1-3 axis sensitivity cube of present value and IRR for the
+    front end's heat maps.
+
+    Request body:
+    - axes: list of {variable, values} or {variable, steps, interval}.
+      Variables: discount_rate, terminal_cap_rate, income_growth_rate,
+      expense_growth_rate, hold_period_years
+    - purchase_price: optional IRR basis (defaults to base present value)
+    """
+    from .services.dcf_calculation_service import DCFCalculationService
+
+    # Verify project exists
+    project = get_object_or_404(Project, project_id=project_id)
+
+    purchase_price = request.data.get('purchase_price')
+    try:
+        result = DCFCalculationService(project_id).calculate_sensitivity(
+            request.data.get('axes') or [],
+            purchase_price=float(purchase_price) if purchase_price is not None else None,
+        )
+    except (TypeError, ValueError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(result)
+
+
 @api_view(['GET'])
 def income_approach_unit_rent_schedule(request, project_id: int):
     """
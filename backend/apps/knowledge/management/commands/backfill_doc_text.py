@@ -2,7 +2,7 @@
 Backfill core_doc_text for existing documents that have real storage URLs.
 
 Extracts text from documents stored in UploadThing (utfs.io) and stores
-the extracted text in core_doc_text.  This enables:
+the extracted text, with its page offsets, in core_doc_text.  This enables:
   - Document chat Quick Actions (Summarize, Key Points, Extract Data, Q&A)
   - Full-text fallback when embeddings are unavailable
   - Text search across all documents
@@ -17,7 +17,8 @@ Usage:
 from django.core.management.base import BaseCommand
 from django.db import connection
 
-from apps.knowledge.services.text_extraction import extract_text_from_url
+from apps.knowledge.services.text_extraction import extract_text_layer_from_url
+from apps.knowledge.services.text_layer import save_text_layer
 
 
 class Command(BaseCommand):
@@ -45,7 +46,7 @@ class Command(BaseCommand):
         self.stdout.write("Querying documents with real storage URLs...\n")
 
         query = """
-            SELECT d.doc_id, d.doc_name, d.storage_uri, d.mime_type
+            SELECT d.doc_id, d.doc_name, d.storage_uri, d.mime_type, d.sha256_hash
             FROM landscape.core_doc d
             WHERE d.deleted_at IS NULL
               AND d.storage_uri IS NOT NULL
@@ -86,7 +87,7 @@ class Command(BaseCommand):
 
         if options['dry_run']:
             self.stdout.write(self.style.WARNING("\n[DRY RUN] Would extract text for:"))
-            for doc_id, doc_name, storage_uri, mime_type in docs[:15]:
+            for doc_id, doc_name, storage_uri, mime_type, _ in docs[:15]:
                 self.stdout.write(f"  doc_id={doc_id}: {doc_name} ({mime_type or 'unknown'})")
             if len(docs) > 15:
                 self.stdout.write(f"  ... and {len(docs) - 15} more")
@@ -96,9 +97,11 @@ class Command(BaseCommand):
         fail_count = 0
         total_words = 0
 
-        for i, (doc_id, doc_name, storage_uri, mime_type) in enumerate(docs, 1):
+        for i, (doc_id, doc_name, storage_uri, mime_type, content_hash) in enumerate(docs, 1):
             try:
-                text, error = extract_text_from_url(storage_uri, mime_type)
+                text, page_offsets, error = extract_text_layer_from_url(
+                    storage_uri, mime_type, doc_id=doc_id, content_hash=content_hash
+                )
 
                 if error or not text or len(text.strip()) == 0:
                     self.stdout.write(
@@ -112,17 +115,7 @@ class Command(BaseCommand):
                 total_words += word_count
 
                 with connection.cursor() as cursor:
-                    cursor.execute("""
-                        INSERT INTO landscape.core_doc_text
-                            (doc_id, extracted_text, word_count, extraction_method, extracted_at, updated_at)
-                        VALUES (%s, %s, %s, 'backfill', NOW(), NOW())
-                        ON CONFLICT (doc_id)
-                        DO UPDATE SET
-                            extracted_text = EXCLUDED.extracted_text,
-                            word_count = EXCLUDED.word_count,
-                            extraction_method = 'backfill',
-                            updated_at = NOW()
-                    """, [doc_id, text, word_count])
+                    save_text_layer(cursor, doc_id, text, page_offsets, 'backfill')
 
                 success_count += 1
                 self.stdout.write(
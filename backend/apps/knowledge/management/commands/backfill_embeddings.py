@@ -5,6 +5,10 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 
 from apps.knowledge.services.document_ingestion import ingest_documents_batch
+from apps.knowledge.services.embedding_cache import (
+    embedding_cache_stats,
+    reset_embedding_cache_stats,
+)
 
 
 class Command(BaseCommand):
@@ -45,7 +49,8 @@ class Command(BaseCommand):
                 mime_type,
                 doc_name,
                 doc_type,
-                project_id
+                project_id,
+                sha256_hash
             FROM landscape.core_doc
             WHERE storage_uri IS NOT NULL
               AND storage_uri != ''
@@ -90,6 +95,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  [{current}/{total}] {status} doc_id={result.doc_id}: {detail}")
 
         self.stdout.write("\nProcessing documents...\n")
+        reset_embedding_cache_stats()
 
         results = ingest_documents_batch(
             documents=documents,
@@ -106,6 +112,11 @@ class Command(BaseCommand):
         self.stdout.write(f"  Failed: {results['failed']}")
         self.stdout.write(f"  Total chunks created: {results['total_chunks']}")
         self.stdout.write(f"  Total embeddings created: {results['total_embeddings']}")
+        cache = embedding_cache_stats()
+        self.stdout.write(
+            f"  Embedding cache: {cache['hits']} hits / {cache['misses']} misses "
+            f"({cache['hit_rate']:.0%} hit rate)"
+        )
 
         if results['errors']:
             self.stdout.write(self.style.WARNING(f"\nErrors ({len(results['errors'])}):"))
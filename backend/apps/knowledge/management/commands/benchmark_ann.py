@@ -0,0 +1,222 @@
+"""
+Recall / latency benchmark of project-scoped HNSW search against exact search.
+
+Loads a synthetic corpus into an UNLOGGED copy of the knowledge_embeddings
+search columns, builds the same indexes manage_vector_indexes builds (shared
+partial HNSW, project_id btree, per-project HNSW above --min-rows), then runs
+the production query shape (vector_index.scoped_hits_cte) per ef_search value
+and once with index scans disabled as ground truth.
+
+Project sizes follow a Zipf curve, so a few projects are large and most are
+small, and each project's chunks cluster around a handful of topics, which
+is what makes filtered search hard: the nearest neighbours in the shared
+graph mostly belong to other projects.
+
+A full 5M x 1536 run needs ~35 GB of disk and hours of index build; raise
+maintenance_work_mem first. Smaller --rows / --dim runs are fine for a quick
+look.
+
+Usage:
+    python manage.py benchmark_ann --rows 5000000
+    python manage.py benchmark_ann --rows 200000 --dim 384 --ef-search 40,100,200 --keep
+    python manage.py benchmark_ann --reuse --queries 500
+"""
+import statistics
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.knowledge.management.commands.benchmark_retrieval import recall_at_k
+from apps.knowledge.services.embedding_storage import vector_literal
+from apps.knowledge.services.vector_index import (
+    PROJECT_INDEX_MIN_ROWS,
+    create_project_index,
+    create_shared_index,
+    plan_project_indexes,
+    scoped_hits_cte,
+    scoped_hits_params,
+)
+from apps.knowledge.services.vector_io import copy_binary
+
+BENCH_TABLE = 'landscape.knowledge_ann_bench'
+BENCH_SHARED_INDEX = 'idx_knowledge_ann_bench_hnsw'
+BENCH_PROJECT_PREFIX = 'idx_knowledge_ann_bench_hnsw_p'
+TOPICS_PER_PROJECT = 8
+LOAD_BATCH = 10000
+
+
+def project_sizes(rows: int, projects: int, shared_fraction: float, zipf_s: float = 1.1) -> Dict:
+    """
+    Rows per project_id (1..projects) on a Zipf curve, plus ``None`` for
+    shared chunks. Sizes sum to rows exactly.
+    """
+    shared = int(rows * shared_fraction)
+    weights = 1.0 / np.arange(1, projects + 1) ** zipf_s
+    sizes = np.floor(weights / weights.sum() * (rows - shared)).astype(int)
+    sizes[0] += rows - shared - sizes.sum()
+    result = {pid: int(size) for pid, size in enumerate(sizes, start=1) if size}
+    if shared:
+        result[None] = shared
+    return result
+
+
+def synthetic_vectors(rng: np.random.Generator, topics: np.ndarray, count: int,
+                      noise: float) -> np.ndarray:
+    """Unit vectors scattered around randomly chosen topic centres."""
+    picks = topics[rng.integers(0, len(topics), size=count)]
+    vectors = picks + rng.normal(0.0, noise, size=picks.shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(pct * (len(ordered) - 1))] if ordered else 0.0
+
+
+class Command(BaseCommand):
+    help = 'Benchmark filtered HNSW search (recall, p50/p95) against exact search on a synthetic corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5_000_000)
+        parser.add_argument('--dim', type=int, default=1536)
+        parser.add_argument('--projects', type=int, default=2000)
+        parser.add_argument('--shared-fraction', type=float, default=0.05,
+                            help='Share of chunks without a project (default: 0.05)')
+        parser.add_argument('--noise', type=float, default=0.08,
+                            help='Per-dimension spread around a topic centre')
+        parser.add_argument('--min-rows', type=int, default=PROJECT_INDEX_MIN_ROWS,
+                            help='Chunks for a project to get its own HNSW index')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--ef-search', default='40,100,200',
+                            help='Comma-separated hnsw.ef_search values to try')
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--reuse', action='store_true', help='Query an existing bench table')
+        parser.add_argument('--keep', action='store_true', help='Leave the bench table in place')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        dim = options['dim']
+        ef_values = [int(v) for v in options['ef_search'].split(',') if v.strip()]
+        if not ef_values:
+            raise CommandError("--ef-search needs at least one value")
+
+        sizes = project_sizes(options['rows'], options['projects'], options['shared_fraction'])
+        # Topic centres are regenerated from the seed, so --reuse queries match the data
+        topics = {
+            pid: rng.normal(0.0, 1.0, size=(TOPICS_PER_PROJECT, dim)).astype(np.float32)
+            for pid in sizes
+        }
+
+        if not options['reuse']:
+            self._load(rng, sizes, topics, dim, options['noise'])
+            self._index(sizes, options['min_rows'])
+
+        large = {pid for pid, rows in sizes.items() if pid is not None and rows >= options['min_rows']}
+        small = [pid for pid in sizes if pid is not None and pid not in large]
+        query_projects = list(rng.choice(sorted(large), size=options['queries'] // 2)) if large else []
+        if small:
+            query_projects += list(rng.choice(small, size=options['queries'] - len(query_projects)))
+        probes = [
+            (int(pid), vector_literal(synthetic_vectors(rng, topics[pid], 1, options['noise'])[0].tolist()))
+            for pid in query_projects
+        ]
+
+        k = options['k']
+        exact, exact_ms = self._run(probes, k, exact=True)
+        self.stdout.write(
+            f"\n{len(probes)} queries, k={k}, {options['rows']} rows x {dim} dims, "
+            f"{len(large)} projects with their own index\n"
+        )
+        self.stdout.write(f"{'search':<16} {'recall@k':>9} {'small':>7} {'large':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        self._row('exact', 1.0, 1.0, 1.0, exact_ms)
+
+        for ef in ef_values:
+            found, latencies = self._run(probes, k, ef_search=ef)
+            recalls = [recall_at_k(got, truth, k) for got, truth in zip(found, exact)]
+            by_group = {
+                group: [r for r, (pid, _) in zip(recalls, probes) if (pid in large) == (group == 'large')]
+                for group in ('small', 'large')
+            }
+            self._row(
+                f'hnsw ef={ef}', statistics.mean(recalls),
+                statistics.mean(by_group['small']) if by_group['small'] else float('nan'),
+                statistics.mean(by_group['large']) if by_group['large'] else float('nan'),
+                latencies,
+            )
+
+        if not options['keep']:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+
+    def _row(self, label, recall, small, large, latencies):
+        self.stdout.write(
+            f"{label:<16} {recall:>9.3f} {small:>7.3f} {large:>7.3f} "
+            f"{statistics.median(latencies):>8.1f} {percentile(latencies, 0.95):>8.1f}"
+        )
+
+    def _load(self, rng, sizes, topics, dim, noise):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+            cursor.execute(f"""
+                CREATE UNLOGGED TABLE {BENCH_TABLE} (
+                    embedding_id BIGINT PRIMARY KEY,
+                    project_id BIGINT,
+                    source_type TEXT NOT NULL,
+                    embedding vector({dim})
+                )
+            """)
+
+        started = time.monotonic()
+        next_id = 1
+        for pid, count in sizes.items():
+            for offset in range(0, count, LOAD_BATCH):
+                batch = synthetic_vectors(rng, topics[pid], min(LOAD_BATCH, count - offset), noise)
+                with transaction.atomic(), connection.cursor() as cursor:
+                    copy_binary(
+                        cursor.cursor, BENCH_TABLE,
+                        ('embedding_id', 'project_id', 'source_type', 'embedding'),
+                        ('int8', 'int8', 'text', 'vector'),
+                        ((next_id + i, pid, 'document_chunk', v) for i, v in enumerate(batch)),
+                    )
+                next_id += len(batch)
+            self.stdout.write(f"\rLoaded {next_id - 1} rows", ending='')
+        self.stdout.write(f"\nLoaded in {time.monotonic() - started:.0f}s")
+
+    def _index(self, sizes, min_rows):
+        started = time.monotonic()
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_knowledge_ann_bench_project
+                    ON {BENCH_TABLE} (project_id) WHERE source_type = 'document_chunk'
+            """)
+        create_shared_index(BENCH_TABLE, BENCH_SHARED_INDEX)
+        to_create, _ = plan_project_indexes(sizes.items(), [], min_rows, BENCH_PROJECT_PREFIX)
+        for project_id in to_create:
+            create_project_index(project_id, BENCH_TABLE, BENCH_PROJECT_PREFIX)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {BENCH_TABLE}")
+        self.stdout.write(f"Indexed in {time.monotonic() - started:.0f}s ({len(to_create)} project indexes)")
+
+    def _run(self, probes, k, exact=False, ef_search=None):
+        """Top-k ids and latency (ms) per probe, exact or via HNSW."""
+        sql = f"""
+            WITH {scoped_hits_cte(BENCH_TABLE)}
+            SELECT embedding_id FROM hits ORDER BY distance LIMIT %s
+        """
+        found: List[List[int]] = []
+        latencies: List[float] = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            if exact:
+                cursor.execute("SET LOCAL enable_indexscan = off")
+            else:
+                cursor.execute("SELECT set_config('hnsw.ef_search', %s, true)", [str(ef_search)])
+            for project_id, vector in probes:
+                started = time.perf_counter()
+                cursor.execute(sql, scoped_hits_params(vector, project_id, k) + [k])
+                found.append([row[0] for row in cursor.fetchall()])
+                latencies.append((time.perf_counter() - started) * 1000)
+        return found, latencies
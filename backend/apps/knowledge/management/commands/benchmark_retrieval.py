@@ -0,0 +1,155 @@
+"""
+Offline relevance benchmark: vector-only vs hybrid (full-text + vector) retrieval.
+
+Runs a file of saved queries through both retrieval modes and reports
+recall@k and search latency. Each query is embedded once (the query cache
+makes repeats free), so latency is the database search alone.
+
+Saved queries are a JSON list; each case targets either project documents
+(knowledge_embeddings, ids are embedding_id) or platform knowledge
+(tbl_platform_knowledge_chunks, ids are chunk id):
+
+    [
+        {"query": "APN 304-12-045 assessed value", "project_id": 17,
+         "relevant_ids": [9812, 9813]},
+        {"query": "capitalization rate definition", "platform": true,
+         "document_key": "appraisal-re-15", "relevant_ids": [441]}
+    ]
+
+Usage:
+    python manage.py benchmark_retrieval --queries saved_queries.json
+    python manage.py benchmark_retrieval --queries saved_queries.json --k 10 --repeat 5
+"""
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.knowledge.services.embedding_service import embed_query
+from apps.knowledge.services.embedding_storage import search_similar
+from apps.knowledge.services.hybrid_search import RETRIEVAL_MODES
+from apps.knowledge.services.platform_knowledge_retriever import PlatformKnowledgeRetriever
+
+
+def recall_at_k(retrieved_ids: Sequence[Any], relevant_ids: Sequence[Any], k: int) -> float:
+    """Share of the relevant ids found in the first k retrieved."""
+    relevant = set(relevant_ids)
+    if not relevant:
+        return 0.0
+    return len(relevant & set(list(retrieved_ids)[:k])) / len(relevant)
+
+
+def run_benchmark(
+    cases: List[Dict[str, Any]],
+    search: Callable[[Dict[str, Any], str, int], List[Any]],
+    k: int,
+    repeat: int = 1,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Score every retrieval mode over cases.
+
+    search(case, mode, k) returns retrieved ids best-first. Each case is run
+    ``repeat`` times per mode; recall comes from the last run, latency from
+    all of them.
+    """
+    report = {}
+    for mode in RETRIEVAL_MODES:
+        recalls, latencies_ms, per_query = [], [], []
+        for case in cases:
+            retrieved: List[Any] = []
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                retrieved = search(case, mode, k)
+                latencies_ms.append((time.perf_counter() - started) * 1000)
+            recall = recall_at_k(retrieved, case['relevant_ids'], k)
+            recalls.append(recall)
+            per_query.append({'query': case['query'], 'recall': recall})
+
+        latencies_ms.sort()
+        report[mode] = {
+            'recall_at_k': statistics.mean(recalls) if recalls else 0.0,
+            'latency_p50_ms': statistics.median(latencies_ms) if latencies_ms else 0.0,
+            'latency_p95_ms': latencies_ms[int(0.95 * (len(latencies_ms) - 1))] if latencies_ms else 0.0,
+            'queries': per_query,
+        }
+    return report
+
+
+class Command(BaseCommand):
+    help = 'Compare recall@k and latency of vector-only and hybrid retrieval over saved queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', required=True, help='JSON file of saved queries')
+        parser.add_argument('--k', type=int, default=5, help='Cut-off for recall@k')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per query and mode')
+        parser.add_argument('--threshold', type=float, default=0.5,
+                            help='Similarity threshold for the vector arm')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        path = Path(options['queries'])
+        if not path.exists():
+            raise CommandError(f"Queries file not found: {path}")
+        cases = json.loads(path.read_text())
+        if not cases:
+            raise CommandError("No saved queries in file")
+
+        embeddings = {}
+        for case in cases:
+            if case['query'] not in embeddings:
+                embeddings[case['query']] = embed_query(case['query'])
+        missing = [q for q, vector in embeddings.items() if not vector]
+        if missing:
+            raise CommandError(f"Could not embed {len(missing)} queries, e.g. {missing[0]!r}")
+
+        threshold = options['threshold']
+        platform = PlatformKnowledgeRetriever()
+
+        def search(case, mode, k):
+            if case.get('platform'):
+                if case.get('document_key'):
+                    chunks = platform.retrieve_for_document(
+                        case['query'], case['document_key'], max_chunks=k,
+                        similarity_threshold=threshold, mode=mode,
+                    )
+                else:
+                    chunks = platform.retrieve(
+                        case['query'], max_chunks=k,
+                        similarity_threshold=threshold, mode=mode,
+                    )
+                return [chunk['chunk_id'] for chunk in chunks]
+
+            chunks = search_similar(
+                query_embedding=embeddings[case['query']],
+                project_id=case['project_id'],
+                top_k=k,
+                similarity_threshold=threshold,
+                query=case['query'],
+                mode=mode,
+            )
+            return [chunk['id'] for chunk in chunks]
+
+        k = options['k']
+        report = run_benchmark(cases, search, k=k, repeat=options['repeat'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{len(cases)} saved queries, k={k}, repeat={options['repeat']}\n")
+        self.stdout.write(f"{'mode':<8} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode, row in report.items():
+            self.stdout.write(
+                f"{mode:<8} {row['recall_at_k']:>9.3f} "
+                f"{row['latency_p50_ms']:>8.1f} {row['latency_p95_ms']:>8.1f}"
+            )
+
+        gained = [
+            hybrid['query'] for vector, hybrid in zip(report['vector']['queries'], report['hybrid']['queries'])
+            if hybrid['recall'] > vector['recall']
+        ]
+        if gained:
+            self.stdout.write(f"\nHybrid improved {len(gained)} queries, e.g. {gained[0]!r}")
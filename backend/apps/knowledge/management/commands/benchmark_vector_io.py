@@ -0,0 +1,136 @@
+"""
+Benchmark text vs binary pgvector I/O.
+
+Always reports the client-side cost of encoding / decoding one embedding in
+both forms. With --db it also times, against a throwaway TEMP table, bulk
+writes (execute_values with '[...]' literals vs COPY binary) and top-k
+searches that bind the query vector three times vs once through a CTE.
+
+Usage:
+    python manage.py benchmark_vector_io
+    python manage.py benchmark_vector_io --db --rows 2000 --queries 50
+"""
+import json
+import random
+import time
+from typing import Callable, Dict
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from psycopg2.extras import execute_values
+
+from apps.knowledge.services.embedding_storage import vector_literal
+from apps.knowledge.services.vector_io import copy_binary, decode_vector, encode_vector
+
+DIMENSIONS = 1536
+
+
+def _per_second(fn: Callable[[], None], count: int) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed else float('inf')
+
+
+def codec_timings(dimensions: int = DIMENSIONS, repeat: int = 200) -> Dict[str, float]:
+    """Microseconds per vector to encode / decode, and bytes on the wire."""
+    vector = [random.uniform(-1, 1) for _ in range(dimensions)]
+    text = vector_literal(vector)
+    binary = encode_vector(vector)
+
+    def micros(fn):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - started) / repeat * 1e6
+
+    return {
+        'text_encode_us': micros(lambda: vector_literal(vector)),
+        'binary_encode_us': micros(lambda: encode_vector(vector)),
+        'text_decode_us': micros(lambda: json.loads(text)),
+        'binary_decode_us': micros(lambda: decode_vector(binary)),
+        'text_bytes': len(text),
+        'binary_bytes': len(binary),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare text and binary pgvector encoding, bulk writes and query binding'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--db', action='store_true',
+                            help='Also time writes and searches against a TEMP table')
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per write run')
+        parser.add_argument('--queries', type=int, default=25, help='Searches per binding style')
+
+    def handle(self, *args, **options):
+        codec = codec_timings()
+        self.stdout.write(f"Per {DIMENSIONS}-dim vector:")
+        self.stdout.write(
+            f"  encode  text {codec['text_encode_us']:8.1f} us   binary {codec['binary_encode_us']:8.1f} us"
+        )
+        self.stdout.write(
+            f"  decode  text {codec['text_decode_us']:8.1f} us   binary {codec['binary_decode_us']:8.1f} us"
+        )
+        self.stdout.write(
+            f"  size    text {codec['text_bytes']:8d} B    binary {codec['binary_bytes']:8d} B"
+        )
+
+        if options['db']:
+            self._database(options['rows'], options['queries'])
+
+    def _database(self, row_count: int, query_count: int):
+        vectors = [[random.uniform(-1, 1) for _ in range(DIMENSIONS)] for _ in range(row_count)]
+        probes = vectors[:max(query_count, 1)]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE vector_io_bench (id BIGINT, embedding vector) ON COMMIT DROP"
+            )
+            raw = cursor.cursor
+
+            def text_insert():
+                execute_values(
+                    raw,
+                    "INSERT INTO vector_io_bench (id, embedding) VALUES %s",
+                    [(i, vector_literal(v)) for i, v in enumerate(vectors)],
+                    template="(%s, %s::vector)",
+                )
+
+            def binary_insert():
+                copy_binary(raw, 'vector_io_bench', ('id', 'embedding'), ('int8', 'vector'),
+                            enumerate(vectors))
+
+            text_rate = _per_second(text_insert, row_count)
+            binary_rate = _per_second(binary_insert, row_count)
+
+            def bound_three_times():
+                for v in probes:
+                    literal = vector_literal(v)
+                    cursor.execute("""
+                        SELECT id, 1 - (embedding <=> %s::vector) FROM vector_io_bench
+                        WHERE 1 - (embedding <=> %s::vector) >= 0
+                        ORDER BY embedding <=> %s::vector LIMIT 5
+                    """, [literal, literal, literal])
+                    cursor.fetchall()
+
+            def bound_once():
+                for v in probes:
+                    cursor.execute("""
+                        WITH q AS NOT MATERIALIZED (SELECT %s::vector AS embedding)
+                        SELECT b.id, 1 - (b.embedding <=> q.embedding) FROM vector_io_bench b
+                        CROSS JOIN q
+                        WHERE 1 - (b.embedding <=> q.embedding) >= 0
+                        ORDER BY b.embedding <=> q.embedding LIMIT 5
+                    """, [vector_literal(v)])
+                    cursor.fetchall()
+
+            three_rate = _per_second(bound_three_times, len(probes))
+            once_rate = _per_second(bound_once, len(probes))
+
+        self.stdout.write(f"\nWrites ({row_count} rows):")
+        self.stdout.write(f"  execute_values text  {text_rate:10.0f} rows/s")
+        self.stdout.write(f"  COPY binary          {binary_rate:10.0f} rows/s")
+        self.stdout.write(f"\nSearches ({len(probes)} queries over {row_count * 2} rows):")
+        self.stdout.write(f"  vector bound 3x      {three_rate:10.1f} queries/s")
+        self.stdout.write(f"  vector bound once    {once_rate:10.1f} queries/s")
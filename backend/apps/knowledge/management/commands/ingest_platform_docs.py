@@ -34,6 +34,7 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 from django.utils import timezone
 
+from apps.knowledge.services.embedding_cache import EmbeddingCacheStats
 from apps.knowledge.services.embedding_service import generate_embedding
 from apps.knowledge.models import (
     PlatformKnowledge,
@@ -141,6 +142,8 @@ class Command(BaseCommand):
             ))
             return
 
+        self.cache_stats = EmbeddingCacheStats()
+
         if options['file']:
             if not options['key']:
                 self.stderr.write(self.style.ERROR(
@@ -160,6 +163,9 @@ class Command(BaseCommand):
                 options
             )
 
+        if not options['skip_embeddings']:
+            self.stdout.write(f"\nEmbedding cache: {self.cache_stats.summary()}")
+
     def _ingest_directory(self, directory: Path, key_prefix: str, options: dict):
         """Ingest all Markdown files in a directory."""
         if not directory.exists():
@@ -486,7 +492,7 @@ class Command(BaseCommand):
                 # Generate embedding
                 embedding = None
                 if not skip_embeddings:
-                    embedding = generate_embedding(chunk_text)
+                    embedding = generate_embedding(chunk_text, stats=self.cache_stats)
                     if not embedding:
                         self.stdout.write(self.style.WARNING(
                             f"    Failed to generate embedding for chunk {chunk_index}"
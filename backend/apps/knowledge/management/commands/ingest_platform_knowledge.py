@@ -21,6 +21,7 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 from django.utils import timezone
 
+from apps.knowledge.services.embedding_cache import EmbeddingCacheStats
 from apps.knowledge.services.embedding_service import generate_embedding
 from apps.knowledge.models import (
     PlatformKnowledge,
@@ -95,6 +96,7 @@ class Command(BaseCommand):
 
         file_path = Path(options['file'])
         config_path = Path(options['config'])
+        self.cache_stats = EmbeddingCacheStats()
 
         if not file_path.exists():
             self.stderr.write(self.style.ERROR(f"File not found: {file_path}"))
@@ -192,6 +194,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(
                 f"\nSuccessfully ingested {doc.chunk_count} chunks from {doc.total_chapters} chapters"
             ))
+            if not options['skip_embeddings']:
+                self.stdout.write(f"  Embedding cache: {self.cache_stats.summary()}")
 
         except Exception as e:
             doc.ingestion_status = 'failed'
@@ -282,7 +286,7 @@ class Command(BaseCommand):
                     # Generate embedding
                     embedding = None
                     if not skip_embeddings:
-                        embedding = generate_embedding(chunk_text)
+                        embedding = generate_embedding(chunk_text, stats=self.cache_stats)
                         if not embedding:
                             self.stdout.write(self.style.WARNING(
                                 f"    Failed to generate embedding for chunk {chunk_index}"
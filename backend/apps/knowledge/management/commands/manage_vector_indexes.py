@@ -0,0 +1,134 @@
+"""
+Build, rebuild and report on the HNSW indexes over knowledge_embeddings.
+
+status   every HNSW index with size, validity and scan count, plus projects
+         that crossed (or fell back under) the per-project index threshold
+build    create the shared document-chunk index if missing, add per-project
+         indexes for large projects and drop ones whose project shrank
+rebuild  REINDEX CONCURRENTLY invalid indexes (or --all / --index NAME)
+
+Every statement runs CONCURRENTLY, so searches keep working meanwhile.
+
+Usage:
+    python manage.py manage_vector_indexes status
+    python manage.py manage_vector_indexes build --min-rows 50000
+    python manage.py manage_vector_indexes build --dry-run
+    python manage.py manage_vector_indexes rebuild --index idx_knowledge_embeddings_hnsw_p17
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.knowledge.services.vector_index import (
+    PROJECT_INDEX_MIN_ROWS,
+    SHARED_INDEX,
+    create_project_index,
+    create_shared_index,
+    drop_indexes,
+    index_health,
+    plan_project_indexes,
+    project_index_name,
+    project_row_counts,
+    rebuild_index,
+)
+
+
+def _mb(size_bytes: int) -> str:
+    return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = 'Build, rebuild and report on knowledge_embeddings HNSW indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['status', 'build', 'rebuild'])
+        parser.add_argument('--min-rows', type=int, default=PROJECT_INDEX_MIN_ROWS,
+                            help=f'Chunks for a project to get its own index (default: {PROJECT_INDEX_MIN_ROWS})')
+        parser.add_argument('--dry-run', action='store_true', help='Print the build plan only')
+        parser.add_argument('--index', help='rebuild: only this index')
+        parser.add_argument('--all', action='store_true', help='rebuild: every HNSW index, valid or not')
+
+    def handle(self, *args, **options):
+        action = options['action']
+        if action == 'status':
+            self._status(options['min_rows'])
+        elif action == 'build':
+            self._build(options['min_rows'], options['dry_run'])
+        else:
+            self._rebuild(options['index'], options['all'])
+
+    def _status(self, min_rows):
+        indexes = index_health()
+        if not indexes:
+            self.stdout.write(self.style.WARNING("No HNSW indexes on knowledge_embeddings"))
+        for index in indexes:
+            state = self.style.SUCCESS('valid') if index['valid'] else self.style.ERROR('INVALID')
+            self.stdout.write(
+                f"{index['name']:<45} {_mb(index['size_bytes']):>10} {state:>8} "
+                f"scans={index['scans']:<8} {index['predicate'] or ''}"
+            )
+
+        counts = project_row_counts()
+        total = sum(rows for _, rows in counts)
+        shared = dict(counts).get(None, 0)
+        self.stdout.write(
+            f"\n{total} document chunks across {len(counts)} scopes "
+            f"({shared} without a project)"
+        )
+        to_create, to_drop = plan_project_indexes(counts, [i['name'] for i in indexes], min_rows)
+        if to_create:
+            self.stdout.write(f"Projects needing an index (>= {min_rows} chunks): {to_create}")
+        if to_drop:
+            self.stdout.write(f"Project indexes below {min_rows // 2} chunks: {to_drop}")
+        if not any(i['name'] == SHARED_INDEX for i in indexes):
+            self.stdout.write(self.style.WARNING(f"Shared index {SHARED_INDEX} is missing"))
+
+    def _build(self, min_rows, dry_run):
+        existing = [index['name'] for index in index_health()]
+        to_create, to_drop = plan_project_indexes(project_row_counts(), existing, min_rows)
+        needs_shared = SHARED_INDEX not in existing
+
+        if dry_run:
+            if needs_shared:
+                self.stdout.write(f"create {SHARED_INDEX}")
+            for project_id in to_create:
+                self.stdout.write(f"create {project_index_name(project_id)}")
+            for name in to_drop:
+                self.stdout.write(f"drop   {name}")
+            if not (needs_shared or to_create or to_drop):
+                self.stdout.write("Nothing to do")
+            return
+
+        if needs_shared:
+            self._timed(f"Built {SHARED_INDEX}", create_shared_index)
+        for project_id in to_create:
+            self._timed(f"Built {project_index_name(project_id)}", create_project_index, project_id)
+        if to_drop:
+            drop_indexes(to_drop)
+            self.stdout.write(f"Dropped {len(to_drop)} project indexes: {', '.join(to_drop)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {int(needs_shared) + len(to_create)} built, {len(to_drop)} dropped"
+        ))
+
+    def _rebuild(self, name, rebuild_all):
+        indexes = index_health()
+        names = [i['name'] for i in indexes]
+        if name:
+            if name not in names:
+                raise CommandError(f"No HNSW index named {name}")
+            targets = [name]
+        elif rebuild_all:
+            targets = names
+        else:
+            targets = [i['name'] for i in indexes if not i['valid']]
+
+        if not targets:
+            self.stdout.write("No invalid indexes; use --all or --index to force a rebuild")
+            return
+        for target in targets:
+            self._timed(f"Rebuilt {target}", rebuild_index, target)
+
+    def _timed(self, label, fn, *args):
+        started = time.monotonic()
+        fn(*args)
+        self.stdout.write(f"{label} in {time.monotonic() - started:.1f}s")
@@ -20,6 +20,8 @@ For production, set up as a cron job or run with supervisor/systemd:
 
     # Systemd service for continuous mode:
     ExecStart=/path/to/venv/bin/python manage.py process_documents --continuous
+
+For several parallel workers with leases, use run_document_workers.
 """
 import time
 import signal
@@ -94,6 +96,13 @@ class Command(BaseCommand):
         self.stdout.write(f"  Processing: {stats['processing']}")
         self.stdout.write(f"  Completed:  {stats['completed']}")
         self.stdout.write(f"  Failed:     {stats['failed']}")
+        self.stdout.write(f"  Expired leases: {stats['expired_leases']}")
+        self.stdout.write(
+            f"  Throughput: {stats['throughput_per_minute']}/min "
+            f"(last {stats['window_minutes']} min)"
+        )
+        for stage, ms in sorted(stats['stage_p95_ms'].items()):
+            self.stdout.write(f"  p95 {stage:<8} {ms} ms")
         self.stdout.write("=" * 40)
 
         total_pending = stats['queued'] + stats['processing']
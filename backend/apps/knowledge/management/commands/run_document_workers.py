@@ -0,0 +1,145 @@
+"""
+Run N document-processing worker processes against doc_processing_queue.
+
+Each worker claims one document at a time under a lease, heartbeats while it
+extracts / chunks / embeds, and records the outcome only if it still holds
+the lease. Leases of crashed workers expire and the rows go back to the queue
+(or fail once max_attempts is reached), so nothing is left in 'processing'.
+
+Usage:
+    python manage.py run_document_workers --workers 4
+    python manage.py run_document_workers --workers 2 --lease-seconds 600 --interval 3
+
+Systemd:
+    ExecStart=/path/to/venv/bin/python manage.py run_document_workers --workers 4
+    KillSignal=SIGTERM   # workers finish their current document, then exit
+"""
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from apps.knowledge.services.document_processor import (
+    DEFAULT_LEASE_SECONDS,
+    claim_next_document,
+    default_worker_id,
+    get_queue_stats,
+    process_claimed,
+    reclaim_expired_leases,
+)
+
+
+def worker_loop(lease_seconds: int, interval: float, max_documents: int = 0) -> None:
+    """Claim and process documents until SIGTERM/SIGINT (or max_documents)."""
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+    worker_id = default_worker_id()
+    processed = 0
+    while not stopping and (not max_documents or processed < max_documents):
+        close_old_connections()
+        try:
+            reclaim_expired_leases(lease_seconds)
+            item = claim_next_document(worker_id, lease_seconds)
+        except Exception:
+            # Database blip: back off and retry rather than kill the worker
+            connections.close_all()
+            time.sleep(interval)
+            continue
+
+        if item is None:
+            time.sleep(interval)
+            continue
+
+        process_claimed(item, worker_id, lease_seconds)
+        processed += 1
+
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run parallel document-processing workers with leased queue claims'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.should_stop = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                            help='Worker processes (default: CPU count)')
+        parser.add_argument('--lease-seconds', type=int, default=DEFAULT_LEASE_SECONDS,
+                            help=f'Lease length, renewed every third of it (default: {DEFAULT_LEASE_SECONDS})')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds a worker sleeps when the queue is empty (default: 5)')
+        parser.add_argument('--stats-every', type=int, default=60,
+                            help='Seconds between queue stat lines, 0 to disable (default: 60)')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        lease_seconds = options['lease_seconds']
+        interval = options['interval']
+        stats_every = options['stats_every']
+
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+
+        self.stdout.write(self.style.HTTP_INFO(
+            f"Starting {workers} document workers (lease {lease_seconds}s, poll {interval}s)"
+        ))
+
+        context = multiprocessing.get_context('fork')
+        processes = {}
+
+        def spawn(slot):
+            process = context.Process(
+                target=worker_loop, args=(lease_seconds, interval),
+                name=f'doc-worker-{slot}', daemon=False,
+            )
+            # Children must not share the parent's database sockets, and
+            # _write_stats reopens one between restarts
+            connections.close_all()
+            process.start()
+            processes[slot] = process
+
+        for slot in range(workers):
+            spawn(slot)
+
+        last_stats = time.monotonic()
+        while not self.should_stop:
+            time.sleep(1)
+            for slot, process in list(processes.items()):
+                if not process.is_alive() and not self.should_stop:
+                    self.stderr.write(self.style.WARNING(
+                        f"{process.name} exited ({process.exitcode}); restarting"
+                    ))
+                    spawn(slot)
+            if stats_every and time.monotonic() - last_stats >= stats_every:
+                last_stats = time.monotonic()
+                self._write_stats()
+
+        self.stdout.write("Stopping workers after their current documents...")
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()  # SIGTERM: finish current document, then exit
+        for process in processes.values():
+            process.join()
+        self.stdout.write(self.style.SUCCESS("All workers stopped"))
+
+    def _handle_signal(self, signum, frame):
+        self.should_stop = True
+
+    def _write_stats(self):
+        try:
+            stats = get_queue_stats()
+        except Exception as e:
+            self.stderr.write(self.style.WARNING(f"Queue stats unavailable: {e}"))
+            return
+        stages = ', '.join(f"{k} {v}ms" for k, v in sorted(stats['stage_p95_ms'].items())) or 'n/a'
+        self.stdout.write(
+            f"[{time.strftime('%H:%M:%S')}] depth={stats['depth']} "
+            f"processing={stats['processing']} expired={stats['expired_leases']} "
+            f"throughput={stats['throughput_per_minute']}/min p95: {stages}"
+        )
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Add core_doc.processing_timings: per-stage wall time (ms) of the last
+    DocumentProcessor run, e.g. {"extract": 812, "chunk": 40, "embed": 2310,
+    "write": 95}. Raw SQL because core_doc is not managed by this app.
+    """
+
+    dependencies = [
+        ("knowledge", "0008_source_registry"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE landscape.core_doc
+                ADD COLUMN IF NOT EXISTS processing_timings JSONB;
+
+            COMMENT ON COLUMN landscape.core_doc.processing_timings IS
+                'Per-stage milliseconds of the last processing run (extract, chunk, embed, write).';
+            """,
+            reverse_sql="""
+            ALTER TABLE landscape.core_doc DROP COLUMN IF EXISTS processing_timings;
+            """,
+        ),
+    ]
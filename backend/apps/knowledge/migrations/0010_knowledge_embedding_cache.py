@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Add landscape.knowledge_embedding_cache: embedding vectors keyed by
+    (model, sha256 of normalized content) so re-processed documents only send
+    changed chunks to the embeddings API. Raw SQL because of the pgvector column.
+    """
+
+    dependencies = [
+        ("knowledge", "0009_doc_processing_timings"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS landscape.knowledge_embedding_cache (
+                model VARCHAR(100) NOT NULL,
+                content_hash CHAR(64) NOT NULL,
+                embedding vector(1536) NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (model, content_hash)
+            );
+
+            COMMENT ON TABLE landscape.knowledge_embedding_cache IS
+                'Embedding vectors by (model, sha256 of whitespace-normalized, truncated input text).';
+            """,
+            reverse_sql="""
+            DROP TABLE IF EXISTS landscape.knowledge_embedding_cache;
+            """,
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text GIN indexes for hybrid (lexical + vector) retrieval.
+
+    Expression indexes rather than stored tsvector columns: no table rewrite,
+    and hybrid_search queries use the identical to_tsvector('english', ...)
+    expression so the planner can match them.
+    """
+
+    dependencies = [
+        ("knowledge", "0010_knowledge_embedding_cache"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE INDEX IF NOT EXISTS idx_knowledge_embeddings_content_fts
+                ON landscape.knowledge_embeddings
+                USING GIN (to_tsvector('english', content_text));
+
+            CREATE INDEX IF NOT EXISTS idx_platform_knowledge_chunks_content_fts
+                ON landscape.tbl_platform_knowledge_chunks
+                USING GIN (to_tsvector('english', content));
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS landscape.idx_knowledge_embeddings_content_fts;
+            DROP INDEX IF EXISTS landscape.idx_platform_knowledge_chunks_content_fts;
+            """,
+        ),
+    ]
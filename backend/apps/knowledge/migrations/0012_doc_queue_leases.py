@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Lease columns on doc_processing_queue for multi-worker processing.
+
+    A worker claims a row by setting lease_owner / lease_expires_at in the
+    same statement that selects it, extends the lease while it works
+    (heartbeat_at), and a row whose lease expired is put back in the queue
+    (or failed once attempts run out) instead of sitting in 'processing'.
+    """
+
+    dependencies = [
+        ("knowledge", "0011_knowledge_fulltext_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE landscape.doc_processing_queue
+                ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(100),
+                ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ,
+                ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+
+            CREATE INDEX IF NOT EXISTS doc_processing_queue_lease_idx
+                ON landscape.doc_processing_queue (lease_expires_at)
+                WHERE status = 'processing';
+
+            CREATE INDEX IF NOT EXISTS doc_processing_queue_completed_idx
+                ON landscape.doc_processing_queue (completed_at)
+                WHERE status = 'completed';
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS landscape.doc_processing_queue_completed_idx;
+            DROP INDEX IF EXISTS landscape.doc_processing_queue_lease_idx;
+            ALTER TABLE landscape.doc_processing_queue
+                DROP COLUMN IF EXISTS heartbeat_at,
+                DROP COLUMN IF EXISTS lease_expires_at,
+                DROP COLUMN IF EXISTS lease_owner;
+            """,
+        ),
+    ]
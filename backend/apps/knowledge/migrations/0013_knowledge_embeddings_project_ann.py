@@ -0,0 +1,105 @@
+"""
+Migration 0013: denormalized project_id and partial HNSW indexes on
+knowledge_embeddings.
+
+search_similar used to join core_doc and filter d.project_id after computing
+distance for every document chunk. project_id now lives on the embedding row
+(backfilled here, kept current by triggers on both tables), and document
+chunks get a partial HNSW index. Projects large enough for their own partial
+index get one from manage_vector_indexes, not from this migration.
+
+Non-atomic so the indexes can be built CONCURRENTLY on a live table.
+"""
+
+from django.db import migrations
+
+
+FORWARD_SQL = """
+ALTER TABLE landscape.knowledge_embeddings
+    ADD COLUMN IF NOT EXISTS project_id BIGINT;
+
+UPDATE landscape.knowledge_embeddings ke
+SET project_id = d.project_id
+FROM landscape.core_doc d
+WHERE ke.source_type = 'document_chunk'
+  AND ke.source_id = d.doc_id
+  AND ke.project_id IS DISTINCT FROM d.project_id;
+
+CREATE OR REPLACE FUNCTION landscape.knowledge_embeddings_fill_project_id()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.project_id IS NULL AND NEW.source_type = 'document_chunk' THEN
+        SELECT project_id INTO NEW.project_id
+        FROM landscape.core_doc
+        WHERE doc_id = NEW.source_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_knowledge_embeddings_project_id ON landscape.knowledge_embeddings;
+CREATE TRIGGER trg_knowledge_embeddings_project_id
+    BEFORE INSERT ON landscape.knowledge_embeddings
+    FOR EACH ROW
+    EXECUTE FUNCTION landscape.knowledge_embeddings_fill_project_id();
+
+CREATE OR REPLACE FUNCTION landscape.core_doc_sync_embedding_project()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE landscape.knowledge_embeddings
+    SET project_id = NEW.project_id
+    WHERE source_type = 'document_chunk'
+      AND source_id = NEW.doc_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_core_doc_embedding_project ON landscape.core_doc;
+CREATE TRIGGER trg_core_doc_embedding_project
+    AFTER UPDATE OF project_id ON landscape.core_doc
+    FOR EACH ROW
+    WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id)
+    EXECUTE FUNCTION landscape.core_doc_sync_embedding_project();
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER IF EXISTS trg_core_doc_embedding_project ON landscape.core_doc;
+DROP FUNCTION IF EXISTS landscape.core_doc_sync_embedding_project();
+DROP TRIGGER IF EXISTS trg_knowledge_embeddings_project_id ON landscape.knowledge_embeddings;
+DROP FUNCTION IF EXISTS landscape.knowledge_embeddings_fill_project_id();
+ALTER TABLE landscape.knowledge_embeddings DROP COLUMN IF EXISTS project_id;
+"""
+
+PROJECT_INDEX_SQL = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_knowledge_embeddings_doc_project
+    ON landscape.knowledge_embeddings (project_id)
+    WHERE source_type = 'document_chunk'
+"""
+
+HNSW_INDEX_SQL = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_knowledge_embeddings_doc_hnsw
+    ON landscape.knowledge_embeddings
+    USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE source_type = 'document_chunk'
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('knowledge', '0012_doc_queue_leases'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=FORWARD_SQL, reverse_sql=REVERSE_SQL),
+        migrations.RunSQL(
+            sql=PROJECT_INDEX_SQL,
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS landscape.idx_knowledge_embeddings_doc_project",
+        ),
+        migrations.RunSQL(
+            sql=HNSW_INDEX_SQL,
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS landscape.idx_knowledge_embeddings_doc_hnsw",
+        ),
+    ]
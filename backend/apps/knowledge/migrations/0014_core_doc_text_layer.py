@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Persisted text layer on landscape.core_doc_text: the character offset
+    where each page starts, and the core_doc.sha256_hash the text was
+    extracted from. Once the document's file changes the row no longer
+    matches and is re-extracted. Rows written without pages keep
+    page_offsets NULL.
+
+    extracted_text is left as plain TEXT (the full-text index and
+    mv_doc_search read it) and compressed by TOAST, with lz4 where the
+    server supports it.
+    """
+
+    dependencies = [
+        ("knowledge", "0013_knowledge_embeddings_project_ann"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE landscape.core_doc_text
+                ADD COLUMN IF NOT EXISTS page_offsets INTEGER[],
+                ADD COLUMN IF NOT EXISTS source_hash VARCHAR(64);
+
+            DO $$
+            BEGIN
+                EXECUTE 'ALTER TABLE landscape.core_doc_text
+                         ALTER COLUMN extracted_text SET COMPRESSION lz4';
+            EXCEPTION WHEN OTHERS THEN
+                -- Before PostgreSQL 14, or built without lz4: keep pglz
+                RAISE NOTICE 'core_doc_text.extracted_text stays on default compression: %', SQLERRM;
+            END
+            $$;
+            """,
+            reverse_sql="""
+            ALTER TABLE landscape.core_doc_text
+                DROP COLUMN IF EXISTS source_hash,
+                DROP COLUMN IF EXISTS page_offsets;
+            """,
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    LLM response cache: one row per request hash (provider, model, prompts,
+    tools, temperature) holding the response text and the tokens it cost.
+
+    Rows older than LLM_CACHE_TTL_DAYS are ignored by lookups and replaced on
+    the next write; the created_at index lets them be purged in bulk.
+    """
+
+    dependencies = [
+        ("knowledge", "0014_core_doc_text_layer"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE TABLE IF NOT EXISTS landscape.knowledge_llm_cache (
+                cache_key VARCHAR(64) PRIMARY KEY,
+                provider VARCHAR(50) NOT NULL,
+                model VARCHAR(100),
+                response JSONB NOT NULL,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_knowledge_llm_cache_created_at
+                ON landscape.knowledge_llm_cache (created_at);
+            """,
+            reverse_sql="DROP TABLE IF EXISTS landscape.knowledge_llm_cache;",
+        ),
+    ]
@@ -34,6 +34,7 @@ from django.db import transaction
 from ..models import KnowledgeFact
 from .entity_sync_service import EntitySyncService
 from .fact_service import FactService
+from .llm_cache import cached_messages_create, loads_fenced_json, parses_as_json_object
 
 logger = logging.getLogger(__name__)
 
@@ -185,9 +186,11 @@ def _call_haiku_extraction(response_text: str) -> Optional[Dict]:
         # Truncate very long responses to keep Haiku fast
         truncated = response_text[:8000] if len(response_text) > 8000 else response_text
 
-        response = client.messages.create(
+        response = cached_messages_create(
+            client,
             model=HAIKU_MODEL,
             max_tokens=2048,
+            validate=parses_as_json_object,
             system=EXTRACTION_SYSTEM_PROMPT,
             messages=[{
                 "role": "user",
@@ -205,13 +208,7 @@ def _call_haiku_extraction(response_text: str) -> Optional[Dict]:
             logger.warning("[FactExtractor] Haiku returned empty response")
             return None
 
-        # Parse JSON — handle markdown code fences if present
-        cleaned = text.strip()
-        if cleaned.startswith('```'):
-            cleaned = re.sub(r'^```(?:json)?\s*', '', cleaned)
-            cleaned = re.sub(r'\s*```$', '', cleaned)
-
-        parsed = json.loads(cleaned)
+        parsed = loads_fenced_json(text)
         logger.info(f"[FactExtractor] Haiku extracted {len(parsed.get('properties', []))} properties")
         return parsed
 
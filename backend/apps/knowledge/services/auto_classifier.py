@@ -19,6 +19,8 @@ from typing import Dict, Any, List, Optional, Tuple
 
 from django.db import connection
 
+from .text_layer import save_text_layer
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
@@ -526,17 +528,10 @@ def auto_classify_document(
 
     # Step 1b: Store extracted text in core_doc_text
     try:
-        word_count = len(text.split())
         with connection.cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO landscape.core_doc_text (doc_id, extracted_text, word_count, extraction_method, extracted_at, updated_at)
-                VALUES (%s, %s, %s, 'auto_upload', NOW(), NOW())
-                ON CONFLICT (doc_id) DO UPDATE SET
-                    extracted_text = EXCLUDED.extracted_text,
-                    word_count = EXCLUDED.word_count,
-                    extraction_method = 'auto_upload',
-                    updated_at = NOW()
-            """, [doc_id, text, word_count])
+            # No page offsets from a byte-level extract; the text layer
+            # fills them in the first time pages are asked for
+            save_text_layer(cursor, doc_id, text, None, 'auto_upload')
     except Exception as e:
         logger.warning("Failed to store extracted text for doc %s: %s", doc_id, e)
 
@@ -0,0 +1,340 @@
+"""
+Content-addressed local cache of uploaded document files.
+
+One upload used to be downloaded once per extractor (text extraction, media
+scan and classification, column discovery, the Excel audit loader, the
+extraction worker). Every one of them now goes through checkout_document(),
+which fetches the file once per storage_uri and hands each caller its own
+path to it. doc_id is optional and only labels the hit / miss counts, so
+callers that know the URI but not the document share the same entry.
+
+Layout under DOC_BLOB_CACHE_DIR:
+
+    blobs/<sha256>      file contents, named by content hash
+    refs/<key>          sha256 of the blob for key = hash(storage_uri)
+    locks/<key>.lock    flock held while that key is being fetched
+
+A checkout is a hard link to the blob (a copy across filesystems), so the
+caller keeps deleting its path exactly as it deleted its temp file before,
+and eviction can never pull a file out from under a reader. Blobs and refs
+are written to a temp name and os.replace()d, so other processes never see
+partial files. When the blobs exceed DOC_BLOB_CACHE_MAX_MB the least recently
+used (oldest mtime; hits touch it) are evicted, along with refs to blobs
+that are gone and lock files nobody holds.
+
+If the caller knows the content hash (core_doc.sha256_hash), a blob with that
+hash is reused under any key, and a ref pointing at different content is
+treated as stale.
+"""
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BLOB_CACHE_ENABLED = os.getenv('DOC_BLOB_CACHE_ENABLED', 'true').lower() == 'true'
+BLOB_CACHE_DIR = os.getenv(
+    'DOC_BLOB_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'landscape-blob-cache')
+)
+BLOB_CACHE_MAX_BYTES = int(os.getenv('DOC_BLOB_CACHE_MAX_MB', '2048')) * 1024 * 1024
+DOWNLOAD_TIMEOUT = 120
+COPY_BUFFER = 1024 * 1024
+
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+_counts: Dict[Optional[int], Dict[str, int]] = {}
+_counts_lock = threading.Lock()
+
+
+def blob_cache_stats(doc_id: Optional[int] = None) -> Dict[str, int]:
+    """Hits / misses in this process, for one document or all of them."""
+    with _counts_lock:
+        if doc_id is not None:
+            return dict(_counts.get(doc_id, {'hits': 0, 'misses': 0}))
+        return {
+            'hits': sum(c['hits'] for c in _counts.values()),
+            'misses': sum(c['misses'] for c in _counts.values()),
+        }
+
+
+def reset_blob_cache_stats() -> None:
+    with _counts_lock:
+        _counts.clear()
+
+
+def _record(doc_id: Optional[int], storage_uri: str, outcome: str) -> None:
+    with _counts_lock:
+        counts = _counts.setdefault(doc_id, {'hits': 0, 'misses': 0})
+        counts['hits' if outcome == 'hit' else 'misses'] += 1
+        hits, misses = counts['hits'], counts['misses']
+    logger.info(
+        "blob_cache %s doc_id=%s uri=%s (doc hits=%d misses=%d)",
+        outcome, doc_id, storage_uri, hits, misses,
+    )
+
+
+def _cache_key(storage_uri: str) -> str:
+    return hashlib.sha256(storage_uri.encode('utf-8')).hexdigest()
+
+
+def _paths(cache_dir: str) -> Dict[str, str]:
+    paths = {name: os.path.join(cache_dir, name) for name in ('blobs', 'refs', 'locks')}
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+    return paths
+
+
+@contextmanager
+def _locked(path: str) -> Iterator[None]:
+    while True:
+        handle = open(path, 'a')
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            if os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        # Pruned while we waited for it; lock the file now at that path
+        handle.close()
+    try:
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'wb') as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+
+
+def _open_source(storage_uri: str):
+    """Readable binary stream for an http(s) URL, a storage key or a local path."""
+    if storage_uri.startswith(('http://', 'https://')):
+        response = requests.get(storage_uri, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return response.raw
+
+    from django.core.files.storage import default_storage
+    try:
+        return default_storage.open(storage_uri, 'rb')
+    except FileNotFoundError:
+        if os.path.exists(storage_uri):
+            return open(storage_uri, 'rb')
+        raise
+
+
+def _download(storage_uri: str, blobs_dir: str) -> str:
+    """Stream storage_uri into blobs_dir; returns its sha256."""
+    digest = hashlib.sha256()
+    tmp = os.path.join(blobs_dir, f".download-{uuid.uuid4().hex}")
+    try:
+        source = _open_source(storage_uri)
+        try:
+            with open(tmp, 'wb') as out:
+                while True:
+                    block = source.read(COPY_BUFFER)
+                    if not block:
+                        break
+                    digest.update(block)
+                    out.write(block)
+        finally:
+            source.close()
+
+        content_hash = digest.hexdigest()
+        os.replace(tmp, os.path.join(blobs_dir, content_hash))
+        return content_hash
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _checkout_path(blob_path: str, suffix: str) -> str:
+    """Caller-owned path to blob_path: a hard link, or a copy across devices."""
+    path = os.path.join(tempfile.gettempdir(), f"blob-{uuid.uuid4().hex}{suffix}")
+    try:
+        os.link(blob_path, path)
+    except OSError:
+        shutil.copyfile(blob_path, path)
+    return path
+
+
+def _lookup(paths: Dict[str, str], key: str, content_hash: Optional[str]) -> Optional[str]:
+    """Blob path for key (or for content_hash) if it is cached."""
+    if content_hash:
+        blob = os.path.join(paths['blobs'], content_hash)
+        if os.path.exists(blob):
+            return blob
+
+    try:
+        with open(os.path.join(paths['refs'], key)) as handle:
+            cached_hash = handle.read().strip()
+    except FileNotFoundError:
+        return None
+    if content_hash and cached_hash != content_hash:
+        return None  # The URI now serves different content
+
+    blob = os.path.join(paths['blobs'], cached_hash)
+    return blob if os.path.exists(blob) else None
+
+
+def _prune(paths: Dict[str, str]) -> None:
+    """Drop refs whose blob was evicted and lock files no one is holding."""
+    for entry in os.scandir(paths['refs']):
+        if entry.name.endswith('.tmp'):
+            continue
+        try:
+            with open(entry.path) as handle:
+                cached_hash = handle.read().strip()
+            if not os.path.exists(os.path.join(paths['blobs'], cached_hash)):
+                os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+
+    if fcntl is None:
+        return  # Without flock there is no telling whether a lock is in use
+    for entry in os.scandir(paths['locks']):
+        if entry.name == 'evict.lock':
+            continue
+        try:
+            with open(entry.path, 'a') as handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                # Unlinked while held, so a waiter re-checks and relocks (see _locked)
+                os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def evict(cache_dir: str = None, max_bytes: int = None) -> int:
+    """
+    Delete least recently used blobs until under max_bytes, then prune refs
+    and lock files left behind; returns the number of blobs deleted.
+    """
+    cache_dir = cache_dir or BLOB_CACHE_DIR
+    max_bytes = BLOB_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    paths = _paths(cache_dir)
+
+    with _locked(os.path.join(paths['locks'], 'evict.lock')):
+        entries = []
+        for entry in os.scandir(paths['blobs']):
+            if entry.is_file() and not entry.name.startswith('.'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        _prune(paths)
+    return evicted
+
+
+def checkout_document(
+    storage_uri: str,
+    doc_id: Optional[int] = None,
+    content_hash: Optional[str] = None,
+    suffix: str = '',
+    cache_dir: str = None,
+) -> str:
+    """
+    Local path to the document's bytes, fetched at most once per cache.
+
+    Entries are keyed by storage_uri (or content_hash when given); doc_id
+    only attributes the hit or miss in blob_cache_stats.
+
+    The returned path belongs to the caller, who deletes it when done (it is
+    a link, so the cached blob survives). Raises whatever the download
+    raises (requests.RequestException, FileNotFoundError, ...).
+    """
+    content_hash = content_hash.lower() if content_hash and _SHA256_RE.match(content_hash.lower()) else None
+
+    if not BLOB_CACHE_ENABLED:
+        _record(doc_id, storage_uri, 'miss')
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            return _checkout_path(os.path.join(tmp_dir, _download(storage_uri, tmp_dir)), suffix)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    paths = _paths(cache_dir or BLOB_CACHE_DIR)
+    key = _cache_key(storage_uri)
+
+    blob = _lookup(paths, key, content_hash)
+    if blob is None:
+        # One process fetches a key at a time; the others wait and then hit
+        with _locked(os.path.join(paths['locks'], f"{key}.lock")):
+            blob = _lookup(paths, key, content_hash)
+            if blob is None:
+                fetched_hash = _download(storage_uri, paths['blobs'])
+                if content_hash and fetched_hash != content_hash:
+                    logger.warning(
+                        "blob_cache hash mismatch doc_id=%s uri=%s expected=%s got=%s",
+                        doc_id, storage_uri, content_hash, fetched_hash,
+                    )
+                _write_atomic(os.path.join(paths['refs'], key), fetched_hash.encode('ascii'))
+                _record(doc_id, storage_uri, 'miss')
+                path = _checkout_path(os.path.join(paths['blobs'], fetched_hash), suffix)
+                evict(cache_dir)
+                return path
+
+    _record(doc_id, storage_uri, 'hit')
+    try:
+        os.utime(blob)
+    except FileNotFoundError:
+        pass
+    try:
+        return _checkout_path(blob, suffix)
+    except FileNotFoundError:
+        # Evicted between lookup and link; fetch again
+        try:
+            os.unlink(os.path.join(paths['refs'], key))
+        except FileNotFoundError:
+            pass
+        return checkout_document(storage_uri, doc_id, content_hash, suffix, cache_dir)
+
+
+@contextmanager
+def local_document(
+    storage_uri: str,
+    doc_id: Optional[int] = None,
+    content_hash: Optional[str] = None,
+    suffix: str = '',
+    cache_dir: str = None,
+) -> Iterator[str]:
+    """checkout_document() as a context manager that removes the path on exit."""
+    path = checkout_document(storage_uri, doc_id, content_hash, suffix, cache_dir)
+    try:
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
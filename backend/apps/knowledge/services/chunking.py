@@ -48,58 +48,144 @@ def chunk_text(
         }]
 
     # Split into sentences
-    sentences = _split_sentences(text)
+    packer = _SentencePacker(chunk_size, chunk_overlap, metadata)
+    for sentence in _split_sentences(text):
+        packer.add(sentence)
+    chunks = packer.close(len(text))
+
+    # Add total count to all chunks
+    total = len(chunks)
+    for chunk in chunks:
+        chunk['total_chunks'] = total
+
+    return chunks
 
-    chunks = []
-    current_chunk = []
-    current_length = 0
-    char_position = 0
-    chunk_start = 0
 
-    for sentence in sentences:
+class _SentencePacker:
+    """
+    Greedy sentence-to-chunk packing shared by chunk_text and
+    StreamingChunker: sentences are added in order, and a chunk is emitted
+    whenever the next sentence would push it past chunk_size.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, metadata: Dict[str, Any] = None):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.metadata = metadata or {}
+        self.chunks: List[Dict[str, Any]] = []
+        self.current_chunk: List[str] = []
+        self.current_length = 0
+        self.char_position = 0
+        self.chunk_start = 0
+
+    def add(self, sentence: str) -> None:
         sentence_length = len(sentence)
 
         # If adding this sentence exceeds chunk size and we have content
-        if current_length + sentence_length > chunk_size and current_chunk:
+        if self.current_length + sentence_length > self.chunk_size and self.current_chunk:
             # Save current chunk
-            chunk_text_content = ' '.join(current_chunk)
-            chunks.append({
-                'content': chunk_text_content,
-                'chunk_index': len(chunks),
-                'char_start': chunk_start,
-                'char_end': char_position,
-                **(metadata or {})
+            self.chunks.append({
+                'content': ' '.join(self.current_chunk),
+                'chunk_index': len(self.chunks),
+                'char_start': self.chunk_start,
+                'char_end': self.char_position,
+                **self.metadata
             })
 
             # Start new chunk with overlap
-            overlap_sentences = _get_overlap_sentences(current_chunk, chunk_overlap)
-            current_chunk = overlap_sentences + [sentence]
-            current_length = sum(len(s) for s in current_chunk)
-            chunk_start = char_position - sum(len(s) for s in overlap_sentences)
+            overlap_sentences = _get_overlap_sentences(self.current_chunk, self.chunk_overlap)
+            self.current_chunk = overlap_sentences + [sentence]
+            self.current_length = sum(len(s) for s in self.current_chunk)
+            self.chunk_start = self.char_position - sum(len(s) for s in overlap_sentences)
         else:
-            current_chunk.append(sentence)
-            current_length += sentence_length
-
-        char_position += sentence_length + 1  # +1 for space
-
-    # Don't forget the last chunk
-    if current_chunk:
-        chunk_text_content = ' '.join(current_chunk)
-        if len(chunk_text_content) >= MIN_CHUNK_SIZE:
-            chunks.append({
-                'content': chunk_text_content,
-                'chunk_index': len(chunks),
-                'char_start': chunk_start,
+            self.current_chunk.append(sentence)
+            self.current_length += sentence_length
+
+        self.char_position += sentence_length + 1  # +1 for space
+
+    def close(self, text_length: int) -> List[Dict[str, Any]]:
+        """Emit the last chunk (unless it is tiny) and return all chunks."""
+        if self.current_chunk:
+            chunk_text_content = ' '.join(self.current_chunk)
+            if len(chunk_text_content) >= MIN_CHUNK_SIZE:
+                self.chunks.append({
+                    'content': chunk_text_content,
+                    'chunk_index': len(self.chunks),
+                    'char_start': self.chunk_start,
+                    'char_end': text_length,
+                    **self.metadata
+                })
+            self.current_chunk = []
+        return self.chunks
+
+
+class StreamingChunker:
+    """
+    chunk_text over text that arrives in pieces, e.g. PDF pages as they are
+    extracted, so chunks can be embedded before the whole document is read.
+
+    feed() returns the chunks completed by that piece. Only the last
+    sentence of what has been fed is held back, since the next piece may
+    continue it. Pieces are cleaned one at a time and joined with a space,
+    so boundaries can differ slightly from chunk_text on the joined text.
+    finish() returns every chunk with total_chunks set.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        metadata: Dict[str, Any] = None
+    ):
+        self._packer = _SentencePacker(chunk_size, chunk_overlap, metadata)
+        self._chunk_size = chunk_size
+        self._pending = ''
+        self._length = 0
+        self._emitted = 0
+        # Whole cleaned text, kept only while it could still be a single chunk
+        self._head: List[str] = []
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        cleaned = _clean_text(text) if text and text.strip() else ''
+        if not cleaned:
+            return []
+
+        self._length += len(cleaned) + (1 if self._length else 0)
+        if self._length <= self._chunk_size:
+            self._head.append(cleaned)
+
+        self._pending = f"{self._pending} {cleaned}" if self._pending else cleaned
+        sentences = _split_sentences(self._pending)
+        self._pending = sentences.pop() if sentences else ''
+        for sentence in sentences:
+            self._packer.add(sentence)
+        return self._take()
+
+    def finish(self) -> List[Dict[str, Any]]:
+        if self._length and self._length <= self._chunk_size:
+            # Document fits in one chunk
+            text = ' '.join(self._head)
+            chunks = [{
+                'content': text,
+                'chunk_index': 0,
+                'char_start': 0,
                 'char_end': len(text),
-                **(metadata or {})
-            })
+                **self._packer.metadata
+            }]
+        else:
+            if self._pending:
+                self._packer.add(self._pending)
+                self._pending = ''
+            chunks = self._packer.close(self._length)
 
-    # Add total count to all chunks
-    total = len(chunks)
-    for chunk in chunks:
-        chunk['total_chunks'] = total
+        for chunk in chunks:
+            chunk['total_chunks'] = len(chunks)
+        return chunks
 
-    return chunks
+    def _take(self) -> List[Dict[str, Any]]:
+        new = self._packer.chunks[self._emitted:]
+        self._emitted = len(self._packer.chunks)
+        return new
 
 
 def _clean_text(text: str) -> str:
@@ -173,6 +259,15 @@ def chunk_document_with_sections(
     Returns:
         List of chunks with document metadata
     """
+    return chunk_text(text, metadata=document_chunk_metadata(doc_name, doc_type, project_id))
+
+
+def document_chunk_metadata(
+    doc_name: str = None,
+    doc_type: str = None,
+    project_id: int = None
+) -> Dict[str, Any]:
+    """Document context attached to every chunk (None values dropped)."""
     metadata = {
         'doc_name': doc_name,
         'doc_type': doc_type,
@@ -180,6 +275,4 @@ def chunk_document_with_sections(
     }
 
     # Filter None values
-    metadata = {k: v for k, v in metadata.items() if v is not None}
-
-    return chunk_text(text, metadata=metadata)
+    return {k: v for k, v in metadata.items() if v is not None}
@@ -11,16 +11,16 @@ column creation for valuable unmapped data.
 
 import re
 import logging
-import tempfile
 from typing import List, Dict, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from enum import Enum
 from decimal import Decimal
 from datetime import datetime
 
-import requests
 from django.db import models as db_models
 
+from .blob_cache import checkout_document
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -264,7 +264,8 @@ def discover_columns(
     storage_uri: str,
     mime_type: Optional[str] = None,
     file_name: Optional[str] = None,
-    project_id: Optional[int] = None
+    project_id: Optional[int] = None,
+    content_hash: Optional[str] = None,
 ) -> DiscoveryResult:
     """
     Analyze an uploaded rent roll file and discover all columns.
@@ -275,6 +276,8 @@ def discover_columns(
         mime_type: MIME type (optional, will infer from URL)
         file_name: Original filename (optional)
         project_id: Project ID for context
+        content_hash: core_doc.sha256_hash of the file (optional, lets the
+            blob cache serve it by content)
 
     Returns:
         DiscoveryResult with all columns and proposed mappings
@@ -297,10 +300,11 @@ def discover_columns(
             is_structured=False,
         )
 
-    # Download file to temp location
+    # Download file to temp location (cached, so the enhanced re-parse is local)
     try:
-        response = requests.get(storage_uri, timeout=60)
-        response.raise_for_status()
+        tmp_path = checkout_document(
+            storage_uri, content_hash=content_hash, suffix=_get_extension(mime_type)
+        )
     except Exception as e:
         return DiscoveryResult(
             file_name=file_name or "unknown",
@@ -311,12 +315,6 @@ def discover_columns(
             is_structured=False,
         )
 
-    # Save to temp file
-    suffix = _get_extension(mime_type)
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(response.content)
-        tmp_path = tmp.name
-
     try:
         # Parse based on file type
         if mime_type in ['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'application/vnd.ms-excel']:
@@ -1010,7 +1008,8 @@ def apply_column_mapping(
 
             extract_result = extractor.extract_rent_roll_chunked(
                 doc_id=doc_id,
-                user_id=None
+                user_id=None,
+                mappings=standard_mappings,
             )
 
             job.status = 'completed'
@@ -1564,6 +1563,7 @@ def discover_columns_enhanced(
     project_id: int,
     mime_type: Optional[str] = None,
     file_name: Optional[str] = None,
+    content_hash: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Full enhanced column discovery: file analysis + existing data check +
@@ -1580,6 +1580,7 @@ def discover_columns_enhanced(
         mime_type=mime_type,
         file_name=file_name,
         project_id=project_id,
+        content_hash=content_hash,
     )
 
     if not result.is_structured:
@@ -1602,17 +1603,14 @@ def discover_columns_enhanced(
             unit_col_idx = col.source_index
             break
 
-    # Re-download and parse for raw data (needed for unit numbers + dynamic analysis)
+    # Re-read and parse for raw data (needed for unit numbers + dynamic analysis)
     if not mime_type:
         mime_type = _infer_mime_type(storage_uri, file_name)
 
     try:
-        response = requests.get(storage_uri, timeout=60)
-        response.raise_for_status()
-        suffix = _get_extension(mime_type)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(response.content)
-            tmp_path = tmp.name
+        tmp_path = checkout_document(
+            storage_uri, content_hash=content_hash, suffix=_get_extension(mime_type)
+        )
 
         try:
             if mime_type in ['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'application/vnd.ms-excel']:
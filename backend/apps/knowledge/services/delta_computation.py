@@ -12,14 +12,14 @@ for the frontend grid to highlight and the user to accept/reject.
 import json
 import logging
 import re
-import tempfile
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
 from django.db import connection
 
+from .blob_cache import checkout_document
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +96,8 @@ def compute_rent_roll_delta(
         mime_type=document.mime_type,
         file_name=document.doc_name,
         mappings=mappings,
+        doc_id=document.doc_id,
+        content_hash=document.sha256_hash,
     )
 
     if not file_units:
@@ -249,6 +251,8 @@ def _parse_file_with_mappings(
     mime_type: Optional[str],
     file_name: Optional[str],
     mappings: List[Dict[str, Any]],
+    doc_id: Optional[int] = None,
+    content_hash: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Parse file rows into unit dicts using confirmed column mappings.
@@ -264,17 +268,13 @@ def _parse_file_with_mappings(
 
     # Download file
     try:
-        response = requests.get(storage_uri, timeout=60)
-        response.raise_for_status()
+        tmp_path = checkout_document(
+            storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=_get_extension(mime_type)
+        )
     except Exception as e:
         logger.error(f"Failed to download file: {e}")
         return []
 
-    suffix = _get_extension(mime_type)
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(response.content)
-        tmp_path = tmp.name
-
     try:
         if mime_type in [
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -22,6 +22,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from django.db import connection
 
+from .text_layer import ensure_text_layer
+
 logger = logging.getLogger(__name__)
 
 
@@ -744,45 +746,20 @@ class DocumentClassifier:
                 'project_id': row[2],
             }
 
-            # Get content from embeddings
-            cursor.execute("""
-                SELECT content_text
-                FROM landscape.knowledge_embeddings
-                WHERE source_id = %s AND source_type = 'document_chunk'
-                ORDER BY embedding_id
-                LIMIT 50
-            """, [doc_id])
+            # Full text from the persisted text layer (extracted once if missing)
+            layer = ensure_text_layer(doc_id)
+            content = layer.text if layer else ''
 
-            chunks = cursor.fetchall()
-            content = "\n".join(chunk[0] for chunk in chunks if chunk[0])
-
-            # If no embeddings, try to get from raw text
+            # Fall back to core_doc.extracted_text if the file has no readable text
             if not content:
                 cursor.execute("""
-                    SELECT COALESCE(extracted_text, ''), storage_uri, mime_type
+                    SELECT COALESCE(extracted_text, '')
                     FROM landscape.core_doc
                     WHERE doc_id = %s
                 """, [doc_id])
                 row = cursor.fetchone()
                 content = row[0] if row and row[0] else ''
 
-                # If still no content, try direct text extraction from the file
-                # (handles images via Vision API, fresh uploads with no embeddings yet)
-                if not content and row and row[1]:
-                    try:
-                        from .text_extraction import extract_text_from_url
-                        extracted_text, _err = extract_text_from_url(row[1], row[2])
-                        if extracted_text:
-                            content = extracted_text
-                            # Cache in core_doc.extracted_text for subsequent calls
-                            cursor.execute("""
-                                UPDATE landscape.core_doc
-                                SET extracted_text = %s
-                                WHERE doc_id = %s AND (extracted_text IS NULL OR extracted_text = '')
-                            """, [extracted_text[:100000], doc_id])
-                    except Exception as e:
-                        logger.warning(f"Direct extraction fallback failed for doc {doc_id}: {e}")
-
             doc_info['content'] = content
             return doc_info
 
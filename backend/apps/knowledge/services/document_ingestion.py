@@ -2,9 +2,10 @@
 Main ingestion pipeline: Document → Text → Chunks → Embeddings
 """
 from typing import Optional, Dict, Any, List
-from django.db import transaction
+from django.db import connection, transaction
 
-from .text_extraction import extract_text_from_url
+from .text_extraction import extract_text_layer_from_url
+from .text_layer import load_text_layer, save_text_layer
 from .chunking import chunk_document_with_sections
 from .embedding_storage import store_embedding
 from ..models import KnowledgeEmbedding
@@ -41,7 +42,8 @@ def ingest_document(
     project_id: int = None,
     entity_ids: List[int] = None,
     tags: List[str] = None,
-    skip_if_exists: bool = True
+    skip_if_exists: bool = True,
+    content_hash: str = None,
 ) -> DocumentIngestionResult:
     """
     Full ingestion pipeline for a single document.
@@ -75,12 +77,21 @@ def ingest_document(
             result.error = "Already processed (skipped)"
             return result
 
-    # Step 1: Extract text
-    extracted_text, extract_error = extract_text_from_url(storage_uri, mime_type)
+    # Step 1: Extract text (or reuse the persisted text layer)
+    layer = load_text_layer(doc_id)
+    if layer:
+        extracted_text = layer.text
+    else:
+        extracted_text, page_offsets, extract_error = extract_text_layer_from_url(
+            storage_uri, mime_type, doc_id=doc_id, content_hash=content_hash
+        )
 
-    if extract_error or not extracted_text:
-        result.error = extract_error or "No text extracted"
-        return result
+        if extract_error or not extracted_text:
+            result.error = extract_error or "No text extracted"
+            return result
+
+        with connection.cursor() as cursor:
+            save_text_layer(cursor, doc_id, extracted_text, page_offsets, 'document_ingestion')
 
     result.extracted_text_length = len(extracted_text)
 
@@ -187,7 +198,8 @@ def ingest_documents_batch(
             project_id=doc.get('project_id'),
             entity_ids=doc.get('entity_ids'),
             tags=doc.get('tags'),
-            skip_if_exists=skip_if_exists
+            skip_if_exists=skip_if_exists,
+            content_hash=doc.get('sha256_hash'),
         )
 
         if result.success:
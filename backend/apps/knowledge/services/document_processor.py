@@ -5,21 +5,43 @@ Handles: upload → extract → chunk → embed → ready
 This service processes documents through the full RAG pipeline:
 1. Extract text from document (PDF, DOCX, TXT)
 2. Chunk text into semantic units
-3. Generate embeddings for each chunk
-4. Update processing status for visibility
+3. Generate embeddings for the chunks in token-bounded batches, several
+   requests in flight, and bulk-insert each batch
+4. Update processing status (and per-stage timings) for visibility
+
+With PDF_STREAM_CHUNKING=true, PDFs overlap steps 1-3: pages arrive in order
+from the page-sharded extractor, are chunked as they come, and completed
+chunks are embedded while later pages are still being read.
 """
+import json
 import logging
+import os
+import socket
+import threading
+import time
 from typing import Optional, Dict, Any, List, Callable
+import requests
 from django.db import connection, transaction
 
-from .text_extraction import extract_text_from_url
-from .chunking import chunk_document_with_sections
-from .embedding_storage import store_embedding
+from .text_extraction import extract_text_layer_from_url, join_pages, open_pdf_pages_from_url
+from .text_layer import save_text_layer
+from .chunking import StreamingChunker, chunk_document_with_sections, document_chunk_metadata
+from .embedding_cache import EmbeddingCacheStats
+from .embedding_service import embed_batches, plan_embedding_batches
+from .embedding_storage import store_embeddings_batch
 from .plan_geometry.intake import AWAITING_OCR, apply_to_document, inspect_upload
 from ..models import KnowledgeEmbedding
 
 logger = logging.getLogger(__name__)
 
+# How long a claimed queue item stays reserved without a heartbeat
+DEFAULT_LEASE_SECONDS = int(os.getenv('DOC_QUEUE_LEASE_SECONDS', '300'))
+
+# Chunk and embed PDFs while their pages are still being extracted
+STREAM_PDF_CHUNKING = os.getenv('PDF_STREAM_CHUNKING', 'false').lower() == 'true'
+# Completed chunks to collect before embedding them mid-extraction
+STREAM_EMBED_CHUNKS = int(os.getenv('PDF_STREAM_EMBED_CHUNKS', '64'))
+
 
 class DocumentProcessor:
     """
@@ -63,6 +85,10 @@ class DocumentProcessor:
                 updates.append("embeddings_count = %s")
                 params.append(kwargs['embeddings_count'])
 
+            if 'timings' in kwargs:
+                updates.append("processing_timings = %s::jsonb")
+                params.append(json.dumps(kwargs['timings']))
+
             params.append(doc_id)
 
             cursor.execute(f"""
@@ -78,12 +104,15 @@ class DocumentProcessor:
             except Exception as e:
                 logger.warning(f"Status callback failed: {e}")
 
-    def process_document(self, doc_id: int) -> Dict[str, Any]:
+    def process_document(self, doc_id: int, should_abort: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
         """
         Process a single document through the full pipeline.
 
         Args:
             doc_id: Document ID from core_doc
+            should_abort: Checked before each write; when it returns True the
+                document is abandoned without writing (used by queue workers
+                whose lease has been lost)
 
         Returns:
             Dict with success status and details
@@ -96,13 +125,33 @@ class DocumentProcessor:
             'chunks_created': 0,
             'embeddings_created': 0,
             'extracted_text_length': 0,
+            'timings': {},
+            'embedding_cache': {},
         }
+        timings = result['timings']
+        cache_stats = EmbeddingCacheStats()
+        stage_started = time.perf_counter()
+
+        def end_stage(name: str) -> None:
+            nonlocal stage_started
+            now = time.perf_counter()
+            timings[name] = round((now - stage_started) * 1000)
+            stage_started = now
+
+        def abandoned() -> bool:
+            # Another worker owns the document now; leave its status alone
+            if should_abort is None or not should_abort():
+                return False
+            logger.warning(f"[doc_id={doc_id}] Abandoning document: lease lost")
+            result['status'] = 'abandoned'
+            result['error'] = 'Lease lost'
+            return True
 
         try:
             # Fetch document info
             with connection.cursor() as cursor:
                 cursor.execute("""
-                    SELECT doc_id, storage_uri, mime_type, doc_name, doc_type, project_id
+                    SELECT doc_id, storage_uri, mime_type, doc_name, doc_type, project_id, sha256_hash
                     FROM landscape.core_doc
                     WHERE doc_id = %s
                 """, [doc_id])
@@ -112,7 +161,7 @@ class DocumentProcessor:
                 result['error'] = 'Document not found'
                 return result
 
-            doc_id, storage_uri, mime_type, doc_name, doc_type, project_id = row
+            doc_id, storage_uri, mime_type, doc_name, doc_type, project_id, content_hash = row
 
             if not storage_uri:
                 self._update_status(doc_id, 'skipped', 'No storage URI')
@@ -124,8 +173,20 @@ class DocumentProcessor:
             logger.info(f"[doc_id={doc_id}] Extracting text from {doc_name or 'unnamed'}...")
             self._update_status(doc_id, 'extracting')
 
-            extracted_text, extract_error = extract_text_from_url(storage_uri, mime_type)
+            streamed = None
+            if mime_type == 'application/pdf' and STREAM_PDF_CHUNKING:
+                streamed = self._extract_streaming(
+                    storage_uri, doc_name, doc_type, project_id, cache_stats, content_hash
+                )
+                extracted_text, extract_error = streamed['text'], streamed['error']
+                page_offsets = streamed['page_offsets']
+                timings['stream_embed'] = streamed['embed_ms']
+            else:
+                extracted_text, page_offsets, extract_error = extract_text_layer_from_url(
+                    storage_uri, mime_type, doc_id=doc_id, content_hash=content_hash
+                )
             extraction_failed = bool(extract_error or not extracted_text)
+            end_stage('extract')
 
             # === STEP 1b: Is this a drawing? ===
             # Nothing upstream of here knows what a plan is. auto_classify_document
@@ -145,6 +206,10 @@ class DocumentProcessor:
                     # Keep the chunk and embedding tags in step with the row we
                     # just rewrote, so the document and its chunks agree on type.
                     doc_type = intake.doc_type
+                    if streamed:
+                        # Streamed chunks were tagged before intake ran
+                        for chunk in streamed['chunks']:
+                            chunk['doc_type'] = doc_type
 
             if extraction_failed:
                 # A plan with no text layer is not a bad document — it is a scan,
@@ -170,16 +235,31 @@ class DocumentProcessor:
             result['extracted_text_length'] = len(extracted_text)
             logger.info(f"[doc_id={doc_id}] Extracted {len(extracted_text)} characters")
 
+            if abandoned():
+                return result
+
+            # Persist the text layer so readers never re-parse the file
+            try:
+                with connection.cursor() as cursor:
+                    save_text_layer(cursor, doc_id, extracted_text, page_offsets, 'document_processor')
+            except Exception as e:
+                logger.warning(f"[doc_id={doc_id}] Could not store text layer: {e}")
+
             # === STEP 2: Chunk text ===
             logger.info(f"[doc_id={doc_id}] Chunking text...")
             self._update_status(doc_id, 'chunking')
+            stage_started = time.perf_counter()
 
-            chunks = chunk_document_with_sections(
-                text=extracted_text,
-                doc_name=doc_name,
-                doc_type=doc_type,
-                project_id=project_id
-            )
+            if streamed and streamed['chunks']:
+                chunks = streamed['chunks']
+            else:
+                chunks = chunk_document_with_sections(
+                    text=extracted_text,
+                    doc_name=doc_name,
+                    doc_type=doc_type,
+                    project_id=project_id
+                )
+            end_stage('chunk')
 
             if not chunks:
                 self._update_status(doc_id, 'failed', 'No chunks generated')
@@ -193,6 +273,32 @@ class DocumentProcessor:
             logger.info(f"[doc_id={doc_id}] Generating embeddings...")
             self._update_status(doc_id, 'embedding')
 
+            stage_started = time.perf_counter()
+
+            # Embed outside the transaction: the HTTP round trips are the slow
+            # part, and holding the delete's row locks across them is not needed.
+            rows = self._build_embedding_rows(chunks, doc_id, doc_name, doc_type, project_id)
+            contents = [row['content_text'] for row in rows]
+            batches = plan_embedding_batches(contents)
+            if streamed:
+                # Reuse what was embedded during extraction; anything else (the
+                # tail, or every chunk if intake retyped the document) is new
+                vectors = [streamed['vectors'].get(content) for content in contents]
+                missing = [i for i, vector in enumerate(vectors) if vector is None]
+                if missing:
+                    missing_contents = [contents[i] for i in missing]
+                    for i, vector in zip(missing, embed_batches(
+                        missing_contents, plan_embedding_batches(missing_contents), stats=cache_stats
+                    )):
+                        vectors[i] = vector
+            else:
+                vectors = embed_batches(contents, batches, stats=cache_stats)
+            result['embedding_cache'] = cache_stats.as_dict()
+            end_stage('embed')
+
+            if abandoned():
+                return result
+
             embeddings_created = 0
 
             with transaction.atomic():
@@ -205,43 +311,36 @@ class DocumentProcessor:
                 if deleted_count > 0:
                     logger.info(f"[doc_id={doc_id}] Cleared {deleted_count} existing embeddings")
 
-                for chunk in chunks:
-                    # Build content with context
-                    content_with_context = self._build_embedding_content(chunk, doc_name, doc_type)
-
-                    # Build tags
-                    chunk_tags = []
-                    if doc_type:
-                        chunk_tags.append(f"doc_type:{doc_type}")
-                    chunk_tags.append(f"chunk:{chunk['chunk_index']+1}/{chunk['total_chunks']}")
-
-                    # Store embedding (generates vector and saves)
-                    embedding_id = store_embedding(
-                        content_text=content_with_context,
-                        source_type='document_chunk',
-                        source_id=doc_id,
-                        entity_ids=[project_id] if project_id else [],
-                        tags=chunk_tags
-                    )
-
-                    if embedding_id:
-                        embeddings_created += 1
+                # One multi-row INSERT per embedding batch
+                for indices in batches:
+                    batch_rows = [
+                        {**rows[i], 'embedding': vectors[i]}
+                        for i in indices
+                        if vectors[i] is not None
+                    ]
+                    embeddings_created += len(store_embeddings_batch(batch_rows))
+            end_stage('write')
 
             result['embeddings_created'] = embeddings_created
-            logger.info(f"[doc_id={doc_id}] Created {embeddings_created} embeddings")
+            logger.info(
+                f"[doc_id={doc_id}] Created {embeddings_created} embeddings "
+                f"in {len(batches)} batches, timings(ms)={timings}, "
+                f"cache hits {cache_stats.hits}/{cache_stats.hits + cache_stats.misses}"
+            )
 
             # === STEP 4: Mark complete ===
             if embeddings_created > 0:
                 self._update_status(
                     doc_id, 'ready',
                     chunks_count=len(chunks),
-                    embeddings_count=embeddings_created
+                    embeddings_count=embeddings_created,
+                    timings=timings,
                 )
                 result['success'] = True
                 result['status'] = 'ready'
                 logger.info(f"[doc_id={doc_id}] Processing complete - ready for RAG")
             else:
-                self._update_status(doc_id, 'failed', 'No embeddings created')
+                self._update_status(doc_id, 'failed', 'No embeddings created', timings=timings)
                 result['error'] = 'No embeddings created'
 
             return result
@@ -252,6 +351,87 @@ class DocumentProcessor:
             result['error'] = str(e)
             return result
 
+    def _extract_streaming(
+        self,
+        storage_uri: str,
+        doc_name: str,
+        doc_type: str,
+        project_id: int,
+        cache_stats: EmbeddingCacheStats,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract a PDF page by page, chunking as pages arrive and embedding
+        every STREAM_EMBED_CHUNKS completed chunks on this thread while the
+        extraction pool keeps reading ahead.
+
+        Returns text / page_offsets / error as extract_text_layer_from_url
+        would, the chunks, the vectors embedded so far keyed by embedding
+        content, and embed_ms.
+        """
+        streamed = {
+            'text': None, 'page_offsets': [], 'error': None,
+            'chunks': [], 'vectors': {}, 'embed_ms': 0,
+        }
+        chunker = StreamingChunker(metadata=document_chunk_metadata(doc_name, doc_type, project_id))
+        pending: List[Dict] = []
+
+        def embed_pending():
+            started = time.perf_counter()
+            contents = [self._build_embedding_content(chunk, doc_name, doc_type) for chunk in pending]
+            vectors = embed_batches(contents, plan_embedding_batches(contents), stats=cache_stats)
+            streamed['vectors'].update(
+                (content, vector) for content, vector in zip(contents, vectors) if vector is not None
+            )
+            streamed['embed_ms'] += round((time.perf_counter() - started) * 1000)
+            pending.clear()
+
+        page_texts = []
+        try:
+            with open_pdf_pages_from_url(storage_uri, content_hash=content_hash) as (_, pages):
+                for _, page_text in pages:
+                    page_texts.append(page_text)
+                    pending.extend(chunker.feed(page_text))
+                    if len(pending) >= STREAM_EMBED_CHUNKS:
+                        embed_pending()
+        except requests.RequestException as e:
+            streamed['error'] = f"Download failed: {str(e)}"
+            return streamed
+        except Exception as e:
+            streamed['error'] = f"Extraction failed: {str(e)}"
+            return streamed
+
+        streamed['text'], streamed['page_offsets'] = join_pages(page_texts)
+        streamed['chunks'] = chunker.finish()
+        return streamed
+
+    def _build_embedding_rows(
+        self,
+        chunks: List[Dict],
+        doc_id: int,
+        doc_name: str = None,
+        doc_type: str = None,
+        project_id: int = None,
+    ) -> List[Dict[str, Any]]:
+        """knowledge_embeddings rows (minus the vector) for a document's chunks."""
+        rows = []
+        for chunk in chunks:
+            # Build tags
+            chunk_tags = []
+            if doc_type:
+                chunk_tags.append(f"doc_type:{doc_type}")
+            chunk_tags.append(f"chunk:{chunk['chunk_index']+1}/{chunk['total_chunks']}")
+
+            rows.append({
+                'content_text': self._build_embedding_content(chunk, doc_name, doc_type),
+                'source_type': 'document_chunk',
+                'source_id': doc_id,
+                'project_id': project_id,
+                'entity_ids': [project_id] if project_id else [],
+                'tags': chunk_tags,
+            })
+        return rows
+
     def _build_embedding_content(self, chunk: Dict, doc_name: str = None, doc_type: str = None) -> str:
         """Build content string with context for better semantic matching."""
         parts = []
@@ -288,6 +468,8 @@ def queue_document_for_processing(doc_id: int, project_id: int = None, priority:
                 priority = EXCLUDED.priority,
                 attempts = 0,
                 error_message = NULL,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
                 created_at = NOW()
         """, [doc_id, project_id, priority])
 
@@ -302,13 +484,205 @@ def queue_document_for_processing(doc_id: int, project_id: int = None, priority:
     logger.info(f"Queued document {doc_id} for processing (priority={priority})")
 
 
-def process_queue(max_items: int = 10) -> Dict[str, Any]:
+def claim_next_document(worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+    """
+    Atomically claim the next queued document for worker_id.
+
+    Highest priority first, then smallest file (more documents finish per
+    minute), then oldest. The SELECT ... FOR UPDATE SKIP LOCKED and the lease
+    UPDATE are one statement, so two workers can never claim the same row.
+
+    Returns:
+        Dict with queue_id, doc_id, project_id, attempts - or None if empty
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            WITH next_item AS (
+                SELECT q.queue_id
+                FROM landscape.doc_processing_queue q
+                LEFT JOIN landscape.core_doc d ON d.doc_id = q.doc_id
+                WHERE q.status = 'queued'
+                  AND q.attempts < q.max_attempts
+                ORDER BY q.priority DESC, d.file_size_bytes ASC NULLS LAST, q.created_at ASC
+                LIMIT 1
+                FOR UPDATE OF q SKIP LOCKED
+            )
+            UPDATE landscape.doc_processing_queue q
+            SET status = 'processing',
+                lease_owner = %s,
+                lease_expires_at = NOW() + make_interval(secs => %s),
+                heartbeat_at = NOW(),
+                started_at = NOW(),
+                attempts = q.attempts + 1
+            FROM next_item
+            WHERE q.queue_id = next_item.queue_id
+            RETURNING q.queue_id, q.doc_id, q.project_id, q.attempts
+        """, [worker_id, lease_seconds])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+    return {'queue_id': row[0], 'doc_id': row[1], 'project_id': row[2], 'attempts': row[3]}
+
+
+def renew_lease(queue_id: int, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+    """Extend a lease still held by worker_id. False means it was lost."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE landscape.doc_processing_queue
+            SET lease_expires_at = NOW() + make_interval(secs => %s),
+                heartbeat_at = NOW()
+            WHERE queue_id = %s
+              AND lease_owner = %s
+              AND status = 'processing'
+        """, [lease_seconds, queue_id, worker_id])
+        return cursor.rowcount == 1
+
+
+def complete_queue_item(queue_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+    """
+    Record the outcome of a claimed item and release its lease.
+
+    Only the lease holder may finish a row: if the lease expired and another
+    worker re-claimed it, this is a no-op and returns False.
+    """
+    with connection.cursor() as cursor:
+        if result['success']:
+            cursor.execute("""
+                UPDATE landscape.doc_processing_queue
+                SET status = 'completed', completed_at = NOW(),
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE queue_id = %s AND lease_owner = %s
+            """, [queue_id, worker_id])
+        else:
+            # Retry until attempts run out
+            cursor.execute("""
+                UPDATE landscape.doc_processing_queue
+                SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                    error_message = %s,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE queue_id = %s AND lease_owner = %s
+            """, [result.get('error'), queue_id, worker_id])
+        return cursor.rowcount == 1
+
+
+def reclaim_expired_leases(lease_seconds: int = DEFAULT_LEASE_SECONDS) -> int:
+    """
+    Return items whose worker stopped heartbeating to the queue.
+
+    Rows out of attempts are failed instead. Rows left in 'processing' by the
+    pre-lease queue (no lease_expires_at) count as expired lease_seconds after
+    they started.
+
+    Returns:
+        Number of rows reclaimed
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE landscape.doc_processing_queue
+            SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                error_message = 'Lease expired (worker stopped: ' || COALESCE(lease_owner, 'unknown') || ')',
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE status = 'processing'
+              AND COALESCE(lease_expires_at, started_at + make_interval(secs => %s)) < NOW()
+            RETURNING queue_id, doc_id
+        """, [lease_seconds])
+        reclaimed = cursor.fetchall()
+
+    for queue_id, doc_id in reclaimed:
+        logger.warning(f"Reclaimed expired lease queue_id={queue_id} doc_id={doc_id}")
+    return len(reclaimed)
+
+
+class LeaseHeartbeat:
+    """
+    Keep a claimed item's lease alive while it is processed.
+
+    A daemon thread renews the lease every lease_seconds / 3 (or every
+    interval seconds) on its own database connection, so a long extraction
+    never looks abandoned while a crashed worker's lease still lapses within
+    lease_seconds. Once a renewal fails, lost is set and the worker must not
+    write its results.
+    """
+
+    def __init__(self, queue_id: int, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 interval: Optional[float] = None):
+        self.queue_id = queue_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval if interval is not None else max(lease_seconds / 3, 1)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f'lease-{queue_id}')
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not renew_lease(self.queue_id, self.worker_id, self.lease_seconds):
+                        self.lost = True
+                        logger.warning(f"Lost lease on queue_id={self.queue_id} ({self.worker_id})")
+                        return
+                except Exception:
+                    logger.exception(f"Heartbeat failed for queue_id={self.queue_id}")
+        finally:
+            connection.close()
+
+
+def process_claimed(item: Dict[str, Any], worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Dict[str, Any]:
+    """
+    Process a claimed queue item under a heartbeat and record the outcome.
+
+    If the lease is lost mid-document the results are not written and the
+    queue row is left to whichever worker reclaimed it.
+    """
+    with LeaseHeartbeat(item['queue_id'], worker_id, lease_seconds) as heartbeat:
+        try:
+            result = processor.process_document(item['doc_id'], should_abort=lambda: heartbeat.lost)
+        except Exception as e:
+            logger.exception(f"[doc_id={item['doc_id']}] Worker {worker_id} failed")
+            result = {'doc_id': item['doc_id'], 'success': False, 'error': str(e)}
+
+    if heartbeat.lost:
+        logger.warning(
+            f"[doc_id={item['doc_id']}] Lease lost; {worker_id} abandoned the document"
+        )
+        return {**result, 'success': False, 'status': 'abandoned', 'error': 'Lease lost'}
+    if not complete_queue_item(item['queue_id'], worker_id, result):
+        logger.warning(
+            f"[doc_id={item['doc_id']}] Lease lost before completion; outcome not recorded by {worker_id}"
+        )
+    return result
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def process_queue(max_items: int = 10, worker_id: Optional[str] = None,
+                  lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Dict[str, Any]:
     """
     Process pending items in the queue.
     Call this from a cron job or background worker.
 
+    Items are claimed one at a time with a lease (see claim_next_document),
+    so any number of these can run side by side; run_document_workers runs
+    several in parallel processes.
+
     Args:
         max_items: Maximum documents to process in this batch
+        worker_id: Lease owner name (default host:pid)
+        lease_seconds: Lease length; renewed while a document is processing
 
     Returns:
         Summary of processing results
@@ -319,66 +693,40 @@ def process_queue(max_items: int = 10) -> Dict[str, Any]:
         'failed': 0,
         'details': []
     }
+    worker_id = worker_id or default_worker_id()
+    reclaim_expired_leases(lease_seconds)
 
-    with connection.cursor() as cursor:
-        # Get queued items (use FOR UPDATE SKIP LOCKED for concurrent workers)
-        cursor.execute("""
-            SELECT queue_id, doc_id, project_id
-            FROM landscape.doc_processing_queue
-            WHERE status = 'queued'
-              AND attempts < max_attempts
-            ORDER BY priority DESC, created_at ASC
-            LIMIT %s
-            FOR UPDATE SKIP LOCKED
-        """, [max_items])
+    while results['processed'] < max_items:
+        item = claim_next_document(worker_id, lease_seconds)
+        if item is None:
+            break
 
-        items = cursor.fetchall()
-
-    if not items:
-        logger.debug("No documents in queue to process")
-        return results
-
-    logger.info(f"Processing {len(items)} documents from queue")
-
-    for queue_id, doc_id, project_id in items:
-        # Mark as processing
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                UPDATE landscape.doc_processing_queue
-                SET status = 'processing', started_at = NOW(), attempts = attempts + 1
-                WHERE queue_id = %s
-            """, [queue_id])
-
-        # Process the document
-        result = processor.process_document(doc_id)
+        result = process_claimed(item, worker_id, lease_seconds)
         results['processed'] += 1
         results['details'].append(result)
-
-        # Update queue status
-        with connection.cursor() as cursor:
-            if result['success']:
-                cursor.execute("""
-                    UPDATE landscape.doc_processing_queue
-                    SET status = 'completed', completed_at = NOW()
-                    WHERE queue_id = %s
-                """, [queue_id])
-                results['succeeded'] += 1
-            else:
-                # Check if we should retry or mark as failed
-                cursor.execute("""
-                    UPDATE landscape.doc_processing_queue
-                    SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
-                        error_message = %s
-                    WHERE queue_id = %s
-                """, [result.get('error'), queue_id])
-                results['failed'] += 1
-
-    logger.info(f"Queue processing complete: {results['succeeded']} succeeded, {results['failed']} failed")
+        if result['success']:
+            results['succeeded'] += 1
+        else:
+            results['failed'] += 1
+
+    if results['processed']:
+        logger.info(
+            f"Queue processing complete ({worker_id}): "
+            f"{results['succeeded']} succeeded, {results['failed']} failed"
+        )
+    else:
+        logger.debug("No documents in queue to process")
     return results
 
 
-def get_queue_stats() -> Dict[str, Any]:
-    """Get current queue statistics."""
+def get_queue_stats(window_minutes: int = 60) -> Dict[str, Any]:
+    """
+    Get current queue statistics.
+
+    Besides the per-status counts: queue depth, items whose lease has lapsed,
+    throughput over the last window_minutes and p95 milliseconds per stage
+    (extract, chunk, embed, write) for documents completed in that window.
+    """
     with connection.cursor() as cursor:
         cursor.execute("""
             SELECT status, COUNT(*) as count
@@ -387,9 +735,40 @@ def get_queue_stats() -> Dict[str, Any]:
         """)
         status_counts = {row[0]: row[1] for row in cursor.fetchall()}
 
+        cursor.execute("""
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'processing' AND lease_expires_at < NOW()),
+                COUNT(DISTINCT lease_owner) FILTER (WHERE status = 'processing'),
+                COUNT(*) FILTER (
+                    WHERE status = 'completed'
+                      AND completed_at > NOW() - make_interval(mins => %s)
+                )
+            FROM landscape.doc_processing_queue
+        """, [window_minutes])
+        expired_leases, active_workers, completed_in_window = cursor.fetchone()
+
+        cursor.execute("""
+            SELECT t.stage,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY t.ms::numeric)
+            FROM landscape.doc_processing_queue q
+            JOIN landscape.core_doc d ON d.doc_id = q.doc_id
+            CROSS JOIN LATERAL jsonb_each_text(d.processing_timings) AS t(stage, ms)
+            WHERE q.status = 'completed'
+              AND q.completed_at > NOW() - make_interval(mins => %s)
+            GROUP BY t.stage
+        """, [window_minutes])
+        stage_p95 = {stage: round(float(ms)) for stage, ms in cursor.fetchall()}
+
     return {
         'queued': status_counts.get('queued', 0),
         'processing': status_counts.get('processing', 0),
         'completed': status_counts.get('completed', 0),
         'failed': status_counts.get('failed', 0),
+        'depth': status_counts.get('queued', 0) + status_counts.get('processing', 0),
+        'expired_leases': expired_leases,
+        'active_workers': active_workers,
+        'window_minutes': window_minutes,
+        'completed_in_window': completed_in_window,
+        'throughput_per_minute': round(completed_in_window / window_minutes, 2) if window_minutes else 0.0,
+        'stage_p95_ms': stage_p95,
     }
@@ -128,7 +128,7 @@ def _transfer_single_document(doc: Document) -> None:
 
     # Extract text
     text, page_count, error = extract_text_and_page_count_from_url(
-        doc.storage_uri, doc.mime_type
+        doc.storage_uri, doc.mime_type, content_hash=doc.sha256_hash
     )
     if error or not text:
         raise ValueError(error or 'No text could be extracted')
@@ -0,0 +1,250 @@
+"""Content-hash cache for embedding vectors.
+
+Re-processing a document deletes its knowledge_embeddings rows and re-embeds
+every chunk, even when almost all of the chunk text is unchanged. Vectors are
+a pure function of (model, input text), so they are cached in
+``landscape.knowledge_embedding_cache`` under::
+
+    (model, sha256 of normalized content)
+
+The provider is sent the text itself (truncated to MAX_CHARS); only the key
+is normalized, collapsing whitespace, so texts that differ in spacing alone
+share an entry. Entries never go stale; a model change simply keys new rows.
+
+When the table is unavailable (non-Postgres database, migration not applied)
+lookups return nothing and writes are skipped: the cache can make embedding
+cheaper, never fail it. Cache SQL runs in its own savepoint so a failure
+cannot poison a caller's transaction.
+
+Query embeddings additionally go through ``query_embedding_cache``, a
+per-process LRU with a TTL: one Landscaper turn embeds the same question from
+several retrievers, and a database round trip per lookup would eat most of
+the saving. The table above is its cross-worker second tier.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from .vector_io import copy_binary, decode_vector
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+QUERY_CACHE_SIZE = int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', '512'))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_EMBEDDING_CACHE_TTL', '3600'))
+QUERY_MAX_CHARS = 8000
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for one run (or the whole process)."""
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'hit_rate': round(self.hit_rate, 4)}
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits / {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate)"
+        )
+
+
+_stats = EmbeddingCacheStats()
+_stats_lock = threading.Lock()
+_cache_table_exists: Optional[bool] = None
+
+
+def _count(stats: Optional[EmbeddingCacheStats], field: str, n: int) -> None:
+    if not n:
+        return
+    with _stats_lock:
+        setattr(_stats, field, getattr(_stats, field) + n)
+    if stats is not None:
+        setattr(stats, field, getattr(stats, field) + n)
+
+
+def embedding_cache_stats() -> Dict[str, Any]:
+    """Snapshot of this process's hit/miss counters."""
+    with _stats_lock:
+        return _stats.as_dict()
+
+
+def reset_embedding_cache_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = EmbeddingCacheStats()
+
+
+def normalize_content(text: str, max_chars: int) -> str:
+    """The text as it is hashed for the cache: whitespace collapsed, then truncated."""
+    return _WHITESPACE.sub(' ', text or '').strip()[:max_chars]
+
+
+def content_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _table_available() -> bool:
+    global _cache_table_exists
+
+    if connection.vendor != 'postgresql':
+        return False
+    if _cache_table_exists is None:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT to_regclass('landscape.knowledge_embedding_cache') IS NOT NULL"
+                )
+                _cache_table_exists = bool(cursor.fetchone()[0])
+        except Exception:  # noqa: BLE001 — no table check means no caching, never a failed embed
+            logger.exception("[embedding_cache] table check failed")
+            return False
+    return _cache_table_exists
+
+
+def get_cached(
+    model: str,
+    hashes: Iterable[str],
+    stats: Optional[EmbeddingCacheStats] = None,
+) -> Dict[str, List[float]]:
+    """Return {content_hash: vector} for the hashes already cached for model.
+
+    Counts one hit per found hash and one miss per missing one, in the
+    process-wide counters and in ``stats`` when given.
+    """
+    wanted = list(dict.fromkeys(hashes))
+    if not wanted:
+        return {}
+
+    found: Dict[str, List[float]] = {}
+    if _table_available():
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT content_hash, vector_send(embedding)
+                    FROM landscape.knowledge_embedding_cache
+                    WHERE model = %s AND content_hash = ANY(%s)
+                    """,
+                    [model, wanted],
+                )
+                found = {h: decode_vector(vector) for h, vector in cursor.fetchall()}
+        except Exception:  # noqa: BLE001
+            logger.exception("[embedding_cache] lookup failed for %d hashes", len(wanted))
+            _count(stats, 'errors', 1)
+
+    _count(stats, 'hits', len(found))
+    _count(stats, 'misses', len(wanted) - len(found))
+    return found
+
+
+def put_cached(
+    model: str,
+    entries: Iterable[Tuple[str, List[float]]],
+    stats: Optional[EmbeddingCacheStats] = None,
+) -> None:
+    """Cache (content_hash, vector) pairs for model; existing entries win."""
+    values = {h: vector for h, vector in entries if vector}
+    if not values or not _table_available():
+        return
+
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS embedding_cache_stage (
+                    content_hash TEXT,
+                    embedding vector
+                ) ON COMMIT DELETE ROWS
+            """)
+            cursor.execute("TRUNCATE embedding_cache_stage")
+            copy_binary(
+                cursor.cursor,
+                'embedding_cache_stage',
+                ('content_hash', 'embedding'),
+                ('text', 'vector'),
+                values.items(),
+            )
+            cursor.execute("""
+                INSERT INTO landscape.knowledge_embedding_cache
+                (model, content_hash, embedding, created_at)
+                SELECT %s, content_hash, embedding, NOW()
+                FROM embedding_cache_stage
+                ON CONFLICT (model, content_hash) DO NOTHING
+            """, [model])
+    except Exception:  # noqa: BLE001
+        logger.exception("[embedding_cache] write failed for %d vectors", len(values))
+        _count(stats, 'errors', 1)
+
+
+class QueryEmbeddingLRU:
+    """Thread-safe, size- and TTL-bounded map of (model, content hash) -> vector."""
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl_seconds: float = QUERY_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = EmbeddingCacheStats()
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, List[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        model: str,
+        text: str,
+        compute: Callable[[], Optional[List[float]]],
+    ) -> Optional[List[float]]:
+        """Return the cached vector for text, or store and return compute().
+
+        Failed computations (None) are not cached. compute runs outside the
+        lock, so two threads racing on a new query may both embed it.
+        """
+        if not text or not text.strip() or self.max_size <= 0:
+            return compute()
+
+        key = (model, content_hash(normalize_content(text, QUERY_MAX_CHARS)))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            self.stats.misses += 1
+
+        vector = compute()
+        if vector:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), vector)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats = EmbeddingCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+query_embedding_cache = QueryEmbeddingLRU()
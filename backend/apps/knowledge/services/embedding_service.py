@@ -4,10 +4,20 @@ Embedding generation service using OpenAI ada-002.
 Generates 1536-dimensional embeddings for semantic search.
 """
 import os
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from openai import OpenAI
 from django.conf import settings
 
+from .embedding_cache import (
+    EmbeddingCacheStats,
+    content_hash,
+    get_cached,
+    normalize_content,
+    put_cached,
+    query_embedding_cache,
+)
+
 # Initialize OpenAI client - will be set lazily on first use
 _client: Optional[OpenAI] = None
 
@@ -16,6 +26,11 @@ EMBEDDING_DIMENSIONS = 1536
 MAX_TOKENS = 8191  # ada-002 token limit
 MAX_CHARS = 8000  # Conservative char estimate (~1 char per token for safety)
 OPENAI_TIMEOUT_SECONDS = 30
+MAX_BATCH_INPUTS = 2048  # ada-002 inputs per request
+MAX_BATCH_TOKENS = 250_000  # request cap is 300k tokens; estimates below are conservative
+EMBEDDING_CONCURRENCY = int(os.getenv('EMBEDDING_CONCURRENCY', '4'))
+# Query embeddings also persist to the shared content-hash table (cross-worker)
+PERSIST_QUERY_EMBEDDINGS = os.getenv('PERSIST_QUERY_EMBEDDINGS', 'true').lower() != 'false'
 
 
 def _get_client() -> OpenAI:
@@ -48,12 +63,20 @@ def _get_client() -> OpenAI:
     return _client
 
 
-def generate_embedding(text: str) -> Optional[List[float]]:
+def generate_embedding(
+    text: str,
+    stats: Optional[EmbeddingCacheStats] = None,
+    use_cache: bool = True,
+) -> Optional[List[float]]:
     """
     Generate embedding vector for text using OpenAI ada-002.
 
+    The content-hash cache is consulted first; only a miss calls the API.
+
     Args:
         text: Input text to embed (max ~8000 tokens)
+        stats: Optional per-run cache counters to update
+        use_cache: False skips the content-hash table entirely
 
     Returns:
         List of 1536 floats, or None if error
@@ -61,9 +84,11 @@ def generate_embedding(text: str) -> Optional[List[float]]:
     if not text or not text.strip():
         return None
 
-    # Truncate if too long
-    if len(text) > MAX_CHARS:
-        text = text[:MAX_CHARS]
+    text, key = _embedding_input(text)
+    if use_cache:
+        cached = get_cached(EMBEDDING_MODEL, [key], stats)
+        if key in cached:
+            return cached[key]
 
     try:
         client = _get_client()
@@ -71,20 +96,97 @@ def generate_embedding(text: str) -> Optional[List[float]]:
             model=EMBEDDING_MODEL,
             input=text
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
     except Exception as e:
         print(f"Embedding generation error: {e}")
         return None
 
+    if use_cache:
+        put_cached(EMBEDDING_MODEL, [(key, embedding)], stats)
+    return embedding
+
+
+def embed_query(query: str) -> Optional[List[float]]:
+    """
+    Embedding for a retrieval query.
+
+    Goes through the per-process query LRU, so every retriever in a turn
+    (and repeats of the question later in the thread) share one API call.
+    """
+    return query_embedding_cache.get_or_compute(
+        EMBEDDING_MODEL,
+        query,
+        lambda: generate_embedding(query, use_cache=PERSIST_QUERY_EMBEDDINGS),
+    )
+
+
+def _embedding_input(text: str) -> Tuple[str, str]:
+    """
+    (text to send, cache key) for a non-empty text.
+
+    The provider gets the text as before, truncated to MAX_CHARS, so new
+    vectors stay comparable with the ones already stored. Only the cache key
+    collapses whitespace, so chunks that differ in spacing alone share a
+    cached vector.
+    """
+    text = text[:MAX_CHARS]
+    return text, content_hash(normalize_content(text, MAX_CHARS))
+
+
+def _request_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """One embeddings API call for already-truncated, non-empty texts."""
+    if not texts:
+        return []
+    try:
+        client = _get_client()
+        response = client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+    except Exception as e:
+        print(f"Batch embedding error: {e}")
+        return [None] * len(texts)
+
+
+def _cache_plan(
+    texts: List[str],
+    stats: Optional[EmbeddingCacheStats],
+) -> Tuple[List[Optional[str]], Dict[str, List[float]], Dict[str, str]]:
+    """
+    Hash texts and look them up in the cache.
 
-def generate_embeddings_batch(texts: List[str]) -> List[Optional[List[float]]]:
+    Returns (hash per text, None for empty text; cached vectors by hash;
+    text to send by hash for everything that still has to be embedded).
+    """
+    hashes: List[Optional[str]] = []
+    input_by_hash: Dict[str, str] = {}
+    for text in texts:
+        if not text or not text.strip():
+            hashes.append(None)
+            continue
+        text, key = _embedding_input(text)
+        hashes.append(key)
+        input_by_hash.setdefault(key, text)
+
+    cached = get_cached(EMBEDDING_MODEL, input_by_hash.keys(), stats)
+    missing = {key: text for key, text in input_by_hash.items() if key not in cached}
+    return hashes, cached, missing
+
+
+def generate_embeddings_batch(
+    texts: List[str],
+    stats: Optional[EmbeddingCacheStats] = None,
+) -> List[Optional[List[float]]]:
     """
     Generate embeddings for multiple texts in one API call.
 
-    More efficient than individual calls for bulk operations.
+    More efficient than individual calls for bulk operations. Texts already
+    in the content-hash cache (and duplicates within the call) are not sent.
 
     Args:
         texts: List of input texts (max 2048 per batch for ada-002)
+        stats: Optional per-run cache counters to update
 
     Returns:
         List of embedding vectors (same order as input), None for empty/invalid
@@ -92,38 +194,83 @@ def generate_embeddings_batch(texts: List[str]) -> List[Optional[List[float]]]:
     if not texts:
         return []
 
-    # Filter empty texts, track indices
-    valid_texts = []
-    valid_indices = []
-    for i, text in enumerate(texts):
-        if text and text.strip():
-            # Truncate if needed
-            if len(text) > MAX_CHARS:
-                text = text[:MAX_CHARS]
-            valid_texts.append(text)
-            valid_indices.append(i)
-
-    if not valid_texts:
-        return [None] * len(texts)
+    hashes, vectors, missing = _cache_plan(texts, stats)
+    fetched = dict(zip(missing, _request_embeddings(list(missing.values()))))
+    put_cached(EMBEDDING_MODEL, fetched.items(), stats)
+    vectors.update(fetched)
 
-    try:
-        client = _get_client()
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=valid_texts
-        )
+    return [vectors.get(key) if key else None for key in hashes]
 
-        # Map back to original indices
-        results: List[Optional[List[float]]] = [None] * len(texts)
-        for i, embedding_data in enumerate(response.data):
-            original_index = valid_indices[i]
-            results[original_index] = embedding_data.embedding
 
-        return results
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate (~3 chars per token) for batch budgeting."""
+    return min(len(text or ''), MAX_CHARS) // 3 + 1
 
-    except Exception as e:
-        print(f"Batch embedding error: {e}")
-        return [None] * len(texts)
+
+def plan_embedding_batches(
+    texts: List[str],
+    max_inputs: int = MAX_BATCH_INPUTS,
+    max_tokens: int = MAX_BATCH_TOKENS,
+) -> List[List[int]]:
+    """
+    Split texts into consecutive index batches that fit one embeddings request.
+
+    Each batch holds at most max_inputs texts and max_tokens estimated tokens
+    (after the MAX_CHARS truncation generate_embeddings_batch applies).
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embed_batches(
+    texts: List[str],
+    batches: List[List[int]],
+    max_concurrency: int = EMBEDDING_CONCURRENCY,
+    stats: Optional[EmbeddingCacheStats] = None,
+) -> List[Optional[List[float]]]:
+    """
+    Embed texts batch by batch, with up to max_concurrency requests in flight.
+
+    batches come from plan_embedding_batches. Cached texts are resolved up
+    front and only the misses of each batch are sent. Returns vectors in
+    input order; a failed batch leaves None for its texts, like
+    generate_embeddings_batch. Cache reads and writes stay on the calling
+    thread so worker threads never open database connections.
+    """
+    hashes, vectors, missing = _cache_plan(texts, stats)
+
+    # Each miss is sent once, with the first batch that contains it
+    requests: List[List[Tuple[str, str]]] = []
+    for indices in batches:
+        batch_keys = list(dict.fromkeys(
+            hashes[i] for i in indices if hashes[i] in missing
+        ))
+        if batch_keys:
+            requests.append([(key, missing.pop(key)) for key in batch_keys])
+
+    def run(request: List[Tuple[str, str]]) -> List[Optional[List[float]]]:
+        return _request_embeddings([text for _, text in request])
+
+    if requests:
+        workers = max(1, min(max_concurrency, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='embed') as pool:
+            for request, fetched in zip(requests, pool.map(run, requests)):
+                fetched_by_key = dict(zip((key for key, _ in request), fetched))
+                put_cached(EMBEDDING_MODEL, fetched_by_key.items(), stats)
+                vectors.update(fetched_by_key)
+
+    return [vectors.get(key) if key else None for key in hashes]
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -6,10 +6,25 @@ Provides high-level functions for:
 - Similarity search using cosine distance
 """
 from typing import List, Optional, Dict, Any
-from django.db import connection
+from django.db import connection, transaction
 
 from ..models import KnowledgeEmbedding
 from .embedding_service import generate_embedding
+from .hybrid_search import (
+    HYBRID,
+    RRF_K,
+    candidate_pool_size,
+    fused_candidates_cte,
+    fused_candidates_params,
+    resolve_mode,
+)
+from .vector_index import scoped_hits_cte, scoped_hits_params
+from .vector_io import copy_binary
+
+STAGE_COLUMNS = (
+    'ord', 'content_text', 'embedding', 'source_type', 'source_id', 'project_id', 'entity_ids', 'tags',
+)
+STAGE_TYPES = ('int8', 'text', 'vector', 'text', 'int8', 'int8', 'int8[]', 'text[]')
 
 
 def store_embedding(
@@ -41,7 +56,7 @@ def store_embedding(
     # Use raw SQL because Django model doesn't have the pgvector 'embedding' field defined
     # The column exists in the database but Django ORM can't handle vector types natively
     try:
-        embedding_str = '[' + ','.join(str(x) for x in embedding_vector) + ']'
+        embedding_str = vector_literal(embedding_vector)
         entity_ids_val = entity_ids or []
         tags_val = tags or []
 
@@ -66,12 +81,82 @@ def store_embedding(
         return None
 
 
+def vector_literal(vector: List[float]) -> str:
+    """pgvector text form of an embedding ('[x,y,...]')."""
+    return '[' + ','.join(str(x) for x in vector) + ']'
+
+
+def store_embeddings_batch(rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Store pre-computed embeddings in one round trip.
+
+    Vectors travel in pgvector's binary form (see vector_io): the rows are
+    COPYed into a session temp table and moved over with INSERT ... SELECT.
+
+    Args:
+        rows: Dicts with content_text, embedding, source_type, source_id and
+            optional project_id / entity_ids / tags (same meaning as store_embedding;
+            project_id is filled from core_doc when omitted).
+
+    Returns:
+        embedding_ids of the inserted rows, in input order
+    """
+    if not rows:
+        return []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS embedding_stage (
+                ord BIGINT,
+                content_text TEXT,
+                embedding vector,
+                source_type TEXT,
+                source_id BIGINT,
+                project_id BIGINT,
+                entity_ids BIGINT[],
+                tags TEXT[]
+            ) ON COMMIT DELETE ROWS
+        """)
+        # A caller's outer transaction may already have staged a batch
+        cursor.execute("TRUNCATE embedding_stage")
+        copy_binary(
+            cursor.cursor,
+            'embedding_stage',
+            STAGE_COLUMNS,
+            STAGE_TYPES,
+            (
+                (
+                    i,
+                    row['content_text'],
+                    row['embedding'],
+                    row['source_type'],
+                    row['source_id'],
+                    row.get('project_id'),
+                    row.get('entity_ids') or [],
+                    row.get('tags') or [],
+                )
+                for i, row in enumerate(rows)
+            ),
+        )
+        cursor.execute("""
+            INSERT INTO landscape.knowledge_embeddings
+            (content_text, embedding, source_type, source_id, project_id, entity_ids, tags, created_at)
+            SELECT content_text, embedding, source_type, source_id, project_id, entity_ids, tags::varchar[], NOW()
+            FROM embedding_stage
+            ORDER BY ord
+            RETURNING embedding_id
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+
 def search_similar(
     query_embedding: List[float],
     project_id: int,
     top_k: int = 5,
     similarity_threshold: float = 0.7,
-    source_types: Optional[List[str]] = None
+    source_types: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    mode: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Search for similar embeddings, scoped to a specific project.
@@ -84,6 +169,10 @@ def search_similar(
         source_types: Optional list of source types to include.
             If None, defaults to ['document'].
             Use ['document', 'market_data', 'user_note'] to include others.
+        query: Query text; required for hybrid mode
+        mode: 'vector' or 'hybrid' (see hybrid_search); defaults to
+            KNOWLEDGE_RETRIEVAL_MODE. Hybrid fuses full-text matches into the
+            document ranking and orders results by rrf_score.
 
     Returns:
         List of matching chunks with similarity scores
@@ -94,31 +183,89 @@ def search_similar(
     if source_types is None:
         source_types = ['document']
 
+    hybrid = resolve_mode(mode) == HYBRID and bool(query and query.strip())
+    # Bound once per statement (see vector_io on why it is still text)
+    query_vector = vector_literal(query_embedding)
     results = []
 
     with connection.cursor() as cursor:
-        if 'document' in source_types:
-            cursor.execute("""
+        if 'document' in source_types and hybrid:
+            # The vector arm ranks the per-project and shared scoped_hits
+            # arms (see vector_index). The lexical arm is a GIN bitmap scan,
+            # where the project filter is only a recheck, so one filter is fine.
+            doc_scope = (
+                "ke.source_type = 'document_chunk' "
+                "AND (ke.project_id = %s OR ke.project_id IS NULL)"
+            )
+            cte = fused_candidates_cte(
+                from_clause="landscape.knowledge_embeddings ke",
+                where_clause=doc_scope,
+                id_column='ke.embedding_id',
+                embedding_column='ke.embedding',
+                text_column='ke.content_text',
+                vector_source='hits',
+            )
+            cursor.execute(f"""
+                WITH {scoped_hits_cte()}, {cte}
                 SELECT
                     ke.embedding_id,
                     ke.content_text,
                     ke.source_id,
                     ke.source_type,
                     d.doc_name,
-                    1 - (ke.embedding <=> %s::vector) as similarity
-                FROM landscape.knowledge_embeddings ke
+                    1 - (ke.embedding <=> q.embedding) as similarity,
+                    f.rrf_score,
+                    f.vector_rank,
+                    f.lexical_rank
+                FROM fused f
+                JOIN landscape.knowledge_embeddings ke ON ke.embedding_id = f.id
                 JOIN landscape.core_doc d ON ke.source_id = d.doc_id
-                WHERE (d.project_id = %s OR d.project_id IS NULL)
-                  AND ke.source_type = 'document_chunk'
-                  AND 1 - (ke.embedding <=> %s::vector) >= %s
-                ORDER BY ke.embedding <=> %s::vector
+                CROSS JOIN query_terms q
+                ORDER BY f.rrf_score DESC
                 LIMIT %s
-            """, [
-                query_embedding,
-                project_id,
-                query_embedding,
+            """, (
+                scoped_hits_params(query_vector, project_id, candidate_pool_size(top_k))
+                + fused_candidates_params(
+                    query_vector, query, [project_id], 1 - similarity_threshold, top_k,
+                    vector_where_params=[],
+                )
+                + [top_k]
+            ))
+
+            for row in cursor.fetchall():
+                results.append({
+                    'id': row[0],
+                    'content': row[1],
+                    'metadata': {},
+                    'source_doc_id': row[2],
+                    'source_type': row[3],
+                    'filename': row[4],
+                    'similarity': float(row[5]),
+                    'rrf_score': float(row[6]),
+                    'vector_rank': row[7],
+                    'lexical_rank': row[8],
+                })
+
+        elif 'document' in source_types:
+            # Threshold applies after each scope's ORDER BY ... LIMIT so the
+            # ANN index scans can stop early (see vector_index)
+            cursor.execute(f"""
+                WITH {scoped_hits_cte()}
+                SELECT
+                    ke.embedding_id,
+                    ke.content_text,
+                    ke.source_id,
+                    ke.source_type,
+                    d.doc_name,
+                    1 - h.distance as similarity
+                FROM hits h
+                JOIN landscape.knowledge_embeddings ke ON ke.embedding_id = h.embedding_id
+                JOIN landscape.core_doc d ON ke.source_id = d.doc_id
+                WHERE 1 - h.distance >= %s
+                ORDER BY h.distance
+                LIMIT %s
+            """, scoped_hits_params(query_vector, project_id, top_k) + [
                 similarity_threshold,
-                query_embedding,
                 top_k
             ])
 
@@ -136,6 +283,7 @@ def search_similar(
         non_doc_types = [t for t in source_types if t != 'document']
         if non_doc_types:
             cursor.execute("""
+                WITH q AS NOT MATERIALIZED (SELECT %s::vector AS embedding)
                 SELECT
                     ke.id,
                     ke.content,
@@ -143,31 +291,30 @@ def search_similar(
                     ke.source_doc_id,
                     ke.source_type,
                     NULL as filename,
-                    1 - (ke.embedding <=> %s::vector) as similarity
+                    1 - (ke.embedding <=> q.embedding) as similarity
                 FROM landscape.knowledge_embeddings ke
+                CROSS JOIN q
                 WHERE ke.source_type = ANY(%s)
                   AND (
                       %s::text = ANY(ke.entity_ids)
                       OR ('project:' || %s::text) = ANY(ke.entity_ids)
                       OR ke.metadata->>'project_id' = %s::text
                   )
-                  AND 1 - (ke.embedding <=> %s::vector) >= %s
-                ORDER BY ke.embedding <=> %s::vector
+                  AND 1 - (ke.embedding <=> q.embedding) >= %s
+                ORDER BY ke.embedding <=> q.embedding
                 LIMIT %s
             """, [
-                query_embedding,
+                query_vector,
                 non_doc_types,
                 str(project_id),
                 str(project_id),
                 str(project_id),
-                query_embedding,
                 similarity_threshold,
-                query_embedding,
                 top_k
             ])
 
-            for row in cursor.fetchall():
-                results.append({
+            for rank, row in enumerate(cursor.fetchall(), start=1):
+                result = {
                     'id': row[0],
                     'content': row[1],
                     'metadata': row[2] or {},
@@ -175,9 +322,14 @@ def search_similar(
                     'source_type': row[4],
                     'filename': row[5],
                     'similarity': float(row[6])
-                })
-
-    results.sort(key=lambda x: x['similarity'], reverse=True)
+                }
+                if hybrid:
+                    # Vector-only arm: score by its rank so it fuses with the documents
+                    result['rrf_score'] = 1.0 / (RRF_K + rank)
+                results.append(result)
+
+    sort_key = 'rrf_score' if hybrid else 'similarity'
+    results.sort(key=lambda x: x[sort_key], reverse=True)
     return results[:top_k]
 
 
@@ -204,29 +356,31 @@ def search_similar_by_vector(
     if not embedding_vector or len(embedding_vector) != 1536:
         return []
 
-    embedding_str = '[' + ','.join(str(x) for x in embedding_vector) + ']'
+    embedding_str = vector_literal(embedding_vector)
 
     where_clause = ""
-    params = [embedding_str, embedding_str, similarity_threshold, embedding_str, limit]
+    params = [embedding_str, similarity_threshold, limit]
 
     if source_type_filter:
         where_clause = "AND source_type = %s"
-        params = [embedding_str, embedding_str, similarity_threshold, source_type_filter, embedding_str, limit]
+        params = [embedding_str, similarity_threshold, source_type_filter, limit]
 
     sql = f"""
+        WITH q AS NOT MATERIALIZED (SELECT %s::vector AS embedding)
         SELECT
-            embedding_id,
-            content_text,
-            source_type,
-            source_id,
-            entity_ids,
-            tags,
-            1 - (embedding <=> %s::vector) as similarity
-        FROM landscape.knowledge_embeddings
-        WHERE embedding IS NOT NULL
-          AND 1 - (embedding <=> %s::vector) >= %s
+            ke.embedding_id,
+            ke.content_text,
+            ke.source_type,
+            ke.source_id,
+            ke.entity_ids,
+            ke.tags,
+            1 - (ke.embedding <=> q.embedding) as similarity
+        FROM landscape.knowledge_embeddings ke
+        CROSS JOIN q
+        WHERE ke.embedding IS NOT NULL
+          AND 1 - (ke.embedding <=> q.embedding) >= %s
           {where_clause}
-        ORDER BY embedding <=> %s::vector
+        ORDER BY ke.embedding <=> q.embedding
         LIMIT %s
     """
 
@@ -9,21 +9,19 @@ Both are required: values for Python replication comparisons, formulas for
 integrity checks (range consistency, broken refs, circular deps).
 
 File resolution:
-  core_doc.storage_uri -> django default_storage -> NamedTemporaryFile
+  core_doc.storage_uri -> blob_cache.checkout_document -> local temp path
 """
 
 import logging
 import os
-import shutil
-import tempfile
 from typing import Tuple, Optional
 
-import requests
-from django.core.files.storage import default_storage
 from django.db import connection
 from openpyxl import load_workbook
 from openpyxl.workbook.workbook import Workbook
 
+from ..blob_cache import checkout_document
+
 logger = logging.getLogger(__name__)
 
 EXCEL_MIME_TYPES = {
@@ -37,11 +35,11 @@ class UnsupportedFileError(Exception):
     pass
 
 
-def _fetch_doc_row(doc_id: int) -> Optional[Tuple[str, str, str]]:
+def _fetch_doc_row(doc_id: int) -> Optional[Tuple[str, str, str, Optional[str]]]:
     with connection.cursor() as cursor:
         cursor.execute(
             """
-            SELECT storage_uri, mime_type, doc_name
+            SELECT storage_uri, mime_type, doc_name, sha256_hash
             FROM landscape.core_doc
             WHERE doc_id = %s
             """,
@@ -66,7 +64,7 @@ def load_workbook_from_doc(doc_id: int) -> Tuple[Workbook, Workbook, str]:
     if not row:
         raise UnsupportedFileError(f"core_doc {doc_id} not found")
 
-    storage_uri, mime_type, doc_name = row
+    storage_uri, mime_type, doc_name, content_hash = row
 
     if mime_type not in EXCEL_MIME_TYPES:
         raise UnsupportedFileError(
@@ -78,17 +76,7 @@ def load_workbook_from_doc(doc_id: int) -> Tuple[Workbook, Workbook, str]:
 
     is_xlsm = "macroEnabled" in (mime_type or "")
     suffix = ".xlsm" if is_xlsm else ".xlsx"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        if storage_uri.startswith(("http://", "https://")):
-            # UploadThing / any HTTP(S) URL — fetch directly
-            resp = requests.get(storage_uri, stream=True, timeout=30)
-            resp.raise_for_status()
-            shutil.copyfileobj(resp.raw, tmp)
-        else:
-            # S3 key or local path — route through Django storage backend
-            with default_storage.open(storage_uri, "rb") as src:
-                tmp.write(src.read())
-        tmp_path = tmp.name
+    tmp_path = checkout_document(storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=suffix)
 
     try:
         values_wb = load_workbook(
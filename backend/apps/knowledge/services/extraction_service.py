@@ -10,12 +10,18 @@ This service handles:
 import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
+import re
+from typing import Dict, List, Any, Optional, Tuple
 from decimal import Decimal
 from django.db import connection
 from django.conf import settings
 from anthropic import Anthropic
 from .opex_utils import upsert_opex_entry
+from .column_discovery import _infer_mime_type, _is_structured_file
+from .llm_cache import LLMCacheStats, cached_messages_create
+from .llm_pool import LLMRequest, run_messages
+from .structured_rent_roll import StructuredRentRoll, read_structured_rent_roll
+from .text_layer import ensure_text_layer, save_text_layer
 
 logger = logging.getLogger(__name__)
 
@@ -767,9 +773,11 @@ class ExtractionService:
         # Call Claude for extraction
         try:
             client = _get_anthropic_client()
-            response = client.messages.create(
+            response = cached_messages_create(
+                client,
                 model="claude-sonnet-4-20250514",
                 max_tokens=4096,
+                validate=lambda text: self._parse_extraction_response(text) is not None,
                 system="""You are a data extraction assistant for real estate analysis.
 Extract structured data from document content with high precision.
 Only extract data that is explicitly stated in the documents.
@@ -1486,9 +1494,11 @@ Never guess or make up values - only extract what is explicitly stated."""
             else:
                 system_prompt = base_system
 
-            response = client.messages.create(
+            response = cached_messages_create(
+                client,
                 model="claude-sonnet-4-20250514",
                 max_tokens=4096,
+                validate=lambda text: self._parse_extraction_response(text) is not None,
                 system=system_prompt,
                 messages=[{"role": "user", "content": prompt}]
             )
@@ -1649,45 +1659,20 @@ Never guess or make up values - only extract what is explicitly stated."""
                 'project_id': row[2],
             }
 
-            # Get content from embeddings (ordered chunks)
-            cursor.execute("""
-                SELECT content_text
-                FROM landscape.knowledge_embeddings
-                WHERE source_id = %s AND source_type = 'document_chunk'
-                ORDER BY embedding_id
-                LIMIT 100
-            """, [doc_id])
-
-            chunks = cursor.fetchall()
-            content = "\n".join(chunk[0] for chunk in chunks if chunk[0])
+            # Full text from the persisted text layer (extracted once if missing)
+            layer = ensure_text_layer(doc_id)
+            content = layer.text if layer else ''
 
-            # Fallback to extracted_text if no embeddings
+            # Fall back to core_doc.extracted_text if the file has no readable text
             if not content:
                 cursor.execute("""
-                    SELECT COALESCE(extracted_text, ''), storage_uri, mime_type
+                    SELECT COALESCE(extracted_text, '')
                     FROM landscape.core_doc
                     WHERE doc_id = %s
                 """, [doc_id])
                 row = cursor.fetchone()
                 content = row[0] if row and row[0] else ''
 
-                # If still no content, try direct text extraction from the file
-                # (handles images via Vision API, fresh uploads with no embeddings yet)
-                if not content and row and row[1]:
-                    try:
-                        from .text_extraction import extract_text_from_url
-                        extracted_text, _err = extract_text_from_url(row[1], row[2])
-                        if extracted_text:
-                            content = extracted_text
-                            # Cache in core_doc.extracted_text for subsequent calls
-                            cursor.execute("""
-                                UPDATE landscape.core_doc
-                                SET extracted_text = %s
-                                WHERE doc_id = %s AND (extracted_text IS NULL OR extracted_text = '')
-                            """, [extracted_text[:100000], doc_id])
-                    except Exception as e:
-                        logger.warning(f"Direct extraction fallback failed for doc {doc_id}: {e}")
-
             doc_info['text'] = content
             return doc_info
 
@@ -2625,6 +2610,16 @@ def get_extraction_batches(property_type: str) -> list:
     return EXTRACTION_BATCHES_MF
 
 
+BATCH_SYSTEM_PROMPT = (
+    "You are a real estate document analyst. "
+    "Extract data precisely and completely from the provided document text. "
+    "Do NOT infer, calculate, fabricate, or estimate any values — only extract data that is explicitly and literally present in the document. "
+    "If a field value is not explicitly stated in the document text, omit it entirely. "
+    "Never derive market rent from current rent, or vice versa. "
+    "Return ONLY valid JSON."
+)
+
+
 class BatchedExtractionService:
     """
     Extracts document data in batches to avoid prompt/response size limits.
@@ -2706,15 +2701,10 @@ class BatchedExtractionService:
                     [doc_id],
                 )
                 if not cursor.fetchone():
-                    word_count = len(doc_content.split())
-                    cursor.execute("""
-                        INSERT INTO landscape.core_doc_text
-                            (doc_id, extracted_text, word_count, extraction_method)
-                        VALUES (%s, %s, %s, 'batched_extraction_backfill')
-                    """, [doc_id, doc_content, word_count])
+                    save_text_layer(cursor, doc_id, doc_content, None, 'batched_extraction_backfill')
                     logger.info(
                         f"Backfilled core_doc_text for doc {doc_id} "
-                        f"({word_count} words)"
+                        f"({len(doc_content.split())} words)"
                     )
         except Exception as e:
             # Non-fatal — extraction can proceed without this
@@ -2731,6 +2721,9 @@ class BatchedExtractionService:
 
         logger.info(f"Starting batched extraction for doc {doc_id} ({len(batches_to_run)} batches)")
 
+        # Build every batch's prompt first; the Claude calls are independent
+        # of each other, so they run together through the LLM pool
+        planned = []
         for batch in batches_to_run:
             batch_name = batch['name']
             scopes = batch['scopes']
@@ -2753,23 +2746,15 @@ class BatchedExtractionService:
                     continue
 
                 logger.info(f"Batch '{batch_name}': {len(fields)} fields from scopes {scopes}")
-
-                # Run extraction for this batch
-                batch_result = self._extract_batch(
-                    doc_id=doc_id,
-                    doc_info=doc_info,
+                prompt = self._build_batch_prompt(
                     doc_content=doc_content,
                     fields=fields,
                     batch_name=batch_name,
                     batch_description=batch['description'],
                     scopes=scopes,
                 )
-
-                results.append(batch_result)
-                if batch_result.get('success'):
-                    total_staged += batch_result.get('staged', 0)
-                else:
-                    errors.append(f"{batch_name}: {batch_result.get('error', 'Unknown error')}")
+                results.append(None)  # Filled in below, keeping batch order
+                planned.append((len(results) - 1, batch_name, fields, scopes, prompt))
 
             except Exception as e:
                 logger.exception(f"Batch {batch_name} failed: {e}")
@@ -2780,6 +2765,50 @@ class BatchedExtractionService:
                     'error': str(e),
                 })
 
+        responses = []
+        cache_stats = LLMCacheStats()
+        if planned:
+            try:
+                responses = run_messages(
+                    _get_anthropic_client(),
+                    [
+                        LLMRequest(
+                            prompt=prompt,
+                            system=BATCH_SYSTEM_PROMPT,
+                            validate=lambda text, fields=fields, scopes=scopes: (
+                                self._parse_batch_response(text, fields, scopes) is not None
+                            ),
+                        )
+                        for _, _, fields, scopes, prompt in planned
+                    ],
+                    cache_stats=cache_stats,
+                )
+            except Exception as e:
+                logger.exception(f"Batched extraction failed: {e}")
+                responses = [e] * len(planned)
+
+        # Parse and stage in batch order, so results are the same however
+        # the calls interleaved
+        for (position, batch_name, fields, scopes, _), response in zip(planned, responses):
+            try:
+                batch_result = self._stage_batch_response(
+                    doc_id=doc_id,
+                    doc_info=doc_info,
+                    response=response,
+                    fields=fields,
+                    batch_name=batch_name,
+                    scopes=scopes,
+                )
+            except Exception as e:
+                logger.exception(f"Batch {batch_name} failed: {e}")
+                batch_result = {'batch': batch_name, 'success': False, 'error': str(e)}
+
+            results[position] = batch_result
+            if batch_result.get('success'):
+                total_staged += batch_result.get('staged', 0)
+            else:
+                errors.append(f"{batch_name}: {batch_result.get('error', 'Unknown error')}")
+
         return {
             'success': len(errors) == 0,
             'doc_id': doc_id,
@@ -2788,99 +2817,70 @@ class BatchedExtractionService:
             'batches_succeeded': sum(1 for r in results if r.get('success')),
             'total_staged': total_staged,
             'results': results,
+            'llm_cache': cache_stats.as_dict(),
             'errors': errors,
         }
 
-    def _extract_batch(
+    def _stage_batch_response(
         self,
         doc_id: int,
         doc_info: Dict[str, Any],
-        doc_content: str,
+        response: Any,
         fields: List[Any],
         batch_name: str,
-        batch_description: str,
         scopes: List[str],
     ) -> Dict[str, Any]:
-        """Extract a single batch of fields."""
-        logger.info(f"Extracting batch '{batch_name}' with {len(fields)} fields")
-
-        # Build batch-specific prompt
-        prompt = self._build_batch_prompt(
-            doc_content=doc_content,
-            fields=fields,
-            batch_name=batch_name,
-            batch_description=batch_description,
-            scopes=scopes,
-        )
-
-        # Call Claude API
-        try:
-            client = _get_anthropic_client()
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=8000,
-                system=(
-                    "You are a real estate document analyst. "
-                    "Extract data precisely and completely from the provided document text. "
-                    "Do NOT infer, calculate, fabricate, or estimate any values — only extract data that is explicitly and literally present in the document. "
-                    "If a field value is not explicitly stated in the document text, omit it entirely. "
-                    "Never derive market rent from current rent, or vice versa. "
-                    "Return ONLY valid JSON."
-                ),
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            response_text = response.content[0].text
-            extractions = self._parse_batch_response(response_text, fields, scopes)
-
-            if extractions is None:
-                return {
-                    'batch': batch_name,
-                    'success': False,
-                    'error': 'Failed to parse JSON response',
-                    'fields': len(fields),
-                    'raw_response': response_text[:500] if response_text else None,
-                }
-
-            # ISSUE 1 FIX: Deduplicate within batch before staging
-            extractions = deduplicate_extractions(extractions)
-
-            if not extractions:
-                return {
-                    'batch': batch_name,
-                    'success': True,
-                    'staged': 0,
-                    'note': 'No extractable fields found in response',
-                    'fields': len(fields),
-                    'raw_response': response_text[:500] if response_text else None,
-                }
+        """Parse and stage one batch's Claude response (text, or the exception raised)."""
+        if isinstance(response, Exception):
+            return {
+                'batch': batch_name,
+                'success': False,
+                'error': str(response),
+                'fields': len(fields),
+            }
 
-            # Stage extractions
-            staged_count = self._stage_batch_extractions(
-                doc_id=doc_id,
-                doc_info=doc_info,
-                extractions=extractions,
-                fields=fields,
-                scopes=scopes,
-            )
+        response_text = response
+        extractions = self._parse_batch_response(response_text, fields, scopes)
 
+        if extractions is None:
             return {
                 'batch': batch_name,
-                'success': True,
-                'staged': staged_count,
+                'success': False,
+                'error': 'Failed to parse JSON response',
                 'fields': len(fields),
-                'extracted': len(extractions),
+                'raw_response': response_text[:500] if response_text else None,
             }
 
-        except Exception as e:
-            logger.exception(f"Batch extraction failed: {e}")
+        # ISSUE 1 FIX: Deduplicate within batch before staging
+        extractions = deduplicate_extractions(extractions)
+
+        if not extractions:
             return {
                 'batch': batch_name,
-                'success': False,
-                'error': str(e),
+                'success': True,
+                'staged': 0,
+                'note': 'No extractable fields found in response',
                 'fields': len(fields),
+                'raw_response': response_text[:500] if response_text else None,
             }
 
+        # Stage extractions
+        staged_count = self._stage_batch_extractions(
+            doc_id=doc_id,
+            doc_info=doc_info,
+            extractions=extractions,
+            fields=fields,
+            scopes=scopes,
+        )
+
+        return {
+            'batch': batch_name,
+            'success': True,
+            'staged': staged_count,
+            'fields': len(fields),
+            'extracted': len(extractions),
+        }
+
     # Inline hints for fields that Claude commonly misses or confuses
     FIELD_HINTS = {
         'zip_code': 'IMPORTANT: 5-digit US ZIP code only (e.g. 90501). NOT the street number.',
@@ -3177,44 +3177,9 @@ Include a note in source_quote indicating whether value is monthly or annual."""
         return "\n".join(instructions)
 
     def _get_document_content(self, doc_id: int) -> Optional[str]:
-        """Get document text content from embeddings or direct extraction."""
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT content_text
-                FROM landscape.knowledge_embeddings
-                WHERE source_id = %s AND source_type = 'document_chunk'
-                ORDER BY embedding_id
-                LIMIT 100
-            """, [doc_id])
-            rows = cursor.fetchall()
-
-        if rows:
-            return "\n\n".join(row[0] for row in rows if row[0])
-
-        # Fallback: fetch document storage_uri and extract text directly
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT storage_uri, mime_type, doc_name
-                FROM landscape.core_doc
-                WHERE doc_id = %s
-            """, [doc_id])
-            doc_row = cursor.fetchone()
-
-        if not doc_row:
-            return None
-
-        storage_uri, mime_type, _doc_name = doc_row
-        try:
-            from .text_extraction import extract_text_from_url
-            extracted_text, extract_error = extract_text_from_url(storage_uri, mime_type)
-            if extracted_text:
-                return extracted_text
-            if extract_error:
-                logger.warning(f"[doc_id={doc_id}] Direct text extraction failed: {extract_error}")
-        except Exception as e:
-            logger.exception(f"[doc_id={doc_id}] Direct text extraction exception: {e}")
-
-        return None
+        """Get the document's full text from its persisted text layer."""
+        layer = ensure_text_layer(doc_id)
+        return layer.text if layer else None
 
     def _get_document_info(self, doc_id: int) -> Optional[Dict[str, Any]]:
         """Get document info."""
@@ -3611,8 +3576,73 @@ RENT_ROLL_CONFIG = {
     'optional_fields': [
         'market_rent',
     ],
+    'overlap_rows': 3,  # Neighbouring rows repeated on each side of a chunk slice
+    'header_chars': 2000,  # Text before the first row kept as column headings
+    'max_row_gap_lines': 6,  # Non-row lines (page breaks) allowed inside one table
+    'review_rows_per_prompt': 100,  # Spreadsheet rows per structured-review call
 }
 
+RENT_ROLL_SYSTEM_PROMPT = """You are a real estate rent roll data extractor.
+Extract unit-level data with high precision. Return ONLY valid JSON array.
+IMPORTANT: Extract exactly the ROW RANGE requested - count rows from the first data row after headers.
+The row number is NOT the same as unit number (e.g., row 1 might be unit 100, row 36 might be unit 201).
+CRITICAL: For tenant_name, extract the EXACT name from the source. NEVER use placeholders like "Current Tenant" or "Tenant" - always use the actual name or omit the field."""
+
+RENT_ROLL_OUTPUT_FORMAT = """## OUTPUT FORMAT
+Return a JSON array of unit objects:
+```json
+[
+  {
+    "unit_number": "100",
+    "unit_type": "1BR/1BA",
+    "bedrooms": 1,
+    "bathrooms": 1,
+    "square_feet": 650,
+    "current_rent": 1595,
+    "occupancy_status": "Occupied",
+    "lease_start": "2024-01-15",
+    "lease_end": "2025-01-14",
+    "tenant_name": "John Smith",
+    "move_in_date": "2024-01-15",
+    "rent_effective_date": "2024-01-15"
+  },
+  {
+    "unit_number": "101",
+    "unit_type": "2BR/2BA",
+    "bedrooms": 2,
+    "bathrooms": 2,
+    "square_feet": 950,
+    "current_rent": 2150,
+    "occupancy_status": "Vacant"
+  }
+]
+```
+
+RULES:
+- Extract ONLY units in the requested range for this chunk
+- Extract ONLY fields listed in FIELDS TO EXTRACT above — do NOT add fields not listed
+- Numeric fields: numbers only (1595 not "$1,595")
+- Dates: ISO format "YYYY-MM-DD"
+- Include all available fields; omit if not found
+- tenant_name: Extract the EXACT name from the source document. NEVER substitute "Current Tenant", "Tenant", or any placeholder - use the actual name or omit the field entirely if not present
+- Return ONLY the JSON array, no other text"""
+
+# A rent roll row: a short line starting with a unit label (101, A-204, 12B),
+# not a date, time or decimal, that carries at least two more numbers (sf,
+# rent, deposit, dates...)
+_UNIT_ROW_RE = re.compile(r'^[ \t]*(?P<unit>[A-Z]{0,2}-?\d{1,4}[A-Z]?)\b(?![/.:-]\d).*$', re.MULTILINE)
+_NUMBER_RE = re.compile(r'\$?\d[\d,]*(?:\.\d+)?')
+# A cell only a rent roll row has: a dollar amount, a unit type, a lease
+# date or an occupancy status. GL-code and year-leading statement lines
+# have numbers but none of these.
+_RENT_ROW_CELL_RE = re.compile(
+    r'\$\s?\d'
+    r'|\b\d\s?(?:BR|BD|Bed)s?\b|\bStudio\b|\b\d\s?x\s?\d(?:\.\d)?\b'
+    r'|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b'
+    r'|\b(?:Occupied|Vacant|Notice|NTV|Leased|Model|Down|Eviction)\b',
+    re.IGNORECASE,
+)
+
 
 class ChunkedRentRollExtractor:
     """
@@ -3631,10 +3661,15 @@ class ChunkedRentRollExtractor:
         self,
         doc_id: int,
         user_id: Optional[int] = None,
+        mappings: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """
         Extract rent roll in chunks.
 
+        XLSX/CSV rent rolls whose columns can be mapped (from the confirmed
+        ``mappings``, {source column: field}, or by column discovery) are
+        parsed directly instead; see _extract_structured.
+
         1. First, get total unit count estimate
         2. Split into chunks of ~35 units
         3. Extract each chunk with specific unit range
@@ -3643,6 +3678,7 @@ class ChunkedRentRollExtractor:
         Args:
             doc_id: Document ID containing rent roll
             user_id: For audit trail
+            mappings: Confirmed column mappings for spreadsheet rent rolls
 
         Returns:
             {
@@ -3657,19 +3693,24 @@ class ChunkedRentRollExtractor:
         errors = []
         all_units = []
 
-        # Get document content
-        doc_content = self._get_document_content(doc_id)
-        if not doc_content:
+        doc_info = self._get_document_info(doc_id)
+        if not doc_info:
             return {
                 'success': False,
-                'error': f'No content found for document {doc_id}',
+                'error': f'Document {doc_id} not found',
             }
 
-        doc_info = self._get_document_info(doc_id)
-        if not doc_info:
+        # Spreadsheets with recognisable columns skip the chunked LLM pass
+        structured_result = self._extract_structured(doc_id, doc_info, mappings)
+        if structured_result:
+            return structured_result
+
+        # Get document content
+        doc_content = self._get_document_content(doc_id)
+        if not doc_content:
             return {
                 'success': False,
-                'error': f'Document {doc_id} not found',
+                'error': f'No content found for document {doc_id}',
             }
 
         logger.info(f"Starting chunked rent roll extraction for doc {doc_id}")
@@ -3678,45 +3719,74 @@ class ChunkedRentRollExtractor:
         estimated_units = self._estimate_unit_count(doc_content)
         logger.info(f"Estimated unit count: {estimated_units}")
 
-        # Calculate number of chunks needed
+        # Calculate number of chunks needed. When the table rows can be
+        # located, chunk by the rows actually found and give each chunk only
+        # its own slice of the document.
         chunk_size = RENT_ROLL_CONFIG['chunk_size']
         max_chunks = RENT_ROLL_CONFIG['max_chunks']
-        num_chunks = min((estimated_units + chunk_size - 1) // chunk_size, max_chunks)
+        rows = self._locate_unit_rows(doc_content)
+        if len(rows) >= chunk_size:
+            num_chunks = min((len(rows) + chunk_size - 1) // chunk_size, max_chunks)
+            logger.info(f"Located {len(rows)} rent roll rows")
+        else:
+            rows = []
+            num_chunks = min((estimated_units + chunk_size - 1) // chunk_size, max_chunks)
 
         if num_chunks == 0:
             num_chunks = 1  # At least one chunk
 
         logger.info(f"Will extract in {num_chunks} chunks of {chunk_size} units each")
 
-        # Step 2: Extract each chunk
+        # Step 2: Extract all chunks together through the LLM pool
+        prompts = []
         for chunk_idx in range(num_chunks):
-            start_unit = chunk_idx * chunk_size + 1
-            end_unit = (chunk_idx + 1) * chunk_size
-
-            logger.info(f"Extracting chunk {chunk_idx + 1}/{num_chunks}: units {start_unit}-{end_unit}")
-
-            try:
-                chunk_result = self._extract_rent_roll_chunk(
+            if rows:
+                prompts.append(self._build_rent_roll_slice_prompt(
                     doc_content=doc_content,
+                    rows=rows,
                     chunk_idx=chunk_idx,
-                    start_unit=start_unit,
-                    end_unit=end_unit,
                     total_chunks=num_chunks,
-                )
+                ))
+            else:
+                prompts.append(self._build_rent_roll_chunk_prompt(
+                    doc_content=doc_content,
+                    chunk_idx=chunk_idx,
+                    start_unit=chunk_idx * chunk_size + 1,
+                    end_unit=(chunk_idx + 1) * chunk_size,
+                    total_chunks=num_chunks,
+                ))
+
+        cache_stats = LLMCacheStats()
+        try:
+            responses = run_messages(
+                _get_anthropic_client(),
+                [
+                    LLMRequest(
+                        prompt=prompt,
+                        system=RENT_ROLL_SYSTEM_PROMPT,
+                        validate=lambda text: self._parse_rent_roll_response(text) is not None,
+                    )
+                    for prompt in prompts
+                ],
+                cache_stats=cache_stats,
+            )
+        except Exception as e:
+            logger.exception(f"Chunk extraction failed: {e}")
+            responses = [e] * num_chunks
 
-                if chunk_result.get('success'):
-                    units = chunk_result.get('units', [])
+        # Parse in chunk order so the first occurrence of a unit always wins
+        for chunk_idx, response in enumerate(responses):
+            if isinstance(response, Exception):
+                error_msg = f"Chunk {chunk_idx + 1}: {str(response)}"
+            else:
+                units = self._parse_rent_roll_response(response)
+                if units is not None:
                     all_units.extend(units)
                     logger.info(f"Chunk {chunk_idx + 1}: extracted {len(units)} units")
-                else:
-                    error_msg = f"Chunk {chunk_idx + 1}: {chunk_result.get('error', 'Unknown error')}"
-                    errors.append(error_msg)
-                    logger.warning(error_msg)
-
-            except Exception as e:
-                error_msg = f"Chunk {chunk_idx + 1}: {str(e)}"
-                errors.append(error_msg)
-                logger.exception(error_msg)
+                    continue
+                error_msg = f"Chunk {chunk_idx + 1}: Failed to parse response"
+            errors.append(error_msg)
+            logger.warning(error_msg)
 
         # Step 3: Deduplicate units by unit_number
         unique_units = {}
@@ -3742,12 +3812,201 @@ class ChunkedRentRollExtractor:
             'doc_id': doc_id,
             'project_id': self.project_id,
             'estimated_units': estimated_units,
+            'rows_located': len(rows),
             'chunks_processed': num_chunks,
             'units_extracted': len(deduped_units),
             'staged_count': staged_count,
+            'llm_cache': cache_stats.as_dict(),
             'errors': errors,
         }
 
+    def _extract_structured(
+        self,
+        doc_id: int,
+        doc_info: Dict[str, Any],
+        mappings: Optional[Dict[str, str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parse a spreadsheet rent roll from its mapped columns, sending only
+        rows and columns that fail validation to Claude. Returns None (and
+        the caller falls back to chunked extraction) for non-spreadsheets or
+        sheets without a recognisable unit column.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT storage_uri, mime_type, doc_name, sha256_hash
+                FROM landscape.core_doc
+                WHERE doc_id = %s
+            """, [doc_id])
+            row = cursor.fetchone()
+
+        if not row or not row[0]:
+            return None
+        storage_uri, mime_type, doc_name, content_hash = row
+        mime_type = mime_type or _infer_mime_type(storage_uri, doc_name)
+        if not _is_structured_file(mime_type):
+            return None
+
+        try:
+            parsed = read_structured_rent_roll(
+                storage_uri, mime_type, doc_name, doc_id=doc_id, confirmed=mappings,
+                content_hash=content_hash,
+            )
+        except Exception as e:
+            logger.warning(f"Structured rent roll parse failed for doc {doc_id}: {e}")
+            return None
+        if not parsed or not parsed.units:
+            return None
+
+        fields = list(RENT_ROLL_CONFIG['fields_per_unit']) + list(RENT_ROLL_CONFIG.get('optional_fields', []))
+        units = [{k: v for k, v in unit.items() if k in fields} for unit in parsed.units]
+        logger.info(
+            f"Structured rent roll for doc {doc_id}: {len(units)} units, "
+            f"{len(parsed.review_rows)} rows and {parsed.review_fields or 'no'} columns to review"
+        )
+
+        errors = self._review_structured_units(parsed, units, fields)
+
+        # Deduplicate units by unit_number, as the chunked path does
+        unique_units = {}
+        for unit in units:
+            unique_units.setdefault(unit['unit_number'], unit)
+        deduped_units = list(unique_units.values())
+
+        staged_count = self._stage_rent_roll_units(
+            doc_id=doc_id,
+            doc_info=doc_info,
+            units=deduped_units,
+        )
+
+        return {
+            'success': True,
+            'method': 'structured',
+            'doc_id': doc_id,
+            'project_id': self.project_id,
+            'estimated_units': len(parsed.units),
+            'chunks_processed': 0,
+            'units_extracted': len(deduped_units),
+            'staged_count': staged_count,
+            'reviewed_rows': len(parsed.review_rows),
+            'reviewed_fields': parsed.review_fields,
+            'totals': parsed.totals,
+            'warnings': parsed.warnings,
+            'errors': errors,
+        }
+
+    def _review_structured_units(
+        self,
+        parsed: StructuredRentRoll,
+        units: List[Dict],
+        fields: List[str],
+    ) -> List[str]:
+        """
+        Have Claude read the cells the structured parse could not trust and
+        merge its values into ``units`` in place. Rows with a bad cell are
+        sent whole and only fill the fields that failed; a failed column is
+        sent alongside the unit column and replaces that field everywhere.
+        """
+        per_prompt = RENT_ROLL_CONFIG['review_rows_per_prompt']
+        unit_col = parsed.field_columns['unit_number']
+        review_fields = [f for f in parsed.review_fields if f in fields]
+
+        batches = []  # (unit positions, source column positions, fields to replace)
+        for start in range(0, len(parsed.review_rows), per_prompt):
+            batches.append((parsed.review_rows[start:start + per_prompt], None, []))
+        if review_fields:
+            columns = sorted({unit_col} | {parsed.field_columns[f] for f in review_fields})
+            positions = list(range(len(units)))
+            for start in range(0, len(positions), per_prompt):
+                batches.append((positions[start:start + per_prompt], columns, review_fields))
+        if not batches:
+            return []
+
+        prompts = []
+        for positions, columns, replace in batches:
+            columns = columns or list(range(len(parsed.source_headers)))
+            prompts.append(self._build_rent_roll_review_prompt(
+                headers=[parsed.source_headers[c] for c in columns],
+                rows=[[parsed.source_rows[p][c] for c in columns] for p in positions],
+                fields=['unit_number'] + replace if replace else fields,
+            ))
+
+        try:
+            responses = run_messages(
+                _get_anthropic_client(),
+                [
+                    LLMRequest(
+                        prompt=prompt,
+                        system=RENT_ROLL_SYSTEM_PROMPT,
+                        validate=lambda text: self._parse_rent_roll_response(text) is not None,
+                    )
+                    for prompt in prompts
+                ],
+            )
+        except Exception as e:
+            logger.exception(f"Structured rent roll review failed: {e}")
+            responses = [e] * len(prompts)
+
+        errors = []
+        for batch_idx, ((positions, _, replace), response) in enumerate(zip(batches, responses)):
+            reviewed = None
+            if isinstance(response, Exception):
+                errors.append(f"Review {batch_idx + 1}: {str(response)}")
+            else:
+                reviewed = self._parse_rent_roll_response(response)
+                if reviewed is None:
+                    errors.append(f"Review {batch_idx + 1}: Failed to parse response")
+            if reviewed is None:
+                continue
+
+            by_unit = {}
+            for unit in reviewed:
+                by_unit.setdefault(str(unit.get('unit_number', '')), unit)
+            for position in positions:
+                unit = units[position]
+                found = by_unit.get(unit['unit_number'])
+                if found is None:
+                    continue
+                if replace:
+                    for f in replace:
+                        if found.get(f) is not None:
+                            unit[f] = found[f]
+                        else:
+                            unit.pop(f, None)
+                else:
+                    for f in fields:
+                        if f not in unit and found.get(f) is not None:
+                            unit[f] = found[f]
+
+        for error in errors:
+            logger.warning(error)
+        return errors
+
+    def _build_rent_roll_review_prompt(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        fields: List[str],
+    ) -> str:
+        """Build prompt for reading a block of spreadsheet rows."""
+        field_list = "\n".join([f"- {f}" for f in fields])
+        table = "\n".join('\t'.join(cells) for cells in [headers] + rows)
+
+        return f"""Extract rent roll data from these spreadsheet rows.
+
+## CHUNK INSTRUCTIONS
+The first line holds the column headings. Every other line is one unit: extract all {len(rows)} of them, in order.
+
+## FIELDS TO EXTRACT (per unit)
+{field_list}
+
+## DOCUMENT CONTENT
+<document>
+{table}
+</document>
+
+{RENT_ROLL_OUTPUT_FORMAT}"""
+
     def _estimate_unit_count(self, doc_content: str) -> int:
         """
         Estimate total unit count from document.
@@ -3825,59 +4084,51 @@ class ChunkedRentRollExtractor:
         # Default - assume a medium-sized property if we can't estimate
         return 120
 
-    def _extract_rent_roll_chunk(
-        self,
-        doc_content: str,
-        chunk_idx: int,
-        start_unit: int,
-        end_unit: int,
-        total_chunks: int,
-    ) -> Dict[str, Any]:
-        """Extract a single chunk of rent roll units."""
-
-        prompt = self._build_rent_roll_chunk_prompt(
-            doc_content=doc_content,
-            chunk_idx=chunk_idx,
-            start_unit=start_unit,
-            end_unit=end_unit,
-            total_chunks=total_chunks,
-        )
-
-        try:
-            client = _get_anthropic_client()
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=8000,
-                system="""You are a real estate rent roll data extractor.
-Extract unit-level data with high precision. Return ONLY valid JSON array.
-IMPORTANT: Extract exactly the ROW RANGE requested - count rows from the first data row after headers.
-The row number is NOT the same as unit number (e.g., row 1 might be unit 100, row 36 might be unit 201).
-CRITICAL: For tenant_name, extract the EXACT name from the source. NEVER use placeholders like "Current Tenant" or "Tenant" - always use the actual name or omit the field.""",
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            response_text = response.content[0].text
-            units = self._parse_rent_roll_response(response_text)
+    def _locate_unit_rows(self, doc_content: str) -> List[Tuple[int, int, str]]:
+        """
+        (start, end, unit label) of every rent roll row, in document order.
+
+        A row is a line led by a unit label with at least three numbers and
+        a rent-roll-shaped cell (see _RENT_ROW_CELL_RE). Only the longest run
+        of rows is kept, allowing a few other lines between rows for page
+        breaks, so stray matches elsewhere in the document are dropped. Text
+        extraction that splits table cells onto separate lines yields few or
+        no rows, and the caller falls back to sending the whole document.
+        """
+        max_gap = RENT_ROLL_CONFIG['max_row_gap_lines']
+        runs: List[List[Tuple[int, int, str]]] = []
+        for match in _UNIT_ROW_RE.finditer(doc_content):
+            line = match.group(0)
+            if (
+                len(line) > 400
+                or len(_NUMBER_RE.findall(line)) < 3
+                or not _RENT_ROW_CELL_RE.search(line)
+            ):
+                continue
+            row = (match.start(), match.end(), match.group('unit'))
+            if runs:
+                gap = doc_content[runs[-1][-1][1]:row[0]]
+                if sum(1 for gap_line in gap.splitlines() if gap_line.strip()) <= max_gap:
+                    runs[-1].append(row)
+                    continue
+            runs.append([row])
+        return max(runs, key=len, default=[])
 
-            if units is None:
-                return {
-                    'success': False,
-                    'error': 'Failed to parse response',
-                    'raw_response': response_text[:500],
-                }
+    def _rent_roll_field_list(self, doc_content: str) -> str:
+        """Fields to extract per unit, as a prompt bullet list."""
+        fields = list(RENT_ROLL_CONFIG['fields_per_unit'])
 
-            return {
-                'success': True,
-                'units': units,
-                'count': len(units),
-            }
+        # Include optional fields only if their keywords appear in the document
+        doc_lower = doc_content[:5000].lower()  # Check header area only
+        optional_keywords = {
+            'market_rent': ['market rent', 'asking rent', 'mkt rent', 'pro forma rent', 'stabilized rent', 'proforma rent'],
+        }
+        for opt_field in RENT_ROLL_CONFIG.get('optional_fields', []):
+            keywords = optional_keywords.get(opt_field, [opt_field.replace('_', ' ')])
+            if any(kw in doc_lower for kw in keywords):
+                fields.append(opt_field)
 
-        except Exception as e:
-            logger.exception(f"Chunk extraction failed: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-            }
+        return "\n".join([f"- {f}" for f in fields])
 
     def _build_rent_roll_chunk_prompt(
         self,
@@ -3889,19 +4140,7 @@ CRITICAL: For tenant_name, extract the EXACT name from the source. NEVER use pla
     ) -> str:
         """Build prompt for extracting a specific chunk of units."""
 
-        fields = list(RENT_ROLL_CONFIG['fields_per_unit'])
-
-        # Include optional fields only if their keywords appear in the document
-        doc_lower = doc_content[:5000].lower()  # Check header area only
-        optional_keywords = {
-            'market_rent': ['market rent', 'asking rent', 'mkt rent', 'pro forma rent', 'stabilized rent', 'proforma rent'],
-        }
-        for opt_field in RENT_ROLL_CONFIG.get('optional_fields', []):
-            keywords = optional_keywords.get(opt_field, [opt_field.replace('_', ' ')])
-            if any(kw in doc_lower for kw in keywords):
-                fields.append(opt_field)
-
-        field_list = "\n".join([f"- {f}" for f in fields])
+        field_list = self._rent_roll_field_list(doc_content)
 
         # Truncate content if very long
         max_chars = 80000
@@ -3939,44 +4178,57 @@ Count from the first data row (after headers). Include ALL units in this row ran
 {doc_content}
 </document>
 
-## OUTPUT FORMAT
-Return a JSON array of unit objects:
-```json
-[
-  {{
-    "unit_number": "100",
-    "unit_type": "1BR/1BA",
-    "bedrooms": 1,
-    "bathrooms": 1,
-    "square_feet": 650,
-    "current_rent": 1595,
-    "occupancy_status": "Occupied",
-    "lease_start": "2024-01-15",
-    "lease_end": "2025-01-14",
-    "tenant_name": "John Smith",
-    "move_in_date": "2024-01-15",
-    "rent_effective_date": "2024-01-15"
-  }},
-  {{
-    "unit_number": "101",
-    "unit_type": "2BR/2BA",
-    "bedrooms": 2,
-    "bathrooms": 2,
-    "square_feet": 950,
-    "current_rent": 2150,
-    "occupancy_status": "Vacant"
-  }}
-]
-```
+{RENT_ROLL_OUTPUT_FORMAT}"""
 
-RULES:
-- Extract ONLY units in the requested range for this chunk
-- Extract ONLY fields listed in FIELDS TO EXTRACT above — do NOT add fields not listed
-- Numeric fields: numbers only (1595 not "$1,595")
-- Dates: ISO format "YYYY-MM-DD"
-- Include all available fields; omit if not found
-- tenant_name: Extract the EXACT name from the source document. NEVER substitute "Current Tenant", "Tenant", or any placeholder - use the actual name or omit the field entirely if not present
-- Return ONLY the JSON array, no other text"""
+    def _build_rent_roll_slice_prompt(
+        self,
+        doc_content: str,
+        rows: List[Tuple[int, int, str]],
+        chunk_idx: int,
+        total_chunks: int,
+    ) -> str:
+        """
+        Build a chunk prompt holding only the column headings and this
+        chunk's rows, plus a few rows of overlap on each side.
+        """
+        per_chunk = -(-len(rows) // total_chunks)
+        first = chunk_idx * per_chunk
+        last = min(first + per_chunk, len(rows)) - 1
+        overlap = RENT_ROLL_CONFIG['overlap_rows']
+
+        table_start = rows[0][0]
+        heading_start = max(0, table_start - RENT_ROLL_CONFIG['header_chars'])
+        slice_start = rows[max(first - overlap, 0)][0]
+        slice_end = rows[min(last + overlap, len(rows) - 1)][1]
+        if slice_start == table_start:
+            excerpt = doc_content[heading_start:slice_end]
+        else:
+            excerpt = (
+                doc_content[heading_start:table_start] +
+                "\n[...earlier rows omitted...]\n" +
+                doc_content[slice_start:slice_end]
+            )
+
+        field_list = self._rent_roll_field_list(doc_content)
+        first_unit, last_unit = rows[first][2], rows[last][2]
+
+        return f"""Extract rent roll data from this excerpt of a rent roll.
+
+## CHUNK INSTRUCTIONS
+This is chunk {chunk_idx + 1} of {total_chunks}. The excerpt holds the table's column headings and rows around this chunk.
+
+For THIS chunk, extract the {last - first + 1} rows from unit {first_unit} through unit {last_unit}, in table order.
+Rows before unit {first_unit} or after unit {last_unit} are context only — do not extract them.
+
+## FIELDS TO EXTRACT (per unit)
+{field_list}
+
+## DOCUMENT EXCERPT
+<document>
+{excerpt}
+</document>
+
+{RENT_ROLL_OUTPUT_FORMAT}"""
 
     def _parse_rent_roll_response(self, response_text: str) -> Optional[List[Dict]]:
         """Parse JSON array from response."""
@@ -4098,7 +4350,7 @@ RULES:
         Get document text content.
 
         For Excel/CSV files: Download and parse directly for complete data.
-        For other files: Use embeddings.
+        For other files: Use the persisted text layer.
         """
         import tempfile
         import requests
@@ -4154,22 +4406,11 @@ RULES:
                         pass
 
             except Exception as e:
-                logger.warning(f"Failed to read Excel/CSV directly: {e}, falling back to embeddings")
+                logger.warning(f"Failed to read Excel/CSV directly: {e}, falling back to text layer")
 
-        # Fallback: Use embeddings
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT content_text
-                FROM landscape.knowledge_embeddings
-                WHERE source_id = %s AND source_type = 'document_chunk'
-                ORDER BY embedding_id
-                LIMIT 100
-            """, [doc_id])
-            rows = cursor.fetchall()
-
-        if rows:
-            return "\n\n".join(row[0] for row in rows if row[0])
-        return None
+        # Everything else: the persisted text layer
+        layer = ensure_text_layer(doc_id)
+        return layer.text if layer else None
 
     def _parse_excel_to_text(self, file_path: str) -> Optional[str]:
         """Parse Excel file to text format for extraction.
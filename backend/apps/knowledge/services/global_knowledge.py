@@ -16,7 +16,7 @@ from typing import Dict, Any, List, Optional
 
 from django.db import connection
 
-from .embedding_service import generate_embedding
+from .embedding_service import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -309,7 +309,7 @@ def _search_global_embeddings(
     Returns (formatted_text, chunk_count).
     """
     try:
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             return "", 0
 
@@ -377,7 +377,7 @@ def _search_platform_knowledge(
     Returns (formatted_text, chunk_count).
     """
     try:
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             return "", 0
 
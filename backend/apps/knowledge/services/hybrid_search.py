@@ -0,0 +1,158 @@
+"""
+Hybrid lexical + vector retrieval with reciprocal-rank fusion (RRF).
+
+Cosine distance alone misses exact tokens - APNs, unit numbers, loan names,
+line-item labels - that barely move an embedding. In hybrid mode a single
+statement ranks candidates both by pgvector distance and by Postgres full-text
+match (the expression GIN indexes from knowledge migration 0011), then fuses
+the two rankings:
+
+    rrf_score = 1 / (RRF_K + vector_rank) + 1 / (RRF_K + lexical_rank)
+
+A chunk missing from one ranking just contributes nothing for it. The vector
+arm keeps its similarity threshold; the lexical arm needs none because it
+only returns chunks that actually contain a query term.
+
+Set KNOWLEDGE_RETRIEVAL_MODE=hybrid to make it the default; callers can also
+pass mode='hybrid' explicitly. benchmark_retrieval compares the two modes.
+"""
+import os
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+VECTOR = 'vector'
+HYBRID = 'hybrid'
+RETRIEVAL_MODES = (VECTOR, HYBRID)
+
+RETRIEVAL_MODE = os.getenv('KNOWLEDGE_RETRIEVAL_MODE', VECTOR)
+RRF_K = 60
+CANDIDATE_MULTIPLIER = 4
+MIN_CANDIDATES = 20
+TS_CONFIG = 'english'
+
+
+def resolve_mode(mode: str = None) -> str:
+    """Explicit mode, else the KNOWLEDGE_RETRIEVAL_MODE default."""
+    mode = mode or RETRIEVAL_MODE
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode {mode!r}; expected one of {RETRIEVAL_MODES}")
+    return mode
+
+
+def candidate_pool_size(limit: int) -> int:
+    """How many candidates each arm ranks before fusion."""
+    return max(limit * CANDIDATE_MULTIPLIER, MIN_CANDIDATES)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[List[Hashable]],
+    k: int = RRF_K,
+) -> List[Tuple[Hashable, float]]:
+    """Fuse best-first id rankings; returns (id, score) sorted by score."""
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def fused_candidates_cte(
+    from_clause: str,
+    where_clause: str,
+    id_column: str,
+    embedding_column: str,
+    text_column: str,
+    vector_source: Optional[str] = None,
+) -> str:
+    """
+    WITH-clause body defining ``query_terms`` and ``fused(id, vector_rank,
+    lexical_rank, rrf_score)``.
+
+    The caller selects FROM fused, joins back to its table on fused.id and
+    may CROSS JOIN query_terms q to reuse q.embedding. Parameters, in order,
+    are those returned by fused_candidates_params().
+
+    vector_source names an earlier CTE of ``(embedding_id, distance)`` rows,
+    such as vector_index.scoped_hits_cte()'s ``hits``. The vector arm then
+    ranks those rows instead of scanning from_clause, and takes no where
+    parameters (pass ``vector_where_params=[]``).
+
+    text_column must match the indexed expression
+    ``to_tsvector('english', <text_column>)`` for the GIN index to be used.
+    """
+    tsvector = f"to_tsvector('{TS_CONFIG}', {text_column})"
+    if vector_source:
+        vector_hits = f"""
+            SELECT
+                h.embedding_id AS id,
+                row_number() OVER (ORDER BY h.distance) AS rnk
+            FROM {vector_source} h
+            WHERE h.distance < %s
+            ORDER BY h.distance
+            LIMIT %s
+        """
+    else:
+        vector_hits = f"""
+            SELECT
+                {id_column} AS id,
+                row_number() OVER (ORDER BY {embedding_column} <=> q.embedding) AS rnk
+            FROM {from_clause}
+            CROSS JOIN query_terms q
+            WHERE {where_clause}
+              AND ({embedding_column} <=> q.embedding) < %s
+            ORDER BY {embedding_column} <=> q.embedding
+            LIMIT %s
+        """
+    return f"""
+        query_terms AS NOT MATERIALIZED (
+            SELECT
+                %s::vector AS embedding,
+                -- any query term may match; ts_rank_cd rewards chunks with more of them
+                replace(plainto_tsquery('{TS_CONFIG}', %s)::text, ' & ', ' | ')::tsquery AS terms
+        ),
+        vector_hits AS ({vector_hits}),
+        lexical_hits AS (
+            SELECT
+                {id_column} AS id,
+                row_number() OVER (ORDER BY ts_rank_cd({tsvector}, q.terms) DESC) AS rnk
+            FROM {from_clause}
+            CROSS JOIN query_terms q
+            WHERE {where_clause}
+              AND {tsvector} @@ q.terms
+            ORDER BY rnk
+            LIMIT %s
+        ),
+        fused AS (
+            SELECT
+                COALESCE(v.id, l.id) AS id,
+                v.rnk AS vector_rank,
+                l.rnk AS lexical_rank,
+                COALESCE(1.0 / (%s + v.rnk), 0) + COALESCE(1.0 / (%s + l.rnk), 0) AS rrf_score
+            FROM vector_hits v
+            FULL OUTER JOIN lexical_hits l ON v.id = l.id
+        )
+    """
+
+
+def fused_candidates_params(
+    embedding_str: str,
+    query: str,
+    where_params: List[Any],
+    max_distance: float,
+    limit: int,
+    vector_where_params: Optional[List[Any]] = None,
+) -> List[Any]:
+    """
+    Parameters for fused_candidates_cte(), in placeholder order.
+
+    vector_where_params overrides where_params for the vector arm; pass []
+    with a vector_source.
+    """
+    pool = candidate_pool_size(limit)
+    if vector_where_params is None:
+        vector_where_params = where_params
+    return (
+        [embedding_str, query]
+        + list(vector_where_params) + [max_distance, pool]
+        + list(where_params) + [pool]
+        + [RRF_K, RRF_K]
+    )
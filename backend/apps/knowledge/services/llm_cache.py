@@ -0,0 +1,380 @@
+"""Prompt-hash cache for LLM responses.
+
+Re-running extraction on a document whose text and prompts have not changed
+(retries, reprocessing, battery runs) used to pay for the same messages.create
+calls again. A response is a function of the request, so complete ones are
+cached under::
+
+    sha256(provider, model, system hash, messages hash, tools hash,
+           temperature, max_tokens)
+
+Components are hashed from canonical JSON (sorted keys), so the same request
+built in a different dict order shares an entry; image blocks hash their
+base64 data like any other content.
+
+Only deterministic requests are cached: those that set temperature to 0. A
+request with a non-zero temperature, or none at all (the provider default,
+1.0 for Anthropic), is passed straight through and counted as skipped. The
+extraction calls keep the provider's default sampling, so they are only
+cached when LLM_CACHE_NONZERO_TEMPERATURE is set - a re-run then replays the
+first sampled answer instead of drawing a new one. Callers can also pass
+``cache=False`` for one call.
+
+A response is not stored if it was cut off at max_tokens, or if the caller's
+``validate`` check rejects its text (say, JSON that does not parse; see
+parses_as_json_object), so a bad answer is retried next time instead of being replayed for the whole TTL.
+
+LLM_CACHE_BACKEND picks the storage:
+
+    postgres   landscape.knowledge_llm_cache (default)
+    file       one JSON file per entry under LLM_CACHE_DIR
+    off        no caching
+
+Entries older than LLM_CACHE_TTL_DAYS are misses and get overwritten. As with
+the embedding cache, an unavailable backend (non-Postgres database, migration
+not applied, unwritable directory) means no caching, never a failed call.
+
+Hits, misses and the input/output tokens hits saved are counted per process
+and, when a caller passes ``stats``, per run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_BACKEND = os.getenv('LLM_CACHE_BACKEND', 'postgres').lower()
+LLM_CACHE_DIR = os.getenv(
+    'LLM_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'landscape-llm-cache')
+)
+LLM_CACHE_TTL_SECONDS = float(os.getenv('LLM_CACHE_TTL_DAYS', '30')) * 86400
+LLM_CACHE_NONZERO_TEMPERATURE = os.getenv('LLM_CACHE_NONZERO_TEMPERATURE', 'false').lower() == 'true'
+
+
+@dataclass
+class LLMCacheStats:
+    """Hit/miss and saved-token counters for one run (or the whole process)."""
+    hits: int = 0
+    misses: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    errors: int = 0
+    saved_input_tokens: int = 0
+    saved_output_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'hit_rate': round(self.hit_rate, 4)}
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits / {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate), "
+            f"{self.saved_input_tokens} input + {self.saved_output_tokens} output tokens saved"
+        )
+
+
+@dataclass
+class CachedUsage:
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class CachedTextBlock:
+    text: str
+    type: str = 'text'
+
+
+@dataclass
+class CachedResponse:
+    """The parts of an Anthropic Message the callers read, rebuilt from the cache."""
+    content: List[CachedTextBlock]
+    usage: CachedUsage = field(default_factory=CachedUsage)
+    model: str = ''
+    stop_reason: Optional[str] = None
+    cached: bool = True
+
+
+_stats = LLMCacheStats()
+_stats_lock = threading.Lock()
+_cache_table_exists: Optional[bool] = None
+
+
+def _count(stats: Optional[LLMCacheStats], field_name: str, n: int) -> None:
+    if not n:
+        return
+    with _stats_lock:
+        setattr(_stats, field_name, getattr(_stats, field_name) + n)
+    if stats is not None:
+        setattr(stats, field_name, getattr(stats, field_name) + n)
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """Snapshot of this process's counters."""
+    with _stats_lock:
+        return _stats.as_dict()
+
+
+def reset_llm_cache_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = LLMCacheStats()
+
+
+def loads_fenced_json(text: str) -> Any:
+    """json.loads, tolerating a markdown code fence around the JSON."""
+    text = text.strip()
+    if text.startswith('```'):
+        text = re.sub(r'^```(?:json)?\s*', '', text)
+        text = re.sub(r'\s*```$', '', text)
+    return json.loads(text)
+
+
+def parses_as_json_object(text: str) -> bool:
+    """validate check for callers that read the response as a JSON object."""
+    try:
+        return isinstance(loads_fenced_json(text), dict)
+    except ValueError:
+        return False
+
+
+def _hash(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    messages: Any,
+    system: Any = None,
+    tools: Any = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[str]:
+    """
+    The cache key for a request, or None if it must not be cached. An unset
+    temperature means the provider default, which is not 0.
+    """
+    if LLM_CACHE_BACKEND == 'off':
+        return None
+    if (temperature is None or temperature != 0) and not LLM_CACHE_NONZERO_TEMPERATURE:
+        return None
+    return _hash([
+        provider,
+        model,
+        _hash(system or ''),
+        _hash(messages),
+        _hash(tools or []),
+        temperature,
+        max_tokens,
+    ])
+
+
+def _table_available() -> bool:
+    global _cache_table_exists
+
+    if connection.vendor != 'postgresql':
+        return False
+    if _cache_table_exists is None:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('landscape.knowledge_llm_cache') IS NOT NULL")
+                _cache_table_exists = bool(cursor.fetchone()[0])
+        except Exception:  # noqa: BLE001 — no table check means no caching, never a failed call
+            logger.exception("[llm_cache] table check failed")
+            return False
+    return _cache_table_exists
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(LLM_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _read_entry(key: str) -> Optional[Dict[str, Any]]:
+    if LLM_CACHE_BACKEND == 'file':
+        try:
+            with open(_entry_path(key), encoding='utf-8') as handle:
+                entry = json.load(handle)
+        except FileNotFoundError:
+            return None
+        if time.time() - entry['created_at'] > LLM_CACHE_TTL_SECONDS:
+            return None
+        return entry
+
+    if LLM_CACHE_BACKEND == 'postgres' and _table_available():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT response, input_tokens, output_tokens
+                FROM landscape.knowledge_llm_cache
+                WHERE cache_key = %s
+                  AND created_at > NOW() - make_interval(secs => %s)
+                """,
+                [key, LLM_CACHE_TTL_SECONDS],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        response = row[0] if isinstance(row[0], dict) else json.loads(row[0])
+        return {'response': response, 'input_tokens': row[1], 'output_tokens': row[2]}
+    return None
+
+
+def _write_entry(key: str, provider: str, model: str, entry: Dict[str, Any]) -> None:
+    if LLM_CACHE_BACKEND == 'file':
+        path = _entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as handle:
+            json.dump({**entry, 'provider': provider, 'model': model, 'created_at': time.time()}, handle)
+        os.replace(tmp, path)
+        return
+
+    if LLM_CACHE_BACKEND == 'postgres' and _table_available():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO landscape.knowledge_llm_cache
+                (cache_key, provider, model, response, input_tokens, output_tokens, created_at)
+                VALUES (%s, %s, %s, %s::jsonb, %s, %s, NOW())
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    response = EXCLUDED.response,
+                    input_tokens = EXCLUDED.input_tokens,
+                    output_tokens = EXCLUDED.output_tokens,
+                    created_at = EXCLUDED.created_at
+                """,
+                [key, provider, model, json.dumps(entry['response']),
+                 entry['input_tokens'], entry['output_tokens']],
+            )
+
+
+def get_cached_response(
+    key: Optional[str],
+    stats: Optional[LLMCacheStats] = None,
+) -> Optional[CachedResponse]:
+    """The cached response for key, or None. Counts a hit (with its tokens) or a miss."""
+    if key is None:
+        return None
+    try:
+        entry = _read_entry(key)
+    except Exception:  # noqa: BLE001
+        logger.exception("[llm_cache] lookup failed for %s", key)
+        _count(stats, 'errors', 1)
+        entry = None
+
+    if entry is None:
+        _count(stats, 'misses', 1)
+        return None
+
+    response = entry['response']
+    _count(stats, 'hits', 1)
+    _count(stats, 'saved_input_tokens', entry['input_tokens'])
+    _count(stats, 'saved_output_tokens', entry['output_tokens'])
+    return CachedResponse(
+        content=[CachedTextBlock(text=text) for text in response['text']],
+        usage=CachedUsage(entry['input_tokens'], entry['output_tokens']),
+        model=response.get('model', ''),
+        stop_reason=response.get('stop_reason'),
+    )
+
+
+def put_cached_response(
+    key: Optional[str],
+    provider: str,
+    model: str,
+    response: Any,
+    stats: Optional[LLMCacheStats] = None,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> None:
+    """
+    Cache a messages.create response under key. Responses without text,
+    truncated at max_tokens, or whose first text block fails validate are
+    not cached (the last two are counted as rejected).
+    """
+    if key is None or getattr(response, 'cached', False):
+        return
+    texts = [
+        block.text for block in getattr(response, 'content', None) or []
+        if getattr(block, 'type', None) == 'text' and isinstance(getattr(block, 'text', None), str)
+    ]
+    if not texts:
+        return
+    if getattr(response, 'stop_reason', None) == 'max_tokens' or (validate and not validate(texts[0])):
+        _count(stats, 'rejected', 1)
+        return
+    usage = getattr(response, 'usage', None)
+    input_tokens = getattr(usage, 'input_tokens', 0)
+    output_tokens = getattr(usage, 'output_tokens', 0)
+    entry = {
+        'response': {
+            'text': texts,
+            'model': getattr(response, 'model', model),
+            'stop_reason': getattr(response, 'stop_reason', None),
+        },
+        'input_tokens': input_tokens if isinstance(input_tokens, int) else 0,
+        'output_tokens': output_tokens if isinstance(output_tokens, int) else 0,
+    }
+    try:
+        _write_entry(key, provider, model, entry)
+    except Exception:  # noqa: BLE001
+        logger.exception("[llm_cache] write failed for %s", key)
+        _count(stats, 'errors', 1)
+
+
+def messages_cache_key(provider: str, kwargs: Dict[str, Any]) -> Optional[str]:
+    """cache_key() for the keyword arguments of a messages.create call."""
+    return cache_key(
+        provider,
+        kwargs.get('model'),
+        kwargs.get('messages'),
+        system=kwargs.get('system'),
+        tools=kwargs.get('tools'),
+        temperature=kwargs.get('temperature'),
+        max_tokens=kwargs.get('max_tokens'),
+    )
+
+
+def cached_messages_create(
+    client,
+    provider: str = 'anthropic',
+    stats: Optional[LLMCacheStats] = None,
+    cache: bool = True,
+    validate: Optional[Callable[[str], bool]] = None,
+    **kwargs,
+):
+    """
+    client.messages.create(**kwargs), answered from the cache when the same
+    request has been made before. Returns the SDK response, or a
+    CachedResponse exposing the same ``content[i].text`` and ``usage``.
+    A fresh response is only stored if validate (when given) accepts the
+    text the caller is about to parse.
+    """
+    key = messages_cache_key(provider, kwargs) if cache else None
+    if key is None:
+        _count(stats, 'skipped', 1)
+        return client.messages.create(**kwargs)
+
+    cached = get_cached_response(key, stats)
+    if cached is not None:
+        return cached
+    response = client.messages.create(**kwargs)
+    put_cached_response(key, provider, kwargs.get('model'), response, stats, validate)
+    return response
@@ -0,0 +1,199 @@
+"""
+Bounded-concurrency LLM calls for multi-request extraction.
+
+Batched field extraction and chunked rent roll extraction make several
+independent messages.create calls per document. run_messages() sends them
+from a thread pool, the same way embed_batches does, with at most
+LLM_CONCURRENCY requests in flight. Before each call it reserves capacity
+from the provider's RateBudget, which tracks requests and input tokens per
+minute with continuously refilled buckets. That lets a burst of requests
+slow down to the account's limits instead of hitting 429s.
+
+Results come back in request order. A failed call yields its exception in
+place of the response text, so one bad request does not sink the others.
+Only the HTTP calls run on worker threads. Prompt building, parsing and
+staging stay with the caller, so worker threads never open database
+connections. For the same reason the response cache (llm_cache) is consulted
+before dispatch and written after the pool drains, both on the calling
+thread: requests answered from the cache never reach the pool or the budget.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from .llm_cache import LLMCacheStats, get_cached_response, messages_cache_key, put_cached_response
+
+logger = logging.getLogger(__name__)
+
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '4'))
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+# Per-provider limits; override with e.g. ANTHROPIC_REQUESTS_PER_MINUTE
+PROVIDER_LIMITS = {
+    'anthropic': {'requests_per_minute': 50, 'input_tokens_per_minute': 200000},
+}
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Conservative input token estimate (~3 chars per token) for budgeting."""
+    return len(text or '') // 3 + 1
+
+
+class RateBudget:
+    """
+    Requests and input tokens per window (a minute by default), shared by
+    every thread calling one provider. Each bucket holds up to one window's
+    allowance and refills continuously.
+    """
+
+    def __init__(self, requests: int, tokens: int, window: float = 60.0):
+        self.max_requests = requests
+        self.max_tokens = tokens
+        self.window = window
+        self._requests = float(requests)
+        self._tokens = float(tokens)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.max_requests, self._requests + elapsed * self.max_requests / self.window)
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.max_tokens / self.window)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a request and ``tokens`` input tokens are free; returns seconds waited."""
+        # A prompt bigger than the whole allowance waits for a full bucket, not forever
+        tokens = min(tokens, self.max_tokens)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return time.monotonic() - started
+                wait = max(
+                    (1 - self._requests) * self.window / self.max_requests,
+                    (tokens - self._tokens) * self.window / self.max_tokens,
+                )
+                self._cond.wait(max(wait, 0.005))
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Return (or take) the difference once the provider reports real usage."""
+        with self._cond:
+            self._tokens = min(self.max_tokens, self._tokens + min(reserved, self.max_tokens) - used)
+            self._cond.notify_all()
+
+
+_budgets: Dict[str, RateBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_budget(provider: str = 'anthropic') -> RateBudget:
+    """The process-wide budget for provider, built from PROVIDER_LIMITS / env."""
+    with _budgets_lock:
+        if provider not in _budgets:
+            limits = PROVIDER_LIMITS[provider]
+            prefix = provider.upper()
+            _budgets[provider] = RateBudget(
+                requests=int(os.getenv(f'{prefix}_REQUESTS_PER_MINUTE', limits['requests_per_minute'])),
+                tokens=int(os.getenv(f'{prefix}_INPUT_TOKENS_PER_MINUTE', limits['input_tokens_per_minute'])),
+            )
+        return _budgets[provider]
+
+
+@dataclass
+class LLMRequest:
+    prompt: str
+    system: str = ''
+    max_tokens: int = 8000
+    model: str = DEFAULT_MODEL
+    # None keeps the provider's default sampling (and so is not cached)
+    temperature: Optional[float] = None
+    # Response text must pass this to be cached (e.g. it parses)
+    validate: Optional[Callable[[str], bool]] = None
+
+    def create_kwargs(self) -> Dict:
+        kwargs = {
+            'model': self.model,
+            'max_tokens': self.max_tokens,
+            'system': self.system,
+            'messages': [{"role": "user", "content": self.prompt}],
+        }
+        if self.temperature is not None:
+            kwargs['temperature'] = self.temperature
+        return kwargs
+
+
+def run_messages(
+    client,
+    requests: List[LLMRequest],
+    provider: str = 'anthropic',
+    max_concurrency: int = None,
+    budget: Optional[RateBudget] = None,
+    cache_stats: Optional[LLMCacheStats] = None,
+) -> List[Union[str, Exception]]:
+    """
+    Send each request as one messages.create call, up to max_concurrency at
+    a time, each admitted by the provider budget. Requests already in the
+    response cache are answered from it without a call. Returns the response
+    text (or the exception raised) per request, in request order.
+    """
+    if not requests:
+        return []
+    budget = budget or get_budget(provider)
+    max_concurrency = max_concurrency or LLM_CONCURRENCY
+    cache_stats = cache_stats if cache_stats is not None else LLMCacheStats()
+    usage = {'input_tokens': 0, 'waited': 0.0}
+    usage_lock = threading.Lock()
+
+    results: List[Union[str, Exception, None]] = [None] * len(requests)
+    pending = []  # (position, request, cache key)
+    for position, request in enumerate(requests):
+        key = messages_cache_key(provider, request.create_kwargs())
+        cached = get_cached_response(key, cache_stats)
+        if cached is not None:
+            results[position] = cached.content[0].text
+        else:
+            pending.append((position, request, key))
+
+    def call(request: LLMRequest):
+        reserved = estimate_prompt_tokens(request.system + request.prompt)
+        waited = budget.acquire(reserved)
+        try:
+            response = client.messages.create(**request.create_kwargs())
+        except Exception as e:
+            logger.warning(f"LLM request failed: {e}")
+            return e
+        used = getattr(getattr(response, 'usage', None), 'input_tokens', None)
+        if used is not None:
+            budget.settle(reserved, used)
+        with usage_lock:
+            usage['input_tokens'] += used or reserved
+            usage['waited'] += waited
+        return response
+
+    started = time.perf_counter()
+    workers = max(1, min(max_concurrency, len(pending)))
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='llm') as pool:
+            responses = list(pool.map(call, [request for _, request, _ in pending]))
+        for (position, request, key), response in zip(pending, responses):
+            if isinstance(response, Exception):
+                results[position] = response
+                continue
+            put_cached_response(key, provider, request.model, response, cache_stats, request.validate)
+            results[position] = response.content[0].text
+    logger.info(
+        f"{len(requests)} {provider} requests ({len(requests) - len(pending)} from cache), "
+        f"{workers} concurrent: {usage['input_tokens']} input tokens, "
+        f"{usage['waited']:.1f}s waiting on budget, {time.perf_counter() - started:.1f}s total; "
+        f"cache {cache_stats.summary()}"
+    )
+    return results
@@ -19,7 +19,6 @@ import json
 import logging
 import os
 import re
-import tempfile
 import time
 from typing import Optional
 
@@ -28,6 +27,10 @@ from django.conf import settings
 from django.core.files.storage import default_storage
 from django.db import connection
 
+from .blob_cache import checkout_document
+from .llm_cache import cached_messages_create, loads_fenced_json, parses_as_json_object
+from .text_layer import load_text_layer
+
 logger = logging.getLogger('landscape.media_extraction')
 
 # ---------------------------------------------------------------------------
@@ -274,9 +277,11 @@ class MediaClassificationService:
             # Call Claude vision
             image_b64 = base64.standard_b64encode(image_data).decode('utf-8')
 
-            response = client.messages.create(
+            response = cached_messages_create(
+                client,
                 model=self.CLAUDE_MODEL,
                 max_tokens=256,
+                validate=parses_as_json_object,
                 messages=[{
                     'role': 'user',
                     'content': [
@@ -296,18 +301,7 @@ class MediaClassificationService:
                 }],
             )
 
-            # Parse response
-            result_text = response.content[0].text.strip()
-
-            # Handle potential markdown code block wrapping
-            if result_text.startswith('```'):
-                lines = result_text.split('\n')
-                result_text = '\n'.join(
-                    line for line in lines
-                    if not line.strip().startswith('```')
-                ).strip()
-
-            result = json.loads(result_text)
+            result = loads_fenced_json(response.content[0].text)
             code = result.get('classification', 'other')
             confidence = float(result.get('confidence', 0.5))
             subject_hint = str(result.get('subject_hint') or '').strip()
@@ -480,7 +474,8 @@ class MediaClassificationService:
         with connection.cursor() as c:
             c.execute("""
                 SELECT doc_type, storage_uri, mime_type,
-                       media_scan_json->'raw_scan'->>'total_pages' as total_pages
+                       media_scan_json->'raw_scan'->>'total_pages' as total_pages,
+                       sha256_hash
                 FROM landscape.core_doc
                 WHERE doc_id = %s AND deleted_at IS NULL
             """, [doc_id])
@@ -496,19 +491,30 @@ class MediaClassificationService:
 
         # Extract page text from PDF for keyword matching
         if mime_type == 'application/pdf' and storage_uri:
-            context['page_texts'] = self._extract_page_texts(storage_uri)
+            context['page_texts'] = self._extract_page_texts(storage_uri, doc_id, row[4])
 
         return context
 
-    def _extract_page_texts(self, storage_uri: str) -> dict[int, str]:
+    def _extract_page_texts(
+        self, storage_uri: str, doc_id: int = None, content_hash: Optional[str] = None,
+    ) -> dict[int, str]:
         """
         Extract first 300 chars of text from each page of a PDF.
-        Used for keyword-based heuristic classification.
+        Used for keyword-based heuristic classification. Reads the persisted
+        text layer when there is one, the PDF otherwise.
         """
         import fitz
 
+        layer = load_text_layer(doc_id) if doc_id else None
+        if layer:
+            return {
+                page_num: text[:300]
+                for page_num, text in enumerate(layer.page_texts(), start=1)
+                if text
+            }
+
         page_texts = {}
-        tmp_path = self._download_to_temp(storage_uri)
+        tmp_path = self._download_to_temp(storage_uri, doc_id, content_hash)
         if not tmp_path:
             return page_texts
 
@@ -768,32 +774,16 @@ class MediaClassificationService:
             logger.exception(f"Failed to load image: {uri}")
             return None
 
-    def _download_to_temp(self, storage_uri: str) -> Optional[str]:
+    def _download_to_temp(
+        self, storage_uri: str, doc_id: Optional[int] = None, content_hash: Optional[str] = None,
+    ) -> Optional[str]:
         """Download a file to a temp path. Handles URLs and local storage."""
         try:
-            if storage_uri.startswith(('http://', 'https://')):
-                response = requests.get(storage_uri, timeout=120)
-                response.raise_for_status()
-                suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(response.content)
-                    return tmp.name
-            else:
-                try:
-                    with default_storage.open(storage_uri, 'rb') as f:
-                        content = f.read()
-                except FileNotFoundError:
-                    if os.path.exists(storage_uri):
-                        with open(storage_uri, 'rb') as f:
-                            content = f.read()
-                    else:
-                        logger.error(f"File not found: {storage_uri}")
-                        return None
-
-                suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(content)
-                    return tmp.name
+            suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
+            return checkout_document(storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=suffix)
+        except FileNotFoundError:
+            logger.error(f"File not found: {storage_uri}")
+            return None
         except Exception:
             logger.exception(f"Failed to download: {storage_uri}")
             return None
@@ -12,20 +12,20 @@ import io
 import json
 import logging
 import os
-import tempfile
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 import fitz  # PyMuPDF
-import requests
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db import connection
 from PIL import Image
 
+from .blob_cache import checkout_document
+
 logger = logging.getLogger('landscape.media_extraction')
 
 # Mime types that can be scanned for embedded media
@@ -111,16 +111,17 @@ class MediaExtractionService:
 
         project_id = doc_meta['project_id']
         mime_type = doc_meta['mime_type']
+        content_hash = self._content_hash(doc_meta, file_path)
 
         # Handle non-PDF documents
         if mime_type not in SCANNABLE_MIME_TYPES:
-            return self._handle_non_scannable(doc_id, mime_type, file_path, project_id)
+            return self._handle_non_scannable(doc_id, mime_type, file_path, project_id, content_hash)
 
         # Set status to scanning
         self._set_media_scan_status(doc_id, 'scanning')
 
         # Download file to temp location
-        tmp_path = self._download_to_temp(file_path)
+        tmp_path = self._download_to_temp(file_path, doc_id, content_hash)
         if not tmp_path:
             self._set_media_scan_status(doc_id, 'error')
             return {}
@@ -179,7 +180,7 @@ class MediaExtractionService:
         self._set_media_scan_status(doc_id, 'extracting')
 
         # Download file to temp
-        tmp_path = self._download_to_temp(file_path)
+        tmp_path = self._download_to_temp(file_path, doc_id, self._content_hash(doc_meta, file_path))
         if not tmp_path:
             self._set_media_scan_status(doc_id, 'error')
             return []
@@ -654,7 +655,7 @@ class MediaExtractionService:
             return {'success': False, 'error': f'Document {doc_id} has no stored file'}
 
         project_id = meta.get('project_id')
-        tmp_path = self._download_to_temp(storage_uri)
+        tmp_path = self._download_to_temp(storage_uri, doc_id, meta.get('sha256_hash'))
         if not tmp_path:
             return {'success': False, 'error': 'Could not download source document'}
 
@@ -823,11 +824,12 @@ class MediaExtractionService:
     #  INTERNAL: _handle_non_scannable
     # ------------------------------------------------------------------ #
     def _handle_non_scannable(self, doc_id: int, mime_type: str,
-                               file_path: str, project_id: int) -> dict:
+                               file_path: str, project_id: int,
+                               content_hash: Optional[str] = None) -> dict:
         """Handle non-PDF documents."""
         if mime_type in IMAGE_MIME_TYPES:
             # Direct image upload — the file IS the media asset
-            self._create_upload_media_record(doc_id, project_id, file_path, mime_type)
+            self._create_upload_media_record(doc_id, project_id, file_path, mime_type, content_hash)
             self._set_media_scan_status(doc_id, 'complete')
             scan_json = {
                 'scan_version': 1,
@@ -854,7 +856,7 @@ class MediaExtractionService:
         """Fetch document metadata."""
         with connection.cursor() as c:
             c.execute("""
-                SELECT doc_id, project_id, mime_type, storage_uri, doc_name
+                SELECT doc_id, project_id, mime_type, storage_uri, doc_name, sha256_hash
                 FROM landscape.core_doc
                 WHERE doc_id = %s AND deleted_at IS NULL
             """, [doc_id])
@@ -867,8 +869,14 @@ class MediaExtractionService:
             'mime_type': row[2] or '',
             'storage_uri': row[3],
             'doc_name': row[4],
+            'sha256_hash': row[5],
         }
 
+    @staticmethod
+    def _content_hash(doc_meta: dict, file_path: str) -> Optional[str]:
+        """The document's stored hash, if file_path is the document's own file."""
+        return doc_meta.get('sha256_hash') if file_path == doc_meta.get('storage_uri') else None
+
     def _get_project_image_hashes(self, project_id: int, exclude_doc_id: int = None) -> set[str]:
         """Load all existing image hashes for this project (cross-document dedup).
 
@@ -1104,12 +1112,13 @@ class MediaExtractionService:
             """, params)
 
     def _create_upload_media_record(self, doc_id: int, project_id: int,
-                                     file_path: str, mime_type: str):
+                                     file_path: str, mime_type: str,
+                                     content_hash: Optional[str] = None):
         """Create a media record for a directly-uploaded image file."""
         # Determine dimensions by downloading and opening
         width, height, file_size = None, None, None
         image_bytes = None
-        tmp = self._download_to_temp(file_path)
+        tmp = self._download_to_temp(file_path, doc_id, content_hash)
         if tmp:
             try:
                 with open(tmp, 'rb') as f:
@@ -1196,38 +1205,19 @@ class MediaExtractionService:
             return storage_uri
         return self._get_public_url(storage_uri)
 
-    def _download_to_temp(self, storage_uri: str) -> Optional[str]:
+    def _download_to_temp(
+        self, storage_uri: str, doc_id: Optional[int] = None, content_hash: Optional[str] = None,
+    ) -> Optional[str]:
         """
         Download a file to a temp path. Handles both URLs and local storage paths.
         Returns the temp file path, or None on failure.
         """
         try:
-            if storage_uri.startswith(('http://', 'https://')):
-                # Remote URL — download via requests
-                response = requests.get(storage_uri, timeout=120)
-                response.raise_for_status()
-                suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(response.content)
-                    return tmp.name
-            else:
-                # Local storage path — read via default_storage
-                try:
-                    with default_storage.open(storage_uri, 'rb') as f:
-                        content = f.read()
-                except FileNotFoundError:
-                    # Try as absolute path
-                    if os.path.exists(storage_uri):
-                        with open(storage_uri, 'rb') as f:
-                            content = f.read()
-                    else:
-                        logger.error(f"File not found: {storage_uri}")
-                        return None
-
-                suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(content)
-                    return tmp.name
+            suffix = os.path.splitext(storage_uri)[-1] or '.pdf'
+            return checkout_document(storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=suffix)
+        except FileNotFoundError:
+            logger.error(f"File not found: {storage_uri}")
+            return None
         except Exception:
             logger.exception(f"Failed to download file: {storage_uri}")
             return None
@@ -14,10 +14,17 @@ from typing import Optional, List, Dict, Any, Tuple
 
 from django.db import connection
 
-from .embedding_service import generate_embedding
+from .embedding_service import embed_query
+from .hybrid_search import HYBRID, fused_candidates_cte, fused_candidates_params, resolve_mode
 
 logger = logging.getLogger(__name__)
 
+CHUNK_TABLES = """
+    landscape.tbl_platform_knowledge_chunks c
+    JOIN landscape.tbl_platform_knowledge pk ON c.document_id = pk.id
+    LEFT JOIN landscape.tbl_platform_knowledge_chapters ch ON c.chapter_id = ch.id
+"""
+
 
 # Known document sources and their aliases
 SOURCE_PATTERNS = {
@@ -98,7 +105,8 @@ class PlatformKnowledgeRetriever:
         applies_to: Optional[str] = None,
         category: Optional[str] = None,
         max_chunks: int = 10,
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant chunks from platform knowledge.
@@ -113,10 +121,13 @@ class PlatformKnowledgeRetriever:
             applies_to: Filter by task type (e.g., 'extraction', 'validation')
             max_chunks: Maximum chunks to return
             similarity_threshold: Minimum cosine similarity (0-1)
+            mode: 'vector' or 'hybrid' full-text + vector fusion (see hybrid_search)
 
         Returns:
             List of chunk dictionaries with content and metadata
         """
+        hybrid = resolve_mode(mode) == HYBRID
+
         # Step 1: Detect document reference in query
         source_hint, year_hint, keywords = detect_document_reference(query)
         doc_filter_applied = source_hint is not None or year_hint is not None
@@ -127,7 +138,7 @@ class PlatformKnowledgeRetriever:
             logger.info(f"[RETRIEVAL] No document reference detected, searching full corpus")
 
         # Generate query embedding
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             logger.warning("Failed to generate embedding for query")
             return []
@@ -190,8 +201,8 @@ class PlatformKnowledgeRetriever:
 
         where_clause = " AND ".join(filters)
 
-        sql = f"""
-            SELECT
+        sql, full_params = self._chunk_search_sql(
+            """
                 c.id AS chunk_id,
                 c.content,
                 c.content_type,
@@ -207,24 +218,11 @@ class PlatformKnowledgeRetriever:
                 ch.chapter_title,
                 ch.topics,
                 ch.property_types AS chapter_property_types,
-                ch.applies_to,
-                (c.embedding <=> %s::vector) AS distance
-        FROM landscape.tbl_platform_knowledge_chunks c
-            JOIN landscape.tbl_platform_knowledge pk ON c.document_id = pk.id
-            LEFT JOIN landscape.tbl_platform_knowledge_chapters ch ON c.chapter_id = ch.id
-            WHERE {where_clause}
-                AND (c.embedding <=> %s::vector) < %s
-            ORDER BY distance ASC
-            LIMIT %s
-        """
-
-        # Build params in order:
-        # 1. embedding (SELECT)
-        # 2. filter params (WHERE filters)
-        # 3. embedding (WHERE distance)
-        # 4. max_distance (WHERE distance threshold)
-        # 5. max_chunks (LIMIT)
-        full_params = [embedding_str] + filter_params + [embedding_str, max_distance, max_chunks]
+                ch.applies_to
+            """,
+            where_clause, filter_params, embedding_str, max_distance, max_chunks,
+            query=query if hybrid else None,
+        )
 
         try:
             with connection.cursor() as cursor:
@@ -238,6 +236,7 @@ class PlatformKnowledgeRetriever:
                 similarity = 1 - row_dict['distance']
 
                 results.append({
+                    'chunk_id': row_dict['chunk_id'],
                     'content': row_dict['content'],
                     'content_type': row_dict['content_type'],
                     'similarity': round(similarity, 4),
@@ -274,7 +273,8 @@ class PlatformKnowledgeRetriever:
                 # Recursive call without document filtering
                 return self._retrieve_full_corpus(
                     query_embedding, embedding_str, max_distance, max_chunks,
-                    property_type, knowledge_domain, applies_to, category=category
+                    property_type, knowledge_domain, applies_to, category=category,
+                    query=query if hybrid else None
                 )
 
             return results
@@ -292,7 +292,8 @@ class PlatformKnowledgeRetriever:
         property_type: Optional[str],
         knowledge_domain: Optional[str],
         applies_to: Optional[str],
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        query: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Fallback to full corpus search without document filtering."""
         filters = ["pk.is_active = TRUE", "c.embedding IS NOT NULL"]
@@ -318,8 +319,8 @@ class PlatformKnowledgeRetriever:
 
         where_clause = " AND ".join(filters)
 
-        sql = f"""
-            SELECT
+        sql, full_params = self._chunk_search_sql(
+            """
                 c.id AS chunk_id,
                 c.content,
                 c.content_type,
@@ -337,18 +338,11 @@ class PlatformKnowledgeRetriever:
                 ch.property_types AS chapter_property_types,
                 ch.applies_to,
                 c.category,
-                c.metadata,
-                (c.embedding <=> %s::vector) AS distance
-            FROM landscape.tbl_platform_knowledge_chunks c
-            JOIN landscape.tbl_platform_knowledge pk ON c.document_id = pk.id
-            LEFT JOIN landscape.tbl_platform_knowledge_chapters ch ON c.chapter_id = ch.id
-            WHERE {where_clause}
-                AND (c.embedding <=> %s::vector) < %s
-            ORDER BY distance ASC
-            LIMIT %s
-        """
-
-        full_params = [embedding_str] + filter_params + [embedding_str, max_distance, max_chunks]
+                c.metadata
+            """,
+            where_clause, filter_params, embedding_str, max_distance, max_chunks,
+            query=query,
+        )
 
         try:
             with connection.cursor() as cursor:
@@ -362,6 +356,7 @@ class PlatformKnowledgeRetriever:
                 similarity = 1 - row_dict['distance']
 
                 results.append({
+                    'chunk_id': row_dict['chunk_id'],
                     'content': row_dict['content'],
                     'content_type': row_dict['content_type'],
                     'similarity': round(similarity, 4),
@@ -394,6 +389,62 @@ class PlatformKnowledgeRetriever:
             logger.error(f"Platform knowledge fallback retrieval failed: {e}")
             return []
 
+    def _chunk_search_sql(
+        self,
+        columns: str,
+        where_clause: str,
+        filter_params: List[Any],
+        embedding_str: str,
+        max_distance: float,
+        max_chunks: int,
+        query: Optional[str] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        SQL + params ranking chunks that match where_clause.
+
+        Every row gets a cosine ``distance``. With query text the ranking is
+        the hybrid full-text + vector fusion and rows also carry ``rrf_score``;
+        without it, plain nearest-neighbour order.
+        """
+        if query and query.strip():
+            cte = fused_candidates_cte(
+                from_clause=CHUNK_TABLES,
+                where_clause=where_clause,
+                id_column='c.id',
+                embedding_column='c.embedding',
+                text_column='c.content',
+            )
+            sql = f"""
+                WITH {cte}
+                SELECT {columns.strip()},
+                    (c.embedding <=> q.embedding) AS distance,
+                    f.rrf_score
+                FROM fused f
+                JOIN landscape.tbl_platform_knowledge_chunks c ON c.id = f.id
+                JOIN landscape.tbl_platform_knowledge pk ON c.document_id = pk.id
+                LEFT JOIN landscape.tbl_platform_knowledge_chapters ch ON c.chapter_id = ch.id
+                CROSS JOIN query_terms q
+                ORDER BY f.rrf_score DESC
+                LIMIT %s
+            """
+            params = fused_candidates_params(
+                embedding_str, query, filter_params, max_distance, max_chunks
+            ) + [max_chunks]
+            return sql, params
+
+        sql = f"""
+            WITH q AS NOT MATERIALIZED (SELECT %s::vector AS embedding)
+            SELECT {columns.strip()},
+                (c.embedding <=> q.embedding) AS distance
+            FROM {CHUNK_TABLES}
+            CROSS JOIN q
+            WHERE {where_clause}
+                AND (c.embedding <=> q.embedding) < %s
+            ORDER BY distance ASC
+            LIMIT %s
+        """
+        return sql, [embedding_str] + list(filter_params) + [max_distance, max_chunks]
+
     def get_chapter_context(
         self,
         document_key: str,
@@ -501,7 +552,8 @@ class PlatformKnowledgeRetriever:
         query: str,
         document_key: str,
         max_chunks: int = 10,
-        similarity_threshold: float = 0.5
+        similarity_threshold: float = 0.5,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve chunks from a specific platform knowledge document.
@@ -514,12 +566,15 @@ class PlatformKnowledgeRetriever:
             document_key: The document_key to scope the search to
             max_chunks: Maximum chunks to return
             similarity_threshold: Minimum cosine similarity (0-1)
+            mode: 'vector' or 'hybrid' full-text + vector fusion (see hybrid_search)
 
         Returns:
             List of chunk dictionaries with content and metadata
         """
+        hybrid = resolve_mode(mode) == HYBRID
+
         # Generate query embedding
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             logger.warning("Failed to generate embedding for query")
             return []
@@ -527,8 +582,8 @@ class PlatformKnowledgeRetriever:
         embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
         max_distance = 1 - similarity_threshold
 
-        sql = """
-            SELECT
+        sql, params = self._chunk_search_sql(
+            """
                 c.id AS chunk_id,
                 c.content,
                 c.content_type,
@@ -543,22 +598,16 @@ class PlatformKnowledgeRetriever:
                 ch.chapter_number,
                 ch.chapter_title,
                 ch.topics,
-                ch.property_types AS chapter_property_types,
-                (c.embedding <=> %s::vector) AS distance
-            FROM landscape.tbl_platform_knowledge_chunks c
-            JOIN landscape.tbl_platform_knowledge pk ON c.document_id = pk.id
-            LEFT JOIN landscape.tbl_platform_knowledge_chapters ch ON c.chapter_id = ch.id
-            WHERE pk.document_key = %s
-                AND pk.is_active = TRUE
-                AND c.embedding IS NOT NULL
-                AND (c.embedding <=> %s::vector) < %s
-            ORDER BY distance ASC
-            LIMIT %s
-        """
+                ch.property_types AS chapter_property_types
+            """,
+            "pk.document_key = %s AND pk.is_active = TRUE AND c.embedding IS NOT NULL",
+            [document_key], embedding_str, max_distance, max_chunks,
+            query=query if hybrid else None,
+        )
 
         try:
             with connection.cursor() as cursor:
-                cursor.execute(sql, [embedding_str, document_key, embedding_str, max_distance, max_chunks])
+                cursor.execute(sql, params)
                 columns = [col[0] for col in cursor.description]
                 rows = cursor.fetchall()
 
@@ -568,6 +617,7 @@ class PlatformKnowledgeRetriever:
                 similarity = 1 - row_dict['distance']
 
                 results.append({
+                    'chunk_id': row_dict['chunk_id'],
                     'content': row_dict['content'],
                     'content_type': row_dict['content_type'],
                     'similarity': round(similarity, 4),
@@ -11,7 +11,7 @@ from typing import List, Dict, Any, Optional
 from django.db import connection
 
 from .embedding_storage import search_similar
-from .embedding_service import generate_embedding
+from .embedding_service import embed_query
 from .schema_context import get_project_schema_context
 from .query_builder import detect_query_intent, execute_project_query, format_query_results
 
@@ -186,14 +186,15 @@ def retrieve_rag_context(
     # STEP 3: Vector similarity search for document chunks (SECONDARY)
     # Always do this - documents may have additional context even if DB answered
     try:
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         similar_chunks = []
         if query_embedding:
             similar_chunks = search_similar(
                 query_embedding=query_embedding,
                 project_id=project_id,
                 top_k=max_chunks,
-                similarity_threshold=similarity_threshold
+                similarity_threshold=similarity_threshold,
+                query=query,
             )
 
         if similar_chunks:
@@ -275,7 +276,7 @@ class RAGRetriever:
         self.source_types = source_types
 
     def retrieve(self, query: str) -> Dict[str, Any]:
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             return {'chunks': []}
 
@@ -284,7 +285,8 @@ class RAGRetriever:
             project_id=self.project_id,
             top_k=self.top_k,
             similarity_threshold=self.similarity_threshold,
-            source_types=self.source_types
+            source_types=self.source_types,
+            query=query,
         )
 
         if chunks:
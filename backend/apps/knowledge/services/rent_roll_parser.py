@@ -11,11 +11,12 @@ headers + rows format.
 import json
 import logging
 import os
-import re
 from typing import Dict, List, Any, Optional
 
 from anthropic import Anthropic
 
+from .llm_cache import cached_messages_create, loads_fenced_json, parses_as_json_object
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,20 +99,15 @@ Return only valid JSON, no markdown fences, no explanation."""
     try:
         client = _get_anthropic_client()
 
-        response = client.messages.create(
+        response = cached_messages_create(
+            client,
             model="claude-sonnet-4-20250514",
             max_tokens=8000,
+            validate=parses_as_json_object,
             messages=[{"role": "user", "content": prompt}],
         )
 
-        text = response.content[0].text.strip()
-
-        # Strip markdown fences if present
-        if text.startswith('```'):
-            text = re.sub(r'^```(?:json)?\s*', '', text)
-            text = re.sub(r'\s*```$', '', text)
-
-        parsed = json.loads(text)
+        parsed = loads_fenced_json(response.content[0].text)
 
         headers = parsed.get('headers', [])
         rows = parsed.get('rows', [])
@@ -0,0 +1,315 @@
+"""
+Deterministic rent roll parsing for spreadsheets.
+
+An XLSX/CSV rent roll with recognisable headers doesn't need Claude to read
+it: the column mappings (confirmed in the mapper, or discovered with enough
+confidence) already say which column holds what. parse_rent_roll() loads the
+sheet into one DataFrame and normalizes each mapped column with vectorized
+pandas operations — money and counts to numbers, dates to ISO, BD/BA splits,
+bed/bath counts implied by the unit type — then checks the parsed sums
+against the footer totals row when the sheet has one.
+
+Units come out with the same keys and value formats the LLM chunk extractor
+produces, so they stage identically. Cells that don't parse are left out of
+their unit and the row is listed in review_rows; a column that mostly fails,
+or whose sum disagrees with its footer total, is listed in review_fields.
+Only those go to Claude.
+"""
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .blob_cache import local_document
+from .column_discovery import (
+    STANDARD_FIELDS,
+    MappingConfidence,
+    _NON_UNIT_HEADER_VALUES,
+    _detect_compound_column,
+    _get_extension,
+    _get_sample_values,
+    _infer_mime_type,
+    _match_column_to_field,
+    _parse_csv,
+    _parse_xlsx,
+    _should_suggest_skip,
+)
+
+logger = logging.getLogger(__name__)
+
+# Discovered (not user-confirmed) mappings below this confidence are ignored
+MIN_MAPPING_CONFIDENCE = os.getenv('STRUCTURED_RENT_ROLL_MIN_CONFIDENCE', MappingConfidence.HIGH.value)
+
+# A column with more failed cells than this (both as a share of its non-empty
+# cells and as a count) is reviewed whole rather than row by row
+MAX_COLUMN_FAILURE_RATE = 0.2
+MIN_COLUMN_FAILURES = 5
+
+# Footer total vs. parsed sum
+TOTAL_TOLERANCE = 0.01
+
+BED_BATH = 'bed_bath'  # Pseudo-target for compound "3/2.00" columns
+
+_CONFIDENCE_RANK = {
+    MappingConfidence.NONE.value: 0,
+    MappingConfidence.LOW.value: 1,
+    MappingConfidence.MEDIUM.value: 2,
+    MappingConfidence.HIGH.value: 3,
+}
+
+_NULL_MARKERS = frozenset({'', 'none', 'nan', 'nat', 'null', 'n/a', '-', '--', '--/--'})
+
+# "Total", "Grand Total", "113 Units"
+_FOOTER_RE = r'^(?:(?:grand\s+)?totals?\b|\d[\d,]*\s+units?\b)'
+_BED_BATH_RE = r'^(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)$'
+# "2BR/2BA", "2 Bed 1.5 Bath", "2x2", "Studio"
+_TYPE_BEDS_RE = r'(?i)(?:(?P<studio>\bstu(?:dio)?\b)|(?P<beds>\d+)\s*(?:(?:br|bd|bed(?:room)?s?)\b|x(?=\s*\d)))'
+_TYPE_BATHS_RE = r'(?i)(?:(?P<baths>\d+(?:\.\d+)?)\s*(?:ba|bath(?:room)?s?)\b|\d\s*x\s*(?P<xbaths>\d+(?:\.\d+)?)\b)'
+
+
+@dataclass
+class StructuredRentRoll:
+    units: List[Dict[str, Any]]        # One per unit row, in sheet order
+    source_headers: List[str]          # Mapped source columns, for review prompts
+    source_rows: List[List[str]]       # Their raw cells, one list per unit
+    field_columns: Dict[str, int]      # Target field -> index into source_headers
+    review_rows: List[int]             # Units with a cell that did not parse
+    review_fields: List[str]           # Fields whose whole column needs review
+    totals: Dict[str, Dict[str, Any]]  # Field -> footer check
+    warnings: List[str] = field(default_factory=list)
+
+
+def resolve_mappings(
+    headers: List[str],
+    data_rows: List[List[Any]],
+    confirmed: Optional[Dict[str, str]] = None,
+    min_confidence: str = MIN_MAPPING_CONFIDENCE,
+) -> Dict[int, str]:
+    """
+    Column index -> target field. Confirmed mappings ({source column: field})
+    are used as given; otherwise each header goes through column discovery
+    and is kept if its confidence is at least min_confidence. Compound BD/BA
+    columns map to BED_BATH. The first column for a field wins.
+    """
+    columns: Dict[int, str] = {}
+    if confirmed:
+        lookup = {header.strip().lower(): idx for idx, header in enumerate(headers)}
+        for source, target in confirmed.items():
+            idx = lookup.get(str(source).strip().lower())
+            if idx is None or not target:
+                continue
+            if target in ('bedrooms', 'bathrooms') and _detect_compound_column(
+                    headers[idx], _get_sample_values(data_rows, idx)):
+                target = BED_BATH
+            columns[idx] = target
+    else:
+        threshold = _CONFIDENCE_RANK[min_confidence]
+        for idx, header in enumerate(headers):
+            samples = _get_sample_values(data_rows, idx)
+            if _detect_compound_column(header, samples):
+                columns[idx] = BED_BATH
+                continue
+            if _should_suggest_skip(header, samples):
+                continue
+            target, confidence = _match_column_to_field(header, samples)
+            if target and _CONFIDENCE_RANK[confidence.value] >= threshold:
+                columns[idx] = target
+
+    resolved: Dict[int, str] = {}
+    for idx in sorted(columns):
+        if columns[idx] not in resolved.values():
+            resolved[idx] = columns[idx]
+    return resolved
+
+
+def _to_number(raw: pd.Series) -> pd.Series:
+    cleaned = (
+        raw.str.replace(r'[$,\s]', '', regex=True)
+        .str.replace(r'^\((.*)\)$', r'-\1', regex=True)
+    )
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def _to_iso_date(raw: pd.Series) -> pd.Series:
+    # Excel cells arrive as "2024-01-15 00:00:00"; typed text as 1/15/2024 etc.
+    parsed = pd.to_datetime(raw, format='ISO8601', errors='coerce')
+    retry = parsed.isna() & raw.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(raw[retry], format='mixed', errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d')
+
+
+def _plain(value: Any) -> Any:
+    """Whole numbers as int and numpy scalars as Python, matching the LLM's JSON."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 2)
+    return value
+
+
+def parse_rent_roll(
+    headers: List[str],
+    data_rows: List[List[Any]],
+    mappings: Dict[int, str],
+) -> Optional[StructuredRentRoll]:
+    """Parse the mapped columns of a rent roll sheet; None without a unit column."""
+    unit_col = next((idx for idx, target in mappings.items() if target == 'unit_number'), None)
+    if unit_col is None or not data_rows:
+        return None
+
+    frame = pd.DataFrame(data_rows, dtype=object)
+    blank = pd.Series('', index=frame.index, dtype=object)
+    cells = {
+        idx: frame[idx].fillna('').astype(str).str.strip() if idx in frame else blank
+        for idx in mappings
+    }
+
+    # Unit rows: same rules as is_valid_unit_row, minus footer rows
+    unit = cells[unit_col]
+    lower = unit.str.lower()
+    footer = lower.str.contains(_FOOTER_RE, regex=True)
+    is_unit = (
+        unit.str.len().between(1, 10)
+        & unit.str.contains(r'\d', regex=True)
+        & ~lower.isin(_NON_UNIT_HEADER_VALUES | _NULL_MARKERS)
+        & ~footer
+    )
+    if not is_unit.any():
+        return None
+    after_units = footer.index > is_unit[is_unit].index[0]
+    footer_rows = footer[footer & after_units].index
+    footer_row = footer_rows[-1] if len(footer_rows) else None
+
+    values: Dict[str, pd.Series] = {}
+    failed: Dict[str, pd.Series] = {}
+    filled: Dict[str, int] = {}
+    totals: Dict[str, Dict[str, Any]] = {}
+    for idx, target in mappings.items():
+        raw = cells[idx][is_unit]
+        empty = raw.str.lower().isin(_NULL_MARKERS)
+        raw = raw.mask(empty)
+
+        if target == BED_BATH:
+            parts = raw.str.extract(_BED_BATH_RE)
+            values['bedrooms'] = pd.to_numeric(parts[0])
+            values['bathrooms'] = pd.to_numeric(parts[1])
+            for name in ('bedrooms', 'bathrooms'):
+                failed[name] = ~empty & values[name].isna()
+                filled[name] = int((~empty).sum())
+            continue
+
+        data_type = STANDARD_FIELDS.get(target, {}).get('data_type', 'text')
+        if target == 'unit_number':
+            parsed = raw
+        elif data_type in ('number', 'currency'):
+            parsed = _to_number(raw)
+            if footer_row is not None and footer_row in cells[idx].index:
+                expected = _to_number(cells[idx].loc[[footer_row]]).iloc[0]
+                if pd.notna(expected):
+                    total = float(parsed.sum())
+                    totals[target] = {
+                        'footer': float(expected),
+                        'parsed': round(total, 2),
+                        'matches': abs(total - float(expected)) <= TOTAL_TOLERANCE,
+                    }
+        elif data_type == 'date':
+            parsed = _to_iso_date(raw)
+        elif target == 'unit_type':
+            parsed = raw.str.replace(r'\s+', ' ', regex=True)
+        else:
+            parsed = raw
+
+        values[target] = parsed
+        failed[target] = ~empty & parsed.isna()
+        filled[target] = int((~empty).sum())
+
+    # Bed/bath counts spelled out in the unit type ("2BR/2BA", "Studio")
+    unit_type = values.get('unit_type')
+    if unit_type is not None:
+        if 'bedrooms' not in values:
+            beds = unit_type.str.extract(_TYPE_BEDS_RE)
+            values['bedrooms'] = pd.to_numeric(beds['beds']).mask(beds['studio'].notna(), 0)
+        if 'bathrooms' not in values:
+            baths = unit_type.str.extract(_TYPE_BATHS_RE)
+            values['bathrooms'] = pd.to_numeric(baths['baths'].fillna(baths['xbaths']))
+
+    warnings = []
+    review_fields = []
+    for target, bad in failed.items():
+        failures = int(bad.sum())
+        if failures >= MIN_COLUMN_FAILURES and failures > MAX_COLUMN_FAILURE_RATE * filled[target]:
+            review_fields.append(target)
+            warnings.append(f"{target}: {failures} of {filled[target]} cells did not parse")
+    for target, check in totals.items():
+        if not check['matches'] and target not in review_fields:
+            review_fields.append(target)
+            warnings.append(
+                f"{target}: parsed total {check['parsed']} does not match footer total {check['footer']}"
+            )
+
+    row_failed = pd.Series(False, index=unit.index[is_unit])
+    for target, bad in failed.items():
+        if target not in review_fields:
+            row_failed |= bad
+
+    table = pd.DataFrame(values)
+    records = table.astype(object).where(table.notna(), None).to_dict('records')
+    units = [
+        {key: _plain(value) for key, value in record.items() if value is not None}
+        for record in records
+    ]
+    for unit_dict in units:
+        unit_dict['unit_number'] = str(unit_dict['unit_number'])
+
+    source_columns = sorted(mappings)
+    field_columns = {}
+    for position, idx in enumerate(source_columns):
+        targets = ('bedrooms', 'bathrooms') if mappings[idx] == BED_BATH else (mappings[idx],)
+        for target in targets:
+            field_columns[target] = position
+
+    return StructuredRentRoll(
+        units=units,
+        source_headers=[headers[idx] if idx < len(headers) else f"Column_{idx + 1}" for idx in source_columns],
+        source_rows=pd.DataFrame({idx: cells[idx][is_unit] for idx in source_columns}).values.tolist(),
+        field_columns=field_columns,
+        review_rows=[int(i) for i in row_failed.to_numpy().nonzero()[0]],
+        review_fields=review_fields,
+        totals=totals,
+        warnings=warnings,
+    )
+
+
+def read_structured_rent_roll(
+    storage_uri: str,
+    mime_type: Optional[str] = None,
+    file_name: Optional[str] = None,
+    doc_id: Optional[int] = None,
+    confirmed: Optional[Dict[str, str]] = None,
+    content_hash: Optional[str] = None,
+) -> Optional[StructuredRentRoll]:
+    """Download and parse a spreadsheet rent roll; None if it can't be parsed structurally."""
+    if not mime_type:
+        mime_type = _infer_mime_type(storage_uri, file_name)
+
+    with local_document(
+        storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=_get_extension(mime_type)
+    ) as tmp_path:
+        if mime_type in [
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'application/vnd.ms-excel',
+        ]:
+            headers, data_rows, warnings = _parse_xlsx(tmp_path)
+        elif mime_type in ['text/csv', 'application/csv']:
+            headers, data_rows, warnings = _parse_csv(tmp_path)
+        else:
+            return None
+
+    mappings = resolve_mappings(headers, data_rows, confirmed)
+    result = parse_rent_roll(headers, data_rows, mappings)
+    if result:
+        result.warnings = warnings + result.warnings
+    return result
@@ -5,13 +5,24 @@ Supports PDF, DOCX, TXT, images (via OpenAI Vision), and common text formats.
 import os
 import base64
 import logging
-import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import requests
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from .blob_cache import checkout_document
+
 logger = logging.getLogger(__name__)
 
+# Page-sharded PDF extraction: documents with at least PDF_PARALLEL_MIN_PAGES
+# pages are split into PDF_SHARD_PAGES-page shards across a process pool
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '40'))
+PDF_SHARD_PAGES = 16
+PAGE_SEPARATOR = "\n\n"
+
 # PDF extraction
 try:
     import fitz  # PyMuPDF
@@ -41,25 +52,20 @@ except ImportError:
     HAS_OPENPYXL = False
 
 
-def _download_to_temp(storage_uri: str, mime_type: str) -> str:
-    """Download a file to a temp path, handling both URLs and Django storage paths."""
-    parsed = urlparse(storage_uri)
-    suffix = _get_extension(mime_type)
-
-    if parsed.scheme in ('http', 'https'):
-        # Full URL — download via HTTP
-        response = requests.get(storage_uri, timeout=60)
-        response.raise_for_status()
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(response.content)
-            return tmp.name
-    else:
-        # Relative path — read via Django storage (local disk or S3/R2)
-        from django.core.files.storage import default_storage
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            with default_storage.open(storage_uri, 'rb') as f:
-                tmp.write(f.read())
-            return tmp.name
+def _download_to_temp(
+    storage_uri: str,
+    mime_type: str,
+    doc_id: int = None,
+    content_hash: str = None,
+) -> str:
+    """
+    Local temp path holding the file, handling both URLs and Django storage
+    paths. Served from the shared blob cache (content_hash is the document's
+    core_doc.sha256_hash, when known); the caller deletes the path.
+    """
+    return checkout_document(
+        storage_uri, doc_id=doc_id, content_hash=content_hash, suffix=_get_extension(mime_type)
+    )
 
 
 def extract_text_from_url(storage_uri: str, mime_type: str = None) -> Tuple[Optional[str], Optional[str]]:
@@ -73,8 +79,25 @@ def extract_text_from_url(storage_uri: str, mime_type: str = None) -> Tuple[Opti
     Returns:
         Tuple of (extracted_text, error_message)
     """
+    text, _, error = extract_text_layer_from_url(storage_uri, mime_type)
+    return text, error
+
+
+def extract_text_layer_from_url(
+    storage_uri: str,
+    mime_type: str = None,
+    doc_id: int = None,
+    content_hash: str = None,
+) -> Tuple[Optional[str], List[int], Optional[str]]:
+    """
+    Download document from URL and extract text with the character offset
+    where each page starts (a single page at 0 for unpaginated formats).
+
+    Returns:
+        Tuple of (extracted_text, page_offsets, error_message)
+    """
     if not storage_uri:
-        return None, "No storage URI provided"
+        return None, [], "No storage URI provided"
 
     # Infer mime type from URL if not provided
     if not mime_type:
@@ -82,39 +105,41 @@ def extract_text_from_url(storage_uri: str, mime_type: str = None) -> Tuple[Opti
 
     try:
         # Download file to temp location
-        tmp_path = _download_to_temp(storage_uri, mime_type)
+        tmp_path = _download_to_temp(storage_uri, mime_type, doc_id, content_hash)
 
         try:
             # Extract based on type
             if mime_type == 'application/pdf':
-                return _extract_pdf(tmp_path), None
+                return (*_extract_pdf_layer(tmp_path), None)
             elif mime_type in ('application/vnd.openxmlformats-officedocument.wordprocessingml.document',):
-                return _extract_docx(tmp_path), None
+                text = _extract_docx(tmp_path)
             elif mime_type in (
                 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 'application/vnd.ms-excel.sheet.macroEnabled.12',
             ):
-                return _extract_xlsx(tmp_path), None
+                text = _extract_xlsx(tmp_path)
             elif mime_type == 'application/vnd.ms-excel':
-                return None, "Legacy .xls format not supported. Please convert to .xlsx"
+                return None, [], "Legacy .xls format not supported. Please convert to .xlsx"
             elif mime_type.startswith('image/'):
-                return _extract_image_via_vision(tmp_path, mime_type), None
+                text = _extract_image_via_vision(tmp_path, mime_type)
             elif mime_type.startswith('text/') or mime_type in ('application/json', 'application/xml'):
-                return _extract_text(tmp_path), None
+                text = _extract_text(tmp_path)
             else:
-                return None, f"Unsupported mime type: {mime_type}"
+                return None, [], f"Unsupported mime type: {mime_type}"
+            return text, [0] if text else [], None
         finally:
             os.unlink(tmp_path)
 
     except requests.RequestException as e:
-        return None, f"Download failed: {str(e)}"
+        return None, [], f"Download failed: {str(e)}"
     except Exception as e:
-        return None, f"Extraction failed: {str(e)}"
+        return None, [], f"Extraction failed: {str(e)}"
 
 
 def extract_text_and_page_count_from_url(
     storage_uri: str,
-    mime_type: str = None
+    mime_type: str = None,
+    content_hash: str = None,
 ) -> Tuple[Optional[str], Optional[int], Optional[str]]:
     """
     Download document from URL and extract text with optional PDF page count.
@@ -129,7 +154,7 @@ def extract_text_and_page_count_from_url(
         mime_type = _infer_mime_type(storage_uri)
 
     try:
-        tmp_path = _download_to_temp(storage_uri, mime_type)
+        tmp_path = _download_to_temp(storage_uri, mime_type, content_hash=content_hash)
 
         try:
             if mime_type == 'application/pdf':
@@ -166,31 +191,149 @@ def _extract_pdf(file_path: str) -> Optional[str]:
 
 def _extract_pdf_with_page_count(file_path: str) -> Tuple[Optional[str], Optional[int]]:
     """Extract text and page count from PDF using PyMuPDF + pdfplumber for tables."""
+    text, offsets = _extract_pdf_layer(file_path)
+    return text, len(offsets)
+
+
+def _extract_pdf_layer(file_path: str) -> Tuple[Optional[str], List[int]]:
+    """Extract text and per-page start offsets from PDF (see join_pages)."""
     if not HAS_PYMUPDF:
         raise ImportError("PyMuPDF (fitz) not installed. Run: pip install PyMuPDF")
 
-    text_parts = []
-    page_count = 0
-
-    # Step 1: Extract text with PyMuPDF (good for prose)
     with fitz.open(file_path) as doc:
         page_count = len(doc)
-        for page in doc:
-            text_parts.append(page.get_text())
 
-    # Step 2: Extract tables with pdfplumber and append to page text
-    if HAS_PDFPLUMBER:
+    return join_pages([text for _, text in iter_pdf_pages(file_path, page_count)])
+
+
+@contextmanager
+def open_pdf_pages_from_url(
+    storage_uri: str,
+    mime_type: str = 'application/pdf',
+    content_hash: str = None,
+):
+    """
+    Download a PDF and yield (page_count, iter_pdf_pages(...)) so the caller
+    can work on pages while later ones are still being extracted. The temp
+    file is removed on exit.
+    """
+    if not HAS_PYMUPDF:
+        raise ImportError("PyMuPDF (fitz) not installed. Run: pip install PyMuPDF")
+
+    tmp_path = _download_to_temp(storage_uri, mime_type, content_hash=content_hash)
+    try:
+        with fitz.open(tmp_path) as doc:
+            page_count = len(doc)
+        yield page_count, iter_pdf_pages(tmp_path, page_count)
+    finally:
+        os.unlink(tmp_path)
+
+
+def iter_pdf_pages(
+    file_path: str,
+    page_count: int,
+    workers: int = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_index, page_text) in page order, tables appended per page.
+
+    Short documents (or workers <= 1) are read in this process. Longer ones
+    are split into contiguous shards; every shard is submitted up front and
+    results are yielded shard by shard, so the caller gets page 1 as soon as
+    the first shard is done while the pool keeps working on the rest.
+    """
+    workers = PDF_EXTRACT_WORKERS if workers is None else workers
+    shards = _page_shards(page_count)
+
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        for start, stop in shards:
+            for offset, text in enumerate(_extract_page_range(file_path, start, stop)):
+                yield start + offset, text
+        return
+
+    # spawn, not fork: the caller may hold DB connections and heartbeat threads.
+    # Unpickling _extract_page_range imports the services package, which needs
+    # Django's app registry, hence django.setup as the worker initializer.
+    import django
+    from django.conf import settings
+
+    pool = ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup if settings.configured else None,
+    )
+    try:
+        futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in shards]
+        for (start, _), future in zip(shards, futures):
+            for offset, text in enumerate(future.result()):
+                yield start + offset, text
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def join_pages(page_texts: List[str]) -> Tuple[Optional[str], List[int]]:
+    """
+    Document text from page texts (PAGE_SEPARATOR-joined, stripped) and the
+    character offset where each page starts in it.
+    """
+    offsets = []
+    position = 0
+    for page_text in page_texts:
+        offsets.append(position)
+        position += len(page_text) + len(PAGE_SEPARATOR)
+
+    joined = PAGE_SEPARATOR.join(page_texts)
+    lead = len(joined) - len(joined.lstrip())
+    text = joined.strip()
+    offsets = [min(max(offset - lead, 0), len(text)) for offset in offsets]
+    return text or None, offsets
+
+
+def _page_shards(page_count: int, shard_pages: int = PDF_SHARD_PAGES) -> List[Tuple[int, int]]:
+    """Contiguous [start, stop) page ranges covering the document."""
+    return [(start, min(start + shard_pages, page_count)) for start in range(0, page_count, shard_pages)]
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Text of pages [start, stop) with their tables appended.
+
+    Runs inside pool workers, so it opens the file itself. pdfplumber's
+    default table strategy needs ruling lines, so only pages where PyMuPDF
+    sees drawn lines or rectangles go through table detection.
+    """
+    texts = []
+    table_pages = []
+    with fitz.open(file_path) as doc:
+        for page_idx in range(start, stop):
+            page = doc[page_idx]
+            texts.append(page.get_text())
+            if HAS_PDFPLUMBER and _page_has_ruling_lines(page):
+                table_pages.append(page_idx)
+
+    if table_pages:
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_idx, page in enumerate(pdf.pages):
+            with pdfplumber.open(file_path, pages=[idx + 1 for idx in table_pages]) as pdf:
+                for page_idx, page in zip(table_pages, pdf.pages):
                     table_text = _extract_tables_from_page(page, page_idx)
-                    if table_text and page_idx < len(text_parts):
-                        text_parts[page_idx] = text_parts[page_idx] + "\n\n" + table_text
+                    if table_text:
+                        texts[page_idx - start] = texts[page_idx - start] + "\n\n" + table_text
         except Exception:
             pass  # Fall back to PyMuPDF-only text
 
-    text = "\n\n".join(text_parts).strip() or None
-    return text, page_count
+    return texts
+
+
+def _page_has_ruling_lines(page) -> bool:
+    """Whether a PyMuPDF page draws any straight line, rectangle or quad."""
+    try:
+        for drawing in page.get_drawings():
+            for item in drawing.get('items', ()):
+                if item[0] in ('l', 're', 'qu'):
+                    return True
+    except Exception:
+        return True  # Can't tell - let pdfplumber decide
+    return False
 
 
 def _extract_tables_from_page(page, page_idx: int) -> Optional[str]:
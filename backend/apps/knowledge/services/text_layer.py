@@ -0,0 +1,143 @@
+"""
+Persisted document text layer.
+
+Extraction stores each document's full normalized text once per file version
+in landscape.core_doc_text, the same row the chat fallback, the workbench and
+the knowledge library read, together with the character offset where each
+page starts. Readers get the whole text or any page range from one
+primary-key read instead of stitching knowledge_embeddings chunks back
+together (which truncated long documents) or downloading and re-parsing the
+source file. Compression is left to TOAST (lz4 where the server has it).
+
+A row is tied to core_doc.sha256_hash at write time. When the document's file
+changes the row stops matching and is treated as missing. Writers that only
+have the text (upload classification, batched extraction) store no page
+offsets; such a row still serves whole-text readers, and ensure_text_layer
+re-extracts it once to fill the pages in.
+
+Documents without pages (DOCX, spreadsheets, plain text) are stored as a
+single page.
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.db import connection
+
+from .text_extraction import extract_text_layer_from_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TextLayer:
+    doc_id: int
+    text: str
+    page_offsets: List[int]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_offsets)
+
+    def pages(self, first: int, last: int = None) -> str:
+        """Text of pages first..last (1-based, inclusive); '' if out of range."""
+        last = min(first if last is None else last, self.page_count)
+        if first < 1 or first > last:
+            return ''
+        start = self.page_offsets[first - 1]
+        end = self.page_offsets[last] if last < self.page_count else len(self.text)
+        return self.text[start:end].strip()
+
+    def page_texts(self) -> List[str]:
+        return [self.pages(page) for page in range(1, self.page_count + 1)]
+
+
+def save_text_layer(
+    cursor,
+    doc_id: int,
+    text: str,
+    page_offsets: Optional[List[int]] = None,
+    extraction_method: str = None,
+) -> None:
+    """
+    Store (or replace) the document's text in core_doc_text against its
+    current file hash. page_offsets=None records the text without pages.
+    """
+    cursor.execute("""
+        INSERT INTO landscape.core_doc_text
+            (doc_id, extracted_text, word_count, page_offsets, source_hash,
+             extraction_method, extracted_at, updated_at)
+        SELECT doc_id, %s, %s, %s, sha256_hash, %s, NOW(), NOW()
+        FROM landscape.core_doc
+        WHERE doc_id = %s
+        ON CONFLICT (doc_id) DO UPDATE SET
+            extracted_text = EXCLUDED.extracted_text,
+            word_count = EXCLUDED.word_count,
+            page_offsets = EXCLUDED.page_offsets,
+            source_hash = EXCLUDED.source_hash,
+            extraction_method = EXCLUDED.extraction_method,
+            extracted_at = EXCLUDED.extracted_at,
+            updated_at = EXCLUDED.updated_at
+    """, [
+        text,
+        len(text.split()),
+        list(page_offsets) if page_offsets is not None else None,
+        extraction_method,
+        doc_id,
+    ])
+
+
+def load_text_layer(doc_id: int) -> Optional[TextLayer]:
+    """
+    The stored text layer, or None if missing, stored without pages, or
+    extracted from an older file.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT t.extracted_text, t.page_offsets
+            FROM landscape.core_doc_text t
+            JOIN landscape.core_doc d ON d.doc_id = t.doc_id
+            WHERE t.doc_id = %s
+              AND t.extracted_text IS NOT NULL
+              AND t.page_offsets IS NOT NULL
+              AND t.source_hash IS NOT DISTINCT FROM d.sha256_hash
+        """, [doc_id])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+    return TextLayer(doc_id=doc_id, text=row[0], page_offsets=list(row[1] or [0]))
+
+
+def ensure_text_layer(doc_id: int) -> Optional[TextLayer]:
+    """
+    The stored text layer, extracting and storing it first if there is none
+    (documents processed before the layer existed, stored without pages, or
+    whose file changed).
+    """
+    layer = load_text_layer(doc_id)
+    if layer:
+        return layer
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT storage_uri, mime_type, sha256_hash
+            FROM landscape.core_doc
+            WHERE doc_id = %s
+        """, [doc_id])
+        row = cursor.fetchone()
+
+    if not row or not row[0]:
+        return None
+
+    text, page_offsets, error = extract_text_layer_from_url(
+        row[0], row[1], doc_id=doc_id, content_hash=row[2]
+    )
+    if not text:
+        logger.warning(f"[doc_id={doc_id}] No text layer: {error or 'no text extracted'}")
+        return None
+
+    with connection.cursor() as cursor:
+        save_text_layer(cursor, doc_id, text, page_offsets, 'on_demand')
+    logger.info(f"[doc_id={doc_id}] Stored text layer ({len(text)} chars, {len(page_offsets)} pages)")
+    return TextLayer(doc_id=doc_id, text=text, page_offsets=page_offsets)
@@ -0,0 +1,208 @@
+"""
+ANN index management for knowledge_embeddings.
+
+Document chunks carry a denormalized project_id (migration 0013) and are
+covered by one shared partial HNSW index:
+
+    idx_knowledge_embeddings_doc_hnsw   WHERE source_type = 'document_chunk'
+
+A filtered HNSW scan walks the shared graph and discards other projects'
+rows, so a project that owns only a sliver of the table can come back short
+of top_k. For small projects the planner normally prefers the project_id
+btree and an exact sort (a few thousand distance computations); on
+pgvector 0.8+ HNSW_ITERATIVE_SCAN=relaxed_order also lets a filtered HNSW
+scan keep going until it has enough rows. Projects with at least
+PROJECT_INDEX_MIN_ROWS chunks get their own partial index, which the
+planner picks when the query names that project_id literally:
+
+    idx_knowledge_embeddings_hnsw_p<project_id>
+        WHERE source_type = 'document_chunk' AND project_id = <project_id>
+
+scoped_hits_cte() is the query shape all of this is built for. Search
+breadth (hnsw.ef_search) and iterative scans are set per connection in
+db_backend from HNSW_EF_SEARCH / HNSW_ITERATIVE_SCAN. manage_vector_indexes
+builds, rebuilds and reports on the indexes; benchmark_ann measures recall
+and latency against exact search.
+"""
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connection
+
+EMBEDDINGS_TABLE = 'landscape.knowledge_embeddings'
+SHARED_INDEX = 'idx_knowledge_embeddings_doc_hnsw'
+PROJECT_INDEX_PREFIX = 'idx_knowledge_embeddings_hnsw_p'
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+PROJECT_INDEX_MIN_ROWS = int(os.getenv('KNOWLEDGE_PROJECT_INDEX_MIN_ROWS', '50000'))
+
+
+def project_index_name(project_id: int, prefix: str = PROJECT_INDEX_PREFIX) -> str:
+    return f'{prefix}{int(project_id)}'
+
+
+def index_project_id(index_name: str, prefix: str = PROJECT_INDEX_PREFIX) -> Optional[int]:
+    """project_id of a per-project index name, None for any other index."""
+    match = re.match(rf'^{re.escape(prefix)}(\d+)$', index_name)
+    return int(match.group(1)) if match else None
+
+
+def hnsw_index_sql(name: str, predicate: str, table: str = EMBEDDINGS_TABLE) -> str:
+    """CREATE INDEX CONCURRENTLY statement for a partial cosine HNSW index."""
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+        f"USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION}) "
+        f"WHERE {predicate}"
+    )
+
+
+def project_index_sql(project_id: int, table: str = EMBEDDINGS_TABLE,
+                      prefix: str = PROJECT_INDEX_PREFIX) -> str:
+    return hnsw_index_sql(
+        project_index_name(project_id, prefix),
+        f"source_type = 'document_chunk' AND project_id = {int(project_id)}",
+        table,
+    )
+
+
+def scoped_hits_cte(table: str = EMBEDDINGS_TABLE) -> str:
+    """
+    WITH-clause body defining ``q`` and ``hits(embedding_id, distance)``:
+    the nearest document chunks of one project plus shared (project-less)
+    chunks.
+
+    Each scope is its own ORDER BY ... LIMIT arm rather than one
+    ``project_id = X OR project_id IS NULL`` filter, so each arm can use the
+    index that fits it and stop after ``limit`` rows. Parameters, in order:
+    vector literal, project_id, limit, limit.
+    """
+    arm = """
+            SELECT ke.embedding_id, ke.embedding <=> q.embedding AS distance
+            FROM {table} ke
+            CROSS JOIN q
+            WHERE ke.source_type = 'document_chunk'
+              AND {scope}
+            ORDER BY ke.embedding <=> q.embedding
+            LIMIT %s
+    """
+    return f"""
+        q AS NOT MATERIALIZED (SELECT %s::vector AS embedding),
+        hits AS (
+            ({arm.format(table=table, scope='ke.project_id = %s')})
+            UNION ALL
+            ({arm.format(table=table, scope='ke.project_id IS NULL')})
+        )
+    """
+
+
+def scoped_hits_params(vector: str, project_id: int, limit: int) -> List[Any]:
+    """Parameters for scoped_hits_cte(), in placeholder order."""
+    return [vector, project_id, limit, limit]
+
+
+def plan_project_indexes(
+    project_rows: Iterable[Tuple[Optional[int], int]],
+    existing_indexes: Iterable[str],
+    min_rows: int = PROJECT_INDEX_MIN_ROWS,
+    prefix: str = PROJECT_INDEX_PREFIX,
+) -> Tuple[List[int], List[str]]:
+    """
+    Per-project indexes to create and to drop.
+
+    project_rows is (project_id, chunk count). A project gets an index at
+    min_rows and keeps it until it falls below half of that, so a project
+    hovering around the threshold is not rebuilt on every run.
+    """
+    counts = {pid: rows for pid, rows in project_rows if pid is not None}
+    indexed = {index_project_id(name, prefix): name for name in existing_indexes}
+    indexed.pop(None, None)
+
+    to_create = sorted(
+        pid for pid, rows in counts.items()
+        if rows >= min_rows and pid not in indexed
+    )
+    to_drop = sorted(
+        name for pid, name in indexed.items()
+        if counts.get(pid, 0) < min_rows // 2
+    )
+    return to_create, to_drop
+
+
+def project_row_counts(table: str = EMBEDDINGS_TABLE) -> List[Tuple[Optional[int], int]]:
+    """Document chunk count per project_id (None = shared documents)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT project_id, COUNT(*)
+            FROM {table}
+            WHERE source_type = 'document_chunk'
+            GROUP BY project_id
+            ORDER BY COUNT(*) DESC
+        """)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def index_health(table: str = EMBEDDINGS_TABLE) -> List[Dict[str, Any]]:
+    """
+    Every HNSW index on table: size, validity (a failed CONCURRENTLY build
+    leaves an invalid index behind), scans since stats reset, and predicate.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                i.relname,
+                pg_relation_size(i.oid),
+                x.indisvalid,
+                COALESCE(s.idx_scan, 0),
+                pg_get_expr(x.indpred, x.indrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_am am ON am.oid = i.relam
+            LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND am.amname = 'hnsw'
+            ORDER BY i.relname
+        """, [table])
+        return [
+            {
+                'name': row[0],
+                'size_bytes': row[1],
+                'valid': row[2],
+                'scans': row[3],
+                'predicate': row[4],
+                'project_id': index_project_id(row[0]),
+            }
+            for row in cursor.fetchall()
+        ]
+
+
+def _schema(table: str) -> str:
+    return table.split('.')[0] if '.' in table else 'public'
+
+
+def create_project_index(project_id: int, table: str = EMBEDDINGS_TABLE,
+                         prefix: str = PROJECT_INDEX_PREFIX) -> str:
+    """Build one project's partial HNSW index. Must run outside a transaction."""
+    with connection.cursor() as cursor:
+        cursor.execute(project_index_sql(project_id, table, prefix))
+    return project_index_name(project_id, prefix)
+
+
+def create_shared_index(table: str = EMBEDDINGS_TABLE, name: str = SHARED_INDEX) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(hnsw_index_sql(name, "source_type = 'document_chunk'", table))
+    return name
+
+
+def rebuild_index(name: str, table: str = EMBEDDINGS_TABLE) -> None:
+    """REINDEX CONCURRENTLY, e.g. after bulk deletes or an invalid build."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"REINDEX INDEX CONCURRENTLY {_schema(table)}.{name}")
+
+
+def drop_indexes(names: Sequence[str], table: str = EMBEDDINGS_TABLE) -> None:
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_schema(table)}.{name}")
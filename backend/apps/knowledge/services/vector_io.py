@@ -0,0 +1,114 @@
+"""
+Binary pgvector I/O.
+
+The text form of a 1536-dim vector ('[0.0123,...]') is ~30 KB to format,
+send and parse. pgvector's binary form is 6 KB of big-endian float32:
+
+    uint16 dim | uint16 unused | float32[dim]
+
+Writes go through COPY ... (FORMAT binary) into a temp staging table and
+then INSERT ... SELECT, which keeps RETURNING / ON CONFLICT available.
+Reads select ``vector_send(embedding)`` and decode with numpy. psycopg2 only
+binds parameters as text, so query vectors are still literals - bind them
+once (a CTE) rather than per use.
+"""
+import io
+import struct
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+
+# Element type OIDs for binary arrays
+INT8_OID = 20
+TEXT_OID = 25
+
+_INT16 = struct.Struct('>h')
+_INT32 = struct.Struct('>i')
+_INT64 = struct.Struct('>q')
+_VECTOR_HEADER = struct.Struct('>HH')
+_NULL_FIELD = _INT32.pack(-1)
+
+
+def encode_vector(vector: Sequence[float]) -> bytes:
+    """pgvector binary (vector_recv) form of an embedding."""
+    values = np.asarray(vector, dtype='>f4')
+    return _VECTOR_HEADER.pack(values.shape[0], 0) + values.tobytes()
+
+
+def decode_vector(data: Optional[bytes]) -> Optional[List[float]]:
+    """Inverse of encode_vector, for ``vector_send(col)`` results."""
+    if data is None:
+        return None
+    return np.frombuffer(bytes(data), dtype='>f4', offset=_VECTOR_HEADER.size).tolist()
+
+
+def _encode_text(value: str) -> bytes:
+    return value.encode('utf-8')
+
+
+def _encode_int8(value: int) -> bytes:
+    return _INT64.pack(int(value))
+
+
+def _encode_array(values: Sequence[Any], element_oid: int, encode_element) -> bytes:
+    if not values:
+        return _INT32.pack(0) + _INT32.pack(0) + _INT32.pack(element_oid)
+    parts = [
+        _INT32.pack(1), _INT32.pack(0), _INT32.pack(element_oid),
+        _INT32.pack(len(values)), _INT32.pack(1),
+    ]
+    for value in values:
+        data = encode_element(value)
+        parts.append(_INT32.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _encode_int8_array(values: Sequence[int]) -> bytes:
+    return _encode_array(values, INT8_OID, _encode_int8)
+
+
+def _encode_text_array(values: Sequence[str]) -> bytes:
+    return _encode_array(values, TEXT_OID, _encode_text)
+
+
+ENCODERS = {
+    'text': _encode_text,
+    'int8': _encode_int8,
+    'vector': encode_vector,
+    'int8[]': _encode_int8_array,
+    'text[]': _encode_text_array,
+}
+
+
+def binary_copy_payload(rows: Iterable[Sequence[Any]], types: Sequence[str]) -> bytes:
+    """
+    COPY (FORMAT binary) stream for rows whose columns have the given types
+    (keys of ENCODERS). None is written as NULL.
+    """
+    encoders = [ENCODERS[t] for t in types]
+    field_count = _INT16.pack(len(types))
+    parts = [COPY_SIGNATURE, _INT32.pack(0), _INT32.pack(0)]
+    for row in rows:
+        parts.append(field_count)
+        for value, encode in zip(row, encoders):
+            if value is None:
+                parts.append(_NULL_FIELD)
+                continue
+            data = encode(value)
+            parts.append(_INT32.pack(len(data)))
+            parts.append(data)
+    parts.append(_INT16.pack(-1))
+    return b''.join(parts)
+
+
+def copy_binary(cursor, table: str, columns: Sequence[str], types: Sequence[str],
+                rows: Iterable[Sequence[Any]]) -> None:
+    """COPY rows into table over a raw psycopg2 cursor in binary format."""
+    payload = binary_copy_payload(rows, types)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)",
+        io.BytesIO(payload),
+    )
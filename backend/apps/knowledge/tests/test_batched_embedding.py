@@ -0,0 +1,152 @@
+"""Batched chunk embedding for DocumentProcessor.
+
+Chunks are split into token-bounded batches, embedded with several requests
+in flight against a local stub of the OpenAI embeddings endpoint, and written
+with one bulk INSERT per batch. Vectors must come back in chunk order and a
+failed batch must only drop its own chunks.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from openai import OpenAI
+
+from apps.knowledge.services import embedding_service
+from apps.knowledge.services.document_processor import DocumentProcessor
+from apps.knowledge.services.embedding_service import (
+    embed_batches,
+    estimate_tokens,
+    plan_embedding_batches,
+)
+
+
+class _StubEmbeddings(BaseHTTPRequestHandler):
+    """Returns [len(text), 0.0] per input; inputs containing 'FAIL' -> HTTP 500."""
+
+    server_state = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        state = self.server_state
+        with state['lock']:
+            state['requests'].append(len(body['input']))
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        try:
+            time.sleep(0.05)
+            if any('FAIL' in text for text in body['input']):
+                self.send_response(500)
+                self.end_headers()
+                return
+            payload = json.dumps({
+                'object': 'list',
+                'model': body['model'],
+                'data': [
+                    {'object': 'embedding', 'index': i, 'embedding': [float(len(text)), 0.0]}
+                    for i, text in enumerate(body['input'])
+                ],
+                'usage': {'prompt_tokens': 0, 'total_tokens': 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with state['lock']:
+                state['in_flight'] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    state = {'lock': threading.Lock(), 'requests': [], 'in_flight': 0, 'max_in_flight': 0}
+    handler = type('Handler', (_StubEmbeddings,), {'server_state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = OpenAI(
+        api_key='test',
+        base_url=f'http://127.0.0.1:{server.server_address[1]}/v1',
+        max_retries=0,
+    )
+    monkeypatch.setattr(embedding_service, '_client', client)
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_plan_respects_input_and_token_limits():
+    texts = ['x' * 300] * 10  # 101 estimated tokens each
+    assert plan_embedding_batches(texts, max_inputs=4) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert plan_embedding_batches(texts, max_tokens=3 * 101) == [
+        [0, 1, 2], [3, 4, 5], [6, 7, 8], [9],
+    ]
+    # An oversized text still gets its own batch rather than being dropped
+    assert plan_embedding_batches(['y' * 50_000], max_tokens=10) == [[0]]
+    assert estimate_tokens('y' * 50_000) == estimate_tokens('y' * embedding_service.MAX_CHARS)
+
+
+def test_embed_batches_preserves_order_with_concurrent_requests(stub_server):
+    texts = ['a' * (i + 1) for i in range(12)]
+    batches = plan_embedding_batches(texts, max_inputs=3)
+
+    vectors = embed_batches(texts, batches, max_concurrency=4)
+
+    assert [v[0] for v in vectors] == [float(i + 1) for i in range(12)]
+    assert sorted(stub_server['requests']) == [3, 3, 3, 3]
+    assert stub_server['max_in_flight'] > 1
+
+
+def test_failed_batch_only_drops_its_own_chunks(stub_server):
+    texts = ['ok', 'fine', 'FAIL', 'ok too']
+    vectors = embed_batches(texts, [[0, 1], [2, 3]], max_concurrency=2)
+
+    assert vectors[0] == [2.0, 0.0] and vectors[1] == [4.0, 0.0]
+    assert vectors[2] is None and vectors[3] is None
+
+
+def test_processor_writes_one_bulk_insert_per_batch(stub_server, monkeypatch):
+    from apps.knowledge.services import document_processor
+
+    monkeypatch.setattr(document_processor, 'plan_embedding_batches',
+                        lambda texts: plan_embedding_batches(texts, max_inputs=2))
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (
+        9, 's3://doc.pdf', 'application/pdf', 'OM.pdf', 'om', 17, None,
+    )
+    monkeypatch.setattr(document_processor, 'connection', connection)
+    monkeypatch.setattr(document_processor, 'extract_text_layer_from_url',
+                        lambda uri, mime, doc_id=None, content_hash=None: ('body text', [0], None))
+    monkeypatch.setattr(document_processor, 'inspect_upload',
+                        lambda **_: mock.MagicMock(is_plan=False))
+    monkeypatch.setattr(document_processor, 'chunk_document_with_sections', lambda **_: [
+        {'content': f'chunk body {i}', 'chunk_index': i, 'total_chunks': 3, 'metadata': {}}
+        for i in range(3)
+    ])
+    embeddings = mock.MagicMock()
+    embeddings.objects.filter.return_value.delete.return_value = (0, {})
+    monkeypatch.setattr(document_processor, 'KnowledgeEmbedding', embeddings)
+    monkeypatch.setattr(document_processor.transaction, 'atomic', mock.MagicMock())
+    store = mock.MagicMock(side_effect=lambda batch: list(range(len(batch))))
+    monkeypatch.setattr(document_processor, 'store_embeddings_batch', store)
+    processor = DocumentProcessor()
+    processor._update_status = mock.MagicMock()
+
+    result = processor.process_document(9)
+
+    assert result['success'] and result['embeddings_created'] == 3
+    assert [len(call.args[0]) for call in store.call_args_list] == [2, 1]
+    first_row = store.call_args_list[0].args[0][0]
+    assert first_row['tags'] == ['doc_type:om', 'chunk:1/3']
+    assert first_row['entity_ids'] == [17]
+    assert first_row['embedding'][0] == float(len(first_row['content_text']))
+    assert set(result['timings']) == {'extract', 'chunk', 'embed', 'write'}
+    processor._update_status.assert_called_with(
+        9, 'ready', chunks_count=3, embeddings_count=3, timings=result['timings'],
+    )
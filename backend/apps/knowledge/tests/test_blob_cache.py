@@ -0,0 +1,192 @@
+"""Local document blob cache.
+
+A document is fetched once per storage_uri no matter how many extractors ask
+for it, with or without its doc_id; callers get private paths that survive
+eviction; eviction drops least recently used blobs first and prunes the refs
+and locks they leave; failed downloads leave nothing behind; and hits /
+misses are counted per document.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from apps.knowledge.services import blob_cache
+from apps.knowledge.services.blob_cache import (
+    blob_cache_stats,
+    checkout_document,
+    evict,
+    local_document,
+)
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """Fake storage: uri -> bytes, recording every open."""
+    files = {}
+    opened = []
+
+    def fake_open(uri):
+        opened.append(uri)
+        if uri not in files:
+            raise FileNotFoundError(uri)
+        return io.BytesIO(files[uri])
+
+    monkeypatch.setattr(blob_cache, '_open_source', fake_open)
+    blob_cache.reset_blob_cache_stats()
+    return files, opened
+
+
+def _blobs(cache_dir):
+    return sorted(os.listdir(os.path.join(cache_dir, 'blobs')))
+
+
+def test_second_checkout_is_a_hit_with_identical_bytes(tmp_path, source):
+    files, opened = source
+    files['s3://om.pdf'] = b'%PDF offering memo'
+    cache_dir = str(tmp_path)
+
+    first = checkout_document('s3://om.pdf', doc_id=7, suffix='.pdf', cache_dir=cache_dir)
+    second = checkout_document('s3://om.pdf', doc_id=7, suffix='.pdf', cache_dir=cache_dir)
+
+    assert opened == ['s3://om.pdf']
+    assert first != second and first.endswith('.pdf')
+    assert open(first, 'rb').read() == open(second, 'rb').read() == b'%PDF offering memo'
+    assert blob_cache_stats(7) == {'hits': 1, 'misses': 1}
+    assert _blobs(cache_dir) == [hashlib.sha256(b'%PDF offering memo').hexdigest()]
+    os.unlink(first)
+    os.unlink(second)
+
+
+def test_callers_without_a_doc_id_share_the_entry(tmp_path, source):
+    files, opened = source
+    files['s3://plan.pdf'] = b'%PDF site plan'
+    cache_dir = str(tmp_path)
+
+    for doc_id in (12, None, 12):
+        os.unlink(checkout_document('s3://plan.pdf', doc_id=doc_id, cache_dir=cache_dir))
+
+    assert opened == ['s3://plan.pdf']
+    assert os.listdir(os.path.join(cache_dir, 'refs')) == [blob_cache._cache_key('s3://plan.pdf')]
+    assert blob_cache_stats(12) == {'hits': 1, 'misses': 1}
+    assert blob_cache_stats() == {'hits': 2, 'misses': 1}
+
+
+def test_eviction_prunes_dangling_refs_and_idle_locks(tmp_path, source):
+    files, _ = source
+    cache_dir = str(tmp_path)
+    files['keep'], files['drop'] = b'k' * 100, b'd' * 100
+    os.unlink(checkout_document('drop', cache_dir=cache_dir))
+    blob = os.path.join(cache_dir, 'blobs', hashlib.sha256(files['drop']).hexdigest())
+    os.utime(blob, (time.time() - 300, time.time() - 300))
+    os.unlink(checkout_document('keep', cache_dir=cache_dir))
+
+    held = os.path.join(cache_dir, 'locks', 'busy.lock')
+    with blob_cache._locked(held):
+        assert evict(cache_dir, max_bytes=100) == 1
+
+    assert os.listdir(os.path.join(cache_dir, 'refs')) == [blob_cache._cache_key('keep')]
+    assert sorted(os.listdir(os.path.join(cache_dir, 'locks'))) == ['busy.lock', 'evict.lock']
+
+
+def test_checked_out_path_outlives_caller_cleanup_and_eviction(tmp_path, source):
+    files, opened = source
+    files['s3://rr.xlsx'] = b'rent roll'
+    cache_dir = str(tmp_path)
+
+    with local_document('s3://rr.xlsx', doc_id=1, suffix='.xlsx', cache_dir=cache_dir) as path:
+        pass
+    assert not os.path.exists(path)
+
+    path = checkout_document('s3://rr.xlsx', doc_id=1, cache_dir=cache_dir)
+    evict(cache_dir, max_bytes=0)
+
+    assert _blobs(cache_dir) == []
+    assert open(path, 'rb').read() == b'rent roll'
+    os.unlink(path)
+
+
+def test_eviction_drops_least_recently_used_first(tmp_path, source):
+    files, _ = source
+    cache_dir = str(tmp_path)
+    for name in ('a', 'b', 'c'):
+        files[name] = name.encode() * 100
+
+    paths = []
+    for age, name in enumerate(('a', 'b', 'c')):
+        paths.append(checkout_document(name, doc_id=age, cache_dir=cache_dir))
+        blob = os.path.join(cache_dir, 'blobs', hashlib.sha256(files[name]).hexdigest())
+        os.utime(blob, (time.time() - 300 + age, time.time() - 300 + age))
+    paths.append(checkout_document('a', doc_id=0, cache_dir=cache_dir))  # a becomes most recent
+
+    assert evict(cache_dir, max_bytes=200) == 1
+    assert hashlib.sha256(files['b']).hexdigest() not in _blobs(cache_dir)
+    assert len(_blobs(cache_dir)) == 2
+    for path in paths:
+        os.unlink(path)
+
+
+def test_known_content_hash_skips_the_fetch_and_detects_stale_refs(tmp_path, source):
+    files, opened = source
+    cache_dir = str(tmp_path)
+    files['https://cdn/v1'] = b'version one'
+    path = checkout_document('https://cdn/v1', doc_id=3, cache_dir=cache_dir)
+    os.unlink(path)
+
+    # Same bytes under a new uri: content-addressed hit, no download
+    digest = hashlib.sha256(b'version one').hexdigest()
+    os.unlink(checkout_document('https://cdn/copy', doc_id=4, content_hash=digest.upper(), cache_dir=cache_dir))
+    assert opened == ['https://cdn/v1']
+
+    # The uri now serves different bytes and the caller knows their hash
+    files['https://cdn/v1'] = b'version two'
+    path = checkout_document(
+        'https://cdn/v1', doc_id=3,
+        content_hash=hashlib.sha256(b'version two').hexdigest(), cache_dir=cache_dir,
+    )
+    assert open(path, 'rb').read() == b'version two'
+    assert blob_cache_stats(3) == {'hits': 0, 'misses': 2}
+    assert blob_cache_stats(4) == {'hits': 1, 'misses': 0}
+    os.unlink(path)
+
+
+def test_failed_download_leaves_no_partial_files(tmp_path, monkeypatch):
+    class Broken(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell():
+                raise IOError('connection reset')
+            return super().read(4)
+
+    monkeypatch.setattr(blob_cache, '_open_source', lambda uri: Broken(b'truncated body'))
+    cache_dir = str(tmp_path)
+
+    with pytest.raises(IOError):
+        checkout_document('s3://flaky.pdf', doc_id=9, cache_dir=cache_dir)
+
+    assert os.listdir(os.path.join(cache_dir, 'blobs')) == []
+    assert os.listdir(os.path.join(cache_dir, 'refs')) == []
+
+
+def test_concurrent_checkouts_download_once(tmp_path, source):
+    files, opened = source
+    files['s3://big.pdf'] = b'x' * 4096
+    cache_dir = str(tmp_path)
+    paths = []
+
+    def worker():
+        paths.append(checkout_document('s3://big.pdf', doc_id=5, cache_dir=cache_dir))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert opened == ['s3://big.pdf']
+    assert len(set(paths)) == 6
+    assert blob_cache_stats(5) == {'hits': 5, 'misses': 1}
+    for path in paths:
+        os.unlink(path)
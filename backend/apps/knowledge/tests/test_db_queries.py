@@ -259,7 +259,7 @@ class TestSchemaContext:
 class TestIntegration:
     """Integration tests for the full flow."""
 
-    @patch('apps.knowledge.services.rag_retrieval.generate_embedding')
+    @patch('apps.knowledge.services.rag_retrieval.embed_query')
     @patch('apps.knowledge.services.rag_retrieval.search_similar')
     @patch('apps.knowledge.services.rag_retrieval.get_project_schema_context')
     @patch('apps.knowledge.services.rag_retrieval.execute_project_query')
@@ -292,7 +292,7 @@ class TestIntegration:
         assert context.db_query_result is not None
         assert 'database' in context.sources_used
 
-    @patch('apps.knowledge.services.rag_retrieval.generate_embedding')
+    @patch('apps.knowledge.services.rag_retrieval.embed_query')
     @patch('apps.knowledge.services.rag_retrieval.search_similar')
     @patch('apps.knowledge.services.rag_retrieval.get_project_schema_context')
     @patch('apps.knowledge.services.rag_retrieval.detect_query_intent')
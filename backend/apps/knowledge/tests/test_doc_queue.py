@@ -0,0 +1,178 @@
+"""Leased document-processing queue.
+
+Claims happen in one statement with SKIP LOCKED, only the lease holder can
+complete a row, long documents keep their lease through heartbeats, a worker
+that loses its lease abandons the document unwritten, and get_queue_stats
+reports depth, throughput and per-stage p95.
+"""
+import functools
+import time
+from unittest import mock
+
+import pytest
+
+from apps.knowledge.management.commands import run_document_workers
+from apps.knowledge.services import document_processor
+from apps.knowledge.services.document_processor import (
+    LeaseHeartbeat,
+    claim_next_document,
+    complete_queue_item,
+    get_queue_stats,
+    process_claimed,
+    process_queue,
+)
+
+
+@pytest.fixture
+def cursor(monkeypatch):
+    cursor = mock.MagicMock()
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(document_processor, 'connection', connection)
+    return cursor
+
+
+def test_claim_is_a_single_leased_update(cursor):
+    cursor.fetchone.return_value = (11, 501, 17, 1)
+
+    item = claim_next_document('host:1', lease_seconds=120)
+
+    sql, params = cursor.execute.call_args.args
+    assert 'FOR UPDATE OF q SKIP LOCKED' in sql
+    assert 'UPDATE landscape.doc_processing_queue' in sql
+    assert 'file_size_bytes ASC' in sql
+    assert params == ['host:1', 120]
+    assert item == {'queue_id': 11, 'doc_id': 501, 'project_id': 17, 'attempts': 1}
+
+    cursor.fetchone.return_value = None
+    assert claim_next_document('host:1') is None
+
+
+def test_completion_is_fenced_by_lease_owner(cursor):
+    cursor.rowcount = 0
+    assert complete_queue_item(11, 'host:1', {'success': True}) is False
+    assert cursor.execute.call_args.args[1] == [11, 'host:1']
+
+    cursor.rowcount = 1
+    assert complete_queue_item(11, 'host:1', {'success': False, 'error': 'boom'}) is True
+    assert cursor.execute.call_args.args[1] == ['boom', 11, 'host:1']
+
+
+def test_process_queue_claims_until_empty(monkeypatch):
+    claims = [{'queue_id': 1, 'doc_id': 10}, {'queue_id': 2, 'doc_id': 20}, None]
+    monkeypatch.setattr(document_processor, 'reclaim_expired_leases', mock.MagicMock(return_value=0))
+    monkeypatch.setattr(document_processor, 'claim_next_document', lambda *_: claims.pop(0))
+    monkeypatch.setattr(document_processor, 'renew_lease', mock.MagicMock(return_value=True))
+    complete = mock.MagicMock(return_value=True)
+    monkeypatch.setattr(document_processor, 'complete_queue_item', complete)
+    monkeypatch.setattr(document_processor.processor, 'process_document',
+                        lambda doc_id, should_abort=None: {'doc_id': doc_id, 'success': doc_id == 10, 'error': None})
+
+    results = process_queue(max_items=5, worker_id='w1')
+
+    assert (results['processed'], results['succeeded'], results['failed']) == (2, 1, 1)
+    assert [c.args[:2] for c in complete.call_args_list] == [(1, 'w1'), (2, 'w1')]
+
+
+def test_heartbeat_renews_while_working_and_flags_lost_lease(monkeypatch):
+    monkeypatch.setattr(document_processor, 'connection', mock.MagicMock())
+    renew = mock.MagicMock(side_effect=[True, False])
+    monkeypatch.setattr(document_processor, 'renew_lease', renew)
+
+    with LeaseHeartbeat(11, 'w1', lease_seconds=3, interval=0.01) as heartbeat:
+        # The thread exits on its own once a renewal fails
+        heartbeat._thread.join(timeout=5)
+
+    assert renew.call_count == 2
+    assert heartbeat.lost is True
+
+
+def test_lost_lease_abandons_document_without_completing(monkeypatch):
+    monkeypatch.setattr(document_processor, 'connection', mock.MagicMock())
+    monkeypatch.setattr(document_processor, 'renew_lease', mock.MagicMock(return_value=False))
+    complete = mock.MagicMock(return_value=True)
+    monkeypatch.setattr(document_processor, 'complete_queue_item', complete)
+    aborts = []
+
+    def process_document(doc_id, should_abort=None):
+        # Stand in for a long extraction that outlives the lease
+        deadline = time.monotonic() + 5
+        while not should_abort() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        aborts.append(should_abort())
+        return {'doc_id': doc_id, 'success': True, 'status': 'ready', 'error': None}
+
+    monkeypatch.setattr(document_processor.processor, 'process_document', process_document)
+    monkeypatch.setattr(document_processor, 'LeaseHeartbeat', functools.partial(LeaseHeartbeat, interval=0.01))
+
+    result = process_claimed({'queue_id': 11, 'doc_id': 501}, 'w1')
+
+    assert aborts == [True]
+    assert result['status'] == 'abandoned' and result['success'] is False
+    complete.assert_not_called()
+
+
+def test_queue_stats_include_depth_throughput_and_stage_p95(cursor):
+    cursor.fetchall.side_effect = [
+        [('queued', 7), ('processing', 2), ('completed', 40)],
+        [('embed', 2310.4), ('extract', 812.0)],
+    ]
+    cursor.fetchone.return_value = (1, 2, 30)
+
+    stats = get_queue_stats(window_minutes=60)
+
+    assert stats['depth'] == 9
+    assert stats['expired_leases'] == 1
+    assert stats['throughput_per_minute'] == 0.5
+    assert stats['stage_p95_ms'] == {'embed': 2310, 'extract': 812}
+    assert stats['failed'] == 0
+
+
+def test_respawned_worker_does_not_inherit_the_stats_connection(monkeypatch):
+    events = []
+
+    class FakeProcess:
+        def __init__(self, target, args, name, daemon):
+            self.name, self.exitcode, self.first = name, 1, not events
+
+        def start(self):
+            events.append('start')
+
+        def is_alive(self):
+            # The first worker dies after the parent has written stats
+            return not (self.first and 'stats' in events)
+
+        def terminate(self):
+            pass
+
+        def join(self):
+            pass
+
+    connections = mock.MagicMock()
+    connections.close_all.side_effect = lambda: events.append('close')
+    clock = iter(range(0, 1000, 10))
+    command = run_document_workers.Command()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        command.should_stop = len(sleeps) >= 3
+
+    monkeypatch.setattr(run_document_workers, 'connections', connections)
+    monkeypatch.setattr(run_document_workers, 'signal', mock.MagicMock())
+    monkeypatch.setattr(run_document_workers.multiprocessing, 'get_context',
+                        lambda method: mock.MagicMock(Process=FakeProcess))
+    monkeypatch.setattr(run_document_workers.time, 'sleep', sleep)
+    monkeypatch.setattr(run_document_workers.time, 'monotonic', lambda: next(clock))
+    monkeypatch.setattr(run_document_workers, 'get_queue_stats',
+                        lambda: events.append('stats') or {
+                            'depth': 0, 'processing': 0, 'expired_leases': 0,
+                            'throughput_per_minute': 0, 'stage_p95_ms': {},
+                        })
+
+    command.stdout = command.stderr = mock.MagicMock()
+    command.handle(workers=1, lease_seconds=30, interval=1, stats_every=5)
+
+    respawn = events.index('start', events.index('stats'))
+    assert events[respawn - 1] == 'close'
+    assert events.count('start') == events.count('close') == 2
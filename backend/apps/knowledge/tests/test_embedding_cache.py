@@ -0,0 +1,154 @@
+"""Content-hash embedding cache.
+
+Re-embedding a document must only send chunks whose normalized text is not
+cached yet, duplicates must be sent once, and a missing cache table must
+degrade to plain (uncached) embedding with every lookup counted as a miss.
+Retrieval queries go through a bounded per-process LRU in front of that.
+"""
+from unittest import mock
+
+import pytest
+
+from apps.knowledge.services import embedding_cache, embedding_service
+from apps.knowledge.services.embedding_cache import (
+    EmbeddingCacheStats,
+    content_hash,
+    normalize_content,
+)
+from apps.knowledge.services.embedding_service import (
+    embed_batches,
+    generate_embedding,
+    generate_embeddings_batch,
+    plan_embedding_batches,
+)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Fake embeddings API recording every input it is sent."""
+    sent = []
+
+    def request(texts):
+        sent.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    monkeypatch.setattr(embedding_service, '_request_embeddings', request)
+    client = mock.MagicMock()
+    client.embeddings.create.side_effect = lambda model, input: mock.MagicMock(
+        data=[mock.MagicMock(embedding=request([input])[0])]
+    )
+    monkeypatch.setattr(embedding_service, '_client', client)
+    return sent
+
+
+@pytest.fixture
+def cache_table(monkeypatch):
+    """Dict-backed stand-in for landscape.knowledge_embedding_cache."""
+    rows = {}
+
+    def get_cached(model, hashes, stats=None):
+        wanted = list(dict.fromkeys(hashes))
+        found = {h: rows[(model, h)] for h in wanted if (model, h) in rows}
+        embedding_cache._count(stats, 'hits', len(found))
+        embedding_cache._count(stats, 'misses', len(wanted) - len(found))
+        return found
+
+    def put_cached(model, entries, stats=None):
+        for h, vector in entries:
+            if vector:
+                rows.setdefault((model, h), vector)
+
+    monkeypatch.setattr(embedding_service, 'get_cached', get_cached)
+    monkeypatch.setattr(embedding_service, 'put_cached', put_cached)
+    return rows
+
+
+def test_normalization_collapses_whitespace_and_truncates():
+    assert normalize_content('  Rent  roll\n\nsummary ', 100) == 'Rent roll summary'
+    assert content_hash(normalize_content('a\tb', 100)) == content_hash(normalize_content('a b ', 100))
+    assert normalize_content('x' * 50, 10) == 'x' * 10
+
+
+def test_reprocessing_only_embeds_changed_chunks(provider, cache_table):
+    first = ['chunk one', 'chunk two', 'chunk three']
+    embed_batches(first, plan_embedding_batches(first), stats=EmbeddingCacheStats())
+    assert provider == [first]
+
+    second = ['chunk one', 'chunk  two', 'chunk three (revised)']
+    stats = EmbeddingCacheStats()
+    vectors = embed_batches(second, plan_embedding_batches(second), stats=stats)
+
+    assert provider[-1] == ['chunk three (revised)']
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert vectors[1] == [9.0, 1.0]  # 'chunk two' served from the cache
+
+
+def test_duplicates_are_sent_once_and_fanned_out(provider, cache_table):
+    vectors = generate_embeddings_batch(['same', '', 'same', 'other'])
+
+    assert provider == [['same', 'other']]
+    assert vectors == [[4.0, 1.0], None, [4.0, 1.0], [5.0, 1.0]]
+
+
+def test_single_embedding_uses_cache(provider, cache_table):
+    stats = EmbeddingCacheStats()
+    generate_embedding('Cap rate  notes', stats=stats)
+    generate_embedding('Cap rate notes', stats=stats)
+
+    assert embedding_service._client.embeddings.create.call_count == 1
+    assert provider == [['Cap rate  notes']]  # sent as written, not normalized
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.summary() == '1 hits / 1 misses (50% hit rate)'
+
+
+def test_missing_table_counts_misses_and_skips_writes(monkeypatch):
+    connection = mock.MagicMock(vendor='postgresql')
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (False,)
+    monkeypatch.setattr(embedding_cache, 'connection', connection)
+    monkeypatch.setattr(embedding_cache, '_cache_table_exists', None)
+    stats = EmbeddingCacheStats()
+
+    assert embedding_cache.get_cached('m', ['a', 'b', 'a'], stats) == {}
+    embedding_cache.put_cached('m', [('a', [1.0])], stats)
+
+    assert (stats.hits, stats.misses, stats.errors) == (0, 2, 0)
+    assert connection.cursor.call_count == 1  # the table check only
+
+
+def test_query_lru_embeds_each_normalized_query_once(provider, cache_table, monkeypatch):
+    lru = embedding_cache.QueryEmbeddingLRU(max_size=2, ttl_seconds=60)
+    monkeypatch.setattr(embedding_service, 'query_embedding_cache', lru)
+    create = embedding_service._client.embeddings.create
+
+    first = embedding_service.embed_query('What is the cap rate?')
+    assert embedding_service.embed_query('  What is the   cap rate? ') == first
+    assert create.call_count == 1
+
+    embedding_service.embed_query('second question')
+    embedding_service.embed_query('third question')  # evicts the cap rate query
+    assert len(lru) == 2
+    embedding_service.embed_query('What is the cap rate?')
+    assert create.call_count == 3  # re-served by the shared table, not the API
+    assert (lru.stats.hits, lru.stats.misses) == (1, 4)
+
+
+def test_query_lru_expires_entries_and_skips_failures(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(embedding_cache.time, 'monotonic', lambda: clock[0])
+    lru = embedding_cache.QueryEmbeddingLRU(max_size=8, ttl_seconds=30)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [1.0] if len(calls) > 1 else None
+
+    assert lru.get_or_compute('m', 'q', compute) is None
+    assert lru.get_or_compute('m', 'q', compute) == [1.0]
+    assert lru.get_or_compute('m', 'q', compute) == [1.0]
+    assert len(calls) == 2
+
+    clock[0] += 31
+    lru.get_or_compute('m', 'q', compute)
+    assert len(calls) == 3
+    lru.get_or_compute('other-model', 'q', compute)
+    assert len(calls) == 4
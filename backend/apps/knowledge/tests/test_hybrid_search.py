@@ -0,0 +1,126 @@
+"""Hybrid lexical + vector retrieval.
+
+RRF must reward chunks that both rankings agree on, the generated SQL must
+bind exactly the parameters it declares (filters appear in both arms), and
+search_similar / the platform retriever must keep plain vector behaviour
+unless hybrid mode is asked for.
+"""
+from unittest import mock
+
+import pytest
+
+from apps.knowledge.management.commands.benchmark_retrieval import recall_at_k, run_benchmark
+from apps.knowledge.services import embedding_storage
+from apps.knowledge.services.hybrid_search import (
+    RRF_K,
+    candidate_pool_size,
+    fused_candidates_cte,
+    fused_candidates_params,
+    reciprocal_rank_fusion,
+    resolve_mode,
+)
+from apps.knowledge.services.platform_knowledge_retriever import PlatformKnowledgeRetriever
+
+
+def _placeholders(sql):
+    return sql.replace('%%', '').count('%s')
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([['a', 'b', 'c'], ['c', 'd', 'a']])
+
+    assert [item for item, _ in fused][:2] == ['a', 'c']
+    assert dict(fused)['a'] == pytest.approx(1 / (RRF_K + 1) + 1 / (RRF_K + 3))
+    assert dict(fused)['d'] == pytest.approx(1 / (RRF_K + 2))
+
+
+def test_mode_resolution_and_pool_size():
+    assert resolve_mode('hybrid') == 'hybrid'
+    assert resolve_mode(None) in ('vector', 'hybrid')
+    with pytest.raises(ValueError):
+        resolve_mode('bm25')
+    assert candidate_pool_size(3) == 20
+    assert candidate_pool_size(10) == 40
+
+
+def test_fused_cte_binds_filters_in_both_arms():
+    where = "pk.document_key = %s AND LOWER(pk.title) LIKE '%%irem%%'"
+    cte = fused_candidates_cte('t c', where, 'c.id', 'c.embedding', 'c.content')
+    params = fused_candidates_params('[0.1]', 'APN 304-12-045', ['irem-2023'], 0.5, 5)
+
+    assert _placeholders(cte) == len(params)
+    assert params.count('irem-2023') == 2
+    assert "to_tsvector('english', c.content) @@ q.terms" in cte
+
+
+def _cursor_returning(rows):
+    cursor = mock.MagicMock()
+    cursor.fetchall.return_value = rows
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    return connection, cursor
+
+
+def test_search_similar_hybrid_orders_by_rrf(monkeypatch):
+    connection, cursor = _cursor_returning([
+        (2, 'APN 304-12-045', 7, 'document_chunk', 'tax.pdf', 0.41, 0.031, None, 1),
+        (1, 'parcel summary', 7, 'document_chunk', 'om.pdf', 0.83, 0.016, 1, None),
+    ])
+    monkeypatch.setattr(embedding_storage, 'connection', connection)
+
+    results = embedding_storage.search_similar(
+        [0.1, 0.2], project_id=17, top_k=2, query='APN 304-12-045', mode='hybrid'
+    )
+
+    sql, params = cursor.execute.call_args.args
+    assert 'FULL OUTER JOIN lexical_hits' in sql
+    assert _placeholders(sql) == len(params)
+    # The vector arm ranks the per-project and shared scoped_hits arms
+    assert 'FROM hits h' in sql and 'UNION ALL' in sql
+    assert sql.count('ke.project_id IS NULL') == 2
+    assert [r['id'] for r in results] == [2, 1]
+    assert results[0]['lexical_rank'] == 1 and results[0]['vector_rank'] is None
+
+
+def test_search_similar_stays_vector_only_by_default_or_without_query(monkeypatch):
+    connection, cursor = _cursor_returning([])
+    monkeypatch.setattr(embedding_storage, 'connection', connection)
+
+    embedding_storage.search_similar([0.1], project_id=17, mode='vector', query='APN')
+    embedding_storage.search_similar([0.1], project_id=17, mode='hybrid', query=None)
+
+    for call in cursor.execute.call_args_list:
+        assert 'lexical_hits' not in call.args[0]
+
+
+@pytest.mark.parametrize('query', [None, 'loan name'])
+def test_platform_chunk_sql_binds_every_placeholder(query):
+    sql, params = PlatformKnowledgeRetriever()._chunk_search_sql(
+        "c.id AS chunk_id, c.content",
+        "pk.is_active = TRUE AND pk.knowledge_domain = %s",
+        ['valuation'], '[0.1]', 0.3, 5, query=query,
+    )
+
+    assert _placeholders(sql) == len(params)
+    assert ('rrf_score' in sql) == bool(query)
+    assert params[-1] == 5
+
+
+def test_benchmark_reports_recall_and_latency_per_mode():
+    cases = [
+        {'query': 'APN 304-12-045', 'relevant_ids': [2]},
+        {'query': 'cap rate', 'relevant_ids': [1, 3]},
+    ]
+    rankings = {
+        ('vector', 'APN 304-12-045'): [1, 3],
+        ('hybrid', 'APN 304-12-045'): [2, 1],
+        ('vector', 'cap rate'): [1, 3],
+        ('hybrid', 'cap rate'): [1, 2],
+    }
+
+    report = run_benchmark(cases, lambda case, mode, k: rankings[(mode, case['query'])], k=2, repeat=2)
+
+    assert recall_at_k([5, 1, 3], [1, 3], 2) == 0.5
+    assert report['vector']['recall_at_k'] == pytest.approx(0.5)
+    assert report['hybrid']['recall_at_k'] == pytest.approx(0.75)
+    assert report['hybrid']['latency_p95_ms'] >= report['hybrid']['latency_p50_ms'] >= 0
@@ -0,0 +1,197 @@
+"""Prompt-hash LLM response cache.
+
+Runs against the file backend with a fake Anthropic client that counts
+calls. Re-running a battery of unchanged documents must not reach the
+provider at all, entries must expire after the TTL, requests with a
+non-zero or unset temperature must bypass the cache, truncated or
+unparseable responses must not be stored, and a hit must report the tokens
+it saved.
+"""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from apps.knowledge.services import extraction_service, llm_cache, llm_pool
+from apps.knowledge.services.extraction_service import ChunkedRentRollExtractor
+from apps.knowledge.services.llm_cache import (
+    LLMCacheStats,
+    cache_key,
+    cached_messages_create,
+    llm_cache_stats,
+    parses_as_json_object,
+    reset_llm_cache_stats,
+)
+from apps.knowledge.services.llm_pool import LLMRequest, RateBudget, run_messages
+
+
+class _FakeMessages:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        prompt = kwargs['messages'][0]['content']
+        if '<document>' in prompt:
+            text = json.dumps([{'unit_number': prompt.split('<document>\n')[1].split()[0]}])
+        else:
+            text = f"echo {prompt}"
+        return SimpleNamespace(
+            content=[SimpleNamespace(type='text', text=text)],
+            usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4),
+            model=kwargs['model'],
+            stop_reason='end_turn',
+        )
+
+
+@pytest.fixture
+def client():
+    return SimpleNamespace(messages=_FakeMessages())
+
+
+@pytest.fixture(autouse=True)
+def file_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_BACKEND', 'file')
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_DIR', str(tmp_path / 'llm-cache'))
+    reset_llm_cache_stats()
+    yield tmp_path / 'llm-cache'
+    reset_llm_cache_stats()
+
+
+def _open_budget():
+    return RateBudget(requests=1000, tokens=10_000_000)
+
+
+def _rent_roll(doc_id):
+    rows = '\n'.join(f'{doc_id}{i:02d} 1BR/1BA 650 $1,{500 + i} Occupied 2024-01-15' for i in range(10))
+    return f'Rent roll for building {doc_id}\nUnit Type SqFt Rent Status Lease Start\n{rows}'
+
+
+def _extract_battery(client, monkeypatch, docs):
+    monkeypatch.setattr(extraction_service, '_get_anthropic_client', lambda: client)
+    monkeypatch.setattr(llm_pool, 'get_budget', lambda provider='anthropic': _open_budget())
+    extractor = ChunkedRentRollExtractor.__new__(ChunkedRentRollExtractor)
+    extractor.project_id = 3
+    monkeypatch.setattr(extractor, '_get_document_content', lambda doc_id: docs[doc_id], raising=False)
+    monkeypatch.setattr(extractor, '_get_document_info', lambda doc_id: {'doc_id': doc_id}, raising=False)
+    monkeypatch.setattr(extractor, '_extract_structured', lambda doc_id, doc_info, mappings: None)
+    monkeypatch.setattr(extractor, '_stage_rent_roll_units', lambda doc_id, doc_info, units: len(units))
+    return [extractor.extract_rent_roll_chunked(doc_id) for doc_id in docs]
+
+
+def test_rerunning_unchanged_documents_makes_no_provider_calls(client, monkeypatch):
+    # Extraction keeps the provider's default sampling; caching it is opt-in
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_NONZERO_TEMPERATURE', True)
+    docs = {doc_id: _rent_roll(doc_id) for doc_id in range(100, 200)}
+
+    first = _extract_battery(client, monkeypatch, docs)
+    calls_first_run = len(client.messages.calls)
+    second = _extract_battery(client, monkeypatch, docs)
+
+    assert calls_first_run == 100
+    assert len(client.messages.calls) == calls_first_run
+    assert [r['staged_count'] for r in second] == [r['staged_count'] for r in first]
+    assert all(r['llm_cache']['misses'] == 1 for r in first)
+    assert all(r['llm_cache']['hits'] == 1 and r['llm_cache']['misses'] == 0 for r in second)
+    totals = llm_cache_stats()
+    assert totals['hits'] == 100 and totals['misses'] == 100
+    assert totals['saved_input_tokens'] == sum(len(c['messages'][0]['content']) // 4 for c in client.messages.calls)
+
+
+def test_cached_and_fresh_requests_keep_request_order(client):
+    run_messages(client, [LLMRequest(prompt='b', temperature=0)], budget=_open_budget())
+    stats = LLMCacheStats()
+
+    results = run_messages(
+        client,
+        [LLMRequest(prompt=p, temperature=0) for p in ('a', 'b', 'c')],
+        budget=_open_budget(),
+        cache_stats=stats,
+    )
+
+    assert results == ['echo a', 'echo b', 'echo c']
+    assert [c['messages'][0]['content'] for c in client.messages.calls] == ['b', 'a', 'c']
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_entries_expire_after_ttl(client, monkeypatch, file_cache):
+    request = dict(model='m', max_tokens=10, temperature=0, messages=[{'role': 'user', 'content': 'hi'}])
+    cached_messages_create(client, **request)
+    assert cached_messages_create(client, **request).cached
+    assert len(client.messages.calls) == 1
+
+    for root, _, files in os.walk(file_cache):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path) as handle:
+                entry = json.load(handle)
+            entry['created_at'] -= llm_cache.LLM_CACHE_TTL_SECONDS + 1
+            with open(path, 'w') as handle:
+                json.dump(entry, handle)
+
+    response = cached_messages_create(client, **request)
+    assert not getattr(response, 'cached', False)
+    assert len(client.messages.calls) == 2
+
+
+def test_nonzero_temperature_bypasses_the_cache(client, monkeypatch):
+    stats = LLMCacheStats()
+    request = dict(model='m', max_tokens=10, messages=[{'role': 'user', 'content': 'hi'}])
+
+    for _ in range(2):
+        cached_messages_create(client, stats=stats, temperature=0.7, **request)
+        cached_messages_create(client, stats=stats, **request)  # provider default, 1.0
+        cached_messages_create(client, stats=stats, cache=False, temperature=0, **request)
+    assert len(client.messages.calls) == 6 and stats.skipped == 6
+
+    for _ in range(2):
+        cached_messages_create(client, stats=stats, temperature=0, **request)
+    assert len(client.messages.calls) == 7 and stats.hits == 1
+
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_NONZERO_TEMPERATURE', True)
+    assert cache_key('anthropic', 'm', request['messages'], temperature=0.7) is not None
+
+
+def test_truncated_and_unparseable_responses_are_not_stored(client, monkeypatch):
+    stats = LLMCacheStats()
+    request = dict(model='m', max_tokens=10, temperature=0, messages=[{'role': 'user', 'content': 'hi'}])
+    create = client.messages.create
+
+    def truncated(**kwargs):
+        response = create(**kwargs)
+        response.stop_reason = 'max_tokens'
+        return response
+
+    monkeypatch.setattr(client.messages, 'create', truncated)
+    cached_messages_create(client, stats=stats, **request)
+    monkeypatch.setattr(client.messages, 'create', create)
+    cached_messages_create(client, stats=stats, validate=parses_as_json_object, **request)
+    assert stats.rejected == 2 and stats.hits == 0
+
+    cached_messages_create(client, stats=stats, validate=lambda text: text == 'echo hi', **request)
+    assert cached_messages_create(client, stats=stats, **request).cached
+    assert len(client.messages.calls) == 3 and stats.hits == 1
+
+
+def test_json_object_check_accepts_fenced_objects_only():
+    assert parses_as_json_object('```json\n{"headers": []}\n```')
+    assert parses_as_json_object(' {"a": 1} ')
+    assert not parses_as_json_object('[1, 2]')
+    assert not parses_as_json_object('{"a": ')
+
+
+def test_key_covers_every_request_component():
+    messages = [{'role': 'user', 'content': [{'type': 'text', 'text': 'x'}]}]
+    base = cache_key('anthropic', 'm', messages, system='s', tools=[{'name': 't'}], temperature=0)
+
+    reordered = [{'content': [{'text': 'x', 'type': 'text'}], 'role': 'user'}]
+    assert cache_key('anthropic', 'm', reordered, system='s', tools=[{'name': 't'}], temperature=0) == base
+    assert len({
+        base,
+        cache_key('openai', 'm', messages, system='s', tools=[{'name': 't'}], temperature=0),
+        cache_key('anthropic', 'm2', messages, system='s', tools=[{'name': 't'}], temperature=0),
+        cache_key('anthropic', 'm', messages, system='s2', tools=[{'name': 't'}], temperature=0),
+        cache_key('anthropic', 'm', messages, system='s', tools=[{'name': 't2'}], temperature=0),
+        cache_key('anthropic', 'm', messages, system='s', tools=[{'name': 't'}]),
+    }) == 6
@@ -0,0 +1,237 @@
+"""Concurrent LLM calls for batched and chunked extraction.
+
+Requests run against a local stub of the Anthropic messages endpoint that
+records how many calls were in flight and how many input tokens each one
+carried. Responses must come back in request order whatever order the calls
+finish in, a failed call must only fail its own slot, the token budget must
+hold calls back once it is spent, and each rent roll chunk must be sent only
+its own slice of the document.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from anthropic import Anthropic
+
+from apps.knowledge.services import extraction_service, llm_cache
+from apps.knowledge.services.extraction_service import (
+    BatchedExtractionService,
+    ChunkedRentRollExtractor,
+)
+from apps.knowledge.services.llm_pool import LLMRequest, RateBudget, run_messages
+
+ROW_RE = re.compile(r'^(\d{3}) ', re.MULTILINE)
+
+
+class _StubMessages(BaseHTTPRequestHandler):
+    """
+    Prompts containing 'FAIL' -> HTTP 500. Prompts with a <document> answer
+    with one unit per rent roll row in it; anything else is echoed back.
+    'slow' in a prompt delays the reply.
+    """
+
+    server_state = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][0]['content']
+        input_tokens = len(body.get('system', '') + prompt) // 4
+        state = self.server_state
+        with state['lock']:
+            state['prompts'].append(prompt)
+            state['input_tokens'].append(input_tokens)
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        try:
+            time.sleep(0.2 if 'slow' in prompt else 0.05)
+            if 'FAIL' in prompt:
+                self.send_response(500)
+                self.end_headers()
+                return
+            if '<document>' in prompt:
+                text = json.dumps([{'unit_number': unit} for unit in ROW_RE.findall(prompt)])
+            else:
+                text = f'echo {prompt}'
+            payload = json.dumps({
+                'id': 'msg_stub',
+                'type': 'message',
+                'role': 'assistant',
+                'model': body['model'],
+                'content': [{'type': 'text', 'text': text}],
+                'stop_reason': 'end_turn',
+                'stop_sequence': None,
+                'usage': {'input_tokens': input_tokens, 'output_tokens': len(text) // 4},
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with state['lock']:
+                state['in_flight'] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    state = {
+        'lock': threading.Lock(),
+        'prompts': [],
+        'input_tokens': [],
+        'in_flight': 0,
+        'max_in_flight': 0,
+    }
+    handler = type('Handler', (_StubMessages,), {'server_state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state['client'] = Anthropic(
+        api_key='test',
+        base_url=f'http://127.0.0.1:{server.server_address[1]}',
+        max_retries=0,
+    )
+    monkeypatch.setattr(extraction_service, '_get_anthropic_client', lambda: state['client'])
+    monkeypatch.setattr(llm_cache, 'LLM_CACHE_BACKEND', 'off')
+    yield state
+    server.shutdown()
+
+
+def _open_budget():
+    return RateBudget(requests=1000, tokens=10_000_000)
+
+
+def test_results_keep_request_order_with_bounded_concurrency(stub_server):
+    prompts = [f'prompt {i} slow' if i % 3 == 0 else f'prompt {i}' for i in range(8)]
+
+    results = run_messages(
+        stub_server['client'],
+        [LLMRequest(prompt=prompt) for prompt in prompts],
+        max_concurrency=3,
+        budget=_open_budget(),
+    )
+
+    assert results == [f'echo {prompt}' for prompt in prompts]
+    assert 1 < stub_server['max_in_flight'] <= 3
+
+
+def test_failed_request_only_fails_its_own_slot(stub_server):
+    results = run_messages(
+        stub_server['client'],
+        [LLMRequest(prompt='a'), LLMRequest(prompt='FAIL'), LLMRequest(prompt='c')],
+        budget=_open_budget(),
+    )
+
+    assert results[0] == 'echo a' and results[2] == 'echo c'
+    assert isinstance(results[1], Exception)
+
+
+def test_token_budget_holds_requests_back(stub_server):
+    # 1000 tokens per second; three ~600-token prompts cannot all start at once
+    budget = RateBudget(requests=100, tokens=1000, window=1.0)
+    requests = [LLMRequest(prompt=f'{i}' + 'x' * 1800) for i in range(3)]
+
+    started = time.monotonic()
+    results = run_messages(stub_server['client'], requests, max_concurrency=3, budget=budget)
+    elapsed = time.monotonic() - started
+
+    assert all(isinstance(result, str) for result in results)
+    assert elapsed >= 0.5
+    assert sum(stub_server['input_tokens']) == sum(len(r.prompt) // 4 for r in requests)
+
+
+def _rent_roll_document(units=80):
+    intro = 'Offering memorandum. Located near shopping and transit. ' * 300
+    rows = '\n'.join(
+        f'{100 + i} 1BR/1BA 650 $1,{500 + i} Occupied 2024-01-15'
+        for i in range(1, units + 1)
+    )
+    expenses = 'T-12 operating statement: repairs, utilities, payroll. ' * 300
+    return f'{intro}\nUnit Type SqFt Rent Status Lease Start\n{rows}\n{expenses}'
+
+
+def test_rent_roll_chunks_get_their_own_rows_and_merge_in_order(stub_server, monkeypatch):
+    doc = _rent_roll_document()
+    extractor = ChunkedRentRollExtractor.__new__(ChunkedRentRollExtractor)
+    extractor.project_id = 3
+    staged = []
+    monkeypatch.setattr(extractor, '_get_document_content', lambda doc_id: doc, raising=False)
+    monkeypatch.setattr(extractor, '_get_document_info', lambda doc_id: {'doc_id': doc_id}, raising=False)
+    monkeypatch.setattr(extractor, '_extract_structured', lambda doc_id, doc_info, mappings: None)
+    monkeypatch.setattr(
+        extractor, '_stage_rent_roll_units',
+        lambda doc_id, doc_info, units: staged.extend(units) or len(units),
+    )
+
+    result = extractor.extract_rent_roll_chunked(7)
+
+    assert result['rows_located'] == 80 and result['chunks_processed'] == 3
+    assert result['staged_count'] == 80 and result['errors'] == []
+    assert [unit['unit_number'] for unit in staged] == [str(100 + i) for i in range(1, 81)]
+
+    assert len(stub_server['prompts']) == 3
+    for prompt in stub_server['prompts']:
+        assert len(prompt) < len(doc) // 4
+        assert 'Unit Type SqFt Rent' in prompt and 'T-12 operating statement' not in prompt
+    chunk_rows = sorted(ROW_RE.findall(prompt) for prompt in stub_server['prompts'])
+    # 27 rows per chunk, plus 3 rows of overlap on each inner edge
+    assert [len(rows) for rows in chunk_rows] == [30, 33, 29]
+
+
+def test_unit_rows_skip_gl_codes_and_stray_rows_outside_the_table():
+    extractor = ChunkedRentRollExtractor.__new__(ChunkedRentRollExtractor)
+    statement = (
+        '5100 Repairs & Maintenance 12,345 13,456 14,000\n'
+        '2024 Net Operating Income 412,000 398,500 405,250\n'
+        '101 1BR 650 $1,500 Occupied\n'
+    )
+    assert [unit for _, _, unit in extractor._locate_unit_rows(statement)] == ['101']
+
+    # A row-shaped line far from the table is not part of it, but a page
+    # break inside the table is
+    doc = '900 Parking 12 $25 Occupied 2024-01-01\n' + 'Amenities include a pool.\n' * 10
+    doc += _rent_roll_document(units=40).replace(
+        '\n141 1BR', '\nPage 2 of 3\nUnit Type SqFt Rent Status Lease Start\n141 1BR'
+    )
+    units = [unit for _, _, unit in extractor._locate_unit_rows(doc)]
+    assert units == [str(100 + i) for i in range(1, 41)]
+
+
+def test_batches_stage_in_batch_order(stub_server, monkeypatch):
+    service = BatchedExtractionService.__new__(BatchedExtractionService)
+    service.project_id = 3
+    service.property_type = 'multifamily'
+    service.registry = mock.MagicMock()
+    service.registry.get_fields_by_scope.return_value = ['field']
+    batches = [
+        {'name': 'first', 'scopes': ['a'], 'description': 'slow'},
+        {'name': 'second', 'scopes': ['b'], 'description': ''},
+        {'name': 'third', 'scopes': ['c'], 'description': ''},
+    ]
+    monkeypatch.setattr(extraction_service, 'get_extraction_batches', lambda property_type: batches)
+    monkeypatch.setattr(extraction_service, 'connection', mock.MagicMock())
+    monkeypatch.setattr(service, '_get_document_content', lambda doc_id: 'document', raising=False)
+    monkeypatch.setattr(service, '_get_document_info', lambda doc_id: {'doc_id': doc_id}, raising=False)
+    monkeypatch.setattr(
+        service, '_build_batch_prompt',
+        lambda doc_content, fields, batch_name, batch_description, scopes: f'{batch_name} {batch_description}',
+    )
+    staged = []
+
+    def stage(doc_id, doc_info, response, fields, batch_name, scopes):
+        staged.append((batch_name, response))
+        return {'batch': batch_name, 'success': True, 'staged': 1}
+
+    monkeypatch.setattr(service, '_stage_batch_response', stage)
+
+    result = service.extract_document_batched(7)
+
+    assert stub_server['max_in_flight'] > 1
+    assert staged == [('first', 'echo first slow'), ('second', 'echo second '), ('third', 'echo third ')]
+    assert [r['batch'] for r in result['results']] == ['first', 'second', 'third']
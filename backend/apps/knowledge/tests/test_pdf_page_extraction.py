@@ -0,0 +1,176 @@
+"""Page-sharded PDF extraction and streaming chunking.
+
+The process pool must return exactly what a single-process read returns, in
+page order; table detection must only run on pages with ruling lines; page
+offsets must point into the joined text; and the streaming pipeline must
+embed chunks before the last page arrives without re-embedding them later,
+carrying the document type intake settles on.
+"""
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+from unittest import mock
+
+import fitz
+import pytest
+
+from apps.knowledge.services import document_processor, text_extraction
+from apps.knowledge.services.chunking import StreamingChunker, chunk_text
+from apps.knowledge.services.document_processor import DocumentProcessor
+from apps.knowledge.services.text_extraction import iter_pdf_pages, join_pages
+
+TABLE_PAGES = {3, 21}
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """40 pages of prose; TABLE_PAGES also carry a ruled 3x2 table."""
+    doc = fitz.open()
+    for page_idx in range(40):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_idx + 1}. Net operating income was stable.")
+        if page_idx in TABLE_PAGES:
+            for row in range(4):
+                page.draw_line((72, 200 + row * 20), (372, 200 + row * 20))
+            for col in range(3):
+                page.draw_line((72 + col * 150, 200), (72 + col * 150, 260))
+            for row, (label, value) in enumerate([('Unit', 'Rent'), ('101', '1,450'), ('102', '1,525')]):
+                page.insert_text((80, 215 + row * 20), label)
+                page.insert_text((230, 215 + row * 20), value)
+    path = tmp_path / 'om.pdf'
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_pool_matches_single_process_read_in_page_order(pdf_path):
+    sequential = list(iter_pdf_pages(pdf_path, 40, workers=1))
+    parallel = list(iter_pdf_pages(pdf_path, 40, workers=2))
+
+    assert [idx for idx, _ in parallel] == list(range(40))
+    assert parallel == sequential
+    assert 'Page 22.' in parallel[21][1]
+    assert '[TABLE page=22 table=1]' in parallel[21][1]
+
+
+def test_table_detection_only_runs_on_ruled_pages(pdf_path, monkeypatch):
+    opened = []
+    real_open = text_extraction.pdfplumber.open
+
+    def spy(path, pages=None, **kwargs):
+        opened.append(pages)
+        return real_open(path, pages=pages, **kwargs)
+
+    monkeypatch.setattr(text_extraction.pdfplumber, 'open', spy)
+    list(iter_pdf_pages(pdf_path, 40, workers=1))
+
+    assert [page for pages in opened for page in pages] == sorted(p + 1 for p in TABLE_PAGES)
+
+
+def test_page_offsets_point_into_joined_text():
+    text, offsets = join_pages(['  first page', 'second', '', 'fourth  '])
+
+    assert text == 'first page\n\nsecond\n\n\n\nfourth'
+    assert [text[o:o + 6] for o in offsets] == ['first ', 'second', '\n\nfour', 'fourth']
+
+
+def test_streaming_chunker_matches_chunk_text_for_one_piece():
+    text = ' '.join(f"Sentence number {i} describes the rent roll." for i in range(120))
+
+    chunker = StreamingChunker(metadata={'doc_name': 'om.pdf'})
+    early = chunker.feed(text)
+
+    assert chunker.finish() == chunk_text(text, metadata={'doc_name': 'om.pdf'})
+    assert early and all(chunk['total_chunks'] == len(chunker.finish()) for chunk in early)
+
+
+def test_streaming_chunker_keeps_every_sentence_across_pages():
+    pages = [' '.join(f"Page {p} sentence {i} mentions cap rates." for i in range(30)) for p in range(5)]
+
+    chunker = StreamingChunker()
+    emitted = []
+    for page in pages:
+        emitted.extend(chunker.feed(page))
+    chunks = chunker.finish()
+
+    assert emitted == chunks[:len(emitted)] and len(emitted) < len(chunks)
+    joined = ' '.join(chunk['content'] for chunk in chunks)
+    assert all(f"Page {p} sentence 29 mentions cap rates." in joined for p in range(5))
+    assert [c['chunk_index'] for c in chunks] == list(range(len(chunks)))
+    assert StreamingChunker().finish() == []
+
+
+def test_streaming_pipeline_embeds_before_extraction_finishes(monkeypatch):
+    events = []
+    pages = [' '.join(f"Page {p} line {i} notes the T-12 expense ratio." for i in range(40)) for p in range(6)]
+
+    @contextmanager
+    def fake_pages(uri, content_hash=None):
+        def generate():
+            for idx, text in enumerate(pages):
+                events.append(('page', idx))
+                yield idx, text
+        yield len(pages), generate()
+
+    def fake_embed(texts, batches, stats=None):
+        events.append(('embed', len(texts)))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    monkeypatch.setattr(document_processor, 'open_pdf_pages_from_url', fake_pages)
+    monkeypatch.setattr(document_processor, 'embed_batches', fake_embed)
+    monkeypatch.setattr(document_processor, 'STREAM_EMBED_CHUNKS', 4)
+
+    streamed = DocumentProcessor()._extract_streaming('s3://om.pdf', 'OM.pdf', 'om', 17, None)
+
+    assert streamed['error'] is None
+    first_embed = next(i for i, event in enumerate(events) if event[0] == 'embed')
+    assert first_embed < events.index(('page', 5))
+    assert streamed['text'].startswith('Page 0 line 0')
+    embedded = sum(n for kind, n in events if kind == 'embed')
+    assert 0 < embedded < len(streamed['chunks'])
+    assert len(streamed['vectors']) == embedded
+
+
+def test_streaming_pipeline_reports_extraction_errors(monkeypatch):
+    @contextmanager
+    def broken(uri, content_hash=None):
+        raise ValueError('cannot open damaged PDF')
+        yield
+
+    monkeypatch.setattr(document_processor, 'open_pdf_pages_from_url', broken)
+
+    streamed = DocumentProcessor()._extract_streaming('s3://bad.pdf', 'bad.pdf', None, None, None)
+
+    assert streamed['error'] == 'Extraction failed: cannot open damaged PDF'
+    assert streamed['chunks'] == [] and streamed['text'] is None
+
+
+def test_streamed_chunks_take_the_doc_type_intake_assigns(monkeypatch):
+    streamed = {
+        'text': 'Sheet C-1 grading plan', 'page_offsets': [0], 'error': None,
+        'chunks': [{'content': 'Sheet C-1 grading plan', 'chunk_index': 0, 'total_chunks': 1, 'doc_type': 'Other'}],
+        'vectors': {}, 'embed_ms': 0,
+    }
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (
+        9, 's3://c1.pdf', 'application/pdf', 'C1.pdf', 'Other', 17, None,
+    )
+    monkeypatch.setattr(document_processor, 'connection', connection)
+    monkeypatch.setattr(document_processor, 'transaction', SimpleNamespace(atomic=nullcontext))
+    embeddings = mock.MagicMock()
+    embeddings.objects.filter.return_value.delete.return_value = (0, {})
+    monkeypatch.setattr(document_processor, 'KnowledgeEmbedding', embeddings)
+    monkeypatch.setattr(document_processor, 'STREAM_PDF_CHUNKING', True)
+    monkeypatch.setattr(document_processor, 'inspect_upload', lambda **_: SimpleNamespace(
+        is_plan=True, doc_type='Plan', message='Filed as a plan'))
+    monkeypatch.setattr(document_processor, 'apply_to_document', mock.MagicMock())
+    monkeypatch.setattr(document_processor, 'save_text_layer', mock.MagicMock())
+    monkeypatch.setattr(document_processor, 'embed_batches', lambda texts, batches, stats=None: [[1.0]] * len(texts))
+    monkeypatch.setattr(document_processor, 'store_embeddings_batch', lambda rows: rows)
+    processor = DocumentProcessor()
+    monkeypatch.setattr(processor, '_extract_streaming', lambda *args: streamed)
+    monkeypatch.setattr(processor, '_update_status', mock.MagicMock())
+
+    result = processor.process_document(9)
+
+    assert result['success'] is True
+    assert [chunk['doc_type'] for chunk in streamed['chunks']] == ['Plan']
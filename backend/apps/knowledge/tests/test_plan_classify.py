@@ -332,13 +332,13 @@ class _FakeConnection:
 
 def _run_pipeline_with_no_text(doc_name: str):
     """Drive process_document for a document whose pages carry no text."""
-    # (doc_id, storage_uri, mime_type, doc_name, doc_type, project_id)
-    row = (99, "ut://scan.pdf", "application/pdf", doc_name, "Property Data", 7)
+    # (doc_id, storage_uri, mime_type, doc_name, doc_type, project_id, sha256_hash)
+    row = (99, "ut://scan.pdf", "application/pdf", doc_name, "Property Data", 7, None)
     conn = _FakeConnection(row)
 
     with patch("apps.knowledge.services.document_processor.connection", conn), \
-         patch("apps.knowledge.services.document_processor.extract_text_from_url",
-               return_value=("", "No text layer found")):
+         patch("apps.knowledge.services.document_processor.extract_text_layer_from_url",
+               return_value=("", [], "No text layer found")):
         result = DocumentProcessor().process_document(99)
 
     statuses = [p[0] for _sql, p in conn.cursor_obj.executed if p]
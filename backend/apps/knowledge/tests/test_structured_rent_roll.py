@@ -0,0 +1,194 @@
+"""Structured rent roll parsing for spreadsheets.
+
+A mapped XLSX rent roll must parse to exactly the units the LLM chunk
+extractor is asked to return, check its sums against the footer totals row,
+and send only the cells it could not read to Claude.
+"""
+import json
+import re
+import time
+from datetime import datetime
+from unittest import mock
+
+from openpyxl import Workbook
+
+from apps.documents.testing.generators import RentRollGenerator
+from apps.knowledge.services import extraction_service
+from apps.knowledge.services.column_discovery import _parse_xlsx
+from apps.knowledge.services.extraction_service import ChunkedRentRollExtractor
+from apps.knowledge.services.structured_rent_roll import parse_rent_roll, resolve_mappings
+
+GENERATOR_MAPPINGS = {
+    'unit_id': 'unit_number',
+    'type': 'unit_type',
+    'sqft': 'square_feet',
+    'market_rent': 'market_rent',
+    'actual_rent': 'current_rent',
+    'lease_start': 'lease_start',
+    'lease_end': 'lease_end',
+    'tenant_name': 'tenant_name',
+    'status': 'occupancy_status',
+}
+BED_BATH = {'STU/1BA': (0, 1), '1BR/1BA': (1, 1), '2BR/2BA': (2, 2), '3BR/2BA': (3, 2)}
+
+
+def _parse(path, confirmed=None):
+    headers, rows, _ = _parse_xlsx(str(path))
+    return parse_rent_roll(headers, rows, resolve_mappings(headers, rows, confirmed))
+
+
+def _iso(us_date):
+    return datetime.strptime(us_date, '%m/%d/%Y').strftime('%Y-%m-%d')
+
+
+def _chadron_style_workbook(path, rent_total, lease_to='2026-06-30'):
+    """Title block, BD/BA column, Excel dates and a '4 Units' footer, like a property manager export."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Rent Roll'])
+    ws.append(['As of: 09/30/2025'])
+    ws.append(['Unit', 'BD/BA', 'Tenant', 'Status', 'Sqft', 'Rent', 'Lease From', 'Lease To', 'Delinquent Rent'])
+    ws.append(['100', '--/--', None, 'Vacant-Unrented', 1101, None, None, None, None])
+    ws.append(['201', '3/2.00', 'Crystal Clayton', 'Current', 1280, 2790,
+               datetime(2025, 6, 1), lease_to, 0])
+    ws.append(['202', '1/1.00', 'Regina Gail  Moody', 'Current', 750, 1384.5,
+               datetime(2019, 1, 16), datetime(2020, 1, 31), 211.9])
+    ws.append(['203', '2/2.00', 'Robyn T. Smith', 'Notice', 1035, '$2,500.00',
+               '1/3/2025', '1/31/2026', 0])
+    ws.append(['4 Units', None, None, '75.00% Occupied', 4166, rent_total, None, None, 211.9])
+    wb.save(path)
+
+
+def test_generated_rent_roll_matches_the_llm_output_format(tmp_path):
+    path = tmp_path / 'rent_roll.xlsx'
+    source = RentRollGenerator(tier='institutional', seed=42).generate_excel(str(path), units_count=60)
+
+    parsed = _parse(path, GENERATOR_MAPPINGS)
+
+    expected = []
+    for unit in source:
+        beds, baths = BED_BATH[unit['type']]
+        row = {
+            'unit_number': unit['unit_id'],
+            'unit_type': unit['type'],
+            'square_feet': unit['sqft'],
+            'market_rent': unit['market_rent'],
+            'current_rent': unit['actual_rent'],
+            'lease_start': _iso(unit['lease_start']) if unit['lease_start'] else None,
+            'lease_end': _iso(unit['lease_end']) if unit['lease_end'] else None,
+            'tenant_name': unit['tenant_name'] or None,
+            'occupancy_status': unit['status'],
+            'bedrooms': beds,
+            'bathrooms': baths,
+        }
+        expected.append({k: v for k, v in row.items() if v is not None})
+
+    assert parsed.units == expected
+    assert parsed.review_rows == [] and parsed.review_fields == []
+    json.dumps(parsed.units)  # Stages as JSON without conversion
+
+
+def test_property_manager_export_checks_footer_totals(tmp_path):
+    path = tmp_path / 'export.xlsx'
+    _chadron_style_workbook(path, rent_total=6674.5)
+
+    parsed = _parse(path)
+
+    assert parsed.units == [
+        {'unit_number': '100', 'occupancy_status': 'Vacant-Unrented', 'square_feet': 1101},
+        {'unit_number': '201', 'bedrooms': 3, 'bathrooms': 2, 'tenant_name': 'Crystal Clayton',
+         'occupancy_status': 'Current', 'square_feet': 1280, 'current_rent': 2790,
+         'lease_start': '2025-06-01', 'lease_end': '2026-06-30'},
+        {'unit_number': '202', 'bedrooms': 1, 'bathrooms': 1, 'tenant_name': 'Regina Gail  Moody',
+         'occupancy_status': 'Current', 'square_feet': 750, 'current_rent': 1384.5,
+         'lease_start': '2019-01-16', 'lease_end': '2020-01-31'},
+        {'unit_number': '203', 'bedrooms': 2, 'bathrooms': 2, 'tenant_name': 'Robyn T. Smith',
+         'occupancy_status': 'Notice', 'square_feet': 1035, 'current_rent': 2500,
+         'lease_start': '2025-01-03', 'lease_end': '2026-01-31'},
+    ]
+    assert parsed.totals == {
+        'square_feet': {'footer': 4166.0, 'parsed': 4166.0, 'matches': True},
+        'current_rent': {'footer': 6674.5, 'parsed': 6674.5, 'matches': True},
+    }
+    assert parsed.review_rows == [] and parsed.review_fields == []
+
+
+def test_only_failing_cells_are_flagged_for_review(tmp_path):
+    bad_cell = tmp_path / 'bad_cell.xlsx'
+    _chadron_style_workbook(bad_cell, rent_total=6674.5, lease_to='MTM')
+    parsed = _parse(bad_cell)
+    assert parsed.review_rows == [1] and parsed.review_fields == []
+    assert 'lease_end' not in parsed.units[1]
+
+    bad_total = tmp_path / 'bad_total.xlsx'
+    _chadron_style_workbook(bad_total, rent_total=9174.5)
+    parsed = _parse(bad_total)
+    assert parsed.review_rows == [] and parsed.review_fields == ['current_rent']
+    assert parsed.totals['current_rent']['matches'] is False
+
+
+def test_extractor_sends_only_unreadable_rows_to_claude(tmp_path, monkeypatch):
+    path = tmp_path / 'export.xlsx'
+    _chadron_style_workbook(path, rent_total=6674.5, lease_to='MTM')
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (
+        'uploads/export.xlsx', None, 'export.xlsx', None,
+    )
+    monkeypatch.setattr(extraction_service, 'connection', connection)
+    monkeypatch.setattr(
+        extraction_service, 'read_structured_rent_roll',
+        lambda uri, mime, name, doc_id=None, confirmed=None, content_hash=None: _parse(path, confirmed),
+    )
+    prompts = []
+
+    def fake_run_messages(client, requests, **kwargs):
+        prompts.extend(request.prompt for request in requests)
+        return [json.dumps([{'unit_number': '201', 'lease_end': '2026-06-30', 'current_rent': 1}])]
+
+    monkeypatch.setattr(extraction_service, 'run_messages', fake_run_messages)
+    monkeypatch.setattr(extraction_service, '_get_anthropic_client', lambda: None)
+    extractor = ChunkedRentRollExtractor.__new__(ChunkedRentRollExtractor)
+    extractor.project_id = 3
+    monkeypatch.setattr(extractor, '_get_document_info', lambda doc_id: {'doc_id': doc_id}, raising=False)
+    staged = []
+    monkeypatch.setattr(
+        extractor, '_stage_rent_roll_units',
+        lambda doc_id, doc_info, units: staged.extend(units) or len(units),
+    )
+
+    result = extractor.extract_rent_roll_chunked(7)
+
+    assert result['method'] == 'structured' and result['reviewed_rows'] == 1
+    assert result['staged_count'] == 4 and result['errors'] == []
+    assert len(prompts) == 1
+    document = re.search(r'<document>\n(.*)\n</document>', prompts[0], re.S).group(1)
+    assert document.splitlines()[1].startswith('201\t3/2.00\tCrystal Clayton')
+    assert len(document.splitlines()) == 2
+    # The failed cell is filled in; cells that parsed are not overwritten
+    assert staged[1]['lease_end'] == '2026-06-30' and staged[1]['current_rent'] == 2790
+    assert [unit['unit_number'] for unit in staged] == ['100', '201', '202', '203']
+
+
+def test_five_thousand_unit_workbook_parses_in_seconds(tmp_path):
+    path = tmp_path / 'large.xlsx'
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Rent Roll')
+    ws.append(['Unit', 'Unit Type', 'SF', 'Tenant', 'Status', 'Rent', 'Market Rent', 'Lease Start', 'Lease End'])
+    for i in range(5000):
+        ws.append([f'{1000 + i}', '2BR/2BA', 1050, f'Tenant {i}', 'Occupied', 2100 + i % 50,
+                   2200, datetime(2025, 1 + i % 12, 1), datetime(2026, 1 + i % 12, 1)])
+    ws.append(['Total', None, 5250000, None, None, sum(2100 + i % 50 for i in range(5000)), 11000000])
+    wb.save(path)
+
+    started = time.perf_counter()
+    parsed = _parse(path)
+    elapsed = time.perf_counter() - started
+
+    assert len(parsed.units) == 5000 and parsed.review_fields == []
+    assert all(check['matches'] for check in parsed.totals.values())
+    assert parsed.units[4999] == {
+        'unit_number': '5999', 'unit_type': '2BR/2BA', 'square_feet': 1050, 'tenant_name': 'Tenant 4999',
+        'occupancy_status': 'Occupied', 'current_rent': 2149, 'market_rent': 2200,
+        'lease_start': '2025-08-01', 'lease_end': '2026-08-01', 'bedrooms': 2, 'bathrooms': 2,
+    }
+    assert elapsed < 10
@@ -0,0 +1,107 @@
+"""Persisted document text layer.
+
+Page ranges must come back exactly as extracted, the layer must live on the
+core_doc_text row every other reader uses and be tied to the document's file
+hash, and a document without a layer (or stored without pages) must be
+extracted once and stored rather than re-parsed on every read.
+"""
+import shutil
+from unittest import mock
+
+import fitz
+import pytest
+
+from apps.knowledge.services import text_extraction, text_layer
+from apps.knowledge.services.text_extraction import extract_text_layer_from_url, join_pages
+from apps.knowledge.services.text_layer import (
+    TextLayer,
+    ensure_text_layer,
+    load_text_layer,
+    save_text_layer,
+)
+
+PAGES = ['Executive summary.', 'Rent roll: 101 $1,450', '', 'T-12 expenses total $412,000']
+
+
+@pytest.fixture
+def db(monkeypatch):
+    connection = mock.MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    monkeypatch.setattr(text_layer, 'connection', connection)
+    return cursor
+
+
+def _layer():
+    text, offsets = join_pages(PAGES)
+    return TextLayer(doc_id=5, text=text, page_offsets=offsets)
+
+
+def test_page_ranges_match_the_extracted_pages():
+    layer = _layer()
+
+    assert layer.page_count == 4
+    assert layer.pages(2) == 'Rent roll: 101 $1,450'
+    assert layer.pages(3) == ''
+    assert layer.pages(2, 4) == 'Rent roll: 101 $1,450\n\n\n\nT-12 expenses total $412,000'
+    assert layer.pages(4, 99) == 'T-12 expenses total $412,000'
+    assert layer.pages(0) == layer.pages(5) == ''
+    assert layer.page_texts() == [page.strip() for page in PAGES]
+
+
+def test_save_writes_core_doc_text_and_binds_the_file_hash(db):
+    save_text_layer(db, 5, 'net operating income', [0], 'document_processor')
+
+    sql, params = db.execute.call_args.args
+    assert 'INSERT INTO landscape.core_doc_text' in sql
+    assert 'sha256_hash' in sql and 'ON CONFLICT (doc_id)' in sql
+    assert params == ['net operating income', 3, [0], 'document_processor', 5]
+
+    save_text_layer(db, 5, 'net operating income', None, 'auto_upload')
+    assert db.execute.call_args.args[1][2] is None
+
+
+def test_load_ignores_layers_from_an_older_file(db):
+    layer = _layer()
+    db.fetchone.return_value = (layer.text, layer.page_offsets)
+
+    assert load_text_layer(5) == layer
+    sql = db.execute.call_args.args[0]
+    assert 'FROM landscape.core_doc_text' in sql
+    assert 'IS NOT DISTINCT FROM d.sha256_hash' in sql and 'page_offsets IS NOT NULL' in sql
+
+    db.fetchone.return_value = None
+    assert load_text_layer(5) is None
+
+
+def test_missing_layer_is_extracted_once_and_stored(db, monkeypatch):
+    db.fetchone.side_effect = [None, ('s3://om.pdf', 'application/pdf', 'abababababababababababababababababababababababababababababababab')]
+    extract = mock.MagicMock(return_value=('page one\n\npage two', [0, 10], None))
+    monkeypatch.setattr(text_layer, 'extract_text_layer_from_url', extract)
+
+    layer = ensure_text_layer(5)
+
+    extract.assert_called_once_with('s3://om.pdf', 'application/pdf', doc_id=5, content_hash='abababababababababababababababababababababababababababababababab')
+    assert layer.pages(2) == 'page two'
+    insert_params = db.execute.call_args.args[1]
+    assert insert_params[2:] == [[0, 10], 'on_demand', 5]
+
+
+def test_pdf_extraction_reports_page_offsets(tmp_path, monkeypatch):
+    doc = fitz.open()
+    for text in ('Cover page', 'Unit mix table', 'Operating statement'):
+        doc.new_page().insert_text((72, 72), text)
+    source = tmp_path / 'om.pdf'
+    doc.save(source)
+    doc.close()
+
+    def download(uri, mime, doc_id=None, content_hash=None):
+        copy = tmp_path / 'download.pdf'
+        shutil.copy(source, copy)
+        return str(copy)
+
+    monkeypatch.setattr(text_extraction, '_download_to_temp', download)
+    text, offsets, error = extract_text_layer_from_url('s3://om.pdf', 'application/pdf', doc_id=5)
+
+    assert error is None and len(offsets) == 3
+    layer = TextLayer(doc_id=5, text=text, page_offsets=offsets)
+    assert [page.strip() for page in layer.page_texts()] == ['Cover page', 'Unit mix table', 'Operating statement']
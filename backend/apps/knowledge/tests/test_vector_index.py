@@ -0,0 +1,79 @@
+"""Project-scoped ANN search over knowledge_embeddings.
+
+Per-project HNSW indexes must follow project size with hysteresis, the
+search must query the project and the shared scope as separate limited arms
+(filtering on the denormalized project_id, not core_doc), and the synthetic
+benchmark corpus must have the requested size and skew.
+"""
+from unittest import mock
+
+import numpy as np
+
+from apps.knowledge.management.commands.benchmark_ann import percentile, project_sizes, synthetic_vectors
+from apps.knowledge.services import embedding_storage
+from apps.knowledge.services.vector_index import (
+    index_project_id,
+    plan_project_indexes,
+    project_index_name,
+    project_index_sql,
+    scoped_hits_cte,
+    scoped_hits_params,
+)
+
+
+def test_project_index_names_round_trip():
+    assert index_project_id(project_index_name(17)) == 17
+    assert index_project_id('idx_knowledge_embeddings_doc_hnsw') is None
+    sql = project_index_sql(17)
+    assert 'CONCURRENTLY' in sql and "project_id = 17" in sql and 'USING hnsw' in sql
+
+
+def test_plan_adds_large_projects_and_drops_shrunken_ones_with_hysteresis():
+    counts = [(None, 90000), (1, 120000), (2, 30000), (3, 10000), (4, 60000)]
+    existing = ['idx_knowledge_embeddings_doc_hnsw', project_index_name(2), project_index_name(3)]
+
+    to_create, to_drop = plan_project_indexes(counts, existing, min_rows=50000)
+
+    assert to_create == [1, 4]
+    # 2 is below the threshold but above half of it: kept
+    assert to_drop == [project_index_name(3)]
+
+
+def test_scoped_hits_query_has_one_limited_arm_per_scope():
+    cte = scoped_hits_cte()
+    params = scoped_hits_params('[0.1]', 17, 5)
+
+    assert cte.count('%s') == len(params)
+    assert cte.count('UNION ALL') == 1
+    assert 'ke.project_id = %s' in cte and 'ke.project_id IS NULL' in cte
+    assert cte.count('LIMIT %s') == 2
+
+
+def test_search_similar_filters_on_denormalized_project_id(monkeypatch):
+    cursor = mock.MagicMock()
+    cursor.fetchall.return_value = [(5, 'rent roll', 9, 'document_chunk', 'rr.pdf', 0.91)]
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(embedding_storage, 'connection', connection)
+
+    results = embedding_storage.search_similar([0.1], project_id=17, top_k=3,
+                                               similarity_threshold=0.6, mode='vector')
+
+    sql, params = cursor.execute.call_args.args
+    assert 'd.project_id' not in sql
+    assert params == ['[0.1]', 17, 3, 3, 0.6, 3]
+    assert results[0]['id'] == 5 and results[0]['similarity'] == 0.91
+
+
+def test_synthetic_corpus_sizes_and_vectors():
+    sizes = project_sizes(100000, 50, shared_fraction=0.05)
+
+    assert sum(sizes.values()) == 100000
+    assert sizes[None] == 5000
+    assert sizes[1] > 10 * sizes[50]
+
+    rng = np.random.default_rng(1)
+    vectors = synthetic_vectors(rng, rng.normal(size=(4, 16)).astype(np.float32), 32, noise=0.1)
+    assert vectors.shape == (32, 16)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert percentile([5, 1, 3, 2, 4], 0.5) == 3
@@ -0,0 +1,111 @@
+"""Binary pgvector I/O.
+
+Vectors must round-trip through pgvector's binary form, the COPY stream must
+follow the PGCOPY layout (NULLs, empty and populated arrays included), batch
+storage must stage rows with COPY and return ids in input order, and the
+vector-only search SQL must bind the query vector exactly once.
+"""
+import io
+import struct
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from apps.knowledge.management.commands.benchmark_vector_io import codec_timings
+from apps.knowledge.services import embedding_storage
+from apps.knowledge.services.platform_knowledge_retriever import PlatformKnowledgeRetriever
+from apps.knowledge.services.vector_io import (
+    COPY_SIGNATURE,
+    binary_copy_payload,
+    decode_vector,
+    encode_vector,
+)
+
+
+def test_vector_round_trips_through_binary_form():
+    vector = [0.5, -1.25, 3.0, 1e-3]
+    data = encode_vector(vector)
+
+    assert struct.unpack('>HH', data[:4]) == (4, 0)
+    assert len(data) == 4 + 4 * len(vector)
+    assert decode_vector(data) == pytest.approx(vector)
+    assert decode_vector(None) is None
+
+
+def test_copy_payload_layout_with_nulls_and_arrays():
+    payload = binary_copy_payload(
+        [(7, 'chunk', [1.0, 2.0], None, [3, 4], [])],
+        ('int8', 'text', 'vector', 'text', 'int8[]', 'text[]'),
+    )
+    stream = io.BytesIO(payload)
+
+    assert stream.read(len(COPY_SIGNATURE)) == COPY_SIGNATURE
+    assert struct.unpack('>ii', stream.read(8)) == (0, 0)
+    assert struct.unpack('>h', stream.read(2)) == (6,)
+
+    def field():
+        (size,) = struct.unpack('>i', stream.read(4))
+        return None if size == -1 else stream.read(size)
+
+    assert struct.unpack('>q', field()) == (7,)
+    assert field() == b'chunk'
+    assert decode_vector(field()) == [1.0, 2.0]
+    assert field() is None
+    ints = field()
+    assert struct.unpack('>iiiii', ints[:20]) == (1, 0, 20, 2, 1)
+    assert struct.unpack('>iqiq', ints[20:]) == (8, 3, 8, 4)
+    assert struct.unpack('>iii', field()) == (0, 0, 25)
+    assert stream.read() == struct.pack('>h', -1)
+
+
+def test_store_embeddings_batch_copies_and_returns_ids_in_order(monkeypatch):
+    cursor = mock.MagicMock()
+    cursor.fetchall.return_value = [(101,), (102,)]
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(embedding_storage, 'connection', connection)
+    monkeypatch.setattr(embedding_storage.transaction, 'atomic', mock.MagicMock())
+
+    ids = embedding_storage.store_embeddings_batch([
+        {'content_text': 'a', 'embedding': np.ones(3).tolist(), 'source_type': 'document_chunk', 'source_id': 9},
+        {'content_text': 'b', 'embedding': [0.0, 1.0, 2.0], 'source_type': 'document_chunk',
+         'source_id': 9, 'tags': ['rent_roll']},
+    ])
+
+    assert ids == [101, 102]
+    copy_sql, payload = cursor.cursor.copy_expert.call_args.args
+    assert 'FORMAT binary' in copy_sql and 'embedding_stage' in copy_sql
+    assert payload.getvalue().startswith(COPY_SIGNATURE)
+    insert_sql = cursor.execute.call_args.args[0]
+    assert 'FROM embedding_stage' in insert_sql and 'ORDER BY ord' in insert_sql
+    assert embedding_storage.store_embeddings_batch([]) == []
+
+
+def test_vector_searches_bind_query_vector_once(monkeypatch):
+    cursor = mock.MagicMock()
+    cursor.fetchall.return_value = []
+    connection = mock.MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(embedding_storage, 'connection', connection)
+
+    embedding_storage.search_similar([0.1, 0.2], project_id=17, mode='vector')
+    embedding_storage.search_similar_by_vector([0.1, 0.2], source_type_filter='document_chunk')
+
+    for call in cursor.execute.call_args_list:
+        sql, params = call.args
+        assert sql.count('%s') == len(params)
+        assert sql.count('::vector') == 1
+        assert params.count('[0.1,0.2]') == 1
+
+    sql, params = PlatformKnowledgeRetriever()._chunk_search_sql(
+        "c.id AS chunk_id", "pk.is_active = TRUE", [], '[0.1]', 0.3, 5,
+    )
+    assert sql.count('::vector') == 1 and params == ['[0.1]', 0.3, 5]
+
+
+def test_binary_codec_is_smaller_than_text():
+    timings = codec_timings(dimensions=64, repeat=2)
+
+    assert timings['binary_bytes'] == 4 + 64 * 4
+    assert timings['binary_bytes'] < timings['text_bytes']
@@ -345,7 +345,7 @@ def document_chat(request, project_id: int, doc_id: int):
 
     try:
         from apps.documents.models import Document
-        from ..services.embedding_service import generate_embedding
+        from ..services.embedding_service import embed_query
         from ..services.landscaper_ai import get_landscaper_response
         from django.db import connection
 
@@ -362,7 +362,7 @@ def document_chat(request, project_id: int, doc_id: int):
             return JsonResponse(error_response('Document not found'), status=404)
 
         # Get document-scoped embeddings
-        query_embedding = generate_embedding(user_message)
+        query_embedding = embed_query(user_message)
         relevant_chunks = []
 
         if query_embedding:
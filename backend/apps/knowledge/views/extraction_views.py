@@ -2773,6 +2773,7 @@ def discover_rent_roll_columns(request, project_id: int):
             mime_type=document.mime_type,
             file_name=document.doc_name,
             project_id=project_id,
+            content_hash=document.sha256_hash,
         )
 
         response_data = discovery_result_to_dict(result)
@@ -96,7 +96,7 @@ def _numbering(page, page_index: int) -> dict[str, Any]:
 def _load_doc(cursor, doc_id: int) -> Optional[dict[str, Any]]:
     cursor.execute(
         """
-        SELECT project_id, doc_name, storage_uri, mime_type
+        SELECT project_id, doc_name, storage_uri, mime_type, sha256_hash
         FROM landscape.core_doc
         WHERE doc_id = %s AND deleted_at IS NULL
         """,
@@ -105,7 +105,7 @@ def _load_doc(cursor, doc_id: int) -> Optional[dict[str, Any]]:
     row = cursor.fetchone()
     if not row:
         return None
-    return dict(zip(("project_id", "doc_name", "storage_uri", "mime_type"), row))
+    return dict(zip(("project_id", "doc_name", "storage_uri", "mime_type", "sha256_hash"), row))
 
 
 def _draped_pages(cursor, doc_id: int) -> dict[int, int]:
@@ -342,7 +342,11 @@ def plan_preview(request, doc_id: int):
 
     pdf = None
     try:
-        path = _download_to_temp(meta["storage_uri"], meta["mime_type"] or "application/pdf")
+        path = _download_to_temp(
+            meta["storage_uri"],
+            meta["mime_type"] or "application/pdf",
+            content_hash=meta["sha256_hash"],
+        )
         pdf = pymupdf.open(path)
         if not _open_drawing(pdf):
             return JsonResponse({"error": "The drawing has no pages."}, status=409)
@@ -403,7 +407,11 @@ def plan_preview_sheet_image(request, doc_id: int, pdf_page: int):
 
     pdf = None
     try:
-        path = _download_to_temp(meta["storage_uri"], meta["mime_type"] or "application/pdf")
+        path = _download_to_temp(
+            meta["storage_uri"],
+            meta["mime_type"] or "application/pdf",
+            content_hash=meta["sha256_hash"],
+        )
         pdf = pymupdf.open(path)
         if pdf_page < 1 or pdf_page > len(pdf):
             return JsonResponse(
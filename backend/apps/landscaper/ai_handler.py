@@ -539,10 +539,10 @@ def _get_alpha_help_context(
     """
     try:
         from django.db import connection
-        from apps.knowledge.services.embedding_service import generate_embedding
+        from apps.knowledge.services.embedding_service import embed_query
 
         # Generate query embedding
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if not query_embedding:
             logger.warning("Failed to generate embedding for Alpha help query")
             return ""
@@ -2632,6 +2632,9 @@ Key behaviors:
 - Use whatif_attribute when asked to break down or decompose the impact
 - Use whatif_reset when asked to start over or remove specific changes
 - Use whatif_status to check current state before responding
+- Use whatif_solve for goal-seek questions ("what price gets a 20% IRR?",
+  "how far can absorption slip before NPV goes negative?") instead of
+  repeated whatif_compute calls
 
 Direct mutation triggers (use update tools, NOT what-if):
 - "Set X to Y", "Change X to Y", "Update the...", "Make that change"
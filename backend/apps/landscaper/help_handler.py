@@ -162,7 +162,7 @@ def _get_alpha_help_context_for_help(
     """
     try:
         from django.db import connection
-        from apps.knowledge.services.embedding_service import generate_embedding
+        from apps.knowledge.services.embedding_service import embed_query
 
         # Normalize page context to match section_path conventions
         page_context = _normalize_page_context(page_context)
@@ -172,7 +172,7 @@ def _get_alpha_help_context_for_help(
         if page_context:
             retrieval_query += f" {page_context} page"
 
-        query_embedding = generate_embedding(retrieval_query)
+        query_embedding = embed_query(retrieval_query)
         if not query_embedding:
             logger.warning("Failed to generate embedding for help query")
             return ""
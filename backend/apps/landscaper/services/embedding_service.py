@@ -15,6 +15,8 @@ from django.db import connection
 from openai import OpenAI
 from decouple import config
 
+from apps.knowledge.services.embedding_cache import query_embedding_cache
+
 from ..models import ChatEmbedding, ThreadMessage, ChatThread
 
 logger = logging.getLogger(__name__)
@@ -149,8 +151,10 @@ class EmbeddingService:
             List of dicts with message content, role, thread info, and score
         """
         try:
-            # Generate embedding for query
-            query_embedding = EmbeddingService.generate_embedding(query)
+            # Generate embedding for query (shared per-process query cache)
+            query_embedding = query_embedding_cache.get_or_compute(
+                EMBEDDING_MODEL, query, lambda: EmbeddingService.generate_embedding(query)
+            )
             if not query_embedding:
                 return []
 
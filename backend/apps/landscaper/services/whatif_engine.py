@@ -14,14 +14,15 @@ The engine does NOT modify the existing calc services. It replicates their
 data-loading logic, patches overrides, and calls the same underlying math.
 """
 import copy
+import itertools
 import json
 import logging
 import math
 import re
 from datetime import date
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.db import connection
 from django.utils import timezone
@@ -102,6 +103,44 @@ class ShadowContext:
         )
 
 
+class CopyOnWriteAssumptions(dict):
+    """
+    Patched assumptions that share their subtrees with a base dict.
+
+    The top level is a shallow copy, so reassigning a key never touches the
+    base. Nested tables and row lists stay shared until writable(*path) is
+    called, which copies each container on the path once (dicts shallowly,
+    lists together with their rows) and returns the private copy. An override
+    therefore clones only the tables and rows it patches, not the whole
+    baseline model.
+    """
+
+    def __init__(self, base: Dict[str, Any]):
+        super().__init__(base)
+        self._owned: set = set()
+
+    def writable(self, *path: str, default: Callable[[], Any] = dict) -> Any:
+        node: Any = self
+        for depth, key in enumerate(path, start=1):
+            owned_path = path[:depth]
+            if key not in node:
+                node[key] = default() if depth == len(path) else {}
+                self._owned.add(owned_path)
+            elif owned_path not in self._owned:
+                node[key] = self._copy_container(node[key])
+                self._owned.add(owned_path)
+            node = node[key]
+        return node
+
+    @staticmethod
+    def _copy_container(value: Any) -> Any:
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return [copy.copy(row) if isinstance(row, (dict, list)) else row for row in value]
+        return value
+
+
 # ---------------------------------------------------------------------------
 # Engine
 # ---------------------------------------------------------------------------
@@ -117,6 +156,9 @@ class WhatIfEngine:
         results = engine.compute_shadow_metrics(shadow)
     """
 
+    # Shapley attribution evaluates 2^N override subsets
+    SHAPLEY_MAX_OVERRIDES = 10
+
     def __init__(self, project_id: int):
         self.project_id = project_id
         self._project_type: Optional[str] = None
@@ -250,33 +292,69 @@ class WhatIfEngine:
             ],
         }
 
-    def compute_attribution(self, shadow: ShadowContext) -> List[Dict[str, Any]]:
+    def compute_attribution(
+        self, shadow: ShadowContext, method: str = 'marginal'
+    ) -> List[Dict[str, Any]]:
         """
         Decompose the compound impact into per-override attributions.
 
-        For N overrides, runs N+1 computations:
+        method='marginal' runs N+1 computations:
         - 1 baseline (no overrides)
         - N runs with each individual override only
         Reports marginal delta per override + interaction residual.
+
+        method='shapley' evaluates every subset of the overrides and reports
+        each override's Shapley value, which allocates interaction effects
+        exactly, so the attributions sum to the compound delta. That is 2^N
+        evaluations, so sessions with more than SHAPLEY_MAX_OVERRIDES
+        overrides fall back to marginal attribution.
+
+        Each subset is patched onto a copy-on-write view of its memoized
+        prefix subset, and all subsets are computed in one batch.
         """
         if not shadow.overrides:
             return []
+        if method not in ('marginal', 'shapley'):
+            raise ValueError(f"Unknown attribution method: {method}")
 
         project_type = shadow.project_type or self._get_project_type()
         baseline_assumptions = shadow.baseline_snapshot.get('assumptions', {})
         baseline_metrics = shadow.baseline_snapshot.get('metrics', {})
 
+        keys = list(shadow.overrides)
+        overrides = list(shadow.overrides.values())
+        fell_back = method == 'shapley' and len(keys) > self.SHAPLEY_MAX_OVERRIDES
+        if fell_back:
+            method = 'marginal'
+
+        if method == 'shapley':
+            subsets = [
+                combo
+                for size in range(1, len(keys) + 1)
+                for combo in itertools.combinations(range(len(keys)), size)
+            ]
+        else:
+            subsets = [(i,) for i in range(len(keys))]
+
+        # Subsets arrive shortest first, so each one extends its already
+        # patched prefix by a single override.
+        patched: Dict[Tuple[int, ...], Dict[str, Any]] = {(): baseline_assumptions}
+        for subset in subsets:
+            assumptions = CopyOnWriteAssumptions(patched[subset[:-1]])
+            self._apply_single_override(assumptions, overrides[subset[-1]])
+            patched[subset] = assumptions
+
+        computed = self._compute_metrics_batch(
+            [patched[subset] for subset in subsets], project_type
+        )
+        subset_metrics = dict(zip(subsets, computed))
+        subset_metrics[()] = baseline_metrics
+
         attributions = []
         total_marginal = {}
 
-        for key, override in shadow.overrides.items():
-            # Build assumptions with ONLY this single override
-            single_patched = copy.deepcopy(baseline_assumptions)
-            self._apply_single_override(single_patched, override)
-
-            # Compute metrics with single override
-            single_metrics = self._compute_metrics(single_patched, project_type)
-            single_delta = self._compute_deltas(baseline_metrics, single_metrics)
+        for i, (key, override) in enumerate(zip(keys, overrides)):
+            single_delta = self._compute_deltas(baseline_metrics, subset_metrics[(i,)])
 
             attributions.append({
                 'override_key': key,
@@ -292,8 +370,28 @@ class WhatIfEngine:
                 if isinstance(delta_val, (int, float)):
                     total_marginal[metric_key] = total_marginal.get(metric_key, 0) + delta_val
 
-        # Compute interaction residual (compound delta - sum of marginals)
         compound_delta = shadow.computed_results.get('delta', {})
+
+        if method == 'shapley':
+            shapley, allocated = self._shapley_values(subset_metrics, len(keys))
+            for attribution, shapley_delta in zip(attributions, shapley):
+                attribution['shapley_delta'] = shapley_delta
+            # Metrics undefined for some subset (e.g. no IRR) cannot be allocated
+            interaction = {
+                metric_key: value
+                for metric_key, value in compound_delta.items()
+                if metric_key not in allocated and isinstance(value, (int, float))
+            }
+            return {
+                'method': 'shapley',
+                'attributions': attributions,
+                'interaction_effects': interaction,
+                'note': 'Shapley deltas allocate interaction effects and sum to the compound delta.'
+                        + (' Metrics undefined for some override combinations are left in '
+                           'interaction_effects.' if interaction else ''),
+            }
+
+        # Compute interaction residual (compound delta - sum of marginals)
         interaction = {}
         for metric_key in compound_delta:
             compound_val = compound_delta.get(metric_key, 0)
@@ -303,13 +401,196 @@ class WhatIfEngine:
                 if abs(residual) > 1e-10:
                     interaction[metric_key] = round(residual, 6)
 
+        notes = []
+        if interaction:
+            notes.append('Marginal deltas may not sum to compound delta due to interaction effects.')
+        if fell_back:
+            notes.append(
+                f'Shapley attribution is limited to {self.SHAPLEY_MAX_OVERRIDES} overrides; '
+                f'reported marginal deltas instead.'
+            )
         return {
+            'method': 'marginal',
             'attributions': attributions,
             'interaction_effects': interaction,
-            'note': 'Marginal deltas may not sum to compound delta due to interaction effects.'
-                    if interaction else None,
+            'note': ' '.join(notes) or None,
         }
 
+    @staticmethod
+    def _shapley_values(
+        subset_metrics: Dict[Tuple[int, ...], Dict[str, Any]], player_count: int
+    ) -> Tuple[List[Dict[str, float]], set]:
+        """
+        Shapley value per override for every metric numeric in all subsets.
+
+        subset_metrics maps each sorted tuple of override indexes (including
+        the empty baseline) to its metrics. Returns the per-override deltas
+        and the set of metric keys that were allocated.
+        """
+        metric_keys = None
+        for metrics in subset_metrics.values():
+            numeric = {
+                key for key, value in metrics.items()
+                if not key.startswith('_')
+                and isinstance(value, (int, float)) and not isinstance(value, bool)
+            }
+            metric_keys = numeric if metric_keys is None else metric_keys & numeric
+        metric_keys = [key for key in subset_metrics[()] if key in (metric_keys or ())]
+
+        weights = [
+            math.factorial(size) * math.factorial(player_count - size - 1)
+            / math.factorial(player_count)
+            for size in range(player_count)
+        ]
+
+        values = []
+        for player in range(player_count):
+            phi = dict.fromkeys(metric_keys, 0.0)
+            for subset, metrics in subset_metrics.items():
+                if player in subset:
+                    continue
+                with_player = tuple(sorted(subset + (player,)))
+                weight = weights[len(subset)]
+                for key in metric_keys:
+                    phi[key] += weight * (subset_metrics[with_player][key] - metrics[key])
+            values.append({
+                key: round(value, 6) for key, value in phi.items() if abs(value) > 1e-10
+            })
+        return values, set(metric_keys)
+
+    def solve_for(
+        self,
+        target_metric: str,
+        target_value: float,
+        override_field: str,
+        bounds: Tuple[float, float],
+        table: str = "",
+        unit: str = "",
+        label: str = "",
+        record_id: Optional[str] = None,
+        shadow: Optional[ShadowContext] = None,
+        tolerance: float = 1e-6,
+        max_iterations: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Goal seek: find the override value that moves target_metric to
+        target_value (e.g. the lot price change that yields a 20% IRR).
+
+        The baseline is loaded once (or taken from shadow, with its other
+        overrides applied) and every trial value is patched onto a
+        copy-on-write view of it. Land projects reuse one
+        LandDevCashFlowService base case and evaluate trials on the pure
+        shadow land model; income projects use the closed-form income
+        projection. Brent's method searches bounds, which must bracket
+        the target.
+
+        Returns the solved value, the metrics at that value, the iteration
+        count and every (value, metric) pair evaluated, sorted by value.
+        """
+        low, high = sorted(float(b) for b in bounds)
+        override_key = self._make_override_key(override_field, table, record_id)
+
+        if shadow is not None:
+            project_type = shadow.project_type or self._get_project_type()
+            base = CopyOnWriteAssumptions(shadow.baseline_snapshot.get('assumptions', {}))
+            for key, override in shadow.overrides.items():
+                if key != override_key:
+                    self._apply_single_override(base, override)
+        else:
+            project_type = self._get_project_type()
+            base = self._load_all_assumptions(project_type)
+
+        if project_type in ('MF', 'OFF', 'RET', 'IND', 'HTL'):
+            evaluate = self._compute_income_metrics
+        else:
+            try:
+                summary = self._land_service_summary()
+            except Exception as e:
+                logger.error(f"Land dev calc error: {e}", exc_info=True)
+                evaluate = self._compute_land_dev_metrics_simplified
+            else:
+                def evaluate(assumptions):
+                    return self._compute_land_dev_metrics_batch([assumptions], summary=summary)[0]
+
+        curve: List[Dict[str, Any]] = []
+        solved_metrics: Dict[float, Dict[str, Any]] = {}
+
+        def metric_at(value: float) -> Optional[float]:
+            patched = CopyOnWriteAssumptions(base)
+            self._apply_single_override(patched, Override(
+                field=override_field,
+                table=table,
+                record_id=record_id,
+                override_value=value,
+                label=label or override_field,
+                unit=unit or self._infer_unit(override_field),
+            ))
+            metrics = evaluate(patched)
+            solved_metrics[value] = metrics
+            metric = metrics.get(target_metric)
+            metric = float(metric) if isinstance(metric, (int, float)) else None
+            curve.append({'value': value, 'metric': metric})
+            return metric
+
+        def result(solved_value=None, iterations=0, converged=False, note=None):
+            metrics = solved_metrics.get(solved_value, {}) if solved_value is not None else {}
+            return {
+                'target_metric': target_metric,
+                'target_value': target_value,
+                'field': override_field,
+                'table': table,
+                'bounds': [low, high],
+                'solved_value': solved_value,
+                'achieved_value': metrics.get(target_metric),
+                'metrics': metrics,
+                'converged': converged,
+                'iterations': iterations,
+                'evaluations': len(curve),
+                'curve': sorted(curve, key=lambda point: point['value']),
+                'note': note,
+            }
+
+        low_metric, high_metric = metric_at(low), metric_at(high)
+        if low_metric is None or high_metric is None:
+            return result(note=(
+                f"{target_metric} is undefined at "
+                f"{low if low_metric is None else high}; narrow the bounds."
+            ))
+        if (low_metric - target_value) * (high_metric - target_value) > 0:
+            return result(note=(
+                f"{target_metric} ranges {low_metric:.6g} to {high_metric:.6g} over the "
+                f"bounds and never reaches {target_value:.6g}; widen the bounds."
+            ))
+
+        from scipy import optimize
+
+        class _Undefined(Exception):
+            pass
+
+        def objective(value: float) -> float:
+            metric = metric_at(value)
+            if metric is None:
+                raise _Undefined(value)
+            return metric - target_value
+
+        try:
+            solved_value, root = optimize.brentq(
+                objective, low, high,
+                xtol=tolerance, maxiter=max_iterations,
+                full_output=True, disp=False,
+            )
+        except _Undefined as undefined:
+            return result(note=f"{target_metric} is undefined at {undefined.args[0]:.6g}.")
+
+        if solved_value not in solved_metrics:
+            metric_at(solved_value)
+        return result(
+            solved_value=solved_value,
+            iterations=root.iterations,
+            converged=bool(root.converged),
+            note=None if root.converged else 'Search stopped at max_iterations before converging.',
+        )
+
     # ------------------------------------------------------------------
     # Internal: Assumption Loading
     # ------------------------------------------------------------------
@@ -696,8 +977,18 @@ class WhatIfEngine:
         return factor if factor > 0 else None
 
     @staticmethod
-    def _append_adjustment(assumptions: Dict[str, Any], adjustment: Dict[str, Any]) -> None:
-        assumptions.setdefault('_scenario_adjustments', []).append(adjustment)
+    def _writable(assumptions: Dict[str, Any], *path: str, default: Callable[[], Any] = dict) -> Any:
+        """Container at path, made private first when assumptions is copy-on-write."""
+        if isinstance(assumptions, CopyOnWriteAssumptions):
+            return assumptions.writable(*path, default=default)
+        node = assumptions
+        for depth, key in enumerate(path, start=1):
+            node = node.setdefault(key, default() if depth == len(path) else {})
+        return node
+
+    @classmethod
+    def _append_adjustment(cls, assumptions: Dict[str, Any], adjustment: Dict[str, Any]) -> None:
+        cls._writable(assumptions, '_scenario_adjustments', default=list).append(adjustment)
 
     def _refresh_land_revenue_summary(self, assumptions: Dict[str, Any]) -> None:
         sales = assumptions.get('land_model', {}).get('parcel_sales', [])
@@ -733,7 +1024,7 @@ class WhatIfEngine:
             or 'absorption_rate' in field
         )
         if absorption_velocity_like:
-            absorption = model.setdefault('absorption_summary', {})
+            absorption = model.get('absorption_summary') or {}
             old_rate = absorption.get('units_per_period') or override.original_value
             try:
                 old_rate = float(old_rate)
@@ -760,7 +1051,10 @@ class WhatIfEngine:
 
             start_period = absorption.get('start_period') or self._first_sale_period(model)
             stretch = old_rate / new_rate
-            for sale in model.get('parcel_sales', []):
+            absorption = self._writable(assumptions, 'land_model', 'absorption_summary')
+            sales = self._writable(assumptions, 'land_model', 'parcel_sales', default=list)
+            model = self._writable(assumptions, 'land_model')
+            for sale in sales:
                 sale_period = int(sale.get('sale_period') or start_period or 1)
                 if start_period and sale_period >= start_period:
                     sale['sale_period'] = max(
@@ -792,7 +1086,9 @@ class WhatIfEngine:
             delay = self._sale_delay_months(model, override)
             if delay is None or delay <= 0:
                 return False
-            shifted = self._shift_land_sales(model, override.record_id, delay)
+            shifted = self._shift_land_sales(
+                self._writable_land_sales(assumptions), override.record_id, delay
+            )
             if shifted:
                 self._append_adjustment(assumptions, {
                     'type': 'sale_delay',
@@ -812,7 +1108,7 @@ class WhatIfEngine:
             if factor is None:
                 return False
             record_id = str(override.record_id) if override.record_id else None
-            for sale in model.get('parcel_sales', []):
+            for sale in self._writable(assumptions, 'land_model', 'parcel_sales', default=list):
                 if record_id and not self._sale_matches_record(sale, record_id):
                     continue
                 for key in ('gross_revenue', 'net_revenue', 'commissions', 'transaction_costs'):
@@ -831,9 +1127,10 @@ class WhatIfEngine:
             factor = self._cost_factor_from_override(model, override)
             if factor is None:
                 return False
-            for item in model.get('cost_schedule', []):
+            cost_schedule = self._writable(assumptions, 'land_model', 'cost_schedule', default=list)
+            for item in cost_schedule:
                 item['amount'] = float(item.get('amount') or 0) * factor
-            assumptions['total_costs'] = sum(float(i.get('amount') or 0) for i in model.get('cost_schedule', []))
+            assumptions['total_costs'] = sum(float(i.get('amount') or 0) for i in cost_schedule)
             self._append_adjustment(assumptions, {
                 'type': 'cost',
                 'field': override.field,
@@ -855,7 +1152,9 @@ class WhatIfEngine:
                 delay *= 12
             if delay <= 0:
                 return False
-            shifted = self._shift_land_sales(model, override.record_id, delay)
+            shifted = self._shift_land_sales(
+                self._writable_land_sales(assumptions), override.record_id, delay
+            )
             if shifted:
                 self._append_adjustment(assumptions, {
                     'type': 'sale_delay',
@@ -866,6 +1165,11 @@ class WhatIfEngine:
 
         return False
 
+    def _writable_land_sales(self, assumptions: Dict[str, Any]) -> Dict[str, Any]:
+        """The land model with its parcel sale rows private to assumptions."""
+        self._writable(assumptions, 'land_model', 'parcel_sales', default=list)
+        return self._writable(assumptions, 'land_model')
+
     def _shift_land_sales(
         self,
         model: Dict[str, Any],
@@ -1049,8 +1353,88 @@ class WhatIfEngine:
         return min(periods) if periods else None
 
     def _compute_land_model_metrics(self, model: Dict[str, Any]) -> Dict[str, Any]:
-        import numpy_financial as npf
+        return self._compute_land_model_metrics_batch([model])[0]
+
+    def _compute_land_model_metrics_batch(
+        self, models: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Shadow metrics for several land models with one IRR/NPV solve.
+
+        Each model is expanded to a monthly cash-flow schedule; the annual
+        IRRs and monthly NPVs for all models are then computed together by
+        the batch solver rather than one numpy_financial call per model.
+        """
+        from financial_engine.core.irr_batch import calculate_irr_batch, calculate_npv_batch
+
+        schedules = [self._build_land_model_cash_flows(model) for model in models]
 
+        annual_rows = [
+            [sum(cash_flows[i:i + 12]) for i in range(0, len(cash_flows), 12)]
+            for cash_flows, _ in schedules
+        ]
+        irrs: List[Optional[float]] = [None] * len(models)
+        irr_rows = [i for i, row in enumerate(annual_rows) if len(row) >= 2]
+        if irr_rows:
+            try:
+                solved = calculate_irr_batch(
+                    self._pad_rows([annual_rows[i] for i in irr_rows])
+                )
+                for i, irr_result in zip(irr_rows, solved):
+                    if not np.isnan(irr_result):
+                        irrs[i] = float(irr_result)
+            except Exception:
+                pass
+
+        discount_rates = [float(model.get('discount_rate') or 0.10) for model in models]
+        npvs: List[Optional[float]] = [None] * len(models)
+        npv_rows = [i for i, rate in enumerate(discount_rates) if rate > 0]
+        if npv_rows:
+            try:
+                monthly_rates = [(1 + discount_rates[i]) ** (1 / 12) - 1 for i in npv_rows]
+                solved = calculate_npv_batch(
+                    monthly_rates,
+                    self._pad_rows([schedules[i][0] for i in npv_rows]),
+                )
+                for i, npv_result in zip(npv_rows, solved):
+                    if not np.isnan(npv_result):
+                        npvs[i] = float(npv_result)
+            except Exception:
+                pass
+
+        results = []
+        for (cash_flows, totals), irr, npv, discount_rate in zip(
+            schedules, irrs, npvs, discount_rates
+        ):
+            total_cash_in = sum(cf for cf in cash_flows if cf > 0)
+            total_cash_out = abs(sum(cf for cf in cash_flows if cf < 0))
+            total_net_revenue = totals['total_net_revenue']
+            total_profit = total_net_revenue - totals['total_costs']
+            running = 0.0
+            peak_equity = 0.0
+            for cf in cash_flows:
+                running += cf
+                peak_equity = min(peak_equity, running)
+
+            results.append({
+                'irr': irr,
+                'npv': npv,
+                'equity_multiple': total_cash_in / total_cash_out if total_cash_out else None,
+                'total_profit': total_profit,
+                'gross_margin': total_profit / total_net_revenue if total_net_revenue else None,
+                'total_costs': totals['total_costs'],
+                'total_net_revenue': total_net_revenue,
+                'total_gross_revenue': totals['total_gross_revenue'],
+                'peak_equity': abs(peak_equity),
+                'discount_rate': discount_rate,
+                'total_project_months': len(cash_flows),
+            })
+        return results
+
+    def _build_land_model_cash_flows(
+        self, model: Dict[str, Any]
+    ) -> Tuple[List[float], Dict[str, float]]:
+        """Monthly net cash flows for a land model plus its cost/revenue totals."""
         period_count = max(
             int(model.get('total_project_months') or 1),
             self._derive_horizon_from_model(model),
@@ -1084,55 +1468,21 @@ class WhatIfEngine:
             total_gross_revenue += gross
             cash_flows[period - 1] += net
 
-        annual_cash_flows = [
-            sum(cash_flows[i:i + 12])
-            for i in range(0, len(cash_flows), 12)
-        ]
-        irr = None
-        if len(annual_cash_flows) >= 2:
-            try:
-                irr_result = npf.irr(annual_cash_flows)
-                if not np.isnan(irr_result):
-                    irr = float(irr_result)
-            except Exception:
-                pass
-
-        discount_rate = float(model.get('discount_rate') or 0.10)
-        npv = None
-        if discount_rate > 0:
-            try:
-                monthly_rate = (1 + discount_rate) ** (1 / 12) - 1
-                npv_result = npf.npv(monthly_rate, cash_flows)
-                if not np.isnan(npv_result):
-                    npv = float(npv_result)
-            except Exception:
-                pass
-
-        total_cash_in = sum(cf for cf in cash_flows if cf > 0)
-        total_cash_out = abs(sum(cf for cf in cash_flows if cf < 0))
-        total_profit = total_net_revenue - total_costs
-        cumulative = []
-        running = 0.0
-        peak_equity = 0.0
-        for cf in cash_flows:
-            running += cf
-            cumulative.append(running)
-            peak_equity = min(peak_equity, running)
-
-        return {
-            'irr': irr,
-            'npv': npv,
-            'equity_multiple': total_cash_in / total_cash_out if total_cash_out else None,
-            'total_profit': total_profit,
-            'gross_margin': total_profit / total_net_revenue if total_net_revenue else None,
+        return cash_flows, {
             'total_costs': total_costs,
             'total_net_revenue': total_net_revenue,
             'total_gross_revenue': total_gross_revenue,
-            'peak_equity': abs(peak_equity),
-            'discount_rate': discount_rate,
-            'total_project_months': len(cash_flows),
         }
 
+    @staticmethod
+    def _pad_rows(rows: List[List[float]]) -> np.ndarray:
+        """Stack ragged cash-flow rows into a NaN-padded matrix for the batch solver."""
+        width = max(len(row) for row in rows)
+        matrix = np.full((len(rows), width), np.nan)
+        for i, row in enumerate(rows):
+            matrix[i, :len(row)] = row
+        return matrix
+
     @staticmethod
     def _calibrate_land_shadow_metrics(
         service_base: Dict[str, Any],
@@ -1177,9 +1527,10 @@ class WhatIfEngine:
     def _build_patched_assumptions(self, shadow: ShadowContext) -> Dict[str, Any]:
         """
         Take baseline assumptions and apply all active overrides.
-        Returns a new dict with overrides patched in.
+        Returns a copy-on-write dict with overrides patched in; the
+        baseline snapshot is never mutated.
         """
-        patched = copy.deepcopy(shadow.baseline_snapshot.get('assumptions', {}))
+        patched = CopyOnWriteAssumptions(shadow.baseline_snapshot.get('assumptions', {}))
 
         for key, override in shadow.overrides.items():
             self._apply_single_override(patched, override)
@@ -1200,12 +1551,12 @@ class WhatIfEngine:
         # Route 1: Direct table.field mapping
         if table and table in assumptions:
             if isinstance(assumptions[table], dict):
-                assumptions[table][field] = value
+                self._writable(assumptions, table)[field] = value
                 return
 
         # Route 2: Income assumptions (flat dict from IncomeApproachDataService)
         if 'income_assumptions' in assumptions and field in assumptions['income_assumptions']:
-            assumptions['income_assumptions'][field] = value
+            self._writable(assumptions, 'income_assumptions')[field] = value
             return
 
         # Route 3: Known field aliases / convenience names
@@ -1234,7 +1585,7 @@ class WhatIfEngine:
                     return
             if target_table in assumptions:
                 if isinstance(assumptions[target_table], dict):
-                    assumptions[target_table][target_field] = value
+                    self._writable(assumptions, target_table)[target_field] = value
                     return
 
         if self._apply_land_model_override(assumptions, override):
@@ -1259,14 +1610,36 @@ class WhatIfEngine:
                 return self._compute_land_dev_metrics(assumptions)
         except Exception as e:
             logger.error(f"Calc engine error for project {self.project_id}: {e}", exc_info=True)
-            return {
-                '_error': str(e),
-                '_diagnostic': (
-                    f"The calculation failed because: {e}. "
-                    f"This may be caused by an assumption that creates an "
-                    f"invalid state (e.g., negative values, division by zero)."
-                ),
-            }
+            return self._calc_error_metrics(e)
+
+    def _compute_metrics_batch(
+        self, assumption_sets: List[Dict[str, Any]], project_type: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute metrics for several patched assumption sets at once.
+
+        Land dev sets share one LandDevCashFlowService base case and one
+        batched shadow solve; income property sets are cheap closed-form
+        projections and are computed one by one.
+        """
+        if project_type in ('MF', 'OFF', 'RET', 'IND', 'HTL'):
+            return [self._compute_metrics(a, project_type) for a in assumption_sets]
+        try:
+            return self._compute_land_dev_metrics_batch(assumption_sets)
+        except Exception as e:
+            logger.error(f"Calc engine error for project {self.project_id}: {e}", exc_info=True)
+            return [self._calc_error_metrics(e) for _ in assumption_sets]
+
+    @staticmethod
+    def _calc_error_metrics(error: Exception) -> Dict[str, Any]:
+        return {
+            '_error': str(error),
+            '_diagnostic': (
+                f"The calculation failed because: {error}. "
+                f"This may be caused by an assumption that creates an "
+                f"invalid state (e.g., negative values, division by zero)."
+            ),
+        }
 
     def _compute_land_dev_metrics(self, assumptions: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1275,52 +1648,93 @@ class WhatIfEngine:
         Uses LandDevCashFlowService to generate the full cash flow,
         then extracts summary metrics.
         """
-        try:
-            from apps.financial.services.land_dev_cashflow_service import LandDevCashFlowService
-            service = LandDevCashFlowService(self.project_id)
-            result = service.calculate(include_financing=False)
-            summary = result.get('summary', {})
-            service_metrics = {
-                'irr': summary.get('irr'),
-                'npv': summary.get('npv'),
-                'equity_multiple': summary.get('equityMultiple'),
-                'total_profit': summary.get('grossProfit'),
-                'gross_margin': summary.get('grossMargin'),
-                'total_costs': summary.get('totalCosts', assumptions.get('total_costs', 0)),
-                'total_net_revenue': summary.get(
-                    'totalNetRevenue',
-                    assumptions.get('revenue_summary', {}).get('total_net_revenue', 0),
-                ),
-                'peak_equity': summary.get('peakEquity'),
-                'discount_rate': assumptions.get('tbl_dcf_analysis', {}).get('discount_rate', 0.10),
-            }
+        return self._compute_land_dev_metrics_batch([assumptions])[0]
 
-            adjustments = assumptions.get('_scenario_adjustments') or []
-            if not adjustments:
-                return {
-                    **service_metrics,
-                    'scenario_adjustments': [],
-                    'source': 'LandDevCashFlowService base case',
-                }
+    def _compute_land_dev_metrics_batch(
+        self,
+        assumption_sets: List[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Land dev metrics for several patched assumption sets.
 
-            baseline_model = assumptions.get('_baseline_land_model')
-            current_model = assumptions.get('land_model')
-            if not baseline_model or not current_model:
-                return self._compute_land_dev_metrics_simplified(assumptions)
-
-            baseline_shadow = self._compute_land_model_metrics(baseline_model)
-            computed_shadow = self._compute_land_model_metrics(current_model)
-            calibrated = self._calibrate_land_shadow_metrics(
-                service_metrics,
-                baseline_shadow,
-                computed_shadow,
-            )
-            calibrated['scenario_adjustments'] = adjustments
-            calibrated['source'] = 'LandDevCashFlowService base case + patched shadow schedule'
-            return calibrated
+        The LandDevCashFlowService base case does not depend on the
+        overrides, so it is calculated once (or passed in as summary by
+        callers that already hold it). Sets with scenario adjustments are
+        calibrated against it from a single batched shadow solve over their
+        patched land models and the (shared) baseline models.
+        """
+        try:
+            if summary is None:
+                summary = self._land_service_summary()
+
+            results: List[Optional[Dict[str, Any]]] = [None] * len(assumption_sets)
+            models: List[Dict[str, Any]] = []
+            model_slots: Dict[int, int] = {}
+            pending = []
+
+            def slot(model: Dict[str, Any]) -> int:
+                if id(model) not in model_slots:
+                    model_slots[id(model)] = len(models)
+                    models.append(model)
+                return model_slots[id(model)]
+
+            for i, assumptions in enumerate(assumption_sets):
+                service_metrics = self._land_service_metrics(summary, assumptions)
+                adjustments = assumptions.get('_scenario_adjustments') or []
+                if not adjustments:
+                    results[i] = {
+                        **service_metrics,
+                        'scenario_adjustments': [],
+                        'source': 'LandDevCashFlowService base case',
+                    }
+                    continue
+
+                baseline_model = assumptions.get('_baseline_land_model')
+                current_model = assumptions.get('land_model')
+                if not baseline_model or not current_model:
+                    results[i] = self._compute_land_dev_metrics_simplified(assumptions)
+                    continue
+                pending.append((i, service_metrics, adjustments, slot(baseline_model), slot(current_model)))
+
+            shadows = self._compute_land_model_metrics_batch(models) if models else []
+            for i, service_metrics, adjustments, baseline_slot, current_slot in pending:
+                calibrated = self._calibrate_land_shadow_metrics(
+                    service_metrics,
+                    shadows[baseline_slot],
+                    shadows[current_slot],
+                )
+                calibrated['scenario_adjustments'] = adjustments
+                calibrated['source'] = 'LandDevCashFlowService base case + patched shadow schedule'
+                results[i] = calibrated
+            return results
         except Exception as e:
             logger.error(f"Land dev calc error: {e}", exc_info=True)
-            return self._compute_land_dev_metrics_simplified(assumptions)
+            return [self._compute_land_dev_metrics_simplified(a) for a in assumption_sets]
+
+    def _land_service_summary(self) -> Dict[str, Any]:
+        """Summary block of the LandDevCashFlowService base case (no financing)."""
+        from apps.financial.services.land_dev_cashflow_service import LandDevCashFlowService
+        service = LandDevCashFlowService(self.project_id)
+        result = service.calculate(include_financing=False)
+        return result.get('summary', {})
+
+    @staticmethod
+    def _land_service_metrics(summary: Dict[str, Any], assumptions: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'irr': summary.get('irr'),
+            'npv': summary.get('npv'),
+            'equity_multiple': summary.get('equityMultiple'),
+            'total_profit': summary.get('grossProfit'),
+            'gross_margin': summary.get('grossMargin'),
+            'total_costs': summary.get('totalCosts', assumptions.get('total_costs', 0)),
+            'total_net_revenue': summary.get(
+                'totalNetRevenue',
+                assumptions.get('revenue_summary', {}).get('total_net_revenue', 0),
+            ),
+            'peak_equity': summary.get('peakEquity'),
+            'discount_rate': assumptions.get('tbl_dcf_analysis', {}).get('discount_rate', 0.10),
+        }
 
     def _compute_land_dev_metrics_simplified(self, assumptions: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1328,6 +1742,7 @@ class WhatIfEngine:
         Uses direct assumption values for quick estimation.
         """
         import numpy_financial as npf
+        from financial_engine.core.irr_batch import calculate_irr_batch
 
         dcf = assumptions.get('tbl_dcf_analysis', {})
         revenue = assumptions.get('revenue_summary', {})
@@ -1348,7 +1763,7 @@ class WhatIfEngine:
             try:
                 # Simplified: lump sum cost at T0, lump sum revenue at T=hold_years
                 cf = [-total_costs] + [0] * (hold_years - 1) + [net_revenue]
-                irr_result = npf.irr(cf)
+                irr_result = calculate_irr_batch([cf])[0]
                 if not np.isnan(irr_result):
                     irr = float(irr_result)
             except Exception:
@@ -1385,6 +1800,7 @@ class WhatIfEngine:
         Compute income property metrics from patched assumptions.
         """
         import numpy_financial as npf
+        from financial_engine.core.irr_batch import calculate_irr_batch
 
         income_a = assumptions.get('income_assumptions', {})
         project = assumptions.get('tbl_project', {})
@@ -1432,7 +1848,7 @@ class WhatIfEngine:
         if noi_series and pv > 0:
             try:
                 cf = [-pv] + noi_series[:-1] + [noi_series[-1] + net_reversion]
-                irr_result = npf.irr(cf)
+                irr_result = calculate_irr_batch([cf])[0]
                 if not np.isnan(irr_result):
                     irr = float(irr_result)
             except Exception:
@@ -1599,6 +2015,116 @@ class WhatIfEngine:
             **results,
         }
 
+    def replay_scenarios(
+        self,
+        scenarios: List[Dict[str, Any]],
+        strict: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Replay any number of saved scenarios against the CURRENT database
+        state in one pass.
+
+        scenarios are tbl_scenario_log rows (scenario_log_id, scenario_name,
+        scenario_data). The baseline is loaded once and every scenario is
+        patched onto a copy-on-write view of it. Each distinct override is
+        also evaluated alone for its delta vs baseline. Baseline, scenario
+        and single-override metrics are computed in one batch.
+
+        An override that cannot be rebuilt or applied is reported under the
+        scenario's 'skipped' list and the rest still replay; with strict=True
+        it raises instead, as a single-scenario replay always has.
+
+        Returns the baseline metrics, one entry per scenario (metrics, delta
+        vs baseline, per-override deltas, skipped overrides) and a scenario x
+        metric matrix for N-way tables.
+        """
+        project_type = self._get_project_type()
+        baseline_assumptions = self._load_all_assumptions(project_type)
+
+        assumption_sets: List[Dict[str, Any]] = [baseline_assumptions]
+        single_index: Dict[str, int] = {}
+        replayed = []
+
+        for scenario in scenarios:
+            patched = CopyOnWriteAssumptions(baseline_assumptions)
+            scenario_index = len(assumption_sets)
+            assumption_sets.append(patched)
+
+            applied, skipped = [], []
+            saved = (scenario.get('scenario_data') or {}).get('overrides', {})
+            for key, ov_data in saved.items():
+                try:
+                    override = self._override_from_saved(ov_data)
+                    self._apply_single_override(patched, override)
+                except Exception as e:
+                    if strict:
+                        raise
+                    skipped.append({'key': key, 'error': str(e)})
+                    continue
+
+                # Scenarios often share overrides; evaluate each one alone once
+                signature = json.dumps([
+                    override.field, override.table, override.record_id,
+                    override.override_value, override.unit, override.label,
+                ], default=str)
+                if signature not in single_index:
+                    single = CopyOnWriteAssumptions(baseline_assumptions)
+                    self._apply_single_override(single, override)
+                    single_index[signature] = len(assumption_sets)
+                    assumption_sets.append(single)
+                applied.append((key, override, single_index[signature]))
+
+            replayed.append((scenario, scenario_index, applied, skipped))
+
+        computed = self._compute_metrics_batch(assumption_sets, project_type)
+        baseline_metrics = computed[0]
+
+        results = []
+        for scenario, scenario_index, applied, skipped in replayed:
+            metrics = computed[scenario_index]
+            results.append({
+                'scenario_log_id': scenario.get('scenario_log_id'),
+                'name': scenario.get('scenario_name') or f"Scenario {scenario.get('scenario_log_id', '')}".strip(),
+                'metrics': metrics,
+                'delta_vs_baseline': self._compute_deltas(baseline_metrics, metrics),
+                'overrides': [
+                    {
+                        'key': key,
+                        'field': override.field,
+                        'label': override.label or override.field,
+                        'value': override.override_value,
+                        'unit': override.unit,
+                        'delta_vs_baseline': self._compute_deltas(
+                            baseline_metrics, computed[single]
+                        ),
+                    }
+                    for key, override, single in applied
+                ],
+                'overrides_replayed': len(applied),
+                'skipped': skipped,
+            })
+
+        columns: List[str] = []
+        for metrics in [baseline_metrics] + [r['metrics'] for r in results]:
+            for key, value in metrics.items():
+                if (
+                    key not in columns
+                    and not key.startswith('_')
+                    and isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                ):
+                    columns.append(key)
+
+        return {
+            'baseline': baseline_metrics,
+            'scenarios': results,
+            'columns': columns,
+            'matrix': [
+                [r['metrics'].get(key) for key in columns]
+                for r in results
+            ],
+        }
+
     def compare_scenarios(
         self,
         scenario_data_a: Dict[str, Any],
@@ -1611,21 +2137,17 @@ class WhatIfEngine:
 
         Replays each scenario's overrides against the current DB independently,
         then produces a comparison with baseline, A metrics, B metrics, and deltas.
+        An override that cannot be replayed raises rather than being dropped
+        from one side of the comparison.
         """
-        # Get current baseline
-        project_type = self._get_project_type()
-        baseline_assumptions = self._load_all_assumptions(project_type)
-        baseline_metrics = self._compute_metrics(baseline_assumptions, project_type)
-
-        # Compute scenario A metrics
-        metrics_a = self._replay_and_compute(
-            baseline_assumptions, scenario_data_a, project_type
-        )
-
-        # Compute scenario B metrics
-        metrics_b = self._replay_and_compute(
-            baseline_assumptions, scenario_data_b, project_type
-        )
+        # Replay both against one baseline load
+        batch = self.replay_scenarios([
+            {'scenario_name': name_a, 'scenario_data': scenario_data_a},
+            {'scenario_name': name_b, 'scenario_data': scenario_data_b},
+        ], strict=True)
+        baseline_metrics = batch['baseline']
+        metrics_a = batch['scenarios'][0]['metrics']
+        metrics_b = batch['scenarios'][1]['metrics']
 
         # Compute deltas
         delta_a_vs_baseline = self._compute_deltas(baseline_metrics, metrics_a)
@@ -1722,19 +2244,13 @@ class WhatIfEngine:
             'absorbed_count': len(absorbed),
         }
 
-    def _replay_and_compute(
-        self,
-        baseline_assumptions: Dict[str, Any],
-        scenario_data: Dict[str, Any],
-        project_type: str,
-    ) -> Dict[str, Any]:
-        """Replay overrides onto baseline assumptions and compute metrics."""
-        patched = copy.deepcopy(baseline_assumptions)
-        overrides = scenario_data.get('overrides', {})
-        for key, ov_data in overrides.items():
-            override = Override(**ov_data) if isinstance(ov_data, dict) else ov_data
-            self._apply_single_override(patched, override)
-        return self._compute_metrics(patched, project_type)
+    @staticmethod
+    def _override_from_saved(ov_data: Any) -> Override:
+        """Override from a saved scenario_data entry, ignoring unknown keys."""
+        if isinstance(ov_data, Override):
+            return ov_data
+        known = {f.name for f in fields(Override)}
+        return Override(**{k: v for k, v in ov_data.items() if k in known})
 
     def _read_field_value(
         self,
@@ -1,7 +1,10 @@
+import copy
+from unittest.mock import patch
+
 import pytest
 
 from apps.landscaper.services.ic_service import normalize_sensitivity_steps
-from apps.landscaper.services.whatif_engine import Override, WhatIfEngine
+from apps.landscaper.services.whatif_engine import Override, ShadowContext, WhatIfEngine
 
 
 def _assumptions():
@@ -262,3 +265,244 @@ def test_sale_date_override_delays_matching_sale_and_lowers_npv():
     assert assumptions["_scenario_adjustments"][0]["delay_months"] == 12
     assert computed["npv"] < baseline["npv"]
     assert computed["total_profit"] == pytest.approx(baseline["total_profit"])
+
+
+def _attribution_shadow(engine, overrides):
+    baseline = _assumptions()
+    baseline_metrics = engine._compute_land_model_metrics(baseline["land_model"])
+    shadow = ShadowContext(
+        thread_id="t",
+        project_id=1,
+        project_type="LAND",
+        overrides={engine._make_override_key(o.field, o.table, o.record_id): o for o in overrides},
+        baseline_snapshot={"assumptions": baseline, "metrics": baseline_metrics},
+    )
+    compound = engine._compute_land_model_metrics(
+        engine._build_patched_assumptions(shadow)["land_model"]
+    )
+    shadow.computed_results = {"delta": engine._compute_deltas(baseline_metrics, compound)}
+    return shadow, baseline_metrics
+
+
+def _interacting_overrides():
+    return [
+        Override(field="inflated_price_per_unit", table="tbl_parcel_sale_assumptions",
+                 override_value=-10, unit="pct"),
+        Override(field="total_budget", table="", override_value=115.0, unit="currency",
+                 label="Development costs +15%"),
+        Override(field="units_per_period", table="", override_value=4.0, unit="number"),
+    ]
+
+
+def _shadow_only_metrics(engine):
+    """Stand-in for the DB-backed service: metrics straight from the shadow land model."""
+    def compute(assumption_sets):
+        return engine._compute_land_model_metrics_batch([a["land_model"] for a in assumption_sets])
+    return patch.object(engine, "_compute_land_dev_metrics_batch", side_effect=compute)
+
+
+def test_patched_assumptions_share_untouched_subtrees_with_baseline():
+    engine = WhatIfEngine(1)
+    shadow, _ = _attribution_shadow(engine, _interacting_overrides()[:1])
+    baseline = shadow.baseline_snapshot["assumptions"]
+    pristine = copy.deepcopy(baseline)
+
+    patched = engine._build_patched_assumptions(shadow)
+
+    assert patched["land_model"]["parcel_sales"][0]["net_revenue"] == pytest.approx(162.0)
+    assert patched["_baseline_land_model"] is baseline["_baseline_land_model"]
+    assert patched["land_model"]["cost_schedule"] is baseline["land_model"]["cost_schedule"]
+    assert baseline == pristine
+
+
+def test_marginal_attribution_matches_deepcopy_replay():
+    engine = WhatIfEngine(1)
+    overrides = _interacting_overrides()
+    shadow, baseline_metrics = _attribution_shadow(engine, overrides)
+
+    with _shadow_only_metrics(engine):
+        result = engine.compute_attribution(shadow)
+
+    assert result["method"] == "marginal"
+    for attribution, override in zip(result["attributions"], overrides):
+        single = copy.deepcopy(shadow.baseline_snapshot["assumptions"])
+        engine._apply_single_override(single, override)
+        expected = engine._compute_deltas(
+            baseline_metrics, engine._compute_land_model_metrics(single["land_model"])
+        )
+        assert attribution["marginal_delta"] == expected
+    assert result["interaction_effects"]
+
+
+def test_shapley_attribution_allocates_the_compound_delta():
+    engine = WhatIfEngine(1)
+    shadow, _ = _attribution_shadow(engine, _interacting_overrides())
+
+    with _shadow_only_metrics(engine):
+        result = engine.compute_attribution(shadow, method="shapley")
+
+    assert result["method"] == "shapley"
+    assert result["interaction_effects"] == {}
+    for metric_key, compound in shadow.computed_results["delta"].items():
+        allocated = sum(a["shapley_delta"].get(metric_key, 0.0) for a in result["attributions"])
+        assert allocated == pytest.approx(compound, abs=1e-5)
+
+
+def test_shapley_attribution_falls_back_to_marginal_above_cap():
+    engine = WhatIfEngine(1)
+    engine.SHAPLEY_MAX_OVERRIDES = 2
+    shadow, _ = _attribution_shadow(engine, _interacting_overrides())
+
+    with _shadow_only_metrics(engine):
+        result = engine.compute_attribution(shadow, method="shapley")
+
+    assert result["method"] == "marginal"
+    assert "limited to 2 overrides" in result["note"]
+
+
+def _land_solver(engine, baseline_metrics):
+    """Service base case stand-in matching the shadow model's own baseline."""
+    summary = {
+        "irr": baseline_metrics["irr"],
+        "npv": baseline_metrics["npv"],
+        "equityMultiple": baseline_metrics["equity_multiple"],
+        "grossProfit": baseline_metrics["total_profit"],
+        "grossMargin": baseline_metrics["gross_margin"],
+        "totalCosts": baseline_metrics["total_costs"],
+        "totalNetRevenue": baseline_metrics["total_net_revenue"],
+        "peakEquity": baseline_metrics["peak_equity"],
+    }
+    return patch.object(engine, "_land_service_summary", return_value=summary)
+
+
+def test_solve_for_finds_price_change_that_hits_target_npv():
+    engine = WhatIfEngine(1)
+    shadow, baseline_metrics = _attribution_shadow(engine, [])
+    target = baseline_metrics["npv"] - 20.0
+
+    with _land_solver(engine, baseline_metrics) as summary:
+        result = engine.solve_for(
+            "npv", target, "inflated_price_per_unit", (-50, 0),
+            table="tbl_parcel_sale_assumptions", unit="pct", shadow=shadow,
+        )
+
+    summary.assert_called_once()
+    assert result["converged"] is True
+    assert result["achieved_value"] == pytest.approx(target, abs=1e-4)
+    assert -50 < result["solved_value"] < 0
+    assert result["evaluations"] == len(result["curve"])
+    values = [point["value"] for point in result["curve"]]
+    assert values == sorted(values)
+    assert shadow.baseline_snapshot["assumptions"] == _assumptions()
+
+
+def test_solve_for_reports_unbracketed_target():
+    engine = WhatIfEngine(1)
+    shadow, baseline_metrics = _attribution_shadow(engine, [])
+
+    with _land_solver(engine, baseline_metrics):
+        result = engine.solve_for(
+            "npv", baseline_metrics["npv"] * 10, "inflated_price_per_unit", (-50, 0),
+            table="tbl_parcel_sale_assumptions", unit="pct", shadow=shadow,
+        )
+
+    assert result["solved_value"] is None
+    assert result["converged"] is False
+    assert result["evaluations"] == 2
+    assert "widen the bounds" in result["note"]
+
+
+def test_solve_for_income_vacancy_hits_target_noi():
+    engine = WhatIfEngine(1)
+    shadow = ShadowContext(
+        thread_id="t",
+        project_id=1,
+        project_type="MF",
+        baseline_snapshot={"assumptions": {
+            "income_assumptions": {
+                "physical_vacancy_pct": 0.05,
+                "hold_period_years": 10,
+                "discount_rate": 0.08,
+                "terminal_cap_rate": 0.06,
+            },
+            "annual_rental_income": 1_000_000.0,
+            "total_opex": 400_000.0,
+            "tbl_project": {"total_units": 100},
+        }},
+    )
+
+    result = engine.solve_for("noi_year1", 500_000.0, "physical_vacancy_pct", (0.0, 0.5), shadow=shadow)
+
+    assert result["converged"] is True
+    assert result["solved_value"] == pytest.approx(0.10, abs=1e-6)
+
+
+def _saved(*overrides):
+    return {"overrides": {
+        WhatIfEngine._make_override_key(o.field, o.table, o.record_id): o.to_dict()
+        for o in overrides
+    }}
+
+
+def test_replay_scenarios_loads_baseline_once_and_builds_matrix():
+    engine = WhatIfEngine(1)
+    engine._project_type = "LAND"
+    baseline = _assumptions()
+    baseline_metrics = engine._compute_land_model_metrics(baseline["land_model"])
+    price, cost, absorption = _interacting_overrides()
+    scenarios = [
+        {"scenario_log_id": 1, "scenario_name": "Soft market", "scenario_data": _saved(price, absorption)},
+        {"scenario_log_id": 2, "scenario_name": "Cost overrun", "scenario_data": _saved(cost)},
+        {"scenario_log_id": 3, "scenario_name": "Both", "scenario_data": _saved(price, cost)},
+    ]
+
+    with patch.object(engine, "_load_all_assumptions", return_value=baseline) as load, \
+            _land_solver(engine, baseline_metrics) as summary, \
+            patch.object(engine, "_compute_land_model_metrics_batch",
+                         wraps=engine._compute_land_model_metrics_batch) as batch:
+        result = engine.replay_scenarios(scenarios)
+
+    load.assert_called_once()
+    summary.assert_called_once()
+    batch.assert_called_once()
+    assert baseline == _assumptions()
+
+    assert [s["name"] for s in result["scenarios"]] == ["Soft market", "Cost overrun", "Both"]
+    assert len(result["matrix"]) == 3
+    assert all(len(row) == len(result["columns"]) for row in result["matrix"])
+
+    for scenario, saved in zip(result["scenarios"], scenarios):
+        replayed = copy.deepcopy(baseline)
+        for ov in saved["scenario_data"]["overrides"].values():
+            engine._apply_single_override(replayed, Override(**ov))
+        expected = engine._compute_land_model_metrics(replayed["land_model"])
+        assert scenario["metrics"]["npv"] == pytest.approx(expected["npv"])
+        assert scenario["overrides_replayed"] == len(saved["scenario_data"]["overrides"])
+
+    soft_price = result["scenarios"][0]["overrides"][0]["delta_vs_baseline"]
+    both_price = result["scenarios"][2]["overrides"][0]["delta_vs_baseline"]
+    assert soft_price == both_price
+    assert soft_price["total_net_revenue"] == pytest.approx(-36.0)
+
+
+def test_broken_override_is_skipped_in_replay_but_raises_in_compare():
+    engine = WhatIfEngine(1)
+    engine._project_type = "LAND"
+    baseline = _assumptions()
+    baseline_metrics = engine._compute_land_model_metrics(baseline["land_model"])
+    price = _interacting_overrides()[0]
+    broken = {"overrides": {"bad": {"table": "tbl_parcel", "override_value": 1}}}  # no field
+
+    with patch.object(engine, "_load_all_assumptions", return_value=baseline), \
+            _land_solver(engine, baseline_metrics):
+        result = engine.replay_scenarios([
+            {"scenario_log_id": 1, "scenario_data": broken},
+            {"scenario_log_id": 2, "scenario_data": _saved(price)},
+        ])
+
+        assert result["scenarios"][0]["overrides_replayed"] == 0
+        assert [s["key"] for s in result["scenarios"][0]["skipped"]] == ["bad"]
+        assert result["scenarios"][1]["overrides_replayed"] == 1
+
+        with pytest.raises(TypeError):
+            engine.compare_scenarios(broken, _saved(price))
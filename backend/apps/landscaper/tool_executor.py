@@ -12389,10 +12389,10 @@ def query_platform_knowledge(
     # Source 2: User-uploaded knowledge docs (knowledge_embeddings via RAG)
     # These are docs uploaded via Platform Knowledge or Project Knowledge intents.
     try:
-        from apps.knowledge.services.embedding_service import generate_embedding
+        from apps.knowledge.services.embedding_service import embed_query
         from django.db import connection as db_conn
 
-        query_embedding = generate_embedding(query)
+        query_embedding = embed_query(query)
         if query_embedding:
             embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
             max_distance = 1 - 0.60  # Slightly lower threshold for user docs
@@ -14762,6 +14762,7 @@ def handle_analyze_rent_roll_columns(
             project_id=project_id,
             mime_type=document.mime_type,
             file_name=document.doc_name,
+            content_hash=document.sha256_hash,
         )
 
         logger.info(f"=== RENT ROLL: discover_columns_enhanced returned keys: {list(full_result.keys()) if isinstance(full_result, dict) else type(full_result)} ===")
@@ -16395,6 +16396,7 @@ def get_document_content(
     # Cap to prevent runaway output; _truncate_tool_result() provides secondary safety net
     max_length = min(max_length, 40000)
     import json
+    from apps.knowledge.services.text_layer import load_text_layer
     try:
         with connection.cursor() as cursor:
             resolved_doc_id = doc_id
@@ -16460,6 +16462,28 @@ def get_document_content(
             result = cursor.fetchone()
 
             if not result or (not result[0] and not result[3]):
+                # Unfocused reads get the full text from the persisted text layer
+                layer = None if focus else load_text_layer(doc_id)
+                if layer:
+                    combined_content = layer.text
+                    if len(combined_content) > max_length:
+                        combined_content = (
+                            combined_content[:max_length]
+                            + "\n\n[Content truncated... use get_document_page for later pages]"
+                        )
+                    return {
+                        'success': True,
+                        'doc_id': doc_id,
+                        'doc_name': doc_name,
+                        'doc_type': doc_type,
+                        'content': combined_content,
+                        'page_count': layer.page_count,
+                        'source': 'text_layer',
+                        'message': f"Retrieved document text ({len(layer.text)} chars, {layer.page_count} pages).",
+                        'doc_swapped': bool(original_doc_id),
+                        'original_doc_id': original_doc_id
+                    }
+
                 # Fallback: Try to get content from knowledge_embeddings
                 cursor.execute("""
                     SELECT content_text
@@ -16752,6 +16776,7 @@ def handle_get_document_page(
     if not doc_id or not page_number:
         return {'success': False, 'error': 'doc_id and page_number are required'}
 
+    from apps.knowledge.services.text_layer import load_text_layer
     try:
         with connection.cursor() as cursor:
             # Verify doc belongs to project
@@ -16776,6 +16801,32 @@ def handle_get_document_page(
             rows = cursor.fetchall()
 
             if not rows:
+                # Exact page boundaries from the persisted text layer
+                layer = load_text_layer(doc_id)
+                if layer:
+                    if page_number > layer.page_count:
+                        return {
+                            'success': True,
+                            'doc_id': doc_id,
+                            'doc_name': doc_name,
+                            'page_number': page_number,
+                            'content': None,
+                            'message': f'Page {page_number} not found. Document has {layer.page_count} pages.',
+                            'total_pages': layer.page_count,
+                            'source': 'text_layer'
+                        }
+                    pages = list(range(page_number, min(page_range_end, layer.page_count) + 1))
+                    return {
+                        'success': True,
+                        'doc_id': doc_id,
+                        'doc_name': doc_name,
+                        'page_number': page_number,
+                        'pages_returned': pages,
+                        'content': "\n\n".join(f"--- Page {pg} ---\n\n{layer.pages(pg)}" for pg in pages),
+                        'total_pages': layer.page_count,
+                        'source': 'text_layer'
+                    }
+
                 # Fallback: try knowledge_embeddings with source_id
                 cursor.execute("""
                     SELECT content_text
@@ -267,6 +267,7 @@ INGESTION_TOOLS = [
 # What-If / scenario / IC tools — added when include_whatif=True.
 WHATIF_TOOLS = [
     "whatif_compute", "whatif_compound", "whatif_reset", "whatif_attribute", "whatif_status",
+    "whatif_solve",
     "scenario_save", "scenario_load", "scenario_log_query",
     "whatif_commit", "whatif_commit_selective", "whatif_undo",
     "scenario_replay", "scenario_compare", "scenario_diff",
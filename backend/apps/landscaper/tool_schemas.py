@@ -2891,7 +2891,35 @@ LANDSCAPER_TOOLS = [
         "description": "Attach a note/attribution to a what-if adjustment.",
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "method": {
+                    "type": "string",
+                    "enum": ["marginal", "shapley"],
+                    "description": "marginal (default) reports per-override deltas plus an interaction residual; shapley splits interaction effects across the overrides that cause them.",
+                },
+            },
+        },
+    },
+    {
+        "name": "whatif_solve",
+        "description": "Goal seek: find the value of one assumption that moves a metric to a target (e.g. lot price for a 20% IRR).",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "target_metric": {"type": "string"},
+                "target_value": {"type": "number"},
+                "field": {"type": "string"},
+                "table": {"type": "string"},
+                "lower_bound": {"type": "number"},
+                "upper_bound": {"type": "number"},
+                "label": {"type": "string"},
+                "unit": {
+                    "type": "string",
+                    "enum": ["pct", "currency", "ratio", "integer", "months", "years", "number"],
+                },
+                "record_id": {"type": "string"},
+            },
+            "required": ["target_metric", "target_value", "field", "lower_bound", "upper_bound"],
         },
     },
     {
@@ -2991,14 +3019,17 @@ LANDSCAPER_TOOLS = [
     },
     {
         "name": "scenario_compare",
-        "description": "Compare two scenarios side by side.",
+        "description": "Compare two scenarios side by side, or several as one table via scenario_ids.",
         "input_schema": {
             "type": "object",
             "properties": {
                 "scenario_id_a": {"type": "integer"},
                 "scenario_id_b": {"type": "integer"},
+                "scenario_ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                },
             },
-            "required": ["scenario_id_a", "scenario_id_b"],
         },
     },
     {
@@ -7,7 +7,7 @@ diff, branching, and cross-project application. They register via
 
 Tools:
 - scenario_replay: Replay saved overrides against current DB state
-- scenario_compare: Side-by-side comparison of two scenarios
+- scenario_compare: Side-by-side comparison of two scenarios, or an N-way table
 - scenario_diff: Show which overrides still differ from current DB
 - scenario_branch: Create a new scenario branching from an existing one
 - scenario_apply_cross_project: Apply rate/percentage overrides to another project
@@ -114,7 +114,14 @@ def handle_scenario_compare(
 
     Replays both against the current DB independently and produces
     baseline, A metrics, B metrics, and all pairwise deltas.
+
+    With scenario_ids, replays any number of scenarios against a single
+    baseline load and returns a scenario x metric table instead.
     """
+    scenario_ids = tool_input.get('scenario_ids')
+    if scenario_ids:
+        return _compare_many(project_id, scenario_ids)
+
     scenario_id_a = tool_input.get('scenario_id_a')
     scenario_id_b = tool_input.get('scenario_id_b')
 
@@ -154,6 +161,32 @@ def handle_scenario_compare(
         return {'success': False, 'error': str(e)}
 
 
+def _compare_many(project_id: int, scenario_ids: list) -> Dict[str, Any]:
+    """N-way scenario comparison from one baseline load."""
+    try:
+        from .scenario_tools import _load_scenarios_by_ids
+
+        scenario_ids = [int(sid) for sid in scenario_ids]
+        scenarios = _load_scenarios_by_ids(scenario_ids, project_id)
+        found = {s['scenario_log_id'] for s in scenarios}
+        missing = [sid for sid in scenario_ids if sid not in found]
+        if missing:
+            return {'success': False, 'error': f'Scenarios not found: {missing}'}
+
+        engine = WhatIfEngine(project_id)
+        comparison = engine.replay_scenarios(scenarios)
+
+        return {
+            'success': True,
+            'mode': 'comparison_table',
+            **comparison,
+        }
+
+    except Exception as e:
+        logger.error(f"scenario_compare error: {e}", exc_info=True)
+        return {'success': False, 'error': str(e)}
+
+
 @register_tool('scenario_diff')
 def handle_scenario_diff(
     tool_input: Dict[str, Any],
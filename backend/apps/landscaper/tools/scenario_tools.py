@@ -12,7 +12,7 @@ Tools:
 """
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from django.db import connection
 from django.utils import timezone
@@ -253,7 +253,28 @@ def _load_scenario_by_id(scenario_log_id: int, project_id: int) -> Optional[Dict
 
     if not row:
         return None
+    return _scenario_from_row(row)
 
+
+def _load_scenarios_by_ids(scenario_log_ids: List[int], project_id: int) -> List[Dict[str, Any]]:
+    """Load several scenario rows in one query, in the order requested.
+
+    IDs that do not exist (or belong to another project) are omitted.
+    """
+    if not scenario_log_ids:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT scenario_log_id, scenario_name, description, status,
+                   scenario_data, tags, created_at, updated_at
+            FROM landscape.tbl_scenario_log
+            WHERE scenario_log_id = ANY(%s) AND project_id = %s
+        """, [list(scenario_log_ids), project_id])
+        by_id = {row[0]: _scenario_from_row(row) for row in cursor.fetchall()}
+    return [by_id[sid] for sid in scenario_log_ids if sid in by_id]
+
+
+def _scenario_from_row(row) -> Dict[str, Any]:
     data = row[4] if isinstance(row[4], dict) else json.loads(row[4])
     return {
         'scenario_log_id': row[0],
@@ -10,6 +10,7 @@ Tools:
 - whatif_reset: Reset shadow to baseline (Phase 2)
 - whatif_attribute: Decompose per-assumption impact (Phase 2)
 - whatif_status: Return current shadow state (Phase 2)
+- whatif_solve: Goal seek one assumption to a metric target
 """
 import logging
 from typing import Any, Dict, Optional
@@ -202,7 +203,8 @@ def handle_whatif_attribute(
     """
     Decompose the compound what-if impact into per-assumption contributions.
 
-    Returns marginal delta for each override plus interaction residual.
+    Returns marginal delta for each override plus interaction residual, or
+    Shapley values when tool_input['method'] == 'shapley'.
     """
     if not thread_id:
         return {'success': False, 'error': 'thread_id not available'}
@@ -225,7 +227,9 @@ def handle_whatif_attribute(
                 'attributions': [],
             }
 
-        attribution_result = engine.compute_attribution(shadow)
+        attribution_result = engine.compute_attribution(
+            shadow, method=tool_input.get('method') or 'marginal'
+        )
 
         return {
             'success': True,
@@ -290,3 +294,61 @@ def handle_whatif_status(
     except Exception as e:
         logger.error(f"whatif_status error: {e}", exc_info=True)
         return {'success': False, 'error': str(e)}
+
+
+@register_tool('whatif_solve')
+def handle_whatif_solve(
+    tool_input: Dict[str, Any],
+    project_id: int,
+    thread_id: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Goal seek: find the value of one assumption that hits a metric target.
+
+    Answers "what lot price gets us to a 20% IRR?" in one call instead of
+    repeated whatif_compute calls. Solves on top of the thread's active
+    what-if overrides when there are any. Read-only — the shadow is not
+    modified; follow up with whatif_compute to apply the solved value.
+    """
+    target_metric = tool_input.get('target_metric', '')
+    target_value = tool_input.get('target_value')
+    field = tool_input.get('field', '')
+    lower = tool_input.get('lower_bound')
+    upper = tool_input.get('upper_bound')
+
+    if not target_metric:
+        return {'success': False, 'error': 'target_metric is required'}
+    if target_value is None:
+        return {'success': False, 'error': 'target_value is required'}
+    if not field:
+        return {'success': False, 'error': 'field is required'}
+    if lower is None or upper is None:
+        return {'success': False, 'error': 'lower_bound and upper_bound are required'}
+
+    try:
+        engine = WhatIfEngine(project_id)
+        existing = whatif_storage.load_shadow_from_db(thread_id) if thread_id else None
+        shadow = ShadowContext.from_scenario_data(existing) if existing else None
+
+        result = engine.solve_for(
+            target_metric=target_metric,
+            target_value=float(target_value),
+            override_field=field,
+            bounds=(float(lower), float(upper)),
+            table=tool_input.get('table', ''),
+            unit=tool_input.get('unit', ''),
+            label=tool_input.get('label', ''),
+            record_id=tool_input.get('record_id'),
+            shadow=shadow,
+        )
+
+        return {
+            'success': result['solved_value'] is not None,
+            'mode': 'goal_seek',
+            **result,
+        }
+
+    except Exception as e:
+        logger.error(f"whatif_solve error: {e}", exc_info=True)
+        return {'success': False, 'error': f"Goal seek failed: {str(e)}"}
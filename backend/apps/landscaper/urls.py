@@ -23,6 +23,7 @@ from .views import (
 from .views_scenario import (
     ScenarioLogListCreateView,
     ScenarioLogDetailView,
+    ScenarioCompareView,
 )
 from .views_instructions import (
     InstructionListCreateView,
@@ -344,6 +345,13 @@ urlpatterns = [
         name='landscaper-scenarios'
     ),
 
+    # N-way comparison of saved scenarios against the current baseline
+    path(
+        'landscaper/projects/<int:project_id>/scenarios/compare/',
+        ScenarioCompareView.as_view(),
+        name='landscaper-scenario-compare'
+    ),
+
     # Detail/Update/Delete a specific scenario
     path(
         'landscaper/projects/<int:project_id>/scenarios/<int:scenario_log_id>/',
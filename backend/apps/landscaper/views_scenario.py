@@ -233,6 +233,52 @@ class ScenarioLogDetailView(APIView):
             )
 
 
+class ScenarioCompareView(APIView):
+    """
+    POST /api/landscaper/projects/<project_id>/scenarios/compare/
+
+    Body: {"scenario_ids": [int, ...]}. Replays every scenario against one
+    load of the current baseline and returns a scenario x metric matrix
+    with per-override deltas.
+    """
+
+    def post(self, request, project_id):
+        scenario_ids = request.data.get('scenario_ids') or []
+        try:
+            scenario_ids = [int(sid) for sid in scenario_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {'success': False, 'error': 'scenario_ids must be a list of integers'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not scenario_ids:
+            return Response(
+                {'success': False, 'error': 'scenario_ids is required'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            from .tools.scenario_tools import _load_scenarios_by_ids
+            scenarios = _load_scenarios_by_ids(scenario_ids, project_id)
+            found = {s['scenario_log_id'] for s in scenarios}
+            missing = [sid for sid in scenario_ids if sid not in found]
+            if missing:
+                return Response(
+                    {'success': False, 'error': f'Scenarios not found: {missing}'},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            comparison = WhatIfEngine(project_id).replay_scenarios(scenarios)
+            return Response({'success': True, **comparison})
+
+        except Exception as e:
+            logger.error(f"ScenarioCompareView.post error: {e}", exc_info=True)
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 def _load_snapshots(scenario_log_id: int) -> list:
     """Load normalized assumption snapshots for a scenario."""
     with connection.cursor() as cursor:
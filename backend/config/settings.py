@@ -349,6 +349,31 @@ DEFAULT_EXIT_CAP_RATE = config('DEFAULT_EXIT_CAP_RATE', default=0.065, cast=floa
 DEFAULT_VACANCY_PCT = config('DEFAULT_VACANCY_PCT', default=0.05, cast=float)
 DEFAULT_CREDIT_LOSS_PCT = config('DEFAULT_CREDIT_LOSS_PCT', default=0.02, cast=float)
 
+# Cash flow envelope cache (apps.financial.services.cashflow_cache). Keys embed
+# the project data revision, so entries never go stale; TIMEOUT/MAX_ENTRIES
+# only bound memory. LocMemCache is per-process; set CASHFLOW_CACHE_BACKEND to
+# django.core.cache.backends.db.DatabaseCache (LOCATION = table name, run
+# `manage.py createcachetable`), FileBasedCache (LOCATION = directory) or
+# RedisCache to share envelopes across gunicorn workers.
+CASHFLOW_CACHE_ENABLED = config('CASHFLOW_CACHE_ENABLED', default=True, cast=bool)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'cashflow': {
+        'BACKEND': config(
+            'CASHFLOW_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': config('CASHFLOW_CACHE_LOCATION', default='cashflow-envelopes'),
+        'TIMEOUT': config('CASHFLOW_CACHE_TIMEOUT', default=86400, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CASHFLOW_CACHE_MAX_ENTRIES', default=256, cast=int),
+        },
+    },
+}
+
 # ============================================================================
 # DEMO PROJECT CONFIGURATION
 # ============================================================================
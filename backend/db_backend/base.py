@@ -2,10 +2,18 @@
 Custom PostgreSQL database backend that sets search_path after connection.
 
 This is needed for Neon pooled connections which don't support search_path in startup options.
+pgvector HNSW search settings are applied the same way.
 """
 
+import os
+
 from django.db.backends.postgresql import base
 
+# Candidates an HNSW scan keeps (pgvector default 40); higher = better recall, slower
+HNSW_EF_SEARCH = int(os.getenv('HNSW_EF_SEARCH', '100'))
+# 'relaxed_order' / 'strict_order' on pgvector 0.8+; unset leaves the server default
+HNSW_ITERATIVE_SCAN = os.getenv('HNSW_ITERATIVE_SCAN', '')
+
 
 class DatabaseWrapper(base.DatabaseWrapper):
     """
@@ -25,6 +33,10 @@ class DatabaseWrapper(base.DatabaseWrapper):
 
         with connection.cursor() as cursor:
             cursor.execute("SET search_path TO landscape, public")
+            if HNSW_EF_SEARCH:
+                cursor.execute("SET hnsw.ef_search = %s", [HNSW_EF_SEARCH])
+            if HNSW_ITERATIVE_SCAN:
+                cursor.execute("SET hnsw.iterative_scan = %s", [HNSW_ITERATIVE_SCAN])
 
         # Restore original isolation level
         connection.set_session(isolation_level=old_isolation_level)
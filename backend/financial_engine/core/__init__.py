@@ -5,9 +5,34 @@ Production-grade implementations using NumPy, Pandas, and SciPy.
 """
 
 from financial_engine.core.metrics import InvestmentMetrics
-from financial_engine.core.cashflow import CashFlowEngine
+from financial_engine.core.cashflow import CashFlowEngine, CashFlowColumns
+from financial_engine.core.irr_batch import (
+    calculate_irr_batch,
+    calculate_xirr_batch,
+    calculate_npv_batch,
+    calculate_xnpv_batch,
+)
+from financial_engine.core.monte_carlo import (
+    AssumptionDistribution,
+    IncomePropertySimulationInputs,
+    LandDevSimulationInputs,
+    MonteCarloEngine,
+    SimulationConfig,
+    SimulationResult,
+)
 
 __all__ = [
     "InvestmentMetrics",
     "CashFlowEngine",
+    "CashFlowColumns",
+    "calculate_irr_batch",
+    "calculate_xirr_batch",
+    "calculate_npv_batch",
+    "calculate_xnpv_batch",
+    "AssumptionDistribution",
+    "IncomePropertySimulationInputs",
+    "LandDevSimulationInputs",
+    "MonteCarloEngine",
+    "SimulationConfig",
+    "SimulationResult",
 ]
@@ -1,16 +1,19 @@
 """
 Cash Flow Projection Engine
 
-Calculates multi-period cash flow projections for commercial properties using
-pandas DataFrames for vectorized operations (5-10x faster than TypeScript).
+Calculates multi-period cash flow projections for commercial properties. Lease
+revenue, recoveries and expenses are computed as numpy (periods x leases)
+matrices rather than per-lease, per-period Python loops.
 
 This replaces src/lib/calculations/cashflow.ts (381 lines).
 """
 
 import numpy as np
 import pandas as pd
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Union
 from loguru import logger
 
 from financial_engine.models import (
@@ -19,16 +22,137 @@ from financial_engine.models import (
     OperatingExpenses,
     CapitalItems,
     CashFlowPeriod,
+    RecoveryStructure,
 )
 from financial_engine.config import get_settings
+from financial_engine.core.leases import LeaseCalculator
+
+
+# Recovery structures under which tenants reimburse taxes, insurance and CAM
+RECOVERABLE_STRUCTURES = frozenset({
+    RecoveryStructure.NNN,
+    RecoveryStructure.MODIFIED_GROSS,
+})
+
+
+@dataclass(eq=False)
+class CashFlowColumns(Sequence):
+    """
+    Columnar cash flow projection.
+
+    Each line item is a numpy array with one entry per period. The object is
+    a read-only sequence of CashFlowPeriod, but the pydantic models are only
+    built for the periods actually indexed or iterated - aggregate consumers
+    should read the columns (or to_dataframe()) directly.
+
+    Example:
+        >>> cash_flows.net_operating_income.sum()      # columnar, no models
+        >>> cash_flows[0].net_cash_flow                 # materializes one period
+        >>> annual = cash_flows.to_dataframe().resample("YS").sum()
+    """
+
+    period_dates: pd.DatetimeIndex
+    period_type: str
+    lease_ids: List[int]
+    lease_revenue: np.ndarray          # (periods x leases)
+    lease_recoveries: np.ndarray       # (periods x leases)
+    base_rent: np.ndarray
+    percentage_rent: np.ndarray
+    expense_recoveries: np.ndarray
+    gross_potential_income: np.ndarray
+    vacancy_loss: np.ndarray
+    credit_loss: np.ndarray
+    effective_gross_income: np.ndarray
+    operating_expenses: np.ndarray
+    net_operating_income: np.ndarray
+    capital_expenditures: np.ndarray
+    debt_service: np.ndarray
+    net_cash_flow: np.ndarray
+    expense_detail: Dict[str, np.ndarray] = field(default_factory=dict)
+    capital_detail: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # The CashFlowPeriod amounts, in model order
+    SUMMARY_COLUMNS = (
+        "base_rent",
+        "percentage_rent",
+        "expense_recoveries",
+        "vacancy_loss",
+        "credit_loss",
+        "effective_gross_income",
+        "operating_expenses",
+        "net_operating_income",
+        "capital_expenditures",
+        "debt_service",
+        "net_cash_flow",
+    )
+
+    def __len__(self) -> int:
+        return len(self.period_dates)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.period(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cash flow period index out of range")
+        return self.period(index)
+
+    def period(self, index: int) -> CashFlowPeriod:
+        """Materialize a single period as a CashFlowPeriod model."""
+        return CashFlowPeriod(
+            period_id=index + 1,
+            period_date=self.period_dates[index].date(),
+            period_type=self.period_type,
+            base_rent=float(self.base_rent[index]),
+            escalated_rent=float(self.base_rent[index]),
+            percentage_rent=float(self.percentage_rent[index]),
+            expense_recoveries=float(self.expense_recoveries[index]),
+            vacancy_loss=float(self.vacancy_loss[index]),
+            credit_loss=float(self.credit_loss[index]),
+            effective_gross_income=float(self.effective_gross_income[index]),
+            operating_expenses=float(self.operating_expenses[index]),
+            net_operating_income=float(self.net_operating_income[index]),
+            capital_expenditures=float(self.capital_expenditures[index]),
+            debt_service=float(self.debt_service[index]),
+            net_cash_flow=float(self.net_cash_flow[index]),
+        )
+
+    def to_periods(self) -> List[CashFlowPeriod]:
+        """Materialize every period (the pre-columnar list result)."""
+        return [self.period(i) for i in range(len(self))]
+
+    def to_dataframe(self, detail: bool = False) -> pd.DataFrame:
+        """
+        Line items as a DataFrame indexed by period date.
+
+        Args:
+            detail: Also include the individual expense and capital columns
+        """
+        data = {"period_id": np.arange(1, len(self) + 1)}
+        data.update({name: getattr(self, name) for name in self.SUMMARY_COLUMNS})
+        if detail:
+            data.update(self.expense_detail)
+            data.update(self.capital_detail)
+        return pd.DataFrame(data, index=self.period_dates.rename("period_date"))
+
+
+def _steps_overlap(lease_index: np.ndarray, first: np.ndarray, stop: np.ndarray) -> bool:
+    """True if any two rent steps of the same lease cover a common period."""
+    if lease_index.size < 2:
+        return False
+    order = np.lexsort((first, lease_index))
+    same_lease = lease_index[order][1:] == lease_index[order][:-1]
+    return bool(np.any(same_lease & (first[order][1:] < stop[order][:-1])))
 
 
 class CashFlowEngine:
     """
     Multi-period cash flow projection engine for CRE properties.
 
-    Uses pandas DataFrames for vectorized calculations - much faster than
-    iterating through periods in TypeScript.
+    Every line item is computed as a numpy column over all periods; results
+    are returned as CashFlowColumns, which only builds CashFlowPeriod models
+    on demand.
 
     Example:
         >>> engine = CashFlowEngine()
@@ -40,8 +164,7 @@ class CashFlowEngine:
         ...     opex_schedule=monthly_opex,
         ...     capital_schedule=monthly_capital,
         ... )
-        >>> df = pd.DataFrame([cf.dict() for cf in cash_flows])
-        >>> print(f"Total NOI: ${df['net_operating_income'].sum():,.0f}")
+        >>> print(f"Total NOI: ${cash_flows.net_operating_income.sum():,.0f}")
     """
 
     def __init__(self):
@@ -58,11 +181,13 @@ class CashFlowEngine:
         annual_debt_service: float = 0,
         vacancy_pct: Optional[float] = None,
         credit_loss_pct: Optional[float] = None,
-    ) -> List[CashFlowPeriod]:
+    ) -> "CashFlowColumns":
         """
         Calculate multi-period cash flow projections.
 
-        This is the main entry point for cash flow calculations.
+        This is the main entry point for cash flow calculations. Every line
+        item is computed as a numpy column over all periods; CashFlowPeriod
+        models are only built when the result is indexed or iterated.
 
         Args:
             property: Property data with lease schedules
@@ -76,7 +201,8 @@ class CashFlowEngine:
             credit_loss_pct: Credit loss percentage (defaults to config)
 
         Returns:
-            List of CashFlowPeriod objects (one per period)
+            CashFlowColumns - a sequence of CashFlowPeriod (one per period)
+            backed by numpy columns
 
         Example:
             >>> cash_flows = engine.calculate_multi_period_cashflow(
@@ -90,10 +216,19 @@ class CashFlowEngine:
             ...     vacancy_pct=0.05,
             ...     credit_loss_pct=0.02,
             ... )
+            >>> cash_flows.net_operating_income.sum()  # no per-period models built
         """
         vacancy_pct = vacancy_pct or self.settings.default_vacancy_pct
         credit_loss_pct = credit_loss_pct or self.settings.default_credit_loss_pct
 
+        if len(opex_schedule) < num_periods or len(capital_schedule) < num_periods:
+            raise ValueError(
+                f"opex_schedule ({len(opex_schedule)}) and capital_schedule "
+                f"({len(capital_schedule)}) must cover all {num_periods} periods"
+            )
+        opex_schedule = opex_schedule[:num_periods]
+        capital_schedule = capital_schedule[:num_periods]
+
         logger.info(
             f"Calculating {num_periods} {period_type} cash flow periods "
             f"starting {start_date.isoformat()}"
@@ -102,20 +237,24 @@ class CashFlowEngine:
         # Generate period dates
         period_dates = self._generate_period_dates(start_date, num_periods, period_type)
 
-        # Calculate base rent by period for all leases (vectorized)
-        lease_revenue_df = self._calculate_lease_revenue(
+        # Base rent and recoveries as (periods x leases) matrices
+        lease_revenue = self._calculate_lease_revenue(
             property.leases, period_dates, period_type
         )
-
-        # Calculate expense recoveries by period
-        recovery_revenue_df = self._calculate_expense_recoveries(
+        recovery_revenue = self._calculate_expense_recoveries(
             property.leases,
             opex_schedule,
             period_dates,
         )
 
+        percentage_rent = self._calculate_percentage_rent(
+            property.leases, period_dates, period_type
+        ).sum(axis=1)
+
         # Combine all revenue streams
-        total_revenue = lease_revenue_df.sum(axis=1) + recovery_revenue_df.sum(axis=1)
+        base_rent = lease_revenue.sum(axis=1)
+        expense_recoveries = recovery_revenue.sum(axis=1)
+        total_revenue = base_rent + percentage_rent + expense_recoveries
 
         # Apply vacancy and credit loss
         vacancy_loss = total_revenue * vacancy_pct
@@ -123,17 +262,17 @@ class CashFlowEngine:
         effective_gross_income = total_revenue - vacancy_loss - credit_loss
 
         # Calculate operating expenses
-        opex_df = self._calculate_operating_expenses(
+        opex = self._calculate_operating_expenses(
             opex_schedule, effective_gross_income, period_dates
         )
-        total_opex = opex_df.sum(axis=1)
+        total_opex = sum(opex.values())
 
         # Net Operating Income
         noi = effective_gross_income - total_opex
 
         # Capital expenses
-        capital_df = self._calculate_capital_expenses(capital_schedule)
-        total_capital = capital_df.sum(axis=1)
+        capital = self._calculate_capital_expenses(capital_schedule)
+        total_capital = sum(capital.values())
 
         # Debt service (monthly if monthly periods, annual if annual)
         if period_type == "monthly":
@@ -144,42 +283,32 @@ class CashFlowEngine:
         # Net Cash Flow
         net_cash_flow = noi - total_capital - debt_service
 
-        # Build result objects
-        cash_flows = []
-        for i in range(num_periods):
-            period = CashFlowPeriod(
-                period_number=i + 1,
-                period_date=period_dates[i],
-                # Revenue
-                base_rent_revenue=float(lease_revenue_df.iloc[i].sum()),
-                expense_recovery_revenue=float(recovery_revenue_df.iloc[i].sum()),
-                other_income=0.0,  # TODO: Add parking, storage, etc.
-                gross_potential_income=float(total_revenue.iloc[i]),
-                vacancy_loss=float(vacancy_loss.iloc[i]),
-                credit_loss=float(credit_loss.iloc[i]),
-                effective_gross_income=float(effective_gross_income.iloc[i]),
-                # Operating Expenses
-                property_taxes=float(opex_df["property_taxes"].iloc[i]),
-                insurance=float(opex_df["insurance"].iloc[i]),
-                utilities=float(opex_df["utilities"].iloc[i]),
-                repairs_maintenance=float(opex_df["repairs_maintenance"].iloc[i]),
-                management_fee=float(opex_df["management_fee"].iloc[i]),
-                other_operating_expenses=float(
-                    opex_df["cam_expenses"].iloc[i] + opex_df["other_expenses"].iloc[i]
-                ),
-                total_operating_expenses=float(total_opex.iloc[i]),
-                net_operating_income=float(noi.iloc[i]),
-                # Capital & Debt
-                capital_expenditures=float(total_capital.iloc[i]),
-                debt_service=debt_service,
-                net_cash_flow=float(net_cash_flow.iloc[i]),
-            )
-            cash_flows.append(period)
+        cash_flows = CashFlowColumns(
+            period_dates=period_dates,
+            period_type=period_type,
+            lease_ids=[lease.lease_id for lease in property.leases],
+            lease_revenue=lease_revenue,
+            lease_recoveries=recovery_revenue,
+            base_rent=base_rent,
+            percentage_rent=percentage_rent,
+            expense_recoveries=expense_recoveries,
+            gross_potential_income=total_revenue,
+            vacancy_loss=vacancy_loss,
+            credit_loss=credit_loss,
+            effective_gross_income=effective_gross_income,
+            operating_expenses=total_opex,
+            net_operating_income=noi,
+            capital_expenditures=total_capital,
+            debt_service=np.full(num_periods, float(debt_service)),
+            net_cash_flow=net_cash_flow,
+            expense_detail=opex,
+            capital_detail=capital,
+        )
 
         logger.info(
             f"Calculated {len(cash_flows)} periods: "
-            f"Total NOI=${sum(cf.net_operating_income for cf in cash_flows):,.0f}, "
-            f"Total NCF=${sum(cf.net_cash_flow for cf in cash_flows):,.0f}"
+            f"Total NOI=${noi.sum():,.0f}, "
+            f"Total NCF=${net_cash_flow.sum():,.0f}"
         )
 
         return cash_flows
@@ -197,167 +326,184 @@ class CashFlowEngine:
 
     def _calculate_lease_revenue(
         self, leases: List[LeaseData], period_dates: pd.DatetimeIndex, period_type: str
-    ) -> pd.DataFrame:
+    ) -> np.ndarray:
         """
         Calculate base rent revenue for all leases across all periods.
 
-        Returns DataFrame with columns = lease_ids, rows = periods.
-        Uses vectorized operations for performance.
+        Every rent step is flattened into start/end/amount arrays and mapped
+        to the period axis with searchsorted; a period earns the amount of the
+        first step (in schedule order) whose date range contains it.
+
+        Returns:
+            (periods x leases) array of base rent
         """
-        revenue_data = {}
-
-        for lease in leases:
-            lease_revenue = []
-
-            for period_date in period_dates:
-                # Find applicable base rent schedule for this period
-                applicable_rent = None
-                for rent_schedule in lease.base_rent:
-                    if (
-                        rent_schedule.period_start_date <= period_date.date()
-                        <= rent_schedule.period_end_date
-                    ):
-                        applicable_rent = rent_schedule
-                        break
-
-                if applicable_rent:
-                    if period_type == "monthly":
-                        revenue = applicable_rent.base_rent_monthly
-                    else:
-                        revenue = applicable_rent.base_rent_annual
-                else:
-                    # Lease not active in this period
-                    revenue = 0.0
-
-                lease_revenue.append(revenue)
-
-            revenue_data[f"lease_{lease.lease_id}"] = lease_revenue
-
-        df = pd.DataFrame(revenue_data, index=period_dates)
-        return df
+        num_periods = len(period_dates)
+        revenue = np.zeros((num_periods, len(leases)))
+        if not leases:
+            return revenue
+
+        lease_index, starts, ends, amounts = LeaseCalculator().flatten_rent_steps(
+            leases, period_type
+        )
+        if amounts.size == 0:
+            return revenue
+
+        periods = period_dates.values.astype("datetime64[D]")
+        first = np.searchsorted(periods, starts, side="left")
+        stop = np.searchsorted(periods, ends, side="right")
+        covered = stop > first
+
+        if not _steps_overlap(lease_index[covered], first[covered], stop[covered]):
+            # Disjoint steps: scatter +amount/-amount edges and integrate
+            edges = np.zeros((num_periods + 1, len(leases)))
+            np.add.at(edges, (first[covered], lease_index[covered]), amounts[covered])
+            np.add.at(edges, (stop[covered], lease_index[covered]), -amounts[covered])
+            return np.cumsum(edges[:-1], axis=0)
+
+        # Overlapping steps: assign in reverse order so the first match wins
+        for k in np.flatnonzero(covered)[::-1]:
+            revenue[first[k]:stop[k], lease_index[k]] = amounts[k]
+        return revenue
+
+    def _calculate_percentage_rent(
+        self, leases: List[LeaseData], period_dates: pd.DatetimeIndex, period_type: str
+    ) -> np.ndarray:
+        """
+        Calculate percentage rent (retail overage) for all leases across all periods.
+
+        The annual overage on prior_year_sales is spread evenly over the
+        periods of the lease term. Leases without a percentage rent clause or
+        prior year sales earn nothing.
+
+        Returns:
+            (periods x leases) array of percentage rent
+        """
+        num_periods = len(period_dates)
+        calculator = LeaseCalculator()
+        periods_per_year = 12 if period_type == "monthly" else 1
+        per_period = np.array([
+            calculator.calculate_percentage_rent(
+                lease.percentage_rent.prior_year_sales, lease.percentage_rent
+            ) / periods_per_year
+            if lease.percentage_rent and lease.percentage_rent.prior_year_sales
+            else 0.0
+            for lease in leases
+        ])
+        if not per_period.any():
+            return np.zeros((num_periods, len(leases)))
+
+        periods = period_dates.values.astype("datetime64[D]")
+        commencement = np.array(
+            [lease.lease_commencement_date for lease in leases], dtype="datetime64[D]"
+        )
+        expiration = np.array(
+            [lease.lease_expiration_date for lease in leases], dtype="datetime64[D]"
+        )
+        active = (periods[:, None] >= commencement) & (periods[:, None] <= expiration)
+        return np.where(active, per_period, 0.0)
 
     def _calculate_expense_recoveries(
         self,
         leases: List[LeaseData],
         opex_schedule: List[OperatingExpenses],
         period_dates: pd.DatetimeIndex,
-    ) -> pd.DataFrame:
+    ) -> np.ndarray:
         """
         Calculate expense recovery revenue from tenants.
 
         For NNN/Modified Gross leases, tenants reimburse operating expenses.
+
+        Returns:
+            (periods x leases) array of recoveries
         """
-        recovery_data = {}
-
-        for lease in leases:
-            lease_recoveries = []
-
-            for i, period_date in enumerate(period_dates):
-                # Check if lease is active in this period
-                if not (
-                    lease.lease_commencement_date
-                    <= period_date.date()
-                    <= lease.lease_expiration_date
-                ):
-                    lease_recoveries.append(0.0)
-                    continue
-
-                opex = opex_schedule[i]
-                recovery = lease.expense_recovery
-
-                # Calculate recoverable expenses based on recovery structure
-                if recovery.recovery_structure == "Triple Net (NNN)":
-                    # Tenant pays all operating expenses proportionally
-                    recoverable = (
-                        opex.property_taxes * (recovery.property_tax_recovery_pct / 100)
-                        + opex.insurance * (recovery.insurance_recovery_pct / 100)
-                        + opex.cam_expenses * (recovery.cam_recovery_pct / 100)
-                    )
-                elif recovery.recovery_structure == "Modified Gross":
-                    # Tenant pays CAM, insurance, and taxes (but not management/repairs)
-                    recoverable = (
-                        opex.property_taxes * (recovery.property_tax_recovery_pct / 100)
-                        + opex.insurance * (recovery.insurance_recovery_pct / 100)
-                        + opex.cam_expenses * (recovery.cam_recovery_pct / 100)
-                    )
-                else:  # Gross lease
-                    recoverable = 0.0
-
-                # Apply expense cap if defined
-                if recovery.expense_cap_psf > 0:
-                    max_recovery = recovery.expense_cap_psf * lease.leased_sf / 12
-                    recoverable = min(recoverable, max_recovery)
-
-                lease_recoveries.append(recoverable)
-
-            recovery_data[f"recovery_{lease.lease_id}"] = lease_recoveries
-
-        df = pd.DataFrame(recovery_data, index=period_dates)
-        return df
+        num_periods = len(period_dates)
+        if not leases:
+            return np.zeros((num_periods, 0))
+
+        periods = period_dates.values.astype("datetime64[D]")
+        commencement = np.array(
+            [lease.lease_commencement_date for lease in leases], dtype="datetime64[D]"
+        )
+        expiration = np.array(
+            [lease.lease_expiration_date for lease in leases], dtype="datetime64[D]"
+        )
+        active = (periods[:, None] >= commencement) & (periods[:, None] <= expiration)
+
+        recoveries = [lease.expense_recovery for lease in leases]
+        recovers = np.array(
+            [r.recovery_structure in RECOVERABLE_STRUCTURES for r in recoveries]
+        )
+        tax_pct = np.array([r.property_tax_recovery_pct for r in recoveries]) / 100
+        insurance_pct = np.array([r.insurance_recovery_pct for r in recoveries]) / 100
+        cam_pct = np.array([r.cam_recovery_pct for r in recoveries]) / 100
+
+        taxes = np.array([opex.property_taxes for opex in opex_schedule])
+        insurance = np.array([opex.insurance for opex in opex_schedule])
+        cam = np.array([opex.cam_expenses for opex in opex_schedule])
+
+        # Calculate recoverable expenses based on recovery structure
+        recoverable = (
+            np.outer(taxes, tax_pct)
+            + np.outer(insurance, insurance_pct)
+            + np.outer(cam, cam_pct)
+        ) * recovers
+
+        # Apply expense cap if defined
+        cap_psf = np.array([r.expense_cap_psf or 0.0 for r in recoveries])
+        max_recovery = np.where(
+            cap_psf > 0,
+            cap_psf * np.array([lease.leased_sf for lease in leases]) / 12,
+            np.inf,
+        )
+        recoverable = np.minimum(recoverable, max_recovery)
+
+        return np.where(active, recoverable, 0.0)
 
     def _calculate_operating_expenses(
         self,
         opex_schedule: List[OperatingExpenses],
-        effective_gross_income: pd.Series,
+        effective_gross_income: np.ndarray,
         period_dates: pd.DatetimeIndex,
-    ) -> pd.DataFrame:
+    ) -> Dict[str, np.ndarray]:
         """
         Calculate operating expenses by period.
 
         Management fee is calculated as % of EGI (varies by period).
         Other expenses are fixed by period.
         """
-        opex_data = {
-            "property_taxes": [],
-            "insurance": [],
-            "cam_expenses": [],
-            "utilities": [],
-            "repairs_maintenance": [],
-            "management_fee": [],
-            "other_expenses": [],
-        }
-
-        for i, opex in enumerate(opex_schedule):
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(opex, name) for opex in opex_schedule], dtype=np.float64)
+
+        return {
+            "property_taxes": column("property_taxes"),
+            "insurance": column("insurance"),
+            "cam_expenses": column("cam_expenses"),
+            "utilities": column("utilities"),
+            "repairs_maintenance": column("repairs_maintenance"),
             # Management fee is % of EGI
-            management_fee = effective_gross_income.iloc[i] * (
-                opex.management_fee_pct / 100
-            )
-
-            opex_data["property_taxes"].append(opex.property_taxes)
-            opex_data["insurance"].append(opex.insurance)
-            opex_data["cam_expenses"].append(opex.cam_expenses)
-            opex_data["utilities"].append(opex.utilities)
-            opex_data["repairs_maintenance"].append(opex.repairs_maintenance)
-            opex_data["management_fee"].append(management_fee)
-            opex_data["other_expenses"].append(opex.other_expenses)
-
-        df = pd.DataFrame(opex_data, index=period_dates)
-        return df
+            "management_fee": effective_gross_income * (column("management_fee_pct") / 100),
+            "other_expenses": column("other_expenses"),
+        }
 
     def _calculate_capital_expenses(
         self, capital_schedule: List[CapitalItems]
-    ) -> pd.DataFrame:
+    ) -> Dict[str, np.ndarray]:
         """
         Calculate capital expenses by period.
 
         Includes capital reserves, TIs, leasing commissions.
         """
-        capital_data = {
-            "capital_reserves": [],
-            "tenant_improvements": [],
-            "leasing_commissions": [],
-        }
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(item, name) for item in capital_schedule], dtype=np.float64)
 
-        for capital in capital_schedule:
-            capital_data["capital_reserves"].append(capital.capital_reserves)
-            capital_data["tenant_improvements"].append(capital.tenant_improvements)
-            capital_data["leasing_commissions"].append(capital.leasing_commissions)
-
-        df = pd.DataFrame(capital_data)
-        return df
+        return {
+            "capital_reserves": column("capital_reserves"),
+            "tenant_improvements": column("tenant_improvements"),
+            "leasing_commissions": column("leasing_commissions"),
+        }
 
     def calculate_annual_summary(
-        self, cash_flows: List[CashFlowPeriod]
+        self, cash_flows: Union[CashFlowColumns, List[CashFlowPeriod]]
     ) -> pd.DataFrame:
         """
         Aggregate monthly cash flows into annual summary.
@@ -365,37 +511,36 @@ class CashFlowEngine:
         Useful for reporting and presentation.
 
         Args:
-            cash_flows: List of monthly CashFlowPeriod objects
+            cash_flows: CashFlowColumns result, or a list of monthly
+                CashFlowPeriod objects
 
         Returns:
             DataFrame with annual aggregations
 
         Example:
             >>> annual_df = engine.calculate_annual_summary(monthly_cash_flows)
-            >>> print(annual_df[["year", "noi", "ncf"]])
-               year         noi          ncf
-            0  2025  1,250,000    890,000
-            1  2026  1,287,500    925,000
+            >>> print(annual_df[["year", "net_operating_income", "net_cash_flow"]])
+               year  net_operating_income  net_cash_flow
+            0  2025             1,250,000        890,000
+            1  2026             1,287,500        925,000
         """
-        # Convert to DataFrame
-        df = pd.DataFrame([cf.dict() for cf in cash_flows])
-        df["period_date"] = pd.to_datetime(df["period_date"])
+        df = self._cash_flows_to_dataframe(cash_flows)
         df["year"] = df["period_date"].dt.year
 
         # Aggregate by year
-        annual_df = df.groupby("year").agg(
-            {
-                "gross_potential_income": "sum",
-                "vacancy_loss": "sum",
-                "credit_loss": "sum",
-                "effective_gross_income": "sum",
-                "total_operating_expenses": "sum",
-                "net_operating_income": "sum",
-                "capital_expenditures": "sum",
-                "debt_service": "sum",
-                "net_cash_flow": "sum",
-            }
-        )
+        annual_df = df.groupby("year").agg({
+            "base_rent": "sum",
+            "percentage_rent": "sum",
+            "expense_recoveries": "sum",
+            "vacancy_loss": "sum",
+            "credit_loss": "sum",
+            "effective_gross_income": "sum",
+            "operating_expenses": "sum",
+            "net_operating_income": "sum",
+            "capital_expenditures": "sum",
+            "debt_service": "sum",
+            "net_cash_flow": "sum",
+        })
 
         annual_df.reset_index(inplace=True)
 
@@ -404,22 +549,22 @@ class CashFlowEngine:
         return annual_df
 
     def export_to_excel(
-        self, cash_flows: List[CashFlowPeriod], output_path: str
+        self, cash_flows: Union[CashFlowColumns, List[CashFlowPeriod]], output_path: str
     ) -> None:
         """
         Export cash flow projections to Excel file.
 
         Args:
-            cash_flows: List of CashFlowPeriod objects
+            cash_flows: CashFlowColumns result or list of CashFlowPeriod objects
             output_path: Path to output Excel file
 
         Example:
             >>> engine.export_to_excel(cash_flows, "cash_flow_projections.xlsx")
         """
-        df = pd.DataFrame([cf.dict() for cf in cash_flows])
+        df = self._cash_flows_to_dataframe(cash_flows)
 
         # Format dates
-        df["period_date"] = pd.to_datetime(df["period_date"]).dt.strftime("%Y-%m-%d")
+        df["period_date"] = df["period_date"].dt.strftime("%Y-%m-%d")
 
         # Write to Excel with formatting
         with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
@@ -430,3 +575,15 @@ class CashFlowEngine:
             annual_df.to_excel(writer, sheet_name="Annual Summary", index=False)
 
         logger.info(f"Exported cash flow projections to {output_path}")
+
+    @staticmethod
+    def _cash_flows_to_dataframe(
+        cash_flows: Union[CashFlowColumns, List[CashFlowPeriod]]
+    ) -> pd.DataFrame:
+        """Flat DataFrame with a datetime period_date column, without materializing columnar results."""
+        if isinstance(cash_flows, CashFlowColumns):
+            return cash_flows.to_dataframe().reset_index()
+
+        df = pd.DataFrame([cf.model_dump() for cf in cash_flows])
+        df["period_date"] = pd.to_datetime(df["period_date"])
+        return df
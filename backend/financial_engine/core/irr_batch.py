@@ -0,0 +1,308 @@
+"""
+Batch IRR / XIRR / NPV Solver
+
+Solves many cash-flow series at once. Sensitivity grids, scenario
+comparisons and portfolio roll-ups used to call numpy-financial or scipy
+once per series; here every row of a 2-D flows matrix is iterated
+simultaneously with vectorized Halley steps, and only the rows that fail to
+converge drop to a per-row bracketed bisection.
+
+Conventions:
+- flows_matrix is (series x periods). Shorter series are padded with NaN
+  (padding is ignored).
+- calculate_irr_batch returns per-period rates, like numpy_financial.irr.
+- calculate_xirr_batch returns annualized rates on an Actual/365 basis,
+  like financial_engine.waterfall.irr.calculate_xirr.
+- Rows with no sign change (or no root in the search range) return NaN.
+
+When a series has several IRRs, the fallback picks the root closest to
+zero, which is the same tie-break numpy_financial.irr uses.
+
+Example:
+    >>> flows = np.array([
+    ...     [-100.0, 10.0, 10.0, 110.0],
+    ...     [-100.0, 0.0, 0.0, 150.0],
+    ...     [100.0, 10.0, 10.0, 10.0],   # no outflow - no IRR
+    ... ])
+    >>> np.round(calculate_irr_batch(flows), 4)
+    array([0.1   , 0.1447,    nan])
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+
+DAYS_IN_YEAR = 365.0
+
+# Search range shared with calculate_xirr's brentq bracket
+LOWER_BOUND = -0.99
+UPPER_BOUND = 10.0
+
+# Rates probed when Halley fails; sign changes between neighbours seed bisection
+_FALLBACK_GRID = np.array([
+    LOWER_BOUND, -0.95, -0.9, -0.8, -0.7, -0.6, -0.5, -0.4, -0.3, -0.2, -0.1,
+    -0.05, 0.0, 0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 1.5,
+    2.0, 3.0, 5.0, 7.5, UPPER_BOUND,
+])
+
+ArrayLike = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def calculate_irr_batch(
+    flows_matrix: ArrayLike,
+    guess: float = 0.10,
+    tolerance: float = 1e-12,
+    max_iterations: int = 50,
+) -> np.ndarray:
+    """Periodic IRR for every row of a flows matrix.
+
+    Args:
+        flows_matrix: (series x periods) signed cash flows, period 0 first.
+            A 1-D input is treated as a single series.
+        guess: Starting rate for the Halley iteration
+        tolerance: Relative step size at which a row counts as converged
+        max_iterations: Halley iterations before falling back to bisection
+
+    Returns:
+        1-D float array of per-period rates (NaN where no IRR exists)
+
+    Example:
+        >>> calculate_irr_batch([[-1000.0, 1100.0]])
+        array([0.1])
+    """
+    flows = _as_flows(flows_matrix)
+    times = np.broadcast_to(
+        np.arange(flows.shape[1], dtype=np.float64), flows.shape
+    )
+    return _solve_rates(times, flows, guess, tolerance, max_iterations)
+
+
+def calculate_xirr_batch(
+    dates_matrix: ArrayLike,
+    flows_matrix: ArrayLike,
+    guess: float = 0.10,
+    tolerance: float = 1e-12,
+    max_iterations: int = 50,
+) -> np.ndarray:
+    """Annualized XIRR for every row of a flows matrix.
+
+    Each row is discounted from its own first date, matching calculate_xirr.
+
+    Args:
+        dates_matrix: (series x periods) dates, or a single row of dates shared
+            by every series. Accepts date objects or numpy datetime64; padding
+            may be None/NaT where the matching flow is NaN.
+        flows_matrix: (series x periods) signed cash flows
+        guess: Starting rate for the Halley iteration
+        tolerance: Relative step size at which a row counts as converged
+        max_iterations: Halley iterations before falling back to bisection
+
+    Returns:
+        1-D float array of annualized rates (NaN where no IRR exists)
+
+    Example:
+        >>> dates = [date(2024, 1, 1), date(2024, 12, 31), date(2025, 12, 31)]
+        >>> flows = [[-10_000_000, 500_000, 12_000_000]]
+        >>> np.round(calculate_xirr_batch(dates, flows), 6)
+        array([0.12073])
+    """
+    flows = _as_flows(flows_matrix)
+    years = _years_from_dates(dates_matrix, flows)
+    return _solve_rates(years, flows, guess, tolerance, max_iterations)
+
+
+def calculate_npv_batch(
+    rates: Union[float, ArrayLike],
+    flows_matrix: ArrayLike,
+) -> np.ndarray:
+    """Periodic NPV for every row, with period 0 undiscounted (numpy_financial.npv).
+
+    Args:
+        rates: Scalar rate, or one rate per row
+        flows_matrix: (series x periods) signed cash flows
+
+    Returns:
+        1-D float array of NPVs
+    """
+    flows = _as_flows(flows_matrix)
+    times = np.broadcast_to(
+        np.arange(flows.shape[1], dtype=np.float64), flows.shape
+    )
+    return _npv(_as_rates(rates, flows.shape[0]), times, np.nan_to_num(flows))
+
+
+def calculate_xnpv_batch(
+    rates: Union[float, ArrayLike],
+    dates_matrix: ArrayLike,
+    flows_matrix: ArrayLike,
+) -> np.ndarray:
+    """Annual-rate NPV of irregular flows for every row (Actual/365 from each row's first date).
+
+    Args:
+        rates: Scalar annual rate, or one rate per row
+        dates_matrix: (series x periods) dates, or one shared row of dates
+        flows_matrix: (series x periods) signed cash flows
+
+    Returns:
+        1-D float array of NPVs
+    """
+    flows = _as_flows(flows_matrix)
+    years = _years_from_dates(dates_matrix, flows)
+    return _npv(_as_rates(rates, flows.shape[0]), years, np.nan_to_num(flows))
+
+
+# ============================================================================
+# SOLVER
+# ============================================================================
+
+def _solve_rates(
+    times: np.ndarray,
+    flows: np.ndarray,
+    guess: float,
+    tolerance: float,
+    max_iterations: int,
+) -> np.ndarray:
+    """Vectorized Halley iteration with per-row bisection fallback."""
+    flows = np.nan_to_num(flows)
+    row_count = flows.shape[0]
+    rates = np.full(row_count, np.nan)
+
+    solvable = (flows > 0).any(axis=1) & (flows < 0).any(axis=1)
+    current = np.full(row_count, float(guess))
+    converged = np.zeros(row_count, dtype=bool)
+    active = solvable.copy()
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for _ in range(max_iterations):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+
+            rate = current[idx]
+            npv, slope, curvature = _npv_derivatives(rate, times[idx], flows[idx])
+
+            halley_denominator = 2.0 * slope * slope - npv * curvature
+            step = np.where(
+                halley_denominator != 0.0,
+                2.0 * npv * slope / halley_denominator,
+                npv / slope,
+            )
+            candidate = rate - step
+
+            failed = ~np.isfinite(candidate) | (candidate <= -1.0) | (candidate > UPPER_BOUND)
+            done = ~failed & (np.abs(step) <= tolerance * (1.0 + np.abs(candidate)))
+
+            current[idx] = np.where(failed, rate, candidate)
+            converged[idx[done]] = True
+            active[idx[failed | done]] = False
+
+        in_range = converged & (current > -1.0) & (current <= UPPER_BOUND)
+        rates[in_range] = current[in_range]
+
+        fallback = np.flatnonzero(solvable & ~in_range)
+        if fallback.size:
+            rates[fallback] = _bisect_rows(times[fallback], flows[fallback])
+
+    return rates
+
+
+def _bisect_rows(times: np.ndarray, flows: np.ndarray, iterations: int = 80) -> np.ndarray:
+    """Bracketed bisection for rows the Halley pass could not settle.
+
+    Each row is bracketed by the sign change on _FALLBACK_GRID closest to a
+    zero rate; rows without any sign change on the grid return NaN.
+    """
+    row_count = flows.shape[0]
+    grid = _FALLBACK_GRID
+    values = np.stack(
+        [_npv(np.full(row_count, r), times, flows) for r in grid], axis=1
+    )
+    signs = np.sign(values)
+    exact = signs == 0
+    change = (signs[:, :-1] * signs[:, 1:]) < 0
+
+    # Distance of each grid interval from a zero rate
+    interval_distance = np.minimum(np.abs(grid[:-1]), np.abs(grid[1:]))
+    distance = np.where(change, interval_distance, np.inf)
+    exact_distance = np.where(exact, np.abs(grid), np.inf)
+
+    best_interval = distance.argmin(axis=1)
+    best_exact = exact_distance.argmin(axis=1)
+    use_exact = exact_distance.min(axis=1) <= distance.min(axis=1)
+    has_root = np.isfinite(distance.min(axis=1)) | (use_exact & exact.any(axis=1))
+
+    result = np.full(row_count, np.nan)
+    result[use_exact & has_root] = grid[best_exact[use_exact & has_root]]
+
+    rows = np.flatnonzero(has_root & ~use_exact)
+    if rows.size == 0:
+        return result
+
+    lo = grid[best_interval[rows]].copy()
+    hi = grid[best_interval[rows] + 1].copy()
+    f_lo = values[rows, best_interval[rows]]
+    row_times = times[rows]
+    row_flows = flows[rows]
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        f_mid = _npv(mid, row_times, row_flows)
+        same_side = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(same_side, mid, lo)
+        f_lo = np.where(same_side, f_mid, f_lo)
+        hi = np.where(same_side, hi, mid)
+    result[rows] = 0.5 * (lo + hi)
+    return result
+
+
+def _npv(rates: np.ndarray, times: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """Row-wise sum of flows / (1 + rate)^t."""
+    discount = np.exp(-times * np.log1p(rates)[:, None])
+    return (flows * discount).sum(axis=1)
+
+
+def _npv_derivatives(rates: np.ndarray, times: np.ndarray, flows: np.ndarray):
+    """Row-wise NPV and its first and second derivatives with respect to the rate."""
+    base = 1.0 + rates
+    discounted = flows * np.exp(-times * np.log1p(rates)[:, None])
+    npv = discounted.sum(axis=1)
+    slope = -(times * discounted).sum(axis=1) / base
+    curvature = (times * (times + 1.0) * discounted).sum(axis=1) / (base * base)
+    return npv, slope, curvature
+
+
+# ============================================================================
+# INPUT HELPERS
+# ============================================================================
+
+def _as_flows(flows_matrix: ArrayLike) -> np.ndarray:
+    flows = np.array(flows_matrix, dtype=np.float64)
+    if flows.ndim == 1:
+        flows = flows[None, :]
+    if flows.ndim != 2:
+        raise ValueError("flows_matrix must be 1-D or 2-D")
+    return flows
+
+
+def _as_rates(rates: Union[float, ArrayLike], row_count: int) -> np.ndarray:
+    rates = np.asarray(rates, dtype=np.float64)
+    return np.broadcast_to(rates, (row_count,)).astype(np.float64)
+
+
+def _years_from_dates(dates_matrix: ArrayLike, flows: np.ndarray) -> np.ndarray:
+    """Year fractions from each row's first date, zeroed where the flow is padding."""
+    dates = np.array(dates_matrix, dtype='datetime64[D]')
+    if dates.ndim == 1:
+        dates = np.broadcast_to(dates, flows.shape)
+    if dates.shape != flows.shape:
+        raise ValueError(
+            f"dates_matrix shape {dates.shape} does not match flows_matrix {flows.shape}"
+        )
+
+    days = (dates - dates[:, :1]).astype(np.float64)
+    padding = np.isnan(flows) | np.isnat(dates)
+    return np.where(padding, 0.0, days / DAYS_IN_YEAR)
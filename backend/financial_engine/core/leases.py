@@ -352,6 +352,50 @@ class LeaseCalculator:
 
         return df
 
+    def flatten_rent_steps(
+        self,
+        leases: List[LeaseData],
+        period_type: str = "monthly",
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Flatten every lease's base rent steps into parallel arrays.
+
+        Steps keep their order within each lease, so callers that need
+        "first matching step wins" semantics can rely on array order.
+
+        Args:
+            leases: List of lease data
+            period_type: "monthly" uses base_rent_monthly, "annual" base_rent_annual
+
+        Returns:
+            Tuple of (lease_index, start_dates, end_dates, amounts). Dates are
+            datetime64[D]; lease_index is the position of the lease in `leases`.
+
+        Example:
+            >>> lease_idx, starts, ends, amounts = calculator.flatten_rent_steps(
+            ...     property.leases, period_type="monthly"
+            ... )
+            >>> len(amounts) == sum(len(lease.base_rent) for lease in property.leases)
+            True
+        """
+        amount_field = "base_rent_monthly" if period_type == "monthly" else "base_rent_annual"
+        steps = [
+            (i, step.period_start_date, step.period_end_date, getattr(step, amount_field))
+            for i, lease in enumerate(leases)
+            for step in lease.base_rent
+        ]
+        if not steps:
+            empty_dates = np.array([], dtype="datetime64[D]")
+            return np.array([], dtype=np.intp), empty_dates, empty_dates, np.array([])
+
+        lease_index, starts, ends, amounts = zip(*steps)
+        return (
+            np.array(lease_index, dtype=np.intp),
+            np.array(starts, dtype="datetime64[D]"),
+            np.array(ends, dtype="datetime64[D]"),
+            np.array(amounts, dtype=np.float64),
+        )
+
     def calculate_tenant_improvement_cost(
         self,
         leased_sf: float,
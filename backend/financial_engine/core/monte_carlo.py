@@ -0,0 +1,860 @@
+"""
+Monte Carlo Simulation Engine
+
+Turns point-estimate underwriting into return distributions. Key
+assumptions (absorption pace, price growth, cost inflation, exit cap,
+vacancy) are given as probability distributions; N scenarios are sampled
+from a seeded RNG, every scenario's cash flows are rebuilt from a snapshot
+of the project inputs, and the engine reports percentile bands for IRR,
+NPV, equity multiple and peak equity (plus LP/GP returns when a waterfall
+is supplied).
+
+Design:
+- The DB is read once. Callers build a LandDevSimulationInputs or
+  IncomePropertySimulationInputs snapshot from the cash-flow services and
+  hand it to the engine; nothing here touches Django.
+- Scenarios are evaluated in batches of (draws x periods) arrays. IRR and
+  NPV use the batch solver, partner returns use FastWaterfallEngine.
+- Batches run in a process pool. Each worker receives the snapshot once
+  (pool initializer) and only per-batch seeds travel afterwards.
+- Batch b always samples from SeedSequence(seed).spawn(...)[b], so results
+  depend on the seed and batch size, never on the worker count.
+- Progress is streamed per batch. With early stopping the run ends once
+  the tracked percentiles stop moving (relative to the P5-P95 spread) for
+  ``patience`` consecutive batches.
+
+Example:
+    >>> engine = MonteCarloEngine(
+    ...     inputs,
+    ...     {
+    ...         'price_growth': {'distribution': 'normal', 'mean': 0.03, 'std': 0.01},
+    ...         'absorption_pace': {'distribution': 'triangular',
+    ...                             'low': 0.7, 'mode': 1.0, 'high': 1.2},
+    ...     },
+    ...     SimulationConfig(draws=10_000, seed=42),
+    ... )
+    >>> for progress in engine.iter_progress():
+    ...     print(progress.completed, progress.bands['irr']['p50'])
+    >>> engine.result.bands['irr']
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from financial_engine.core.irr_batch import calculate_irr_batch, calculate_npv_batch
+
+
+# ============================================================================
+# ASSUMPTIONS
+# ============================================================================
+
+class SimulationVariable(str, Enum):
+    """Assumptions that can be given a distribution."""
+    ABSORPTION_PACE = "absorption_pace"   # Multiplier on the sales pace (1.0 = plan)
+    PRICE_GROWTH = "price_growth"         # Annual price / income growth rate
+    COST_INFLATION = "cost_inflation"     # Annual cost / expense growth rate
+    EXIT_CAP = "exit_cap"                 # Terminal cap rate
+    VACANCY = "vacancy"                   # General vacancy rate
+
+
+class DistributionType(str, Enum):
+    """Supported sampling distributions."""
+    FIXED = "fixed"
+    UNIFORM = "uniform"
+    NORMAL = "normal"
+    TRIANGULAR = "triangular"
+    LOGNORMAL = "lognormal"
+
+
+@dataclass
+class AssumptionDistribution:
+    """Distribution for one assumption.
+
+    Parameters by type:
+    - fixed: value
+    - uniform: low, high
+    - normal: mean, std (low/high optionally clip the samples)
+    - triangular: low, mode, high
+    - lognormal: mean, std of the value itself (low/high optionally clip)
+
+    Example:
+        >>> AssumptionDistribution('normal', mean=0.055, std=0.0025, low=0.04)
+    """
+    distribution: DistributionType
+    value: Optional[float] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    mode: Optional[float] = None
+    mean: Optional[float] = None
+    std: Optional[float] = None
+
+    _REQUIRED = {
+        DistributionType.FIXED: ('value',),
+        DistributionType.UNIFORM: ('low', 'high'),
+        DistributionType.NORMAL: ('mean', 'std'),
+        DistributionType.TRIANGULAR: ('low', 'mode', 'high'),
+        DistributionType.LOGNORMAL: ('mean', 'std'),
+    }
+
+    def __post_init__(self):
+        if isinstance(self.distribution, str):
+            self.distribution = DistributionType(self.distribution.lower())
+        for name in ('value', 'low', 'high', 'mode', 'mean', 'std'):
+            current = getattr(self, name)
+            if current is not None:
+                setattr(self, name, float(current))
+
+        missing = [
+            name for name in self._REQUIRED[self.distribution]
+            if getattr(self, name) is None
+        ]
+        if missing:
+            raise ValueError(
+                f"{self.distribution.value} distribution requires {', '.join(missing)}"
+            )
+        if self.std is not None and self.std < 0:
+            raise ValueError("std must be non-negative")
+        if self.low is not None and self.high is not None and self.low > self.high:
+            raise ValueError("low must not exceed high")
+        if self.distribution == DistributionType.TRIANGULAR and not (
+            self.low <= self.mode <= self.high
+        ):
+            raise ValueError("triangular mode must lie between low and high")
+        if self.distribution == DistributionType.LOGNORMAL and self.mean <= 0:
+            raise ValueError("lognormal mean must be positive")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'AssumptionDistribution':
+        """Build from a request dict such as {'distribution': 'normal', 'mean': ...}."""
+        data = dict(data)
+        distribution = data.pop('distribution', None) or data.pop('type', None)
+        if distribution is None:
+            raise ValueError("distribution type is required")
+        known = {'value', 'low', 'high', 'mode', 'mean', 'std'}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown distribution parameters: {', '.join(sorted(unknown))}")
+        return cls(distribution=distribution, **data)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw ``size`` samples."""
+        kind = self.distribution
+        if kind == DistributionType.FIXED:
+            return np.full(size, self.value)
+        if kind == DistributionType.UNIFORM:
+            return rng.uniform(self.low, self.high, size)
+        if kind == DistributionType.TRIANGULAR:
+            if self.low == self.high:
+                return np.full(size, self.low)
+            return rng.triangular(self.low, self.mode, self.high, size)
+
+        if kind == DistributionType.NORMAL:
+            samples = rng.normal(self.mean, self.std, size)
+        else:
+            # Convert the value's mean/std to the underlying normal's parameters
+            sigma_sq = math.log1p((self.std / self.mean) ** 2)
+            mu = math.log(self.mean) - sigma_sq / 2
+            samples = rng.lognormal(mu, math.sqrt(sigma_sq), size)
+
+        if self.low is not None or self.high is not None:
+            samples = np.clip(samples, self.low, self.high)
+        return samples
+
+
+DistributionSpec = Union[AssumptionDistribution, Mapping[str, Any]]
+
+
+# ============================================================================
+# PROJECT SNAPSHOTS
+# ============================================================================
+
+def _month_end_dates(start_date: date, count: int) -> np.ndarray:
+    """Month-end dates for periods 1..count starting in start_date's month."""
+    first_month = np.datetime64(start_date, 'M')
+    next_months = first_month + np.arange(1, count + 1)
+    return next_months.astype('datetime64[D]') - np.timedelta64(1, 'D')
+
+
+def _relative_growth(rates: np.ndarray, base_rate: float, months: np.ndarray) -> np.ndarray:
+    """(S x P) factors that move a schedule grown at base_rate onto each sampled rate."""
+    ratio = (1.0 + rates) / (1.0 + base_rate)
+    return ratio[:, None] ** (months[None, :] / 12.0)
+
+
+@dataclass
+class LandDevSimulationInputs:
+    """Land development inputs captured once from LandDevCashFlowService.
+
+    Costs are taken as scheduled (at the base inflation rate) and re-inflated
+    relative to it per draw. Parcel sales are held unescalated so a draw can
+    move them in time (absorption pace) before applying its price growth.
+
+    Matches LandDevCashFlowService's summary conventions: IRR on calendar-
+    year totals, NPV on monthly flows at the monthly equivalent of the
+    discount rate, period 1 undiscounted.
+
+    Attributes:
+        start_date: Project analysis start (period 1 is this month)
+        cost_flows: (P,) positive costs per period at the base inflation rate
+        sale_periods: (K,) 1-based sale period per parcel
+        sale_net_revenue: (K,) net sale proceeds per parcel before price growth
+        discount_rate: Annual discount rate
+        price_growth_rate: Base annual price growth
+        cost_inflation_rate: Base annual cost inflation
+        fixed_flows: Optional (P,) signed flows no assumption affects
+    """
+    start_date: date
+    cost_flows: np.ndarray
+    sale_periods: np.ndarray
+    sale_net_revenue: np.ndarray
+    discount_rate: float
+    price_growth_rate: float = 0.0
+    cost_inflation_rate: float = 0.0
+    fixed_flows: Optional[np.ndarray] = None
+
+    supported_variables = (
+        SimulationVariable.ABSORPTION_PACE,
+        SimulationVariable.PRICE_GROWTH,
+        SimulationVariable.COST_INFLATION,
+    )
+
+    def __post_init__(self):
+        self.cost_flows = np.asarray(self.cost_flows, dtype=np.float64)
+        self.sale_periods = np.asarray(self.sale_periods, dtype=np.int64)
+        self.sale_net_revenue = np.asarray(self.sale_net_revenue, dtype=np.float64)
+        if self.fixed_flows is not None:
+            self.fixed_flows = np.asarray(self.fixed_flows, dtype=np.float64)
+        if self.sale_periods.shape != self.sale_net_revenue.shape:
+            raise ValueError("sale_periods and sale_net_revenue must have the same length")
+        if self.sale_periods.size and self.sale_periods.min() < 1:
+            raise ValueError("sale_periods are 1-based")
+        self.discount_rate = float(self.discount_rate or 0.0)
+        self.price_growth_rate = float(self.price_growth_rate or 0.0)
+        self.cost_inflation_rate = float(self.cost_inflation_rate or 0.0)
+
+    @property
+    def period_count(self) -> int:
+        counts = [self.cost_flows.shape[0]]
+        if self.fixed_flows is not None:
+            counts.append(self.fixed_flows.shape[0])
+        if self.sale_periods.size:
+            counts.append(int(self.sale_periods.max()))
+        return max(counts)
+
+    def base_values(self) -> Dict[SimulationVariable, float]:
+        return {
+            SimulationVariable.ABSORPTION_PACE: 1.0,
+            SimulationVariable.PRICE_GROWTH: self.price_growth_rate,
+            SimulationVariable.COST_INFLATION: self.cost_inflation_rate,
+        }
+
+    def cash_flows(self, draws: Mapping[SimulationVariable, np.ndarray]) -> np.ndarray:
+        """(S x H) monthly net cash flows, column 0 = period 1."""
+        pace = np.maximum(draws[SimulationVariable.ABSORPTION_PACE], 1e-3)
+        growth = draws[SimulationVariable.PRICE_GROWTH]
+        inflation = draws[SimulationVariable.COST_INFLATION]
+        draw_count = pace.shape[0]
+
+        # Faster pace pulls each sale toward period 1, slower pace pushes it out
+        sale_periods = 1 + np.rint(
+            (self.sale_periods[None, :] - 1) / pace[:, None]
+        ).astype(np.int64)
+        horizon = self.period_count
+        if sale_periods.size:
+            horizon = max(horizon, int(sale_periods.max()))
+
+        flows = np.zeros((draw_count, horizon))
+
+        cost_months = np.arange(self.cost_flows.shape[0], dtype=np.float64)
+        flows[:, :self.cost_flows.shape[0]] -= self.cost_flows[None, :] * _relative_growth(
+            inflation, self.cost_inflation_rate, cost_months
+        )
+
+        if sale_periods.size:
+            escalation = (1.0 + growth[:, None]) ** ((sale_periods - 1) / 12.0)
+            revenue = self.sale_net_revenue[None, :] * escalation
+            rows = np.repeat(np.arange(draw_count), sale_periods.shape[1])
+            np.add.at(flows, (rows, sale_periods.ravel() - 1), revenue.ravel())
+
+        if self.fixed_flows is not None:
+            flows[:, :self.fixed_flows.shape[0]] += self.fixed_flows[None, :]
+        return flows
+
+    def flow_dates(self, count: int) -> np.ndarray:
+        return _month_end_dates(self.start_date, count)
+
+    def irr(self, flows: np.ndarray) -> np.ndarray:
+        """Annual IRR on calendar-year totals (LandDevCashFlowService convention)."""
+        years = (self.start_date.month - 1 + np.arange(flows.shape[1])) // 12
+        membership = np.zeros((flows.shape[1], int(years[-1]) + 1))
+        membership[np.arange(flows.shape[1]), years] = 1.0
+        annual = flows @ membership
+        irr = np.full(flows.shape[0], np.nan)
+        if annual.shape[1] >= 2:
+            irr = calculate_irr_batch(annual)
+        return irr
+
+    def npv(self, flows: np.ndarray) -> np.ndarray:
+        monthly_rate = (1.0 + self.discount_rate) ** (1.0 / 12.0) - 1.0
+        return calculate_npv_batch(monthly_rate, flows)
+
+
+@dataclass
+class IncomePropertySimulationInputs:
+    """Income property inputs captured once from DCFCalculationService.calculate_monthly.
+
+    Monthly GPR and base opex are taken as projected at the base growth
+    rates and re-grown relative to them per draw; vacancy, management fee
+    and the exit reversion are then recomputed exactly as the DCF does
+    (terminal NOI = last 12 months grown one year, capped, less selling
+    costs). Flows are unlevered: column 0 is the acquisition, columns 1..P
+    are months, and the net reversion lands in the last month.
+
+    Attributes:
+        start_date: Analysis start (month 1)
+        gpr: (P,) gross potential rent per month, renovation-adjusted
+        other_income: (P,) other income per month
+        base_opex: (P,) operating expenses before management fee
+        replacement_reserves: (P,) reserves per month
+        capital_costs: (P,) non-operating capital spend (renovation, relocation)
+        acquisition_cost: Purchase price (or indicated value) paid at close
+        discount_rate: Annual discount rate
+        vacancy_rate, credit_loss_rate, management_fee_pct: Base DCF rates
+        income_growth_rate, expense_growth_rate: Base annual growth rates
+        terminal_cap_rate: Base exit cap rate
+        selling_costs_pct: Selling costs as a fraction of exit value
+    """
+    start_date: date
+    gpr: np.ndarray
+    other_income: np.ndarray
+    base_opex: np.ndarray
+    replacement_reserves: np.ndarray
+    capital_costs: np.ndarray
+    acquisition_cost: float
+    discount_rate: float
+    vacancy_rate: float
+    credit_loss_rate: float
+    management_fee_pct: float
+    income_growth_rate: float
+    expense_growth_rate: float
+    terminal_cap_rate: float
+    selling_costs_pct: float
+
+    supported_variables = (
+        SimulationVariable.PRICE_GROWTH,
+        SimulationVariable.COST_INFLATION,
+        SimulationVariable.EXIT_CAP,
+        SimulationVariable.VACANCY,
+    )
+
+    def __post_init__(self):
+        for name in ('gpr', 'other_income', 'base_opex', 'replacement_reserves', 'capital_costs'):
+            setattr(self, name, np.asarray(getattr(self, name), dtype=np.float64))
+        if not (
+            self.gpr.shape == self.other_income.shape == self.base_opex.shape
+            == self.replacement_reserves.shape == self.capital_costs.shape
+        ):
+            raise ValueError("monthly income and expense schedules must have the same length")
+        if self.gpr.shape[0] < 12:
+            raise ValueError("income property simulation needs at least 12 months of projections")
+        for name in (
+            'acquisition_cost', 'discount_rate', 'vacancy_rate', 'credit_loss_rate',
+            'management_fee_pct', 'income_growth_rate', 'expense_growth_rate',
+            'terminal_cap_rate', 'selling_costs_pct',
+        ):
+            setattr(self, name, float(getattr(self, name) or 0.0))
+
+    @property
+    def period_count(self) -> int:
+        return self.gpr.shape[0] + 1
+
+    def base_values(self) -> Dict[SimulationVariable, float]:
+        return {
+            SimulationVariable.PRICE_GROWTH: self.income_growth_rate,
+            SimulationVariable.COST_INFLATION: self.expense_growth_rate,
+            SimulationVariable.EXIT_CAP: self.terminal_cap_rate,
+            SimulationVariable.VACANCY: self.vacancy_rate,
+        }
+
+    def cash_flows(self, draws: Mapping[SimulationVariable, np.ndarray]) -> np.ndarray:
+        """(S x P+1) unlevered flows: acquisition, then months 1..P."""
+        growth = draws[SimulationVariable.PRICE_GROWTH]
+        inflation = draws[SimulationVariable.COST_INFLATION]
+        exit_cap = draws[SimulationVariable.EXIT_CAP]
+        vacancy = draws[SimulationVariable.VACANCY]
+
+        months = np.arange(self.gpr.shape[0], dtype=np.float64)
+        gpr = self.gpr[None, :] * _relative_growth(growth, self.income_growth_rate, months)
+        opex = self.base_opex[None, :] * _relative_growth(
+            inflation, self.expense_growth_rate, months
+        )
+
+        egi = gpr * (1.0 - vacancy[:, None] - self.credit_loss_rate) + self.other_income[None, :]
+        management_fee = egi * self.management_fee_pct
+        noi = egi - opex - management_fee - self.replacement_reserves[None, :]
+
+        # Terminal NOI: last 12 months grown one year; reserves stay flat
+        terminal_egi = egi[:, -12:].sum(axis=1) * (1.0 + growth)
+        terminal_opex = (
+            (opex[:, -12:].sum(axis=1) + management_fee[:, -12:].sum(axis=1)) * (1.0 + inflation)
+            + self.replacement_reserves[-12:].sum()
+        )
+        terminal_noi = terminal_egi - terminal_opex
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exit_value = np.where(
+                (terminal_noi > 0) & (exit_cap > 0), terminal_noi / exit_cap, 0.0
+            )
+        net_reversion = exit_value * (1.0 - self.selling_costs_pct)
+
+        flows = np.empty((growth.shape[0], self.gpr.shape[0] + 1))
+        flows[:, 0] = -self.acquisition_cost
+        flows[:, 1:] = noi - self.capital_costs[None, :]
+        flows[:, -1] += net_reversion
+        return flows
+
+    def flow_dates(self, count: int) -> np.ndarray:
+        dates = np.empty(count, dtype='datetime64[D]')
+        dates[0] = np.datetime64(self.start_date, 'D')
+        dates[1:] = _month_end_dates(self.start_date, count - 1)
+        return dates
+
+    def irr(self, flows: np.ndarray) -> np.ndarray:
+        """Monthly IRR annualized (DCFCalculationService convention)."""
+        return (1.0 + calculate_irr_batch(flows)) ** 12 - 1.0
+
+    def npv(self, flows: np.ndarray) -> np.ndarray:
+        monthly_rate = (1.0 + self.discount_rate) ** (1.0 / 12.0) - 1.0
+        return calculate_npv_batch(monthly_rate, flows)
+
+
+SimulationInputs = Union[LandDevSimulationInputs, IncomePropertySimulationInputs]
+
+
+# ============================================================================
+# CONFIGURATION AND RESULTS
+# ============================================================================
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Metrics whose bands decide early stopping
+CONVERGENCE_METRICS = ('irr', 'npv')
+
+
+@dataclass
+class SimulationConfig:
+    """Run settings.
+
+    Attributes:
+        draws: Maximum number of scenarios
+        seed: RNG seed; None draws fresh entropy (reported back in the result)
+        batch_size: Scenarios per batch (the unit of progress and parallelism)
+        max_workers: Worker processes; None uses every CPU, 1 runs in-process
+        percentiles: Percentiles reported for every metric
+        early_stopping: Stop once percentile estimates stabilise
+        min_draws: Never stop before this many scenarios
+        tolerance: Largest allowed move of any tracked percentile between
+            batches, as a fraction of that metric's P5-P95 spread
+        patience: Consecutive stable batches required to stop
+    """
+    draws: int = 10_000
+    seed: Optional[int] = None
+    batch_size: int = 250
+    max_workers: Optional[int] = None
+    percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES
+    early_stopping: bool = True
+    min_draws: int = 2_000
+    tolerance: float = 0.005
+    patience: int = 3
+
+    def __post_init__(self):
+        if self.draws < 1:
+            raise ValueError("draws must be at least 1")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.percentiles = tuple(float(p) for p in self.percentiles)
+
+
+@dataclass
+class SimulationProgress:
+    """Snapshot emitted after each completed batch."""
+    completed: int
+    total: int
+    bands: Dict[str, Dict[str, Optional[float]]]
+    max_shift: Optional[float]
+    converged: bool
+    elapsed_seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'completed': self.completed,
+            'total': self.total,
+            'bands': self.bands,
+            'maxShift': self.max_shift,
+            'converged': self.converged,
+            'elapsedSeconds': round(self.elapsed_seconds, 3),
+        }
+
+
+@dataclass
+class SimulationResult:
+    """Percentile bands and the raw samples behind them.
+
+    Attributes:
+        bands: metric -> {'p5': ..., 'p50': ..., 'mean': ..., 'std': ...}
+        samples: metric -> (draws_completed,) values (NaN where undefined)
+        assumptions: assumption -> (draws_completed,) sampled values
+        draws_completed: Scenarios evaluated
+        draws_requested: Scenario budget from the config
+        stopped_early: True when early stopping ended the run
+        seed: Seed that reproduces the run (with the same batch_size)
+        elapsed_seconds: Wall-clock time
+    """
+    bands: Dict[str, Dict[str, Optional[float]]]
+    samples: Dict[str, np.ndarray]
+    assumptions: Dict[str, np.ndarray]
+    draws_completed: int
+    draws_requested: int
+    stopped_early: bool
+    seed: int
+    elapsed_seconds: float
+
+    def to_dict(self, include_samples: bool = False) -> Dict[str, Any]:
+        data = {
+            'bands': self.bands,
+            'drawsCompleted': self.draws_completed,
+            'drawsRequested': self.draws_requested,
+            'stoppedEarly': self.stopped_early,
+            'seed': self.seed,
+            'elapsedSeconds': round(self.elapsed_seconds, 3),
+        }
+        if include_samples:
+            data['samples'] = {k: _nan_to_none_list(v) for k, v in self.samples.items()}
+            data['assumptions'] = {k: v.tolist() for k, v in self.assumptions.items()}
+        return data
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class MonteCarloEngine:
+    """Samples assumptions and evaluates scenarios in a process pool.
+
+    Args:
+        inputs: Project snapshot (LandDevSimulationInputs or
+            IncomePropertySimulationInputs)
+        distributions: assumption name -> AssumptionDistribution (or dict).
+            Assumptions left out stay at the snapshot's base value.
+        config: Run settings
+        waterfall: Optional (tiers, settings) to add LP/GP IRR and equity
+            multiple bands via FastWaterfallEngine
+    """
+
+    def __init__(
+        self,
+        inputs: SimulationInputs,
+        distributions: Mapping[str, DistributionSpec],
+        config: Optional[SimulationConfig] = None,
+        waterfall: Optional[Tuple[Sequence[Any], Any]] = None,
+    ):
+        self.inputs = inputs
+        self.config = config or SimulationConfig()
+        self.waterfall = waterfall
+        self.distributions = self._resolve_distributions(inputs, distributions)
+        self.result: Optional[SimulationResult] = None
+
+    @staticmethod
+    def _resolve_distributions(
+        inputs: SimulationInputs,
+        distributions: Mapping[str, DistributionSpec],
+    ) -> Dict[SimulationVariable, AssumptionDistribution]:
+        resolved = {}
+        for name, spec in (distributions or {}).items():
+            try:
+                variable = SimulationVariable(name)
+            except ValueError:
+                raise ValueError(f"Unknown simulation assumption: {name}")
+            if variable not in inputs.supported_variables:
+                supported = ', '.join(v.value for v in inputs.supported_variables)
+                raise ValueError(
+                    f"{variable.value} does not apply to this project type (supported: {supported})"
+                )
+            if not isinstance(spec, AssumptionDistribution):
+                spec = AssumptionDistribution.from_dict(spec)
+            resolved[variable] = spec
+        return resolved
+
+    def run(
+        self,
+        progress_callback: Optional[Callable[[SimulationProgress], None]] = None,
+    ) -> SimulationResult:
+        """Run to completion (or early stop) and return the result."""
+        for progress in self.iter_progress():
+            if progress_callback is not None:
+                progress_callback(progress)
+        return self.result
+
+    def iter_progress(self) -> Iterator[SimulationProgress]:
+        """Yield a SimulationProgress per batch; ``self.result`` is set when exhausted."""
+        config = self.config
+        started = time.perf_counter()
+        seed_sequence = np.random.SeedSequence(config.seed)
+        batch_sizes = _batch_sizes(config.draws, config.batch_size)
+        batch_seeds = seed_sequence.spawn(len(batch_sizes))
+        jobs = list(zip(batch_seeds, batch_sizes))
+
+        collected: List[Dict[str, np.ndarray]] = []
+        previous_bands = None
+        stable_batches = 0
+        stopped_early = False
+        completed = 0
+
+        batches = self._evaluate_batches(jobs)
+        try:
+            for batch in batches:
+                collected.append(batch)
+                completed += len(next(iter(batch.values())))
+                samples = _concatenate(collected)
+                bands = _percentile_bands(samples, config.percentiles)
+
+                shift = None
+                if previous_bands is not None:
+                    shift = _max_shift(previous_bands, bands, CONVERGENCE_METRICS)
+                    if shift is not None and shift <= config.tolerance:
+                        stable_batches += 1
+                    else:
+                        stable_batches = 0
+                previous_bands = bands
+
+                converged = (
+                    config.early_stopping
+                    and completed >= config.min_draws
+                    and stable_batches >= config.patience
+                )
+                yield SimulationProgress(
+                    completed=completed,
+                    total=config.draws,
+                    bands=bands,
+                    max_shift=shift,
+                    converged=converged,
+                    elapsed_seconds=time.perf_counter() - started,
+                )
+                if converged:
+                    stopped_early = completed < config.draws
+                    break
+        finally:
+            batches.close()
+
+        samples = _concatenate(collected)
+        assumption_samples = {
+            key[len('assumption:'):]: samples.pop(key)
+            for key in list(samples) if key.startswith('assumption:')
+        }
+        self.result = SimulationResult(
+            bands=_percentile_bands(samples, config.percentiles),
+            samples=samples,
+            assumptions=assumption_samples,
+            draws_completed=completed,
+            draws_requested=config.draws,
+            stopped_early=stopped_early,
+            seed=seed_sequence.entropy,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+    def _evaluate_batches(self, jobs) -> Iterator[Dict[str, np.ndarray]]:
+        """Evaluate jobs in order, in-process or across a bounded pool window."""
+        workers = self.config.max_workers or os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+        state = (self.inputs, self.distributions, self.waterfall)
+
+        if workers <= 1:
+            for seed, size in jobs:
+                yield _evaluate_batch(state, seed, size)
+            return
+
+        # spawn keeps workers clear of the parent's DB connections and threads
+        context = multiprocessing.get_context('spawn')
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=state,
+        )
+        try:
+            pending = deque()
+            queue = iter(jobs)
+            # Keep a couple of batches per worker in flight so an early stop
+            # wastes little work
+            for seed, size in _take(queue, workers * 2):
+                pending.append(executor.submit(_evaluate_worker_batch, seed, size))
+            while pending:
+                batch = pending.popleft().result()
+                for seed, size in _take(queue, 1):
+                    pending.append(executor.submit(_evaluate_worker_batch, seed, size))
+                yield batch
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ============================================================================
+# BATCH EVALUATION
+# ============================================================================
+
+_WORKER_STATE: Optional[Tuple[Any, Any, Any]] = None
+
+
+def _init_worker(inputs, distributions, waterfall) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (inputs, distributions, waterfall)
+
+
+def _evaluate_worker_batch(seed: np.random.SeedSequence, size: int) -> Dict[str, np.ndarray]:
+    return _evaluate_batch(_WORKER_STATE, seed, size)
+
+
+def _evaluate_batch(state, seed: np.random.SeedSequence, size: int) -> Dict[str, np.ndarray]:
+    """Sample one batch of assumptions and compute every metric."""
+    inputs, distributions, waterfall = state
+    rng = np.random.default_rng(seed)
+
+    draws = {}
+    for variable, base_value in inputs.base_values().items():
+        distribution = distributions.get(variable)
+        if distribution is None:
+            draws[variable] = np.full(size, base_value)
+        else:
+            draws[variable] = distribution.sample(rng, size)
+
+    flows = inputs.cash_flows(draws)
+    cash_in = np.where(flows > 0, flows, 0.0).sum(axis=1)
+    cash_out = -np.where(flows < 0, flows, 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        equity_multiple = np.where(cash_out > 0, cash_in / cash_out, np.nan)
+
+    metrics = {
+        'irr': inputs.irr(flows),
+        'npv': inputs.npv(flows),
+        'equity_multiple': equity_multiple,
+        'peak_equity': np.maximum(-np.cumsum(flows, axis=1).min(axis=1), 0.0),
+    }
+
+    if waterfall is not None:
+        from financial_engine.waterfall.fast import FastWaterfallEngine
+
+        tiers, settings = waterfall
+        result = FastWaterfallEngine(
+            tiers, settings, inputs.flow_dates(flows.shape[1]), flows
+        ).calculate()
+        metrics.update({
+            'lp_irr': result.lp_irr,
+            'gp_irr': result.gp_irr,
+            'lp_equity_multiple': result.lp_emx,
+            'gp_equity_multiple': result.gp_emx,
+        })
+
+    for variable, values in draws.items():
+        if variable in distributions:
+            metrics[f'assumption:{variable.value}'] = values
+    return metrics
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _batch_sizes(draws: int, batch_size: int) -> List[int]:
+    full, remainder = divmod(draws, batch_size)
+    return [batch_size] * full + ([remainder] if remainder else [])
+
+
+def _take(iterator, count: int):
+    for _ in range(count):
+        try:
+            yield next(iterator)
+        except StopIteration:
+            return
+
+
+def _concatenate(batches: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    if not batches:
+        return {}
+    return {key: np.concatenate([b[key] for b in batches]) for key in batches[0]}
+
+
+def _percentile_bands(
+    samples: Mapping[str, np.ndarray],
+    percentiles: Sequence[float],
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """Percentiles, mean and std per metric, ignoring NaN (no IRR) draws."""
+    bands = {}
+    for metric, values in samples.items():
+        if metric.startswith('assumption:'):
+            continue
+        finite = values[np.isfinite(values)]
+        band = {}
+        if finite.size:
+            points = np.percentile(finite, percentiles)
+            for p, v in zip(percentiles, points):
+                band[_percentile_key(p)] = float(v)
+            band['mean'] = float(finite.mean())
+            band['std'] = float(finite.std())
+        else:
+            for p in percentiles:
+                band[_percentile_key(p)] = None
+            band['mean'] = None
+            band['std'] = None
+        band['defined'] = int(finite.size)
+        band['count'] = int(values.size)
+        bands[metric] = band
+    return bands
+
+
+def _percentile_key(p: float) -> str:
+    return f"p{int(p)}" if float(p).is_integer() else f"p{p:g}"
+
+
+def _max_shift(previous, current, metrics: Sequence[str]) -> Optional[float]:
+    """Largest percentile move across metrics, scaled by each metric's P5-P95 spread."""
+    shifts = []
+    for metric in metrics:
+        before, after = previous.get(metric), current.get(metric)
+        if not before or not after:
+            continue
+        keys = [k for k in after if k.startswith('p')]
+        values_before = [before.get(k) for k in keys]
+        values_after = [after.get(k) for k in keys]
+        if None in values_before or None in values_after:
+            continue
+        spread = max(values_after) - min(values_after)
+        scale = spread if spread > 0 else max(abs(v) for v in values_after) or 1.0
+        shifts.append(
+            max(abs(a - b) for a, b in zip(values_after, values_before)) / scale
+        )
+    return max(shifts) if shifts else None
+
+
+def _nan_to_none_list(values: np.ndarray) -> List[Optional[float]]:
+    return [None if not np.isfinite(v) else float(v) for v in values]
@@ -8,6 +8,7 @@ Implements the same logic as the Excel model WaterfallADVCRE.xlsx.
 from financial_engine.waterfall.types import (
     HurdleMethod,
     ReturnOfCapital,
+    PeriodIrrMode,
     WaterfallTierConfig,
     WaterfallSettings,
     CashFlow,
@@ -31,13 +32,19 @@ from financial_engine.waterfall.formulas import (
     is_hurdle_met,
     get_tier_hurdle_rate,
 )
-from financial_engine.waterfall.irr import calculate_xirr
+from financial_engine.waterfall.irr import calculate_xirr, IncrementalXIRR
 from financial_engine.waterfall.engine import WaterfallEngine
+from financial_engine.waterfall.fast import (
+    FastWaterfallEngine,
+    FastWaterfallResult,
+    WaterfallVerification,
+)
 
 __all__ = [
     # Types
     "HurdleMethod",
     "ReturnOfCapital",
+    "PeriodIrrMode",
     "WaterfallTierConfig",
     "WaterfallSettings",
     "CashFlow",
@@ -61,6 +68,10 @@ __all__ = [
     "get_tier_hurdle_rate",
     # IRR
     "calculate_xirr",
+    "IncrementalXIRR",
     # Engine
     "WaterfallEngine",
+    "FastWaterfallEngine",
+    "FastWaterfallResult",
+    "WaterfallVerification",
 ]
@@ -15,6 +15,7 @@ from loguru import logger
 from financial_engine.waterfall.types import (
     HurdleMethod,
     ReturnOfCapital,
+    PeriodIrrMode,
     CashFlow,
     WaterfallTierConfig,
     WaterfallSettings,
@@ -94,6 +95,12 @@ class WaterfallEngine:
             partner_name='General Partner',
         )
 
+        # Each period adds at most one contribution plus one distribution per
+        # tier, so size the IRR accumulators once instead of growing them.
+        irr_capacity = len(self.cash_flows) * (len(self.tiers) + 1)
+        self.lp_state.irr_accumulator.reserve(irr_capacity)
+        self.gp_state.irr_accumulator.reserve(irr_capacity)
+
         # Results storage
         self.period_results: List[PeriodResult] = []
 
@@ -116,7 +123,7 @@ class WaterfallEngine:
         2. Calculate accruals for all tiers
         3. Distribute positive cash flows through tiers
         4. Update capital accounts
-        5. Calculate IRR/EMx
+        5. Calculate EMx, and IRR for the periods selected by settings.period_irr
 
         Returns:
             WaterfallResult with all period results and summaries
@@ -141,6 +148,7 @@ class WaterfallEngine:
                 cf,
                 prior_date,
                 cumulative_cash_flow,
+                emit_irr=self._should_emit_period_irr(i),
             )
             self.period_results.append(period_result)
 
@@ -163,11 +171,21 @@ class WaterfallEngine:
             gp_state=self.gp_state,
         )
 
+    def _should_emit_period_irr(self, index: int) -> bool:
+        """Whether the period at ``index`` reports running LP/GP IRR."""
+        mode = self.settings.period_irr
+        if mode == PeriodIrrMode.EVERY or index == len(self.cash_flows) - 1:
+            return True
+        if mode == PeriodIrrMode.EVERY_N:
+            return (index + 1) % self.settings.period_irr_interval == 0
+        return False
+
     def _process_period(
         self,
         cf: CashFlow,
         prior_date: date,
         cumulative_cash_flow: Decimal,
+        emit_irr: bool = True,
     ) -> PeriodResult:
         """Process a single period's cash flow.
 
@@ -175,6 +193,7 @@ class WaterfallEngine:
             cf: Current period cash flow
             prior_date: Previous period's date (for accrual calculation)
             cumulative_cash_flow: Running total of cash flows
+            emit_irr: Whether to solve running LP/GP IRR for this period
 
         Returns:
             PeriodResult for this period
@@ -258,8 +277,9 @@ class WaterfallEngine:
             )
 
         # Step 4: Calculate current IRR and EMx
-        lp_irr = self._calculate_partner_irr(self.lp_state)
-        gp_irr = self._calculate_partner_irr(self.gp_state)
+        if emit_irr:
+            result.lp_irr = self._calculate_partner_irr(self.lp_state)
+            result.gp_irr = self._calculate_partner_irr(self.gp_state)
         lp_emx = calculate_equity_multiple(
             self.lp_state.total_distributions,
             self.lp_state.total_contributions,
@@ -269,8 +289,6 @@ class WaterfallEngine:
             self.gp_state.total_contributions,
         )
 
-        result.lp_irr = lp_irr
-        result.gp_irr = gp_irr
         result.lp_emx = lp_emx
         result.gp_emx = gp_emx
 
@@ -314,13 +332,11 @@ class WaterfallEngine:
 
         # Update LP totals
         self.lp_state.total_contributions += lp_contrib
-        self.lp_state.cash_flow_dates.append(contrib_date)
-        self.lp_state.cash_flow_amounts.append(-lp_contrib)  # Outflow
+        self.lp_state.record_cash_flow(contrib_date, -lp_contrib)  # Outflow
 
         # Update GP totals
         self.gp_state.total_contributions += gp_contrib
-        self.gp_state.cash_flow_dates.append(contrib_date)
-        self.gp_state.cash_flow_amounts.append(-gp_contrib)  # Outflow
+        self.gp_state.record_cash_flow(contrib_date, -gp_contrib)  # Outflow
 
         if use_emx_targets:
             # EMx mode: Set capital accounts to contribution * EMx threshold
@@ -633,26 +649,25 @@ class WaterfallEngine:
             tier_attr = f'tier{tier_number}_distributions'
             current = getattr(self.lp_state, tier_attr)
             setattr(self.lp_state, tier_attr, current + lp_dist)
-            self.lp_state.cash_flow_dates.append(dist_date)
-            self.lp_state.cash_flow_amounts.append(lp_dist)  # Inflow
+            self.lp_state.record_cash_flow(dist_date, lp_dist)  # Inflow
 
         if gp_dist > ZERO:
             self.gp_state.total_distributions += gp_dist
             tier_attr = f'tier{tier_number}_distributions'
             current = getattr(self.gp_state, tier_attr)
             setattr(self.gp_state, tier_attr, current + gp_dist)
-            self.gp_state.cash_flow_dates.append(dist_date)
-            self.gp_state.cash_flow_amounts.append(gp_dist)  # Inflow
+            self.gp_state.record_cash_flow(dist_date, gp_dist)  # Inflow
 
     def _calculate_partner_irr(self, partner: PartnerState) -> Optional[Decimal]:
-        """Calculate IRR for a partner's cash flows."""
+        """Calculate IRR for a partner's cash flows.
+
+        Uses the partner's incremental accumulator, which warm-starts from the
+        previous solve and caches the result until another flow is recorded.
+        """
         if len(partner.cash_flow_dates) < 2:
             return None
 
-        return calculate_xirr(
-            partner.cash_flow_dates,
-            partner.cash_flow_amounts,
-        )
+        return partner.irr_accumulator.solve()
 
     def _build_partner_summary(self, partner: PartnerState) -> PartnerSummary:
         """Build summary for a partner."""
@@ -0,0 +1,547 @@
+"""
+Float64 Waterfall Engine
+
+Runs the WaterfallEngine tier logic on float64 numpy arrays instead of
+Decimal. State is held as (scenarios x tiers x partners) arrays and every
+period is processed for all scenarios at once, so a sensitivity grid or
+Monte Carlo batch costs one pass over the periods rather than one Decimal
+engine run per scenario.
+
+Decimal (WaterfallEngine) remains the engine of record for reports. This
+path is for what-if, sensitivity and Monte Carlo callers; use
+``calculate(verify=True)`` to run both and measure the cent-level drift.
+
+Array layout:
+- scenarios (S) x periods (N) for cash flows
+- tier axis has 5 slots (tier_number - 1); unused tiers stay zero
+- partner axis is [LP, GP]
+
+Example:
+    >>> engine = FastWaterfallEngine.from_cash_flows(tiers, settings, cash_flows)
+    >>> result = engine.calculate(verify=True)
+    >>> result.lp_irr[0], result.verification.max_cents
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from financial_engine.core.irr_batch import calculate_xirr_batch
+from financial_engine.waterfall.types import (
+    HurdleMethod,
+    ReturnOfCapital,
+    PeriodIrrMode,
+    CashFlow,
+    WaterfallTierConfig,
+    WaterfallSettings,
+    WaterfallResult,
+)
+from financial_engine.waterfall.formulas import (
+    HUNDRED,
+    get_tier_hurdle_rate,
+    normalize_tier,
+)
+from financial_engine.waterfall.engine import WaterfallEngine
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+LP = 0
+GP = 1
+MAX_TIERS = 5
+DAYS_IN_YEAR = 365.0
+
+# PeriodResult fields compared in verification mode, with the fast-result
+# accessor (array name, tier index, partner index) for each
+_VERIFY_FIELDS = {
+    'lp_contribution': ('contributions', None, LP),
+    'gp_contribution': ('contributions', None, GP),
+    'accrued_pref_lp': ('accruals', 0, LP),
+    'accrued_pref_gp': ('accruals', 0, GP),
+    'accrued_hurdle2_lp': ('accruals', 1, LP),
+    'accrued_hurdle3_lp': ('accruals', 2, LP),
+    'accrued_hurdle4_lp': ('accruals', 3, LP),
+    'accrued_hurdle5_lp': ('accruals', 4, LP),
+    'tier1_lp_dist': ('distributions', 0, LP),
+    'tier1_gp_dist': ('distributions', 0, GP),
+    'tier2_lp_dist': ('distributions', 1, LP),
+    'tier2_gp_dist': ('distributions', 1, GP),
+    'tier3_lp_dist': ('distributions', 2, LP),
+    'tier3_gp_dist': ('distributions', 2, GP),
+    'tier4_lp_dist': ('distributions', 3, LP),
+    'tier4_gp_dist': ('distributions', 3, GP),
+    'tier5_lp_dist': ('distributions', 4, LP),
+    'tier5_gp_dist': ('distributions', 4, GP),
+    'lp_capital_tier1': ('capital_accounts', 0, LP),
+    'gp_capital_tier1': ('capital_accounts', 0, GP),
+    'lp_capital_tier2': ('capital_accounts', 1, LP),
+    'cumulative_accrued_pref': ('cumulative_accrued_pref', None, None),
+    'cumulative_accrued_hurdle': ('cumulative_accrued_hurdle', None, None),
+}
+
+
+# ============================================================================
+# RESULT TYPES
+# ============================================================================
+
+@dataclass
+class WaterfallVerification:
+    """Divergence between the float64 and Decimal engines.
+
+    Attributes:
+        period_ids: Period identifiers (N)
+        max_divergence_cents: Largest absolute difference over all compared
+            line items, in cents, per scenario and period (S x N)
+        worst_item: Name of the line item with the largest divergence in each
+            period of each scenario
+        irr_divergence: Absolute LP/GP final IRR difference (S x 2)
+    """
+    period_ids: np.ndarray
+    max_divergence_cents: np.ndarray
+    worst_item: List[List[str]]
+    irr_divergence: np.ndarray
+
+    @property
+    def max_cents(self) -> float:
+        """Largest divergence in cents across all scenarios and periods."""
+        if self.max_divergence_cents.size == 0:
+            return 0.0
+        return float(self.max_divergence_cents.max())
+
+    def within(self, cents: float = 1.0) -> bool:
+        """True if every line item agrees to within ``cents``."""
+        return self.max_cents <= cents
+
+
+@dataclass
+class FastWaterfallResult:
+    """Float64 waterfall result for one or more scenarios.
+
+    Per-period arrays carry a leading scenario axis even for a single run.
+    IRRs are NaN where a partner has no sign change (the Decimal engine
+    reports those as zero).
+    """
+    period_ids: np.ndarray                 # (N,)
+    dates: np.ndarray                      # (N,) datetime64[D]
+    net_cash_flow: np.ndarray              # (S, N)
+    contributions: np.ndarray              # (S, N, partners)
+    accruals: np.ndarray                   # (S, N, tiers, partners)
+    distributions: np.ndarray              # (S, N, tiers, partners)
+    capital_accounts: np.ndarray           # (S, N, tiers, partners), end of period
+    cumulative_accrued_pref: np.ndarray    # (S, N)
+    cumulative_accrued_hurdle: np.ndarray  # (S, N)
+    lp_irr: np.ndarray                     # (S,)
+    gp_irr: np.ndarray                     # (S,)
+    project_irr: np.ndarray                # (S,)
+    lp_emx: np.ndarray                     # (S,)
+    gp_emx: np.ndarray                     # (S,)
+    project_emx: np.ndarray                # (S,)
+    verification: Optional[WaterfallVerification] = None
+
+    @property
+    def total_contributions(self) -> np.ndarray:
+        """Total contributions per scenario and partner (S x 2)."""
+        return self.contributions.sum(axis=1)
+
+    @property
+    def total_distributions(self) -> np.ndarray:
+        """Total distributions per scenario and partner (S x 2)."""
+        return np.where(self.distributions > 0, self.distributions, 0.0).sum(axis=(1, 2))
+
+    @property
+    def tier_distributions(self) -> np.ndarray:
+        """Cumulative distributions per scenario, tier and partner (S x 5 x 2)."""
+        return np.where(self.distributions > 0, self.distributions, 0.0).sum(axis=1)
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class FastWaterfallEngine:
+    """Float64, multi-scenario counterpart of WaterfallEngine.
+
+    Applies the same contribution, accrual, tier distribution and capital
+    account rules (including cent rounding at the same steps), vectorized
+    across scenarios that share dates, tiers and settings.
+
+    Example:
+        >>> amounts = np.vstack([base_amounts * s for s in (0.9, 1.0, 1.1)])
+        >>> engine = FastWaterfallEngine(tiers, settings, dates, amounts)
+        >>> result = engine.calculate()
+        >>> result.lp_irr
+        array([0.118, 0.142, 0.163])
+    """
+
+    def __init__(
+        self,
+        tiers: List[WaterfallTierConfig],
+        settings: WaterfallSettings,
+        dates: Sequence[date],
+        amounts: Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]],
+        period_ids: Optional[Sequence[int]] = None,
+    ):
+        """Initialize the float64 engine.
+
+        Args:
+            tiers: List of tier configurations (1-5)
+            settings: Global waterfall settings
+            dates: Period dates (N), shared by every scenario
+            amounts: Period cash flows, (N,) for one scenario or (S, N)
+            period_ids: Period identifiers; defaults to 1..N
+        """
+        amounts = np.array(amounts, dtype=np.float64)
+        if amounts.ndim == 1:
+            amounts = amounts[None, :]
+        dates = np.array(dates, dtype='datetime64[D]')
+        if amounts.ndim != 2 or amounts.shape[1] != dates.shape[0]:
+            raise ValueError(
+                f"amounts shape {amounts.shape} does not match {dates.shape[0]} dates"
+            )
+        if period_ids is None:
+            period_ids = np.arange(1, dates.shape[0] + 1)
+        period_ids = np.asarray(period_ids)
+
+        # Match WaterfallEngine's date ordering
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+        self.amounts = amounts[:, order]
+        self.period_ids = period_ids[order]
+
+        self.tiers = [normalize_tier(t) for t in sorted(tiers, key=lambda x: x.tier_number)]
+        self.settings = settings
+        self._source_cash_flows: Optional[List[CashFlow]] = None
+
+    @classmethod
+    def from_cash_flows(
+        cls,
+        tiers: List[WaterfallTierConfig],
+        settings: WaterfallSettings,
+        cash_flows: List[CashFlow],
+    ) -> 'FastWaterfallEngine':
+        """Build a single-scenario engine from the Decimal engine's inputs."""
+        engine = cls(
+            tiers,
+            settings,
+            [cf.date for cf in cash_flows],
+            [float(cf.amount) for cf in cash_flows],
+            [cf.period_id for cf in cash_flows],
+        )
+        engine._source_cash_flows = list(cash_flows)
+        return engine
+
+    @property
+    def scenario_count(self) -> int:
+        return self.amounts.shape[0]
+
+    def calculate(self, verify: bool = False) -> FastWaterfallResult:
+        """Run the waterfall for every scenario.
+
+        Args:
+            verify: Also run the Decimal engine on each scenario and attach a
+                WaterfallVerification with the per-period cent divergence
+
+        Returns:
+            FastWaterfallResult
+        """
+        scenarios, periods = self.amounts.shape
+        settings = self.settings
+        lp_ownership = float(settings.lp_ownership)
+        use_emx_targets = settings.hurdle_method == HurdleMethod.EMX
+        active_tiers = [t for t in self.tiers if t.tier_number <= settings.num_tiers]
+        tier_rates = {
+            t.tier_number: float(get_tier_hurdle_rate(t, settings.hurdle_method))
+            for t in active_tiers
+        }
+
+        contributions = np.zeros((scenarios, periods, 2))
+        accruals = np.zeros((scenarios, periods, MAX_TIERS, 2))
+        distributions = np.zeros((scenarios, periods, MAX_TIERS, 2))
+        capital_history = np.zeros((scenarios, periods, MAX_TIERS, 2))
+        accrued_pref_history = np.zeros((scenarios, periods))
+        accrued_hurdle_history = np.zeros((scenarios, periods))
+
+        capital = np.zeros((scenarios, MAX_TIERS, 2))
+        accrued_pref = np.zeros(scenarios)
+        accrued_hurdle = np.zeros(scenarios)
+
+        day_gaps = np.diff(self.dates).astype(np.float64)
+
+        for i in range(periods):
+            amount = self.amounts[:, i]
+            is_first_period = self.period_ids[i] == 1
+
+            # First period: contribution before accrual (matches Excel)
+            if is_first_period:
+                contributions[:, i] = self._contribute(
+                    capital, amount, lp_ownership, use_emx_targets
+                )
+
+            # Step 1: Accruals (IRR / IRR_EMx only)
+            days = day_gaps[i - 1] if i > 0 else 0.0
+            if not use_emx_targets and days > 0:
+                for tier in active_tiers:
+                    rate = tier_rates[tier.tier_number]
+                    if rate <= 0:
+                        continue
+                    t = tier.tier_number - 1
+                    growth = (1.0 + rate) ** (days / DAYS_IN_YEAR) - 1.0
+                    partners = slice(LP, GP + 1) if t == 0 else slice(LP, LP + 1)
+                    balance = capital[:, t, partners]
+                    accrual = np.where(balance > 0, _round_cents(balance * growth), 0.0)
+                    accruals[:, i, t, partners] = accrual
+                    capital[:, t, partners] += accrual
+
+            accrued_pref += accruals[:, i, 0, LP] + accruals[:, i, 0, GP]
+            accrued_hurdle += accruals[:, i, 1, LP]
+
+            # Step 2: Contributions for later periods
+            if not is_first_period:
+                contributions[:, i] = self._contribute(
+                    capital, amount, lp_ownership, use_emx_targets
+                )
+
+            # Step 3: Distribute positive cash flows through the tiers
+            remaining = np.where(amount > 0, amount, 0.0)
+            for tier in active_tiers:
+                t = tier.tier_number - 1
+                active = remaining > 0
+                if not active.any():
+                    break
+                lp_split = float(tier.lp_split_pct / HUNDRED)
+                gp_split = float(tier.gp_split_pct / HUNDRED)
+
+                if t == 0:
+                    lp_dist, gp_dist, left = self._tier1(
+                        remaining, capital[:, 0, LP], capital[:, 0, GP], lp_split, gp_split
+                    )
+                elif tier.tier_number == settings.num_tiers:
+                    lp_dist = _round_cents(remaining * lp_split)
+                    gp_dist = _round_cents(remaining * gp_split)
+                    left = np.zeros(scenarios)
+                else:
+                    lp_dist = np.minimum(np.maximum(capital[:, t, LP], 0.0), remaining * lp_split)
+                    if lp_split > 0:
+                        gp_dist = np.where(lp_dist > 0, lp_dist / lp_split * gp_split, 0.0)
+                    else:
+                        gp_dist = np.zeros(scenarios)
+                    left = np.maximum(remaining - lp_dist - gp_dist, 0.0)
+                    lp_dist, gp_dist, left = (
+                        _round_cents(lp_dist), _round_cents(gp_dist), _round_cents(left)
+                    )
+
+                lp_dist = np.where(active, lp_dist, 0.0)
+                gp_dist = np.where(active, gp_dist, 0.0)
+                remaining = np.where(active, left, remaining)
+                distributions[:, i, t, LP] = lp_dist
+                distributions[:, i, t, GP] = gp_dist
+
+                # Capital accounts: this tier, and LP "prior distributions"
+                # for every later tier (residual tier only reduces itself)
+                capital[:, t, LP] -= lp_dist
+                if t == 0:
+                    capital[:, 0, GP] -= gp_dist
+                if tier.tier_number != settings.num_tiers or t == 0:
+                    capital[:, t + 1:, LP] -= lp_dist[:, None]
+
+            # Step 4: Pay down cumulative accrued pref / hurdle
+            tier1_total = distributions[:, i, 0].sum(axis=1)
+            accrued_pref = np.where(
+                tier1_total > 0,
+                np.maximum(accrued_pref - np.minimum(tier1_total, accrued_pref), 0.0),
+                accrued_pref,
+            )
+            tier2_total = distributions[:, i, 1].sum(axis=1)
+            accrued_hurdle = np.where(
+                tier2_total > 0,
+                np.maximum(accrued_hurdle - np.minimum(tier2_total, accrued_hurdle), 0.0),
+                accrued_hurdle,
+            )
+
+            capital_history[:, i] = capital
+            accrued_pref_history[:, i] = accrued_pref
+            accrued_hurdle_history[:, i] = accrued_hurdle
+
+        # Partner cash flows: contributions out, positive distributions in
+        received = np.where(distributions > 0, distributions, 0.0).sum(axis=2)
+        partner_flows = received - contributions
+        lp_irr = calculate_xirr_batch(self.dates, partner_flows[:, :, LP])
+        gp_irr = calculate_xirr_batch(self.dates, partner_flows[:, :, GP])
+        project_irr = calculate_xirr_batch(self.dates, self.amounts)
+
+        total_contributions = contributions.sum(axis=1)
+        total_received = received.sum(axis=1)
+
+        result = FastWaterfallResult(
+            period_ids=self.period_ids,
+            dates=self.dates,
+            net_cash_flow=self.amounts,
+            contributions=contributions,
+            accruals=accruals,
+            distributions=distributions,
+            capital_accounts=capital_history,
+            cumulative_accrued_pref=accrued_pref_history,
+            cumulative_accrued_hurdle=accrued_hurdle_history,
+            lp_irr=lp_irr,
+            gp_irr=gp_irr,
+            project_irr=project_irr,
+            lp_emx=_equity_multiple(total_received[:, LP], total_contributions[:, LP]),
+            gp_emx=_equity_multiple(total_received[:, GP], total_contributions[:, GP]),
+            project_emx=_equity_multiple(
+                total_received.sum(axis=1), total_contributions.sum(axis=1)
+            ),
+        )
+
+        if verify:
+            result.verification = self._verify(result)
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Period steps
+    # ------------------------------------------------------------------
+
+    def _contribute(
+        self,
+        capital: np.ndarray,
+        amount: np.ndarray,
+        lp_ownership: float,
+        use_emx_targets: bool,
+    ) -> np.ndarray:
+        """Allocate negative cash flows to LP/GP and load capital accounts.
+
+        Returns:
+            (S x 2) contributions as positive values
+        """
+        total = np.where(amount < 0, -amount, 0.0)
+        lp_contrib = _round_cents(total * lp_ownership)
+        gp_contrib = _round_cents(total * (1.0 - lp_ownership))
+
+        if use_emx_targets:
+            for tier in self.tiers:
+                if tier.emx_hurdle is None:
+                    continue
+                emx = float(tier.emx_hurdle)
+                capital[:, tier.tier_number - 1, LP] += lp_contrib * emx
+                if tier.tier_number == 1:
+                    capital[:, 0, GP] += gp_contrib * emx
+        else:
+            capital[:, :, LP] += lp_contrib[:, None]
+            capital[:, 0, GP] += gp_contrib
+
+        return np.stack([lp_contrib, gp_contrib], axis=1)
+
+    def _tier1(
+        self,
+        cash: np.ndarray,
+        lp_capital: np.ndarray,
+        gp_capital: np.ndarray,
+        lp_split: float,
+        gp_split: float,
+    ):
+        """Tier 1 (pref + return of capital) for every scenario."""
+        settings = self.settings
+        if settings.return_of_capital == ReturnOfCapital.LP_FIRST:
+            lp_dist = np.minimum(lp_capital, cash)
+            after_lp = cash - lp_dist
+            gp_dist = np.minimum(gp_capital, after_lp)
+            remaining = after_lp - gp_dist
+        else:
+            lp_dist = np.minimum(lp_capital, cash * lp_split)
+            if settings.gp_catch_up:
+                gp_dist = np.maximum(np.minimum(cash - lp_dist, gp_capital), 0.0)
+            elif lp_split > 0:
+                gp_dist = np.where(
+                    lp_dist > 0,
+                    np.minimum(lp_dist / lp_split * gp_split, gp_capital),
+                    0.0,
+                )
+            else:
+                gp_dist = np.zeros_like(cash)
+            remaining = np.maximum(cash - lp_dist - gp_dist, 0.0)
+
+        return _round_cents(lp_dist), _round_cents(gp_dist), _round_cents(remaining)
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def _decimal_cash_flows(self, scenario: int) -> List[CashFlow]:
+        if self._source_cash_flows is not None and self.scenario_count == 1:
+            return self._source_cash_flows
+        return [
+            CashFlow(
+                period_id=int(period_id),
+                date=cf_date.item(),
+                amount=Decimal(repr(float(amount))),
+            )
+            for period_id, cf_date, amount in zip(
+                self.period_ids, self.dates, self.amounts[scenario]
+            )
+        ]
+
+    def _verify(self, result: FastWaterfallResult) -> WaterfallVerification:
+        """Run the Decimal engine per scenario and measure cent-level divergence."""
+        scenarios, periods = self.amounts.shape
+        divergence = np.zeros((scenarios, periods))
+        worst_item: List[List[str]] = []
+        irr_divergence = np.zeros((scenarios, 2))
+
+        # Period IRRs are not compared, so skip the running solves
+        decimal_settings = replace(self.settings, period_irr=PeriodIrrMode.FINAL)
+
+        for s in range(scenarios):
+            decimal_result: WaterfallResult = WaterfallEngine(
+                tiers=self.tiers,
+                settings=decimal_settings,
+                cash_flows=self._decimal_cash_flows(s),
+            ).calculate()
+
+            diffs = np.zeros((periods, len(_VERIFY_FIELDS)))
+            for i, period in enumerate(decimal_result.period_results):
+                for j, (name, (array_name, tier, partner)) in enumerate(_VERIFY_FIELDS.items()):
+                    fast_value = getattr(result, array_name)[s, i]
+                    if tier is not None:
+                        fast_value = fast_value[tier]
+                    if partner is not None:
+                        fast_value = fast_value[partner]
+                    diffs[i, j] = abs(float(fast_value) - float(getattr(period, name))) * 100
+
+            names = list(_VERIFY_FIELDS)
+            divergence[s] = diffs.max(axis=1) if periods else divergence[s]
+            worst_item.append([names[k] for k in diffs.argmax(axis=1)])
+
+            for p, (summary, fast_irr) in enumerate((
+                (decimal_result.lp_summary, result.lp_irr[s]),
+                (decimal_result.gp_summary, result.gp_irr[s]),
+            )):
+                fast_value = 0.0 if np.isnan(fast_irr) else float(fast_irr)
+                irr_divergence[s, p] = abs(fast_value - float(summary.irr))
+
+        return WaterfallVerification(
+            period_ids=self.period_ids,
+            max_divergence_cents=divergence,
+            worst_item=worst_item,
+            irr_divergence=irr_divergence,
+        )
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _round_cents(values: np.ndarray) -> np.ndarray:
+    """Round to cents, half away from zero (Decimal ROUND_HALF_UP)."""
+    return np.sign(values) * np.floor(np.abs(values) * 100.0 + 0.5) / 100.0
+
+
+def _equity_multiple(distributions: np.ndarray, contributions: np.ndarray) -> np.ndarray:
+    """Equity multiple rounded to 4 places, zero where nothing was contributed."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        multiple = np.where(contributions > 0, distributions / contributions, 0.0)
+    return np.round(multiple, 4)
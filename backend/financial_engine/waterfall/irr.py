@@ -75,6 +75,32 @@ def calculate_xirr(
         logger.warning("XIRR requires both positive and negative cash flows")
         return None
 
+    result = _solve_xirr(days_array, cf_array, guess, max_iterations)
+    if result is None:
+        return None
+    return Decimal(str(round(result, 8)))
+
+
+def _solve_xirr(
+    days_array: np.ndarray,
+    cf_array: np.ndarray,
+    guess: float = 0.10,
+    max_iterations: int = 1000,
+) -> Optional[float]:
+    """Root-find the XIRR rate for prepared float arrays.
+
+    Shared by calculate_xirr and IncrementalXIRR so both fall back to the
+    exact same brentq/newton sequence.
+
+    Args:
+        days_array: Day offsets from the first cash flow
+        cf_array: Cash flow amounts as float64
+        guess: Initial guess for the newton fallback
+        max_iterations: Maximum iterations for solver
+
+    Returns:
+        Annualized IRR as float, or None if calculation fails
+    """
     def npv_at_rate(rate: float) -> float:
         """Calculate NPV at a given rate."""
         if rate <= -1:  # Prevent division issues
@@ -91,7 +117,7 @@ def calculate_xirr(
             maxiter=max_iterations,
         )
         logger.debug(f"XIRR calculated using brentq: {result:.4%}")
-        return Decimal(str(round(result, 8)))
+        return result
 
     except ValueError:
         # Brentq failed (no sign change in interval), try newton
@@ -107,7 +133,7 @@ def calculate_xirr(
             # Validate result is reasonable
             if -1 < result < 10:
                 logger.debug(f"XIRR calculated using newton: {result:.4%}")
-                return Decimal(str(round(result, 8)))
+                return result
             else:
                 logger.warning(f"XIRR result out of bounds: {result}")
                 return None
@@ -121,6 +147,178 @@ def calculate_xirr(
         return None
 
 
+# ============================================================================
+# INCREMENTAL XIRR
+# ============================================================================
+
+class IncrementalXIRR:
+    """Running XIRR over a cash-flow history that only ever grows.
+
+    The waterfall engine asks for each partner's IRR after every period.
+    Re-running calculate_xirr on the full history each time rebuilds the
+    arrays from Decimals and restarts brentq from the full [-99%, 1000%]
+    bracket, which is O(n^2) over the life of the waterfall. This
+    accumulator keeps day offsets and float flows in preallocated numpy
+    arrays and warm-starts Newton from the previous solution.
+
+    Newton is safeguarded by the same [-99%, 1000%] bracket brentq uses: a
+    step that leaves the current sign-change bracket becomes a bisection, so
+    the solve always lands on a root inside it. When the bracket ends have
+    the same sign (brentq would raise), or dates arrive out of order, the
+    solve falls back to the exact brentq/newton sequence of calculate_xirr.
+    For histories with a single root in the bracket the two agree to the
+    8-place rounding; with several roots both return a valid XIRR but may
+    pick different ones.
+
+    Example:
+        >>> acc = IncrementalXIRR()
+        >>> acc.append(date(2024, 1, 1), Decimal('-10000000'))
+        >>> acc.append(date(2024, 12, 31), Decimal('500000'))
+        >>> acc.append(date(2025, 12, 31), Decimal('12000000'))
+        >>> f"{float(acc.solve()):.2%}"
+        '12.07%'
+    """
+
+    LOWER_BOUND = -0.99
+    UPPER_BOUND = 10.0
+    TOLERANCE = 1e-12
+    MAX_ITERATIONS = 100
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(int(capacity), 2)
+        self._days = np.empty(capacity, dtype=np.float64)
+        self._flows = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        self._origin: Optional[date] = None
+        self._last_day = 0.0
+        self._ordered = True
+        self._has_negative = False
+        self._has_positive = False
+
+        self._last_rate: Optional[float] = None
+        self._cached_size = -1
+        self._cached_result: Optional[Decimal] = None
+
+        # Solver statistics (useful when profiling long waterfalls)
+        self.solves = 0
+        self.iterations = 0
+        self.fallbacks = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the backing arrays to hold at least ``capacity`` flows."""
+        if capacity <= len(self._days):
+            return
+        days = np.empty(capacity, dtype=np.float64)
+        flows = np.empty(capacity, dtype=np.float64)
+        days[:self._size] = self._days[:self._size]
+        flows[:self._size] = self._flows[:self._size]
+        self._days = days
+        self._flows = flows
+
+    def append(self, cf_date: date, amount: Decimal) -> None:
+        """Record one cash flow (negative = outflow, positive = inflow)."""
+        if self._size == len(self._days):
+            self.reserve(2 * len(self._days))
+
+        if self._origin is None:
+            self._origin = cf_date
+        day = float((cf_date - self._origin).days)
+        if day < self._last_day:
+            self._ordered = False
+        self._last_day = max(self._last_day, day)
+
+        value = float(amount)
+        self._days[self._size] = day
+        self._flows[self._size] = value
+        self._size += 1
+
+        if value < 0:
+            self._has_negative = True
+        elif value > 0:
+            self._has_positive = True
+
+    def solve(self) -> Optional[Decimal]:
+        """Return the XIRR of all flows appended so far.
+
+        Returns:
+            Annualized IRR as Decimal rounded to 8 places, or None when there
+            are fewer than 2 flows, no sign change, or the solver fails.
+        """
+        if self._size == self._cached_size:
+            return self._cached_result
+
+        result: Optional[Decimal] = None
+        if self._size >= 2 and self._has_negative and self._has_positive:
+            self.solves += 1
+            days = self._days[:self._size]
+            flows = self._flows[:self._size]
+
+            rate = None
+            if self._ordered:
+                rate = self._bracketed_newton(days / 365.0, flows)
+            if rate is None:
+                self.fallbacks += 1
+                rate = _solve_xirr(days, flows)
+
+            if rate is not None:
+                self._last_rate = rate
+                result = Decimal(str(round(rate, 8)))
+
+        self._cached_size = self._size
+        self._cached_result = result
+        return result
+
+    def _bracketed_newton(self, years: np.ndarray, flows: np.ndarray) -> Optional[float]:
+        """Warm-started Newton with bisection safeguard; None means no bracket."""
+
+        def npv_and_slope(rate: float) -> Tuple[float, float]:
+            discounted = flows * np.exp(-years * np.log1p(rate))
+            return discounted.sum(), -(years * discounted).sum() / (1.0 + rate)
+
+        lo, hi = self.LOWER_BOUND, self.UPPER_BOUND
+        f_lo, _ = npv_and_slope(lo)
+        f_hi, _ = npv_and_slope(hi)
+        if f_lo == 0.0:
+            return lo
+        if f_hi == 0.0:
+            return hi
+        if np.sign(f_lo) == np.sign(f_hi) or not np.isfinite(f_lo):
+            return None
+
+        rate = self._last_rate if self._last_rate is not None else 0.10
+        if not lo < rate < hi:
+            rate = 0.5 * (lo + hi)
+
+        for _ in range(self.MAX_ITERATIONS):
+            self.iterations += 1
+            npv, slope = npv_and_slope(rate)
+            if npv == 0.0:
+                return float(rate)
+
+            # Shrink the bracket around the sign change
+            if np.sign(npv) == np.sign(f_lo):
+                lo, f_lo = rate, npv
+            else:
+                hi = rate
+
+            if slope != 0.0 and np.isfinite(slope):
+                candidate = rate - npv / slope
+            else:
+                candidate = lo - 1.0  # force bisection
+            if not lo < candidate < hi:
+                candidate = 0.5 * (lo + hi)
+
+            step = candidate - rate
+            rate = candidate
+            if abs(step) <= self.TOLERANCE * (1.0 + abs(rate)):
+                return float(rate)
+
+        return None
+
+
 def calculate_xirr_safe(
     dates: List[date],
     cash_flows: List[Decimal],
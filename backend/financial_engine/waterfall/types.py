@@ -13,6 +13,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional, List
 
+from financial_engine.waterfall.irr import IncrementalXIRR
+
 
 # ============================================================================
 # ENUMS
@@ -31,6 +33,13 @@ class ReturnOfCapital(str, Enum):
     PARI_PASSU = "Pari Passu"
 
 
+class PeriodIrrMode(str, Enum):
+    """Which periods report running LP/GP IRR in PeriodResult."""
+    FINAL = "final"
+    EVERY = "every"
+    EVERY_N = "every_n"
+
+
 # ============================================================================
 # INPUT TYPES
 # ============================================================================
@@ -107,6 +116,8 @@ class WaterfallSettings:
         gp_catch_up: Whether GP catches up in Tier 1
         lp_ownership: LP ownership percentage as decimal (e.g., Decimal('0.90') for 90%)
         preferred_return_pct: LP preferred return rate as percentage
+        period_irr: Which periods get running IRR (final, every, or every_n)
+        period_irr_interval: Period spacing for every_n (final period always reported)
     """
     hurdle_method: HurdleMethod = HurdleMethod.IRR
     num_tiers: int = 3
@@ -114,12 +125,18 @@ class WaterfallSettings:
     gp_catch_up: bool = True
     lp_ownership: Decimal = Decimal('0.90')
     preferred_return_pct: Decimal = Decimal('8')
+    period_irr: PeriodIrrMode = PeriodIrrMode.EVERY
+    period_irr_interval: int = 12
 
     def __post_init__(self):
         if not isinstance(self.lp_ownership, Decimal):
             self.lp_ownership = Decimal(str(self.lp_ownership))
         if not isinstance(self.preferred_return_pct, Decimal):
             self.preferred_return_pct = Decimal(str(self.preferred_return_pct))
+        if not isinstance(self.period_irr, PeriodIrrMode):
+            self.period_irr = PeriodIrrMode(self.period_irr)
+        if self.period_irr_interval < 1:
+            raise ValueError("period_irr_interval must be at least 1")
 
 
 # ============================================================================
@@ -179,6 +196,13 @@ class PartnerState:
     # IRR/EMx tracking
     cash_flow_dates: List[date] = field(default_factory=list)
     cash_flow_amounts: List[Decimal] = field(default_factory=list)
+    irr_accumulator: IncrementalXIRR = field(default_factory=IncrementalXIRR, repr=False)
+
+    def record_cash_flow(self, cf_date: date, amount: Decimal) -> None:
+        """Append a partner cash flow (negative = contribution, positive = distribution)."""
+        self.cash_flow_dates.append(cf_date)
+        self.cash_flow_amounts.append(amount)
+        self.irr_accumulator.append(cf_date, amount)
 
 
 # ============================================================================
@@ -10,14 +10,14 @@ from .pdf_rent_roll_extractor import PDFRentRollExtractor
 import json
 from datetime import datetime
 from django.utils import timezone
-import tempfile
-import requests
+from apps.knowledge.services.blob_cache import checkout_document
 import os
 
 
-def _download_remote_file(url: str, doc_name: str) -> Optional[str]:
+def _download_remote_file(url: str, doc_name: str, doc_id: Optional[int] = None,
+                          content_hash: Optional[str] = None) -> Optional[str]:
     """
-    Download a remote file to a temporary location.
+    Download a remote file to a temporary location (via the shared blob cache).
     Returns the local file path or None if download fails.
     """
     try:
@@ -27,19 +27,8 @@ def _download_remote_file(url: str, doc_name: str) -> Optional[str]:
             # Try to guess from URL or default to .tmp
             ext = '.tmp'
 
-        # Create temp file with appropriate extension
-        temp_fd, temp_path = tempfile.mkstemp(suffix=ext)
-        os.close(temp_fd)
-
-        print(f"Downloading {url} to {temp_path}")
-
-        response = requests.get(url, timeout=60)
-        response.raise_for_status()
-
-        with open(temp_path, 'wb') as f:
-            f.write(response.content)
-
-        print(f"Downloaded {len(response.content)} bytes")
+        temp_path = checkout_document(url, doc_id=doc_id, content_hash=content_hash, suffix=ext)
+        print(f"Downloaded {url} to {temp_path} ({os.path.getsize(temp_path)} bytes)")
         return temp_path
 
     except Exception as e:
@@ -123,7 +112,9 @@ def process_extraction_queue():
 
             if is_remote:
                 # Download remote file to temp location
-                temp_file_path = _download_remote_file(storage_uri, doc.doc_name)
+                temp_file_path = _download_remote_file(
+                    storage_uri, doc.doc_name, doc.doc_id, doc.sha256_hash
+                )
                 if not temp_file_path:
                     raise Exception(f"Failed to download file from {storage_uri}")
                 file_path = temp_file_path
@@ -0,0 +1,252 @@
+"""
+Cash Flow Engine Tests
+
+Checks the interval-indexed lease revenue kernel against a straightforward
+per-lease, per-period reference, and the assembled period results.
+"""
+
+import numpy as np
+import pytest
+from datetime import date
+
+from financial_engine.core.cashflow import CashFlowColumns, CashFlowEngine
+from financial_engine.models import (
+    PropertyData,
+    LeaseData,
+    BaseRentSchedule,
+    ExpenseRecovery,
+    OperatingExpenses,
+    CapitalItems,
+    CashFlowPeriod,
+    PercentageRent,
+)
+
+
+def _lease(lease_id, steps, structure="Gross", cap_psf=None, sf=5_000):
+    return LeaseData(
+        lease_id=lease_id,
+        space_id=lease_id,
+        tenant_id=lease_id,
+        tenant_name=f"Tenant {lease_id}",
+        lease_type="NNN" if structure == "NNN" else "Gross",
+        lease_status="Active",
+        lease_commencement_date=steps[0][0],
+        lease_expiration_date=steps[-1][1],
+        leased_sf=sf,
+        base_rent=[
+            BaseRentSchedule(
+                period_start_date=start,
+                period_end_date=end,
+                base_rent_annual=monthly * 12,
+                base_rent_monthly=monthly,
+                base_rent_psf_annual=monthly * 12 / sf,
+            )
+            for start, end, monthly in steps
+        ],
+        expense_recovery=ExpenseRecovery(
+            recovery_structure=structure,
+            property_tax_recovery_pct=1.0,
+            insurance_recovery_pct=0.5,
+            cam_recovery_pct=1.0,
+            expense_cap_psf=cap_psf,
+        ),
+    )
+
+
+def _reference_rent(leases, period_dates):
+    """First matching rent step per lease and period (the original loop)."""
+    expected = np.zeros((len(period_dates), len(leases)))
+    for j, lease in enumerate(leases):
+        for i, period_date in enumerate(period_dates):
+            for step in lease.base_rent:
+                if step.period_start_date <= period_date.date() <= step.period_end_date:
+                    expected[i, j] = step.base_rent_monthly
+                    break
+    return expected
+
+
+@pytest.fixture
+def rent_roll():
+    rng = np.random.default_rng(5)
+    leases = []
+    for lease_id in range(1, 41):
+        year = int(rng.integers(2023, 2027))
+        month = int(rng.integers(1, 13))
+        steps = []
+        rent = float(rng.integers(5_000, 40_000))
+        for _ in range(int(rng.integers(1, 6))):
+            start = date(year, month, int(rng.integers(1, 28)))
+            year += 1
+            end = date(year, month, 1)
+            steps.append((start, end, rent))
+            rent *= 1.03
+        structure = ("Gross", "NNN", "Modified Gross")[lease_id % 3]
+        leases.append(_lease(lease_id, steps, structure, cap_psf=2.0 if lease_id % 4 == 0 else None))
+    return leases
+
+
+def _schedules(num_periods):
+    opex = OperatingExpenses(
+        period_date=date(2025, 1, 1),
+        property_taxes=4_000,
+        insurance=1_200,
+        cam_expenses=2_500,
+        utilities=800,
+        management_fee_pct=0.03,
+        repairs_maintenance=600,
+        other_expenses=300,
+    )
+    capital = CapitalItems(
+        period_date=date(2025, 1, 1),
+        capital_reserves=500,
+        tenant_improvements=0,
+        leasing_commissions=0,
+    )
+    return [opex] * num_periods, [capital] * num_periods
+
+
+def test_lease_revenue_matches_reference(rent_roll):
+    engine = CashFlowEngine()
+    period_dates = engine._generate_period_dates(date(2024, 1, 1), 96, "monthly")
+
+    revenue = engine._calculate_lease_revenue(rent_roll, period_dates, "monthly")
+
+    np.testing.assert_allclose(revenue, _reference_rent(rent_roll, period_dates))
+
+
+def test_lease_revenue_overlapping_steps_first_match_wins():
+    lease = _lease(1, [
+        (date(2025, 1, 1), date(2025, 12, 31), 1_000.0),
+        (date(2025, 6, 1), date(2026, 12, 31), 2_000.0),
+    ])
+    engine = CashFlowEngine()
+    period_dates = engine._generate_period_dates(date(2025, 1, 1), 24, "monthly")
+
+    revenue = engine._calculate_lease_revenue([lease], period_dates, "monthly")
+
+    np.testing.assert_allclose(revenue, _reference_rent([lease], period_dates))
+    assert revenue[11, 0] == 1_000.0
+    assert revenue[12, 0] == 2_000.0
+
+
+def test_expense_recoveries_respect_structure_term_and_cap(rent_roll):
+    engine = CashFlowEngine()
+    num_periods = 96
+    period_dates = engine._generate_period_dates(date(2024, 1, 1), num_periods, "monthly")
+    opex_schedule, _ = _schedules(num_periods)
+
+    recoveries = engine._calculate_expense_recoveries(rent_roll, opex_schedule, period_dates)
+
+    opex = opex_schedule[0]
+    for j, lease in enumerate(rent_roll):
+        recovery = lease.expense_recovery
+        if recovery.recovery_structure.value == "Gross":
+            expected = 0.0
+        else:
+            expected = (
+                opex.property_taxes * recovery.property_tax_recovery_pct / 100
+                + opex.insurance * recovery.insurance_recovery_pct / 100
+                + opex.cam_expenses * recovery.cam_recovery_pct / 100
+            )
+            if recovery.expense_cap_psf:
+                expected = min(expected, recovery.expense_cap_psf * lease.leased_sf / 12)
+        for i, period_date in enumerate(period_dates):
+            active = (
+                lease.lease_commencement_date
+                <= period_date.date()
+                <= lease.lease_expiration_date
+            )
+            assert recoveries[i, j] == pytest.approx(expected if active else 0.0)
+
+
+def test_percentage_rent_spreads_overage_over_lease_term():
+    lease = _lease(1, [(date(2025, 1, 1), date(2025, 12, 31), 1_000.0)])
+    lease.percentage_rent = PercentageRent(
+        breakpoint_amount=1_000_000, percentage_rate=0.5, prior_year_sales=1_240_000
+    )
+    no_clause = _lease(2, [(date(2025, 1, 1), date(2026, 12, 31), 1_000.0)])
+    engine = CashFlowEngine()
+    period_dates = engine._generate_period_dates(date(2025, 1, 1), 24, "monthly")
+
+    percentage_rent = engine._calculate_percentage_rent([lease, no_clause], period_dates, "monthly")
+
+    # LeaseCalculator convention: 0.5% of the $240k overage, i.e. $1,200 a year
+    np.testing.assert_allclose(percentage_rent[:12, 0], 100.0)
+    np.testing.assert_allclose(percentage_rent[12:, 0], 0.0)
+    np.testing.assert_allclose(percentage_rent[:, 1], 0.0)
+
+
+def test_multi_period_cashflow_returns_lazy_columns(rent_roll):
+    engine = CashFlowEngine()
+    num_periods = 60
+    opex_schedule, capital_schedule = _schedules(num_periods)
+    property_data = PropertyData(
+        cre_property_id=1,
+        property_name="Rent Roll",
+        rentable_sf=250_000,
+        acquisition_price=50_000_000,
+        leases=rent_roll,
+    )
+
+    cash_flows = engine.calculate_multi_period_cashflow(
+        property=property_data,
+        start_date=date(2025, 1, 1),
+        num_periods=num_periods,
+        opex_schedule=opex_schedule,
+        capital_schedule=capital_schedule,
+        annual_debt_service=120_000,
+        vacancy_pct=0.05,
+        credit_loss_pct=0.01,
+    )
+
+    assert isinstance(cash_flows, CashFlowColumns)
+    assert len(cash_flows) == num_periods
+    assert all(isinstance(cf, CashFlowPeriod) for cf in cash_flows)
+    assert [cf.period_id for cf in cash_flows[1:3]] == [2, 3]
+    with pytest.raises(IndexError):
+        cash_flows[num_periods]
+
+    period_dates = engine._generate_period_dates(date(2025, 1, 1), num_periods, "monthly")
+    expected_rent = _reference_rent(rent_roll, period_dates).sum(axis=1)
+    np.testing.assert_allclose(cash_flows.base_rent, expected_rent)
+    np.testing.assert_allclose([cf.base_rent for cf in cash_flows], expected_rent)
+
+    period = cash_flows[-1]
+    assert period.period_id == num_periods
+    assert period.debt_service == pytest.approx(10_000)
+    assert period.net_cash_flow == pytest.approx(
+        period.net_operating_income - 500 - period.debt_service
+    )
+
+    annual = engine.calculate_annual_summary(cash_flows)
+    assert list(annual["year"]) == [2025, 2026, 2027, 2028, 2029]
+    assert annual["net_cash_flow"].sum() == pytest.approx(sum(cf.net_cash_flow for cf in cash_flows))
+    assert "gross_potential_income" not in annual.columns
+
+    # The materialized list summarizes to the same frame
+    from_periods = engine.calculate_annual_summary(cash_flows.to_periods())
+    np.testing.assert_allclose(
+        from_periods.drop(columns="year").to_numpy(),
+        annual.drop(columns="year").to_numpy(),
+    )
+
+
+def test_multi_period_cashflow_requires_full_schedules():
+    engine = CashFlowEngine()
+    opex_schedule, capital_schedule = _schedules(6)
+    property_data = PropertyData(
+        cre_property_id=1,
+        property_name="Short",
+        rentable_sf=5_000,
+        acquisition_price=1_000_000,
+        leases=[_lease(1, [(date(2025, 1, 1), date(2025, 12, 31), 1_000.0)])],
+    )
+
+    with pytest.raises(ValueError):
+        engine.calculate_multi_period_cashflow(
+            property=property_data,
+            start_date=date(2025, 1, 1),
+            num_periods=12,
+            opex_schedule=opex_schedule,
+            capital_schedule=capital_schedule,
+        )
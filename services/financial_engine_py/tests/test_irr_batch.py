@@ -0,0 +1,106 @@
+"""
+Batch IRR / XIRR / NPV Solver Tests
+
+Checks the vectorized solver against numpy-financial and the scalar
+calculate_xirr used by the waterfall engine.
+"""
+
+import numpy as np
+import numpy_financial as npf
+import pytest
+from datetime import date, timedelta
+
+from financial_engine.core.irr_batch import (
+    calculate_irr_batch,
+    calculate_npv_batch,
+    calculate_xirr_batch,
+    calculate_xnpv_batch,
+)
+from financial_engine.waterfall.irr import calculate_xirr
+
+
+def _random_series(rng, count, periods):
+    flows = rng.normal(50_000, 40_000, size=(count, periods))
+    flows[:, 0] = -rng.uniform(1_000_000, 3_000_000, size=count)
+    flows[:, -1] += rng.uniform(1_000_000, 4_000_000, size=count)
+    return flows
+
+
+def test_irr_batch_matches_numpy_financial():
+    rng = np.random.default_rng(7)
+    flows = _random_series(rng, 50, 60)
+
+    batch = calculate_irr_batch(flows)
+    expected = np.array([npf.irr(row) for row in flows])
+
+    np.testing.assert_allclose(batch, expected, rtol=0, atol=1e-10)
+
+
+def test_irr_batch_returns_nan_without_sign_change():
+    flows = [
+        [-100.0, 60.0, 60.0],
+        [100.0, 10.0, 10.0],
+        [-100.0, -10.0, -10.0],
+    ]
+
+    result = calculate_irr_batch(flows)
+
+    assert result[0] == pytest.approx(npf.irr(flows[0]), abs=1e-12)
+    assert np.isnan(result[1])
+    assert np.isnan(result[2])
+
+
+def test_irr_batch_ignores_nan_padding():
+    short = [-1000.0, 300.0, 400.0, 500.0]
+    long = [-1000.0, 100.0, 100.0, 100.0, 100.0, 1000.0]
+    padded = np.full((2, 6), np.nan)
+    padded[0, :4] = short
+    padded[1, :] = long
+
+    result = calculate_irr_batch(padded)
+
+    assert result[0] == pytest.approx(npf.irr(short), abs=1e-12)
+    assert result[1] == pytest.approx(npf.irr(long), abs=1e-12)
+
+
+def test_irr_batch_multiple_roots_matches_numpy_financial():
+    # Roots at 10% and 20%; numpy-financial reports the one nearest zero
+    flows = [-100.0, 230.0, -132.0]
+
+    result = calculate_irr_batch(flows)
+
+    assert result[0] == pytest.approx(npf.irr(flows), abs=1e-10)
+
+
+def test_xirr_batch_matches_calculate_xirr():
+    rng = np.random.default_rng(11)
+    start = date(2024, 1, 1)
+    dates = [start + timedelta(days=int(d)) for d in np.cumsum(rng.integers(20, 40, size=36))]
+    dates.insert(0, start)
+    flows = _random_series(rng, 10, len(dates))
+
+    batch = calculate_xirr_batch(dates, flows)
+
+    for rate, row in zip(batch, flows):
+        expected = calculate_xirr(dates, row.tolist())
+        assert rate == pytest.approx(float(expected), abs=5e-9)
+
+
+def test_npv_batch_matches_numpy_financial():
+    rng = np.random.default_rng(3)
+    flows = _random_series(rng, 5, 24)
+    rates = np.linspace(0.005, 0.02, 5)
+
+    batch = calculate_npv_batch(rates, flows)
+    expected = [npf.npv(r, row) for r, row in zip(rates, flows)]
+
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
+
+
+def test_xnpv_batch_is_zero_at_xirr():
+    dates = [date(2024, 1, 1), date(2024, 12, 31), date(2025, 12, 31)]
+    flows = [[-10_000_000, 500_000, 12_000_000]]
+
+    rate = calculate_xirr_batch(dates, flows)
+
+    assert calculate_xnpv_batch(rate, dates, flows)[0] == pytest.approx(0.0, abs=1e-4)
@@ -0,0 +1,179 @@
+"""
+Monte Carlo Simulation Engine Tests
+
+Fixed assumptions must reproduce the point estimate, runs must be
+reproducible from the seed regardless of worker count, and early stopping
+must end a long run once the percentile bands settle.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from financial_engine.core.monte_carlo import (
+    AssumptionDistribution,
+    IncomePropertySimulationInputs,
+    LandDevSimulationInputs,
+    MonteCarloEngine,
+    SimulationConfig,
+)
+from financial_engine.waterfall import (
+    HurdleMethod,
+    ReturnOfCapital,
+    WaterfallSettings,
+    WaterfallTierConfig,
+)
+
+
+@pytest.fixture
+def land_inputs():
+    cost_flows = np.zeros(48)
+    cost_flows[0] = 4_000_000
+    cost_flows[1:19] = 250_000
+    return LandDevSimulationInputs(
+        start_date=date(2025, 1, 1),
+        cost_flows=cost_flows,
+        sale_periods=[13, 19, 25, 31, 37, 43],
+        sale_net_revenue=[2_000_000] * 6,
+        discount_rate=0.10,
+        price_growth_rate=0.03,
+        cost_inflation_rate=0.025,
+    )
+
+
+@pytest.fixture
+def income_inputs():
+    months = 60
+    return IncomePropertySimulationInputs(
+        start_date=date(2025, 1, 1),
+        gpr=100_000 * 1.03 ** (np.arange(months) / 12),
+        other_income=np.full(months, 2_000.0),
+        base_opex=35_000 * 1.03 ** (np.arange(months) / 12),
+        replacement_reserves=np.full(months, 2_500.0),
+        capital_costs=np.zeros(months),
+        acquisition_cost=10_000_000,
+        discount_rate=0.08,
+        vacancy_rate=0.05,
+        credit_loss_rate=0.01,
+        management_fee_pct=0.03,
+        income_growth_rate=0.03,
+        expense_growth_rate=0.03,
+        terminal_cap_rate=0.055,
+        selling_costs_pct=0.02,
+    )
+
+
+def test_fixed_assumptions_reproduce_point_estimate(land_inputs):
+    config = SimulationConfig(draws=20, batch_size=10, seed=1, max_workers=1)
+    result = MonteCarloEngine(land_inputs, {}, config).run()
+
+    flows = -land_inputs.cost_flows.copy()
+    for period, revenue in zip(land_inputs.sale_periods, land_inputs.sale_net_revenue):
+        flows[period - 1] += revenue * 1.03 ** ((period - 1) / 12)
+    annual = flows.reshape(4, 12).sum(axis=1)
+    expected_irr = npf.irr(annual)
+    expected_npv = npf.npv(1.10 ** (1 / 12) - 1, flows)
+
+    np.testing.assert_allclose(result.samples['irr'], expected_irr, atol=1e-10)
+    np.testing.assert_allclose(result.samples['npv'], expected_npv, rtol=1e-10)
+    assert result.bands['peak_equity']['p50'] == pytest.approx(-np.cumsum(flows).min())
+
+
+def test_faster_absorption_raises_irr(land_inputs):
+    config = SimulationConfig(draws=10, batch_size=10, seed=1, max_workers=1)
+    slow = MonteCarloEngine(
+        land_inputs, {'absorption_pace': {'distribution': 'fixed', 'value': 0.8}}, config
+    ).run()
+    fast = MonteCarloEngine(
+        land_inputs, {'absorption_pace': {'distribution': 'fixed', 'value': 1.25}}, config
+    ).run()
+
+    assert fast.bands['irr']['p50'] > slow.bands['irr']['p50']
+
+
+def test_income_property_exit_cap_drives_value(income_inputs):
+    config = SimulationConfig(draws=2_000, batch_size=500, seed=3, max_workers=1,
+                              early_stopping=False)
+    result = MonteCarloEngine(
+        income_inputs,
+        {'exit_cap': {'distribution': 'normal', 'mean': 0.055, 'std': 0.004, 'low': 0.04}},
+        config,
+    ).run()
+
+    caps = result.assumptions['exit_cap']
+    npvs = result.samples['npv']
+    assert caps.min() >= 0.04
+    assert np.corrcoef(caps, npvs)[0, 1] < -0.9
+    band = result.bands['irr']
+    assert band['p5'] < band['p50'] < band['p95']
+
+
+def test_results_depend_on_seed_not_worker_count(land_inputs):
+    distributions = {
+        'price_growth': AssumptionDistribution('normal', mean=0.03, std=0.01),
+        'cost_inflation': AssumptionDistribution('uniform', low=0.01, high=0.04),
+    }
+    serial = MonteCarloEngine(
+        land_inputs, distributions,
+        SimulationConfig(draws=400, batch_size=100, seed=11, max_workers=1, early_stopping=False),
+    ).run()
+    pooled = MonteCarloEngine(
+        land_inputs, distributions,
+        SimulationConfig(draws=400, batch_size=100, seed=11, max_workers=2, early_stopping=False),
+    ).run()
+
+    np.testing.assert_array_equal(serial.samples['irr'], pooled.samples['irr'])
+    np.testing.assert_array_equal(
+        serial.assumptions['price_growth'], pooled.assumptions['price_growth']
+    )
+
+
+def test_early_stopping_and_progress(land_inputs):
+    config = SimulationConfig(draws=50_000, batch_size=500, seed=5, max_workers=1,
+                              min_draws=2_000, tolerance=0.02, patience=3)
+    progress = []
+    result = MonteCarloEngine(
+        land_inputs,
+        {'price_growth': {'distribution': 'triangular', 'low': 0.0, 'mode': 0.03, 'high': 0.05}},
+        config,
+    ).run(progress.append)
+
+    assert result.stopped_early
+    assert 2_000 <= result.draws_completed < 50_000
+    assert [p.completed for p in progress] == list(range(500, result.draws_completed + 1, 500))
+    assert progress[-1].converged
+    assert result.to_dict()['drawsCompleted'] == result.draws_completed
+
+
+def test_waterfall_bands(land_inputs):
+    tiers = [
+        WaterfallTierConfig(tier_number=1, tier_name="Pref", irr_hurdle=Decimal("8"),
+                            lp_split_pct=Decimal("90"), gp_split_pct=Decimal("10")),
+        WaterfallTierConfig(tier_number=2, tier_name="Promote", irr_hurdle=None,
+                            lp_split_pct=Decimal("70"), gp_split_pct=Decimal("30")),
+    ]
+    settings = WaterfallSettings(hurdle_method=HurdleMethod.IRR, num_tiers=2,
+                                 return_of_capital=ReturnOfCapital.PARI_PASSU)
+    config = SimulationConfig(draws=50, batch_size=25, seed=2, max_workers=1)
+
+    result = MonteCarloEngine(
+        land_inputs,
+        {'price_growth': {'distribution': 'normal', 'mean': 0.03, 'std': 0.01}},
+        config,
+        waterfall=(tiers, settings),
+    ).run()
+
+    assert result.bands['lp_irr']['defined'] == 50
+    assert result.bands['lp_equity_multiple']['p50'] > 1.0
+
+
+def test_invalid_distributions_rejected(land_inputs, income_inputs):
+    with pytest.raises(ValueError, match="requires"):
+        AssumptionDistribution('triangular', low=0.0, high=1.0)
+    with pytest.raises(ValueError, match="does not apply"):
+        MonteCarloEngine(land_inputs, {'exit_cap': {'distribution': 'fixed', 'value': 0.05}})
+    with pytest.raises(ValueError, match="Unknown simulation assumption"):
+        MonteCarloEngine(income_inputs, {'rent': {'distribution': 'fixed', 'value': 1}})
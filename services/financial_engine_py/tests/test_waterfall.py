@@ -27,7 +27,7 @@ from financial_engine.waterfall.formulas import (
     calculate_splits,
     calculate_equity_multiple,
 )
-from financial_engine.waterfall.irr import calculate_xirr
+from financial_engine.waterfall.irr import calculate_xirr, IncrementalXIRR
 
 
 class TestFormulas:
@@ -112,6 +112,45 @@ class TestXIRR:
         xirr = calculate_xirr(dates, flows)
         assert xirr is None
 
+    def test_incremental_xirr_matches_full_solve(self):
+        """Running XIRR agrees with calculate_xirr after every appended flow."""
+        dates = [
+            date(2024, 1, 1),
+            date(2024, 3, 31),
+            date(2024, 9, 30),
+            date(2025, 6, 30),
+            date(2025, 12, 31),
+            date(2026, 6, 30),
+        ]
+        flows = [
+            Decimal('-6000000'),
+            Decimal('-4000000'),
+            Decimal('1500000'),
+            Decimal('2500000'),
+            Decimal('-1000000'),  # second sign change forces the bracketed fallback
+            Decimal('14000000'),
+        ]
+
+        acc = IncrementalXIRR(capacity=2)
+        for i, (d, cf) in enumerate(zip(dates, flows), start=1):
+            acc.append(d, cf)
+            if i < 2:
+                continue
+            expected = calculate_xirr(dates[:i], flows[:i])
+            actual = acc.solve()
+            if expected is None:
+                assert actual is None
+            else:
+                assert abs(actual - expected) <= Decimal('1e-8')
+
+        assert acc.fallbacks >= 1
+
+    def test_incremental_xirr_requires_mixed_flows(self):
+        acc = IncrementalXIRR()
+        acc.append(date(2024, 1, 1), Decimal('1000000'))
+        acc.append(date(2024, 12, 31), Decimal('500000'))
+        assert acc.solve() is None
+
 
 class TestWaterfallEngine:
     """Test the full waterfall engine."""
@@ -218,6 +257,41 @@ class TestWaterfallEngine:
         assert result.lp_summary.equity_multiple > Decimal('1')
         assert result.gp_summary.equity_multiple > Decimal('1')
 
+    def test_period_irr_modes(self, simple_waterfall_config):
+        """period_irr controls which periods report running IRR."""
+        tiers, settings = simple_waterfall_config
+        cash_flows = [
+            CashFlow(period_id=1, date=date(2024, 1, 1), amount=Decimal('-50000000')),
+            CashFlow(period_id=2, date=date(2024, 6, 30), amount=Decimal('-50000000')),
+            CashFlow(period_id=3, date=date(2025, 3, 31), amount=Decimal('30000000')),
+            CashFlow(period_id=4, date=date(2025, 9, 30), amount=Decimal('40000000')),
+            CashFlow(period_id=5, date=date(2026, 3, 31), amount=Decimal('50000000')),
+            CashFlow(period_id=6, date=date(2026, 12, 31), amount=Decimal('125000000')),
+        ]
+
+        every = WaterfallEngine(tiers=tiers, settings=settings, cash_flows=cash_flows).calculate()
+
+        settings.period_irr = 'final'
+        settings.__post_init__()
+        final = WaterfallEngine(tiers=tiers, settings=settings, cash_flows=cash_flows).calculate()
+        assert [pr.lp_irr for pr in final.period_results[:-1]] == [None] * 5
+        assert final.period_results[-1].lp_irr == every.period_results[-1].lp_irr
+        assert final.lp_summary.irr == every.lp_summary.irr
+
+        settings.period_irr = 'every_n'
+        settings.period_irr_interval = 2
+        settings.__post_init__()
+        every_n = WaterfallEngine(tiers=tiers, settings=settings, cash_flows=cash_flows).calculate()
+        reported = [pr.period_id for pr in every_n.period_results if pr.lp_irr is not None]
+        assert reported == [4, 6]  # period 2 has no distributions yet
+        for pr in every_n.period_results:
+            if pr.lp_irr is not None:
+                assert pr.lp_irr == every.period_results[pr.period_id - 1].lp_irr
+
+    def test_invalid_period_irr_mode(self):
+        with pytest.raises(ValueError):
+            WaterfallSettings(period_irr='sometimes')
+
 
 class TestExcelValidation:
     """
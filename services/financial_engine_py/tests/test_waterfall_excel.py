@@ -1,5 +1,6 @@
 from decimal import Decimal
 
+from financial_engine.waterfall.irr import calculate_xirr
 from services.financial_engine_py.tests.excel_waterfall_utils import (
     build_engine,
     load_excel_scenario,
@@ -33,3 +34,30 @@ def test_excel_scenario_matches_within_one_dollar():
             max_abs_delta = period_max
 
     assert max_abs_delta <= Decimal("1.00"), f"max per-tier delta {max_abs_delta}"
+
+
+def test_excel_scenario_period_irr_matches_full_xirr():
+    """Incremental per-period IRR matches a full calculate_xirr re-solve."""
+    cash_flows, _, _ = load_excel_scenario()
+    engine = build_engine(cash_flows)
+
+    expected = []
+    original = engine._calculate_partner_irr
+
+    def recording_irr(partner):
+        irr = original(partner)
+        if len(partner.cash_flow_dates) >= 2:
+            expected.append(
+                (irr, calculate_xirr(partner.cash_flow_dates, partner.cash_flow_amounts))
+            )
+        return irr
+
+    engine._calculate_partner_irr = recording_irr
+    engine.calculate()
+
+    assert expected
+    for actual, full in expected:
+        if full is None:
+            assert actual is None
+        else:
+            assert abs(actual - full) <= Decimal("1e-8")
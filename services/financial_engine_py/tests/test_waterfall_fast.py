@@ -0,0 +1,96 @@
+"""
+Float64 Waterfall Engine Tests
+
+The fast path must track the Decimal engine to the cent on the validated
+Excel scenario and on the alternate settings it supports.
+"""
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from financial_engine.waterfall import (
+    FastWaterfallEngine,
+    HurdleMethod,
+    ReturnOfCapital,
+    WaterfallSettings,
+    WaterfallTierConfig,
+)
+from services.financial_engine_py.tests.excel_waterfall_utils import (
+    build_engine,
+    load_excel_scenario,
+)
+
+
+@pytest.fixture(scope="module")
+def excel_inputs():
+    cash_flows, _, _ = load_excel_scenario()
+    engine = build_engine(cash_flows)
+    return engine.tiers, engine.settings, cash_flows
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"return_of_capital": ReturnOfCapital.LP_FIRST},
+    {"gp_catch_up": False},
+    {"num_tiers": 2},
+])
+def test_fast_path_matches_decimal_to_the_cent(excel_inputs, overrides):
+    tiers, settings, cash_flows = excel_inputs
+    engine = FastWaterfallEngine.from_cash_flows(
+        tiers, replace(settings, **overrides), cash_flows
+    )
+
+    result = engine.calculate(verify=True)
+
+    verification = result.verification
+    assert verification.max_divergence_cents.shape == (1, len(cash_flows))
+    assert verification.within(cents=1.0), (
+        f"max divergence {verification.max_cents:.4f} cents"
+    )
+    assert np.all(verification.irr_divergence < 1e-7)
+
+
+def test_fast_path_emx_hurdles():
+    tiers = [
+        WaterfallTierConfig(tier_number=1, irr_hurdle=8, emx_hurdle=Decimal("1.0"),
+                            lp_split_pct=90, gp_split_pct=10),
+        WaterfallTierConfig(tier_number=2, irr_hurdle=15, emx_hurdle=Decimal("1.5"),
+                            lp_split_pct=72, gp_split_pct=28),
+        WaterfallTierConfig(tier_number=3, lp_split_pct=45, gp_split_pct=55),
+    ]
+    settings = WaterfallSettings(hurdle_method=HurdleMethod.EMX, num_tiers=3)
+    dates = [date(2025, m, 1) for m in range(1, 13)]
+    amounts = [-5_000_000, -2_000_000] + [250_000] * 9 + [12_000_000]
+
+    result = FastWaterfallEngine(tiers, settings, dates, amounts).calculate(verify=True)
+
+    assert result.verification.within(cents=1.0)
+    assert result.accruals.sum() == 0
+
+
+def test_scenario_batch_matches_individual_runs(excel_inputs):
+    tiers, settings, cash_flows = excel_inputs
+    dates = [cf.date for cf in cash_flows]
+    base = np.array([float(cf.amount) for cf in cash_flows])
+    # Stress only the inflows so the scenarios actually differ
+    scales = (0.7, 1.0, 1.3)
+    amounts = np.vstack([np.where(base > 0, base * s, base) for s in scales])
+
+    batch = FastWaterfallEngine(tiers, settings, dates, amounts).calculate()
+
+    assert batch.distributions.shape == (3, len(cash_flows), 5, 2)
+    for s, row in enumerate(amounts):
+        single = FastWaterfallEngine(tiers, settings, dates, row).calculate()
+        np.testing.assert_allclose(batch.distributions[s], single.distributions[0])
+        assert batch.lp_irr[s] == pytest.approx(single.lp_irr[0])
+    assert batch.lp_irr[0] < batch.lp_irr[1] < batch.lp_irr[2]
+
+
+def test_fast_path_rejects_mismatched_shapes(excel_inputs):
+    tiers, settings, _ = excel_inputs
+    with pytest.raises(ValueError):
+        FastWaterfallEngine(tiers, settings, [date(2025, 1, 1)], [[-1.0, 2.0]])